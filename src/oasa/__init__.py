@@ -45,18 +45,26 @@ from . import geometry
 from . import transform3d
 from . import transform
 from . import known_groups
+from . import ring_info
+from . import ring_templates
+from . import spatial_index
+from . import substructure_matcher
+from . import fingerprint
 
 atom = atom.atom
 bond = bond.bond
 molecule = molecule.molecule
 query_atom = query_atom.query_atom
 chem_vertex = chem_vertex.chem_vertex
+ring_info = ring_info.ring_info
+spatial_index = spatial_index.spatial_index
+substructure_matcher = substructure_matcher.substructure_matcher
 
 allNames = ['atom', 'bond', 'chem_vertex', 'coords_generator', 'config',
-            'coords_optimizer', 'geometry', 'graph', 'inchi', 'known_groups',
+            'coords_optimizer', 'fingerprint', 'geometry', 'graph', 'inchi', 'known_groups',
             'linear_formula', 'molecule', 'molfile', 'name_database',
-            'oasa_exceptions', 'periodic_table', 'query_atom', 'smiles',
-            'stereochemistry', 'subsearch', 'svg_out', 'transform',
+            'oasa_exceptions', 'periodic_table', 'query_atom', 'ring_info', 'ring_templates', 'smiles',
+            'spatial_index', 'stereochemistry', 'subsearch', 'substructure_matcher', 'svg_out', 'transform',
             'transform3d']
 
 try:
@@ -39,8 +39,8 @@ class atom(chem_vertex):
   def __init__( self, symbol='C', charge=0, coords=None):
     chem_vertex.__init__( self, coords=coords)
     self.symbol = symbol
-    self.charge = charge
-    self.isotope = None
+    self._charge = charge
+    self._isotope = None
     self.explicit_hydrogens = 0
 
 
@@ -65,12 +65,13 @@ class atom(chem_vertex):
 
   @symbol.setter
   def symbol(self, symbol):
-    self._clean_cache()
     try:
-      self.valency = PT.periodic_table[ symbol]['valency'][0]
-      self.symbol_number = PT.periodic_table[ symbol]['ord']
+      element = PT.periodic_table[ symbol]
     except KeyError:
       raise oasa_invalid_atom_symbol( "invalid atom symbol", symbol)
+    # the valency setter cleans the cache
+    self.valency = element['valency'][0]
+    self.symbol_number = element['ord']
     self._symbol = symbol
 
 
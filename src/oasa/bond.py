@@ -51,11 +51,14 @@ class bond(graph.edge, object):
 
   def __init__( self, vs=[], order=1, type='n'):
     graph.edge.__init__( self, vs=vs)
-    self.set_vertices( vs)
     self.aromatic = None  # None means it was not set
-    self.order = order
+    # the order setter is not needed, the bond is not attached to its atoms yet
+    if order == 4:
+      self._order = None
+      self.aromatic = 1
+    else:
+      self._order = order
     self.type = type
-    self.properties_ = {}
     self.stereochemistry = None
 
 
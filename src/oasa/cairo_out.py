@@ -17,9 +17,12 @@
 
 #--------------------------------------------------------------------------
 
+import os
 import sys
 import copy
 import math
+import multiprocessing
+import xml.sax
 import cairo
 
 from . import misc
@@ -147,6 +150,10 @@ class cairo_out(object):
     # list of paths that contribute to the bounding box (probably no edges)
     self._vertex_to_bbox = {} # vertex-to-bbox mapping
     self._bboxes = [] # for overall bbox calcualtion
+    # parsed markup of texts and text extents, they are kept for all the
+    # drawings made by this object
+    self._chunks_cache = {}
+    self._extents_cache = {}
     for k,v in kw.items():
       if k in self.__class__.default_options:
         setattr( self, k, v)
@@ -197,6 +204,18 @@ class cairo_out(object):
 
 
   def mols_to_cairo( self, mols, filename, format="png"):
+    self._vertex_to_bbox = {}
+    self._bboxes = []
+    # the coords are flipped and aligned only for the drawing
+    coords = [(v, v.x, v.y, v.z) for mol in mols for v in mol.vertices]
+    try:
+      self._mols_to_cairo( mols, filename, format)
+    finally:
+      for v, x, y, z in coords:
+        v.x, v.y, v.z = x, y, z
+
+
+  def _mols_to_cairo( self, mols, filename, format):
     x1, y1, x2, y2 = None, None, None, None
     for mol in mols:
       for v in mol.vertices:
@@ -216,24 +235,44 @@ class cairo_out(object):
     h = int( y2 - y1)
     self._bboxes.append( (x1,y1,x2,y2))
 
-    # dummy surface to get complete size of the drawing
-    # Because it is not possible to calculate the bounding box of a drawing before its drawn (mainly
-    # because we don't know the size of text items), this object internally draws to a surface with
-    # large margins to get the bbox
-    _w = int( self.scaling*w+2*self.scaling*self._temp_margin)
-    _h = int( self.scaling*h+2*self.scaling*self._temp_margin)
-    self.create_dummy_surface( _w, _h)
-    self.context = cairo.Context( self.surface)
+    # It is not possible to calculate the bounding box of a drawing before its drawn (mainly
+    # because we don't know the size of text items). When cairo supports it the drawing is
+    # recorded and replayed to the real surface, otherwise it is drawn twice - to a dummy
+    # surface with large margins to get the bbox and then for real.
+    record = hasattr( cairo, "RecordingSurface")
+    if record:
+      self.surface = cairo.RecordingSurface( cairo.CONTENT_COLOR_ALPHA, None)
+    else:
+      _w = int( self.scaling*w+2*self.scaling*self._temp_margin)
+      _h = int( self.scaling*h+2*self.scaling*self._temp_margin)
+      self.create_dummy_surface( _w, _h)
+    recording = self.surface
+    self._create_context()
+    self.context.scale( self.scaling, self.scaling)
     [self.draw_mol( mol) for mol in mols]
     x1, y1, x2, y2 = self._get_bbox()
-    x1, y1 = self.context.user_to_device( x1, y1)
-    x2, y2 = self.context.user_to_device( x2, y2)
     width = int( self.scaling*(x2-x1) + 2*self.margin*self.scaling)
     height = int( self.scaling*(y2-y1) + 2*self.margin*self.scaling)
 
     # now paint for real
     self.filename = filename
     self.create_surface( width, height, format)
+    self._create_context()
+    self.context.translate( round( -x1*self.scaling+self.scaling*self.margin), round( -y1*self.scaling+self.scaling*self.margin))
+    self._set_source_color( self.background_color)
+    self.context.paint()
+    if record:
+      self.context.set_source_surface( recording, 0, 0)
+      self.context.paint()
+    else:
+      self.context.scale( self.scaling, self.scaling)
+      self.context.set_source_rgb( 0, 0, 0)
+      [self.draw_mol( mol) for mol in mols]
+    # write the content to the file
+    self.write_surface()
+
+
+  def _create_context( self):
     self.context = cairo.Context( self.surface)
     if not self.antialias_drawing:
       self.context.set_antialias( cairo.ANTIALIAS_NONE)
@@ -241,19 +280,6 @@ class cairo_out(object):
       options = self.context.get_font_options()
       options.set_antialias( cairo.ANTIALIAS_NONE)
       self.context.set_font_options( options)
-    self.context.translate( round( -x1*self.scaling+self.scaling*self.margin), round( -y1*self.scaling+self.scaling*self.margin))
-    self.context.scale( self.scaling, self.scaling)
-    self.context.rectangle( x1, y1, w, h)
-    self._set_source_color( self.background_color)
-    self.context.paint()
-    self.context.new_path()
-    self.context.set_source_rgb( 0, 0, 0)
-    [self.draw_mol( mol) for mol in mols]
-    # write the content to the file
-    self.write_surface()
-    # flip y coordinates back
-    for v in mol.vertices:
-      v.y = -v.y
 
 
   def mol_to_cairo( self, mol, filename, format="png"):
@@ -393,7 +419,7 @@ class cairo_out(object):
         # find how to center the bonds
         # rings have higher priority in setting the positioning
         in_ring = False
-        for ring in self.molecule.get_smallest_independent_cycles_dangerous_and_cached():
+        for ring in self.molecule.get_ring_info().sssr:
           double_bonds = len( [b for b in self.molecule.vertex_subgraph_to_edge_subgraph(ring) if b.order == 2])
           if v1 in ring and v2 in ring:
             in_ring = True
@@ -564,8 +590,7 @@ class cairo_out(object):
           angle = 0.5*math.pi
         else:
           angle = self._find_place_around_atom( v)
-        self.context.set_font_size( self.subscript_size_ratio * self.font_size)
-        xbearing, ybearing, width, height, x_advance, y_advance = self.context.text_extents( charge)
+        xbearing, ybearing, width, height, x_advance, y_advance = self._text_extents( charge, self.font_name, self.subscript_size_ratio * self.font_size)
         x0 = v.x + 40*math.cos( angle)
         y0 = v.y + 40*math.sin( angle)
         line = (v.x,v.y,x0,y0)
@@ -642,39 +667,7 @@ class cairo_out(object):
 
   def _draw_text( self, xy, text, font_name=None, font_size=None, center_letter=None,
                   color=(0,0,0)):
-    import xml.sax
-    class text_chunk(object):
-      def __init__( self, text, attrs=None):
-        self.text = text
-        self.attrs = attrs or set()
-
-    class FtextHandler ( xml.sax.ContentHandler):
-      def __init__( self):
-        xml.sax.ContentHandler.__init__( self)
-        self._above = []
-        self.chunks = []
-        self._text = ""
-      def startElement( self, name, attrs):
-        self._closeCurrentText()
-        self._above.append( name)
-      def endElement( self, name):
-        self._closeCurrentText()
-        self._above.pop( -1)
-      def _closeCurrentText( self):
-        if self._text:
-          self.chunks.append( text_chunk( self._text, attrs = set( self._above)))
-          self._text = ""
-      def characters( self, data):
-        self._text += data
-
-    # parse the text for markup
-    handler = FtextHandler()
-    try:
-      xml.sax.parseString( "<x>%s</x>" % text, handler)
-    except:
-      chunks = [text_chunk( text)]
-    else:
-      chunks = handler.chunks
+    chunks = self._parse_text( text)
 
     if not font_name:
       font_name = self.font_name
@@ -688,10 +681,10 @@ class cairo_out(object):
     x, y = xy
     if center_letter == 'first':
       if "sup" in chunks[0].attrs or 'sub' in chunks[0].attrs:
-        self.context.set_font_size( int( font_size * self.subscript_size_ratio))
+        size = int( font_size * self.subscript_size_ratio)
       else:
-        self.context.set_font_size( font_size)
-      xbearing, ybearing, width, height, x_advance, y_advance = self.context.text_extents( chunks[0].text[0])
+        size = font_size
+      xbearing, ybearing, width, height, x_advance, y_advance = self._text_extents( chunks[0].text[0], font_name, size)
       x -= 0.5*x_advance
       y += 0.5*height
     elif center_letter == 'last':
@@ -699,13 +692,13 @@ class cairo_out(object):
       _dx = 0
       for i,chunk in enumerate( chunks):
         if "sup" in chunk.attrs or 'sub' in chunk.attrs:
-          self.context.set_font_size( int( font_size * self.subscript_size_ratio))
+          size = int( font_size * self.subscript_size_ratio)
         else:
-          self.context.set_font_size( font_size)
-        xbearing, ybearing, width, height, x_advance, y_advance = self.context.text_extents( chunk.text)
+          size = font_size
+        xbearing, ybearing, width, height, x_advance, y_advance = self._text_extents( chunk.text, font_name, size)
         _dx += x_advance
       # last letter
-      xbearing, ybearing, width, height, x_advance, y_advance = self.context.text_extents( chunk.text[-1])
+      xbearing, ybearing, width, height, x_advance, y_advance = self._text_extents( chunk.text[-1], font_name, size)
       x -= _dx - 0.5*x_advance
       y += 0.5*height
 
@@ -716,13 +709,13 @@ class cairo_out(object):
       y1 = round( y)
       if "sup" in chunk.attrs:
         y1 -= asc / 2
-        self.context.set_font_size( int( font_size * self.subscript_size_ratio))
+        size = int( font_size * self.subscript_size_ratio)
       elif "sub" in chunk.attrs:
         y1 += asc / 2
-        self.context.set_font_size( int( font_size * self.subscript_size_ratio))
+        size = int( font_size * self.subscript_size_ratio)
       else:
-        self.context.set_font_size( font_size)
-      xbearing, ybearing, width, height, x_advance, y_advance = self.context.text_extents( chunk.text)
+        size = font_size
+      xbearing, ybearing, width, height, x_advance, y_advance = self._text_extents( chunk.text, font_name, size)
       # background
       if self.add_background_to_text:
         self.context.rectangle( x1+xbearing, y1+ybearing, width, height)
@@ -748,6 +741,34 @@ class cairo_out(object):
     return bbox
 
 
+  def _parse_text( self, text):
+    """splits text with markup (<sub>, <sup>) to a list of _text_chunk"""
+    chunks = self._chunks_cache.get( text)
+    if chunks is None:
+      handler = _markup_handler()
+      try:
+        xml.sax.parseString( "<x>%s</x>" % text, handler)
+      except Exception:
+        chunks = [_text_chunk( text)]
+      else:
+        chunks = handler.chunks
+      self._chunks_cache[ text] = chunks
+    return chunks
+
+
+  def _text_extents( self, text, font_name, font_size):
+    """sets the font of the context and returns the extents of text in it, the
+    extents are cached as they are the same for all drawings with the same scaling"""
+    self.context.select_font_face( font_name)
+    self.context.set_font_size( font_size)
+    key = (text, font_name, font_size, self.scaling, self.antialias_text)
+    extents = self._extents_cache.get( key)
+    if extents is None:
+      extents = tuple( self.context.text_extents( text))
+      self._extents_cache[ key] = extents
+    return extents
+
+
   # not used
   def _draw_rectangle( self, coords, fill_color=(1,1,1)):
     #outline = self.paper.itemcget( item, 'outline')
@@ -798,6 +819,33 @@ class cairo_out(object):
 
 
 
+class _text_chunk(object):
+  def __init__( self, text, attrs=None):
+    self.text = text
+    self.attrs = attrs or set()
+
+
+class _markup_handler( xml.sax.ContentHandler):
+  def __init__( self):
+    xml.sax.ContentHandler.__init__( self)
+    self._above = []
+    self.chunks = []
+    self._text = ""
+  def startElement( self, name, attrs):
+    self._closeCurrentText()
+    self._above.append( name)
+  def endElement( self, name):
+    self._closeCurrentText()
+    self._above.pop( -1)
+  def _closeCurrentText( self):
+    if self._text:
+      self.chunks.append( _text_chunk( self._text, attrs = set( self._above)))
+      self._text = ""
+  def characters( self, data):
+    self._text += data
+
+
+
 def mol_to_png( mol, filename, **kw):
   c = cairo_out( **kw)
   c.mol_to_cairo( mol, filename)
@@ -819,6 +867,87 @@ def mols_to_cairo( mols, filename, format, **kw):
 
 
 
+##################################################
+## BATCH RENDERING
+
+# the job of the running render_many, the forked workers inherit it
+_batch = None
+# the renderer of a worker process
+_renderer = None
+
+
+def render_many( mols, out_dir, workers=1, format="png", names=None, chunk_size=100, **kw):
+  """draws each molecule to its own file in out_dir, names gives the file names
+  without extension (the indexes of the molecules by default); kw are the
+  options of cairo_out. Returns (filename, error) for each molecule in the
+  order of mols, error is None or the message describing why the drawing failed.
+
+  One cairo_out with its caches is used for all the molecules drawn in one
+  process. With workers > 1 (None for the number of CPUs) chunks of chunk_size
+  molecules are drawn in a pool of processes; the workers get the molecules by
+  forking, so on platforms without fork the molecules are drawn in this process.
+  The coords of the molecules are not changed."""
+  global _batch
+  if workers is None:
+    workers = multiprocessing.cpu_count()
+  if names is None:
+    names = [str( i) for i in range( len( mols))]
+  filenames = [os.path.join( out_dir, "%s.%s" % (name, format)) for name in names]
+  if not os.path.isdir( out_dir):
+    os.makedirs( out_dir)
+  # made here so that wrong options are reported before the workers start
+  renderer = cairo_out( **kw)
+  context = workers > 1 and _get_fork_context()
+  _batch = (mols, filenames, format)
+  try:
+    if not context:
+      return _render_range( 0, len( mols), renderer)
+    pool = context.Pool( workers, _init_renderer, (kw,))
+    try:
+      chunks = [pool.apply_async( _render_range, (i, min( i+chunk_size, len( mols))))
+                for i in range( 0, len( mols), chunk_size)]
+      return [record for chunk in chunks for record in chunk.get()]
+    finally:
+      pool.terminate()
+      pool.join()
+  finally:
+    _batch = None
+
+
+def _get_fork_context():
+  """multiprocessing context which starts the workers by forking, None when
+  it is not available"""
+  if not hasattr( multiprocessing, "get_context"):
+    return sys.platform != "win32" and multiprocessing or None
+  if "fork" in multiprocessing.get_all_start_methods():
+    return multiprocessing.get_context( "fork")
+  return None
+
+
+def _init_renderer( kw):
+  global _renderer
+  _renderer = cairo_out( **kw)
+
+
+def _render_range( start, end, renderer=None):
+  """the worker part of render_many, draws the molecules start:end of the batch"""
+  renderer = renderer or _renderer
+  mols, filenames, format = _batch
+  records = []
+  for i in range( start, end):
+    try:
+      renderer.mol_to_cairo( mols[i], filenames[i], format=format)
+      error = None
+    except Exception as e:
+      error = "%s: %s" % (e.__class__.__name__, e)
+    records.append( (filenames[i], error))
+  return records
+
+# END OF BATCH RENDERING
+##################################################
+
+
+
 if __name__ == "__main__":
 
   from . import smiles
@@ -38,8 +38,9 @@ class chem_vertex(graph.vertex):
 
   def __init__( self, coords=None):
     graph.vertex.__init__( self)
-    self.charge = 0
-    self.free_sites = 0
+    # the cache is empty, the setters are not needed here
+    self._charge = 0
+    self._free_sites = 0
     # None means not set (used)
     if coords:
       self.x, self.y, self.z = coords
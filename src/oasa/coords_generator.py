@@ -21,15 +21,24 @@ from __future__ import division, print_function
 
 import warnings
 
-from math import pi, sqrt, sin, cos
+from math import pi, sqrt, sin, cos, atan2
 
 from . import geometry
 from . import misc
+from . import ring_templates
 
 
 
 class coords_generator(object):
 
+  # limits of the search for flips resolving overlaps of atoms
+  max_overlap_passes = 10
+  max_overlap_bridges = 6
+  # how many times each atom may be visited in average, keeps the time linear
+  max_overlap_work = 100
+  # atoms too close to the part of molecule to flip are counted only up to this number
+  max_overlap_count = 3
+
   def __init__( self, bond_length=1):
     self.bond_length = bond_length
 
@@ -40,6 +49,7 @@ class coords_generator(object):
     coords and we calculate the bond_length from it;
     force says if we should recalc all coords"""
     processed = []
+    fixed = set()
     self.mol = mol
     # stereochemistry info
     self.stereo = {}
@@ -55,7 +65,7 @@ class coords_generator(object):
       return
     elif not force and atms and not len( atms) == len( mol.vertices):
       # this is here just to setup the molecule well
-      self.rings = mol.get_smallest_independent_cycles()
+      rings = mol.get_ring_info().get_sssr()
       # it is - we can use it as backbone
       sub = mol.get_new_induced_subgraph( atms, mol.vertex_subgraph_to_edge_subgraph( atms))
       subs = [comp for comp in sub.get_connected_components()]
@@ -71,6 +81,8 @@ class coords_generator(object):
             for a in sub:
               a.x = None
               a.y = None
+      fixed = set( backbone)
+      self._find_templates( mol)
       # now we check if we have to calculate bond_length from the backbone
       if bond_length < 0:
         bls = []
@@ -82,10 +94,8 @@ class coords_generator(object):
         pass
       else:
         self.bond_length = bond_length
-      # at last we have to remove rings that have coords from the self.rings
-      for ring in self.rings[:]:
-        if backbone >= ring:
-          self.rings.remove( ring)
+      # at last we have to remove rings that have coords from the rings to process
+      self._index_rings( [ring for ring in rings if not backbone >= ring])
     else:
       if force:
         for a in self.mol.vertices:
@@ -98,29 +108,36 @@ class coords_generator(object):
       # the longest chain in case of acyclic molecule
       if mol.contains_cycle():
         # ring
-        self.rings = mol.get_smallest_independent_cycles()
-        # find the most crowded ring
-        jmax = 0
-        imax = 0
-        for i, ring in enumerate( self.rings):
-          j = 0
-          for r in self.rings:
-            if r != ring and r & ring:
-              j += 1
-          if j > jmax:
-            jmax = j
-            imax = i
-        #
-        backbone = self.rings.pop(imax)
-        gcoords = gen_ring_coords( len( backbone), side_length=self.bond_length)
-        for v in mol.sort_vertices_in_path( backbone):
-          v.x, v.y = next(gcoords)
-        processed += backbone
-        processed += self.process_all_anelated_rings( backbone)
+        rings = mol.get_ring_info().get_sssr()
+        self._index_rings( rings)
+        self._find_templates( mol)
+        if self._templates:
+          # the largest ring system with a template
+          v = max( self._templates, key=lambda a: len( self._templates[a][0]))
+          backbone = self._place_template( v, start=True)
+        else:
+          # find the most crowded ring - the one sharing atoms with most other rings
+          jmax = 0
+          imax = 0
+          for i, ring in enumerate( rings):
+            j = len( self._get_rings_of( ring)) - 1
+            if j > jmax:
+              jmax = j
+              imax = i
+          #
+          backbone = rings.pop(imax)
+          self._index_rings( rings)
+          gcoords = gen_ring_coords( len( backbone), side_length=self.bond_length)
+          for v in mol.sort_vertices_in_path( backbone):
+            v.x, v.y = next(gcoords)
+          processed += backbone
+          processed += self.process_all_anelated_rings( backbone)
       elif len( mol.vertices) == 1:
         a = mol.vertices[0]
         a.x, a.y, a.z = 0, 0, 0
         backbone = [a]
+        self._index_rings( [])
+        self._templates = {}
       else:
         # chain - we process 2 atoms as backbone and leave the rest for the code
         a1 = self.mol.vertices[0]
@@ -128,37 +145,108 @@ class coords_generator(object):
         a1.x, a1.y = 0, 0
         a2.x, a2.y = self.bond_length, 0
         backbone = [a1,a2]
-        self.rings = []
+        self._index_rings( [])
+        self._templates = {}
     processed += backbone
     self._continue_with_the_coords( mol, processed=processed)
+    self._resolve_overlaps( mol, fixed=fixed)
     for v in mol.vertices:
       if v.z is None:
         v.z = 0
 
 
+  def _index_rings( self, rings):
+    """sets the rings that should be processed and the index of rings of each atom,
+    rings are never removed from self.rings, only from self._rings_to_go"""
+    self.rings = rings
+    self._rings_to_go = set( range( len( rings)))
+    self._atom_rings = {}
+    for i, ring in enumerate( rings):
+      for a in ring:
+        self._atom_rings.setdefault( a, []).append( i)
+
+
+  def _get_rings_of( self, atoms):
+    """returns indexes of the rings to process sharing an atom with atoms,
+    in the order of self.rings"""
+    idxs = set()
+    for a in atoms:
+      idxs.update( self._atom_rings.get( a, ()))
+    return sorted( idxs & self._rings_to_go)
+
+
+  def _find_templates( self, mol):
+    """finds templates of the ring systems without coords (see ring_templates),
+    self._templates maps their atoms to the ring system and the template coords"""
+    self._templates = {}
+    for system in mol.get_ring_info().get_ring_systems():
+      if not [a for a in system if a.x is not None]:
+        coords = ring_templates.find_template_coords( system)
+        if coords:
+          for a in system:
+            self._templates[ a] = (system, coords)
+
+
+  def _place_template( self, v, start=False):
+    """sets the coords of the ring system of v from its template and returns its atoms;
+    with start the system is placed around the origin, otherwise v is the only atom
+    of the system with coords and the system is turned away from its neighbor"""
+    system, mappings = self._templates[ v]
+    bl = self.bond_length
+    # atoms with substituents should be far from the center of the ring system
+    # to leave room for the rest of the molecule
+    attached = [a for a in system if [n for n in a.neighbors if n not in system]]
+    coords = max( mappings, key=lambda c: sum( c[a][0]**2 + c[a][1]**2 for a in attached))
+    if start:
+      for a, (x, y) in coords.items():
+        a.x, a.y = bl*x, bl*y
+    else:
+      x0, y0 = coords[v]
+      d = [a for a in v.neighbors if a.x is not None and a.y is not None][0]
+      angle = atan2( d.y-v.y, d.x-v.x) - atan2( y0, x0)
+      for a, (x, y) in coords.items():
+        if a is not v:
+          x, y = bl*(x-x0), bl*(y-y0)
+          a.x = v.x + x*cos( angle) - y*sin( angle)
+          a.y = v.y + x*sin( angle) + y*cos( angle)
+    for a in system:
+      del self._templates[ a]
+    for i in self._get_rings_of( system):
+      self._rings_to_go.discard( i)
+    return list( system)
+
+
   def _continue_with_the_coords( self, mol, processed=[]):
     """processes the atoms in circles around the backbone (processed) until all is done"""
+    # atoms are never deprived of coords here, so the ones that got them meanwhile
+    # may be dropped from the end of this list and all is done when it is empty
+    to_go = [o for o in self.mol.vertices if o.x is None]
     while processed:
       new_processed = []
+      processed_set = set( processed)
+      connected = None
       for v in processed:
-        if len([o for o in self.mol.vertices if o.x is None]) == 0:
+        while to_go and to_go[-1].x is not None:
+          to_go.pop()
+        if not to_go:
           # its all done
           return
         # look if v is part of a ring
-        ring = None
-        for r in self.rings:
-          if v in r:
-            ring = r
-            break
-        if not ring:
+        rings = self._get_rings_of( [v])
+        if not rings:
           # v is not in a ring - we can continue
           new_processed += self.process_atom_neigbors( v)
         else:
           # v is in ring so we process the ring
-          if len( processed) > 1 and mol.defines_connected_subgraph_v( processed) and set( processed) <= ring:
+          ring = self.rings[ rings[0]]
+          if len( processed) > 1 and processed_set <= ring and connected is None:
+            connected = mol.defines_connected_subgraph_v( processed)
+          if v in self._templates:
+            new_processed += self._place_template( v)
+          elif len( processed) > 1 and processed_set <= ring and connected:
             new_processed += self.process_all_anelated_rings( processed)
           else:
-            self.rings.remove( ring)
+            self._rings_to_go.discard( rings[0])
             ring = mol.sort_vertices_in_path( ring, start_from=v)
             ring.remove( v)
             d = [a for a in v.neighbors
@@ -175,38 +263,194 @@ class coords_generator(object):
       processed = new_processed
 
 
+  ## OVERLAPS
+
+  def _resolve_overlaps( self, mol, fixed=frozenset()):
+    """finds atoms closer than half of the bond length and moves them apart by
+    mirroring the smaller part of the molecule over a bridge on the path between
+    them; atoms in fixed (coords given by the user) are never moved"""
+    radius = 0.5 * self.bond_length
+    index = mol.get_spatial_index( cell_size=self.bond_length)
+    bridges = mol.get_bridges()
+    tree = self._get_spanning_tree( mol.vertices)
+    # all the atoms visited are subtracted, _count_close_atoms does it as well
+    self._overlap_work = self.max_overlap_work * len( mol.vertices)
+    for _i in range( self.max_overlap_passes):
+      flipped = False
+      # bridges that did not help in this pass
+      tried = set()
+      for a1, a2 in index.iter_close_pairs( radius):
+        self._overlap_work -= 1
+        if (a1.x-a2.x)**2 + (a1.y-a2.y)**2 >= radius**2:
+          # moved apart by one of the previous flips
+          continue
+        es, length = self._get_bridges_between( a1, a2, bridges, tree)
+        self._overlap_work -= length
+        for e in es:
+          if e in tried:
+            continue
+          tried.add( e)
+          side = self._get_smaller_side( e)
+          self._overlap_work -= len( side)
+          if side & fixed or self._overlap_work < 0:
+            continue
+          if self._flip_if_better( e, side, index, radius):
+            flipped = True
+            tried = set()
+            break
+        if self._overlap_work < 0:
+          return
+      if not flipped:
+        break
+
+
+  def _get_bridges_between( self, a1, a2, bridges, tree):
+    """bridges on the path between a1 and a2 in the spanning tree that may be used
+    to flip one of them away, the ones closest to the ends of the path come first;
+    returns them together with the length of the path"""
+    paths = ([], [])
+    while a1 is not a2:
+      if tree[ a1][1] >= tree[ a2][1]:
+        if not tree[ a1][0]:
+          # different components
+          return [], len( paths[0]) + len( paths[1])
+        a1, e = tree[ a1][0]
+        paths[0].append( e)
+      else:
+        a2, e = tree[ a2][0]
+        paths[1].append( e)
+    path = sorted( list( enumerate( paths[0])) + list( enumerate( paths[1])), key=lambda x: x[0])
+    ret = [e for _i, e in path if e in bridges and not self._is_stereo_bond( e)]
+    return ret[:self.max_overlap_bridges], len( path)
+
+
+  def _get_spanning_tree( self, atoms):
+    """returns a dict of (parent, edge), depth for each atom, parent is None for the roots"""
+    tree = {}
+    for root in atoms:
+      if root in tree:
+        continue
+      tree[ root] = (None, 0)
+      queue = [root]
+      for v in queue:
+        depth = tree[ v][1] + 1
+        for e, n in v.get_neighbor_edge_pairs():
+          if n not in tree:
+            tree[ n] = ((v, e), depth)
+            queue.append( n)
+    return tree
+
+
+  def _is_stereo_bond( self, e):
+    """flipping over the double bond of cis/trans stereo would change it"""
+    v1, v2 = e.vertices
+    return bool( [st for st in self.stereo.get( v1, []) if v2 in st.references])
+
+
+  def _get_smaller_side( self, e):
+    """returns the atoms on the smaller side of the bridge e including its end;
+    both sides are searched in turns so only about twice the smaller one is visited"""
+    sides = [set( [v]) for v in e.vertices]
+    stacks = [[v] for v in e.vertices]
+    while True:
+      for side, stack in zip( sides, stacks):
+        if not stack:
+          return side
+        v = stack.pop()
+        for e2, n in v.get_neighbor_edge_pairs():
+          if e2 is not e and n not in side:
+            side.add( n)
+            stack.append( n)
+
+
+  def _flip_if_better( self, e, side, index, radius):
+    """mirrors side over the bond e when there are fewer atoms too close to it
+    afterwards; the distances inside side do not change so only the other atoms
+    are counted"""
+    coords = [(a.x, a.y) for a in side]
+    # usually a few atoms are enough to tell, all are counted only when it is close
+    before = self._count_close_atoms( side, coords, index, radius, limit=self.max_overlap_count)
+    if not before:
+      return False
+    mirrored = self._mirror( e, side)
+    after = self._count_close_atoms( side, mirrored, index, radius, limit=before)
+    if after >= before and before >= self.max_overlap_count:
+      before = self._count_close_atoms( side, coords, index, radius)
+      after = self._count_close_atoms( side, mirrored, index, radius, limit=before)
+    if after >= before or self._overlap_work < 0:
+      # the counts are not complete when the work ran out
+      return False
+    for a, (x, y) in zip( side, mirrored):
+      a.x, a.y = x, y
+      index.move( a)
+    return True
+
+
+  def _count_close_atoms( self, side, coords, index, radius, limit=None):
+    """number of atoms not in side closer than radius to coords, the counting
+    stops when limit is reached; the atoms looked at are subtracted from the work"""
+    count = 0
+    r2 = radius * radius
+    for x, y in coords:
+      near = index.get_items_near( x, y, radius)
+      self._overlap_work -= len( near)
+      count += len( [1 for b in near if (b.x-x)**2 + (b.y-y)**2 < r2 and b not in side])
+      if limit is not None and count >= limit or self._overlap_work < 0:
+        break
+    return count
+
+
+  def _mirror( self, e, side):
+    """returns the coords of atoms of side mirrored over the bond e"""
+    v1, v2 = e.vertices
+    ux, uy = v2.x-v1.x, v2.y-v1.y
+    d = sqrt( ux*ux + uy*uy)
+    ux, uy = ux/d, uy/d
+    ret = []
+    for a in side:
+      x, y = a.x-v1.x, a.y-v1.y
+      dot = x*ux + y*uy
+      ret.append( (v1.x + 2*dot*ux - x, v1.y + 2*dot*uy - y))
+    return ret
+
+
   def process_all_anelated_rings( self, base):
+    """processes the rings fused to base, then the rings fused to them and so on;
+    the rings are visited depth first using a stack instead of recursion"""
     out = []
-    to_go = []
-    b = set( base)
-    for r in self.rings:
-      if r & b:
-        to_go.append( r)
-    for r in to_go:
-      out += self.process_one_anelated_ring( base)
-    if out:
-      for b in to_go:
-        out += self.process_all_anelated_rings( b)
+    stack = [[base]]
+    while stack:
+      if not stack[-1]:
+        stack.pop()
+        continue
+      b = stack[-1].pop()
+      to_go = self._get_rings_of( b)
+      done = []
+      for i in to_go:
+        done += self._process_anelated_ring( i, b)
+      out += done
+      if done:
+        stack.append( [self.rings[i] for i in reversed( to_go)])
     return out
 
 
   def process_one_anelated_ring( self, base):
-    mol = self.mol
+    to_go = self._get_rings_of( base)
+    if to_go:
+      return self._process_anelated_ring( to_go[0], base)
+    return []
+
+
+  def _process_anelated_ring( self, i, base):
     out = []
-    ring = None
-    b = set( base)
-    for r in self.rings:
-      if r & b:
-        ring = r
-        break
-    if ring:
-      self.rings.remove( ring)
-      inter = b & ring
-      to_go = [a for a in ring if a.x is None or a.y is None]
-      if len( ring) - len( to_go) == len( inter):
-        out += self._process_simply_anelated_ring( ring, base)
-      else:
-        out += self._process_multi_anelated_ring( ring)
+    ring = self.rings[i]
+    self._rings_to_go.discard( i)
+    inter = set( base) & ring
+    to_go = [a for a in ring if a.x is None or a.y is None]
+    if len( ring) - len( to_go) == len( inter):
+      out += self._process_simply_anelated_ring( ring, base)
+    else:
+      out += self._process_multi_anelated_ring( ring)
     return out
 
 
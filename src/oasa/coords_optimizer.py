@@ -26,7 +26,12 @@ from math import pi, sqrt, sin, cos, atan2
 #from . import graph
 from . import geometry
 from . import misc
+from .spatial_index import spatial_index
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
 
 
 def sum_of_ring_internal_angles( size):
@@ -55,17 +60,78 @@ def rad_to_deg( rad):
 
 
 
+def _get_index_pairs( mol):
+  """returns lists of index pairs of bonded atoms and of atoms bonded to a common neighbor"""
+  vs = mol.vertices
+  index = dict( (v, i) for i, v in enumerate( vs))
+  bonds = [tuple( index[a] for a in e.vertices) for e in mol.edges]
+  pairs = [(index[v1], index[v2]) for v in vs for v1, v2 in gen_variations( list( v.neighbors), 2)]
+  return bonds, pairs
+
+
+
+class _point(object):
+  __slots__ = ("x", "y", "i")
+
+  def __init__( self, x, y, i):
+    self.x = x
+    self.y = y
+    self.i = i
+
+
+
+class _repulsion_pairs(object):
+  """index pairs (i < j) of the atoms that are neither bonded nor share a neighbor
+  and are closer than twice the bond length; they are searched with a spatial_index
+  again only after the atoms could have moved by more than half of the extra bond
+  length towards each other, so no pair closer than the bond length is missed"""
+
+  def __init__( self, bonds, pairs, bond_length):
+    self.excluded = set( bonds) | set( pairs)
+    self.excluded.update( [(j, i) for i, j in self.excluded])
+    self.bond_length = bond_length
+    self.pairs = []
+    # the sum of the largest atom shifts of the steps since the last search
+    self.moved = None
+
+
+  def is_outdated( self):
+    return self.moved is None or 4 * self.moved > self.bond_length
+
+
+  def update( self, coords):
+    """searches the pairs anew for coords, a sequence of (x, y)"""
+    radius = 2 * self.bond_length
+    index = spatial_index( [_point( x, y, i) for i, (x, y) in enumerate( coords)], cell_size=radius)
+    pairs = []
+    for p1, p2 in index.iter_close_pairs( radius):
+      pair = p1.i < p2.i and (p1.i, p2.i) or (p2.i, p1.i)
+      if pair not in self.excluded:
+        pairs.append( pair)
+    pairs.sort()
+    self.pairs = pairs
+    self.moved = 0
+
+
+
 class coords_optimizer(object):
 
   def __init__( self):
     self.cutoff_rms_grad = 1e-5
     self.cutoff_max_grad = 3e-5
     self.max_iter_number = 1000
+    # atoms that are neither bonded nor share a neighbor are pushed apart
+    # with this strength when they are closer than the bond length
+    self.repulsion = 0
+    # numpy is used for molecules with at least this many atoms when it is
+    # installed, for smaller ones its overhead is larger than the gain
+    self.numpy_min_atoms = 40
 
 
   def optimize_coords( self, mol, bond_length=1, callback=None):
     """callback may be used to obtain information about the running optimization,
-    it is called after each step with three parameters - step number, RMS grad and maxgrad"""
+    it is called after each step with three parameters - step number, RMS grad and maxgrad;
+    the coordinates of atoms are updated when the optimization ends"""
     self.mol = mol
 
     if bond_length < 0:
@@ -77,6 +143,11 @@ class coords_optimizer(object):
     else:
       self.bond_length = bond_length
 
+    if numpy is not None and self.numpy_min_atoms is not None and len( mol.vertices) >= self.numpy_min_atoms:
+      self.engine = _numpy_engine( mol, self.bond_length, self.repulsion)
+    else:
+      self.engine = _python_engine( mol, self.bond_length, self.repulsion)
+
     sumdd, max_grad = self.step()
     rms_grad = sumdd / len( self.mol.vertices)
     i = 0
@@ -100,6 +171,7 @@ class coords_optimizer(object):
         ok = False
         break
 
+    self.engine.write_coords()
     self.i = i
     self.rms_grad = rms_grad
     self.max_grad = max_grad
@@ -107,69 +179,9 @@ class coords_optimizer(object):
 
 
   def step( self, callback=None):
-
-    for v in self.mol.vertices:
-      v.properties_['dx'] = 0
-      v.properties_['dy'] = 0
-
-    for v in self.mol.vertices:
-      self.set_gradient( v)
-
-    dd = 0
-    mdd = 0
-    for v in self.mol.vertices:
-      dx = v.properties_['dx']
-      dy = v.properties_['dy']
-      v.x += dx
-      v.y += dy
-      d = dx**2 + dy**2
-      dd += d
-      if d > mdd:
-        mdd = d
-
-    return sqrt( dd), sqrt( mdd)
-
-
-  def set_gradient( self, vertex):
-    dx, dy = 0, 0
-    for v in vertex.neighbors:
-      gx, gy = self.get_length_gradient( vertex, v)
-      dx -= gx/2.0
-      dy -= gy/2.0
-    vertex.properties_['dx'] += dx
-    vertex.properties_['dy'] += dy
-
-    dx, dy = 0, 0
-    vs = list( vertex.neighbors)
-    variations = list( gen_variations( vs, 2))
-    if variations:
-      for var in variations:
-        v1, v2 = var
-        gx1, gy1, gx2, gy2 = self.get_angle_gradient( deg_to_rad( 120), vertex, v1, v2)
-        v1.properties_['dx'] -= gx1/4.0
-        v1.properties_['dy'] -= gy1/4.0
-        v2.properties_['dx'] -= gx2/4.0
-        v2.properties_['dy'] -= gy2/4.0
-
-
-  def get_length_gradient( self, v1, v2, opt_length=0):
-    if not opt_length:
-      opt_length = self.bond_length
-    dx = v1.x - v2.x
-    dy = v1.y - v2.y
-    dist = sqrt( dx**2 + dy**2)
-    dd = dist - opt_length
-    gx = (dx / dist) * dd
-    gy = (dy / dist) * dd
-    return gx, gy
-
-
-  def get_angle_gradient( self, opt_angle, refv, v1, v2):
-    expl = sqrt( 3) * self.bond_length
-    gx1, gy1 = self.get_length_gradient( v1, v2, opt_length=expl)
-    gx2 = -gx1
-    gy2 = -gy1
-    return gx1, gy1, gx2, gy2
+    """moves the atoms along the gradient, returns the square root of the sum
+    and of the maximum of squared atom shifts"""
+    return self.engine.step()
 
 
   def get_angle_gradient2( self, opt_angle, refv, v1, v2):
@@ -219,6 +231,146 @@ class coords_optimizer(object):
 
 
 
+class _python_engine(object):
+  """coordinates of atoms in lists, used when numpy is not available"""
+
+  def __init__( self, mol, bond_length, repulsion=0):
+    self.vertices = mol.vertices
+    self.xs = [v.x for v in self.vertices]
+    self.ys = [v.y for v in self.vertices]
+    self.bond_length = bond_length
+    self.repulsion = repulsion
+    bonds, pairs = _get_index_pairs( mol)
+    # the 1-3 distance of 120 degrees angles
+    self.terms = [(bonds, bond_length, 0.5), (pairs, sqrt( 3) * bond_length, 0.25)]
+    self.others = repulsion and _repulsion_pairs( bonds, pairs, bond_length) or None
+
+
+  def step( self):
+    xs, ys = self.xs, self.ys
+    dxs = len( xs) * [0.0]
+    dys = len( xs) * [0.0]
+    for pairs, length, k in self.terms:
+      for i, j in pairs:
+        dx = xs[i] - xs[j]
+        dy = ys[i] - ys[j]
+        dist = sqrt( dx*dx + dy*dy)
+        if dist:
+          f = k * (dist - length) / dist
+        else:
+          # atoms at the same point are pushed apart along the x axis
+          f, dx, dy = -k * length, 1.0, 0.0
+        dxs[i] -= f * dx
+        dys[i] -= f * dy
+        dxs[j] += f * dx
+        dys[j] += f * dy
+    if self.repulsion:
+      length = self.bond_length
+      k = self.repulsion / 2
+      if self.others.is_outdated():
+        self.others.update( zip( xs, ys))
+      for i, j in self.others.pairs:
+        dx = xs[i] - xs[j]
+        dy = ys[i] - ys[j]
+        dist = sqrt( dx*dx + dy*dy)
+        if dist < length:
+          if dist:
+            f = k * (dist - length) / dist
+          else:
+            f, dx, dy = -k * length, 1.0, 0.0
+          dxs[i] -= f * dx
+          dys[i] -= f * dy
+          dxs[j] += f * dx
+          dys[j] += f * dy
+
+    dd = 0
+    mdd = 0
+    for i, (dx, dy) in enumerate( zip( dxs, dys)):
+      xs[i] += dx
+      ys[i] += dy
+      d = dx**2 + dy**2
+      dd += d
+      if d > mdd:
+        mdd = d
+    if self.others:
+      self.others.moved += sqrt( mdd)
+    return sqrt( dd), sqrt( mdd)
+
+
+  def write_coords( self):
+    for v, x, y in zip( self.vertices, self.xs, self.ys):
+      v.x = x
+      v.y = y
+
+
+
+class _numpy_engine(object):
+  """coordinates of atoms and the index pairs in numpy arrays, the gradient
+  of all the pairs is computed at once"""
+
+  def __init__( self, mol, bond_length, repulsion=0):
+    self.vertices = mol.vertices
+    self.coords = numpy.array( [(v.x, v.y) for v in self.vertices], dtype=float)
+    self.bond_length = bond_length
+    self.repulsion = repulsion
+    bonds, pairs = _get_index_pairs( mol)
+    self.terms = [(self._to_array( bonds), bond_length, 0.5),
+                  (self._to_array( pairs), sqrt( 3) * bond_length, 0.25)]
+    self.others = repulsion and _repulsion_pairs( bonds, pairs, bond_length) or None
+
+
+  @staticmethod
+  def _to_array( pairs):
+    """two arrays with the first and the second indexes of pairs"""
+    a = numpy.array( pairs, dtype=int).reshape( -1, 2)
+    return a[:,0], a[:,1]
+
+
+  def step( self):
+    grad = numpy.zeros_like( self.coords)
+    for (i, j), length, k in self.terms:
+      d = self.coords[i] - self.coords[j]
+      self._add_gradient( grad, i, j, d, length, k)
+    if self.repulsion:
+      if self.others.is_outdated():
+        self.others.update( self.coords.tolist())
+        self._others = self._to_array( self.others.pairs)
+      i, j = self._others
+      d = self.coords[i] - self.coords[j]
+      dist = numpy.hypot( d[:,0], d[:,1])
+      close = dist < self.bond_length
+      self._add_gradient( grad, i[close], j[close], d[close], self.bond_length, self.repulsion / 2)
+    self.coords += grad
+    dd = (grad**2).sum( axis=1)
+    if self.others:
+      self.others.moved += sqrt( dd.max())
+    return sqrt( dd.sum()), sqrt( dd.max())
+
+
+  def _add_gradient( self, grad, i, j, d, length, k):
+    """pulls the atoms i and j with distance vectors d toward length"""
+    dist = numpy.hypot( d[:,0], d[:,1])
+    same = dist == 0
+    if same.any():
+      # atoms at the same point are pushed apart along the x axis, as in _python_engine
+      d = numpy.where( same[:,None], (1.0, 0.0), d)
+      f = numpy.where( same, -k * length, k * (dist - length) / numpy.where( same, 1.0, dist))
+    else:
+      f = k * (dist - length) / dist
+    g = d * f[:,None]
+    n = len( grad)
+    for axis in (0, 1):
+      grad[:,axis] += numpy.bincount( j, g[:,axis], n) - numpy.bincount( i, g[:,axis], n)
+
+
+  def write_coords( self):
+    for v, (x, y) in zip( self.vertices, self.coords.tolist()):
+      v.x = x
+      v.y = y
+
+
+
+
 if __name__ == "__main__":
 
   from . import smiles
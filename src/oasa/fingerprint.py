@@ -0,0 +1,85 @@
+#--------------------------------------------------------------------------
+#     This file is part of OASA - a free chemical python library
+#     Copyright (C) 2003-2008 Beda Kosata <beda@zirael.org>
+
+#     This program is free software; you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation; either version 2 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     Complete text of GNU GPL can be found in the file gpl.txt in the
+#     main directory of the program
+
+#--------------------------------------------------------------------------
+
+"""Screening fingerprints for substructure search.
+
+A fingerprint is an integer with bits set for features of the molecule -
+the number of atoms of each element and the simple paths of up to
+max_path bonds written as element symbols and bond orders. Every
+feature of a fragment is also present in any molecule containing it,
+therefore a molecule may contain a fragment only when the bits of the
+fragment fingerprint are a subset of the molecule's ones.
+
+Hydrogens and query atoms are left out, they may match implicit
+hydrogens or several elements. The features are hashed with crc32 so
+the fingerprints are the same in every run and may be stored.
+"""
+
+import zlib
+
+from .atom import atom
+
+
+SIZE = 1024
+MAX_PATH = 3
+MAX_COUNT = 16
+
+bond_symbols = {1: '-', 2: '=', 3: '#', 4: ':'}
+
+
+
+def get_features( mol, max_path=MAX_PATH):
+  """returns the set of feature strings of a molecule"""
+  features = set()
+  vs = [v for v in mol.vertices if isinstance( v, atom) and v.symbol != 'H']
+  counts = {}
+  for v in vs:
+    counts[ v.symbol] = counts.get( v.symbol, 0) + 1
+  for symbol, count in counts.items():
+    for i in range( 1, min( count, MAX_COUNT)+1):
+      features.add( "%s#%d" % (symbol, i))
+  allowed = set( vs)
+  # depth-first search of simple paths from each atom, each path is found
+  # from both of its ends, only one direction is stored
+  for v in vs:
+    stack = [(v, [v.symbol], [v])]
+    while stack:
+      x, labels, path = stack.pop()
+      if len( path) > 1:
+        rev = labels[::-1]
+        features.add( "".join( min( labels, rev)))
+      if len( path) > max_path:
+        continue
+      for e, n in x.get_neighbor_edge_pairs():
+        if n in allowed and n not in path:
+          stack.append( (n, labels + [bond_symbols.get( e.order, '?'), n.symbol], path + [n]))
+  return features
+
+
+def get_fingerprint( mol, size=SIZE, max_path=MAX_PATH):
+  """returns the screening fingerprint of a molecule as an integer"""
+  fp = 0
+  for f in get_features( mol, max_path=max_path):
+    fp |= 1 << (zlib.crc32( f.encode( 'utf-8')) & 0xffffffff) % size
+  return fp
+
+
+def may_contain( mol_fp, fragment_fp):
+  """tells whether a molecule with mol_fp may contain a fragment with fragment_fp"""
+  return not fragment_fp & ~mol_fp
@@ -21,9 +21,12 @@ from . import graph
 from . import vertex
 from . import edge
 from . import digraph
+from . import compact_graph
 
 graph = graph.graph
 vertex = vertex.vertex
 edge = edge.edge
 digraph = digraph.digraph
+too_many_cycles_error = compact_graph.too_many_cycles_error
+compact_graph = compact_graph.compact_graph
 
@@ -0,0 +1,778 @@
+#--------------------------------------------------------------------------
+#     This file is part of OASA - a free chemical python library
+#     Copyright (C) 2003-2008 Beda Kosata <beda@zirael.org>
+
+#     This program is free software; you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation; either version 2 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     Complete text of GNU GPL can be found in the file gpl.txt in the
+#     main directory of the program
+
+#--------------------------------------------------------------------------
+
+"""Compact array based snapshot of graph connectivity.
+
+"""
+
+import warnings
+
+from array import array
+
+
+
+class too_many_cycles_error( Exception):
+  """raised when the number of cycles exceeds the given limit"""
+
+  def __init__( self, limit):
+    Exception.__init__( self, limit)
+    self.limit = limit
+
+  def __str__( self):
+    return "More than %d cycles (or paths) found" % self.limit
+
+
+
+class compact_graph(object):
+  """Frozen compressed-sparse-row (CSR) snapshot of a graph.
+
+  Vertices and edges are referred to by their integer index into the
+  vertices and edges lists. The neighbors of vertex i are stored in
+  indices[indptr[i]:indptr[i+1]], the edges leading to them are stored
+  at the same positions in edge_ids. Temporarily disconnected edges are
+  not part of the snapshot.
+
+  The snapshot is never changed once created, algorithms that need to
+  remove edges work on their own edge masks.
+  """
+
+  def __init__( self, g):
+    self.vertices = list( g.vertices)
+    self.vertex_index = dict( (v,i) for i,v in enumerate( self.vertices))
+    self.edges = []
+    self.edge_index = {}
+    self.edge_v1 = array( 'i')
+    self.edge_v2 = array( 'i')
+    for e in g.edges:
+      if e.disconnected:
+        continue
+      v1, v2 = e.get_vertices()
+      i1 = self.vertex_index.get( v1)
+      i2 = self.vertex_index.get( v2)
+      if i1 is None or i2 is None:
+        continue
+      self.edge_index[ e] = len( self.edges)
+      self.edges.append( e)
+      self.edge_v1.append( i1)
+      self.edge_v2.append( i2)
+    # the adjacency keeps the order of vertex.get_neighbor_edge_pairs()
+    self.indptr = array( 'i', [0])
+    self.indices = array( 'i')
+    self.edge_ids = array( 'i')
+    for v in self.vertices:
+      for e, n in v.get_neighbor_edge_pairs():
+        j = self.edge_index.get( e)
+        if j is not None:
+          self.indices.append( self.vertex_index[ n])
+          self.edge_ids.append( j)
+      self.indptr.append( len( self.indices))
+    self._ring_edges = None
+
+
+  def __str__( self):
+    return "compact graph, |V|=%d, |E|=%d" % (len( self.vertices), len( self.edges))
+
+
+  def degree( self, i):
+    return self.indptr[i+1] - self.indptr[i]
+
+
+  def get_degrees( self):
+    ptr = self.indptr
+    return [ptr[i+1]-ptr[i] for i in range( len( self.vertices))]
+
+
+  def neighbors( self, i):
+    return self.indices[ self.indptr[i]:self.indptr[i+1]]
+
+
+  def neighbor_edge_pairs( self, i):
+    start, end = self.indptr[i], self.indptr[i+1]
+    return zip( self.edge_ids[start:end], self.indices[start:end])
+
+
+  ## ANALYSIS
+
+  def get_distances_from( self, i, alive=None):
+    """breadth-first search from vertex i; returns a list of distances
+    (-1 for unreachable vertices) and the maximum distance found.
+    alive is an optional edge mask, edges with 0 in it are ignored"""
+    ptr, ind, eids = self.indptr, self.indices, self.edge_ids
+    dist = len( self.vertices) * [-1]
+    dist[i] = 0
+    d = 0
+    to_mark = [i]
+    while to_mark:
+      d += 1
+      to_mark_next = []
+      for j in to_mark:
+        for k in range( ptr[j], ptr[j+1]):
+          n = ind[k]
+          if dist[n] < 0 and (alive is None or alive[eids[k]]):
+            dist[n] = d
+            to_mark_next.append( n)
+      to_mark = to_mark_next
+    return dist, d-1
+
+
+  def get_connected_components( self, alive=None):
+    """returns the connected components as lists of vertex indexes"""
+    ptr, ind, eids = self.indptr, self.indices, self.edge_ids
+    seen = bytearray( len( self.vertices))
+    comps = []
+    for i in range( len( self.vertices)):
+      if seen[i]:
+        continue
+      seen[i] = 1
+      comp = [i]
+      for j in comp:
+        for k in range( ptr[j], ptr[j+1]):
+          n = ind[k]
+          if not seen[n] and (alive is None or alive[eids[k]]):
+            seen[n] = 1
+            comp.append( n)
+      comps.append( comp)
+    return comps
+
+
+  def is_edge_a_bridge( self, j, alive=None):
+    """tells whether an edge (given by its index) is a bridge"""
+    start, end = self.edge_v1[j], self.edge_v2[j]
+    ptr, ind, eids = self.indptr, self.indices, self.edge_ids
+    seen = bytearray( len( self.vertices))
+    seen[start] = 1
+    to_go = [start]
+    while to_go:
+      i = to_go.pop()
+      for k in range( ptr[i], ptr[i+1]):
+        e = eids[k]
+        if e == j or (alive is not None and not alive[e]):
+          continue
+        n = ind[k]
+        if n == end:
+          return 0
+        if not seen[n]:
+          seen[n] = 1
+          to_go.append( n)
+    return 1
+
+
+  def get_biconnected_components( self, alive=None):
+    """returns the biconnected components (blocks) as lists of edge indexes;
+    it is a single iterative depth-first search computing the low-links (Tarjan),
+    a block made of one edge is a bridge, the other blocks contain cycles.
+    alive is an optional edge mask, edges with 0 in it are ignored"""
+    ptr, ind, eids = self.indptr, self.indices, self.edge_ids
+    disc = len( self.vertices) * [-1]
+    low = len( self.vertices) * [0]
+    blocks = []
+    edge_stack = []
+    t = 0
+    for root in range( len( self.vertices)):
+      if disc[root] >= 0:
+        continue
+      disc[root] = low[root] = t
+      t += 1
+      # vertex, edge we came by, position of the next neighbor to process
+      stack = [[root, -1, ptr[root]]]
+      while stack:
+        top = stack[-1]
+        v, came_by, k = top
+        if k < ptr[v+1]:
+          top[2] = k+1
+          e = eids[k]
+          if e == came_by or (alive is not None and not alive[e]):
+            continue
+          w = ind[k]
+          if disc[w] < 0:
+            disc[w] = low[w] = t
+            t += 1
+            edge_stack.append( e)
+            stack.append( [w, e, ptr[w]])
+          elif disc[w] < disc[v]:
+            # back edge to an ancestor
+            edge_stack.append( e)
+            if disc[w] < low[v]:
+              low[v] = disc[w]
+        else:
+          stack.pop()
+          if stack:
+            u = stack[-1][0]
+            if low[v] < low[u]:
+              low[u] = low[v]
+            if low[v] >= disc[u]:
+              # u separates the block containing the edge we came by
+              block = []
+              while True:
+                e = edge_stack.pop()
+                block.append( e)
+                if e == came_by:
+                  break
+              blocks.append( block)
+    return blocks
+
+
+  def get_bridges( self, alive=None):
+    """returns a list of indexes of all bridges, see get_biconnected_components"""
+    return [b[0] for b in self.get_biconnected_components( alive=alive) if len( b) == 1]
+
+
+  def get_maximum_matching( self, alive=None):
+    """returns the maximum matching as a list of the edge index matching each
+    vertex (-1 for exposed vertices); a greedy matching is extended along
+    augmenting paths found by Edmonds' blossom algorithm.
+    alive is an optional edge mask, edges with 0 in it are ignored"""
+    ptr, ind, eids = self.indptr, self.indices, self.edge_ids
+    n = len( self.vertices)
+    mate = n * [-1]
+    mate_edge = n * [-1]
+    for v in range( n):
+      if mate[v] < 0:
+        for k in range( ptr[v], ptr[v+1]):
+          u = ind[k]
+          if mate[u] < 0 and u != v and (alive is None or alive[eids[k]]):
+            mate[u], mate[v] = v, u
+            mate_edge[u] = mate_edge[v] = eids[k]
+            break
+    for root in range( n):
+      if mate[root] < 0 and [k for k in range( ptr[root], ptr[root+1]) if alive is None or alive[eids[k]]]:
+        path = self._find_augmenting_path( root, mate, alive)
+        # flip the edges along the path
+        for v, u, e in path:
+          mate[u], mate[v] = v, u
+          mate_edge[u] = mate_edge[v] = e
+    return mate_edge
+
+
+  def _find_augmenting_path( self, root, mate, alive):
+    """returns the unmatched edges of an augmenting path from root as (v, u, edge)
+    triples, an empty list when there is none"""
+    ptr, ind, eids = self.indptr, self.indices, self.edge_ids
+    n = len( self.vertices)
+    used = bytearray( n)
+    parent = n * [-1]
+    base = list( range( n))
+
+    def lca( a, b):
+      seen = bytearray( n)
+      while True:
+        a = base[a]
+        seen[a] = 1
+        if mate[a] < 0:
+          break
+        a = parent[ mate[a]]
+      while True:
+        b = base[b]
+        if seen[b]:
+          return b
+        b = parent[ mate[b]]
+
+    def mark_path( v, b, child, blossom):
+      while base[v] != b:
+        blossom[ base[v]] = blossom[ base[ mate[v]]] = 1
+        parent[v] = child
+        child = mate[v]
+        v = parent[ mate[v]]
+
+    used[root] = 1
+    queue = [root]
+    head = 0
+    while head < len( queue):
+      v = queue[head]
+      head += 1
+      for k in range( ptr[v], ptr[v+1]):
+        to = ind[k]
+        if alive is not None and not alive[ eids[k]]:
+          continue
+        if base[v] == base[to] or mate[v] == to:
+          continue
+        if to == root or (mate[to] >= 0 and parent[ mate[to]] >= 0):
+          # an odd cycle is contracted into a blossom
+          b = lca( v, to)
+          blossom = bytearray( n)
+          mark_path( v, b, to, blossom)
+          mark_path( to, b, v, blossom)
+          for i in range( n):
+            if blossom[ base[i]]:
+              base[i] = b
+              if not used[i]:
+                used[i] = 1
+                queue.append( i)
+        elif parent[to] < 0:
+          parent[to] = v
+          if mate[to] < 0:
+            path = []
+            while to >= 0:
+              v = parent[to]
+              path.append( (v, to, self._get_edge_between( v, to, alive)))
+              to = mate[v]
+            return path
+          used[ mate[to]] = 1
+          queue.append( mate[to])
+    return []
+
+
+  def _get_edge_between( self, v, u, alive=None):
+    ptr, ind, eids = self.indptr, self.indices, self.edge_ids
+    for k in range( ptr[v], ptr[v+1]):
+      if ind[k] == u and (alive is None or alive[ eids[k]]):
+        return eids[k]
+    return -1
+
+
+  def get_smallest_independent_cycles_e( self):
+    """returns a set of smallest possible independent cycles as a set of frozensets
+    of edge indexes - a minimum cycle basis. The candidate cycles of Vismara's
+    algorithm are taken from the shortest and added when they are independent
+    (Gaussian elimination over GF(2) on edge bitmasks) until |E|-|V|+C of them
+    are found; the result does not depend on the order of edges in the vertices.
+    Vismara P., Union of all the minimum cycle bases of a graph,
+    Electron. J. Combin. 4 (1997)"""
+    ncycles = len( self.edges) - len( self.vertices) + len( self.get_connected_components())
+    if ncycles <= 0:
+      return set()
+    basis = {}
+    cycles = []
+    for same_size in self._get_prototypes_by_size():
+      for proto in same_size:
+        if _insert( proto[1], basis):
+          cycles.append( proto[1])
+      if len( cycles) == ncycles:
+        break
+    return set( frozenset( mask_to_indexes( c)) for c in cycles)
+
+
+  def get_smallest_independent_cycles_e_old( self):
+    """the previous implementation of get_smallest_independent_cycles_e, it finds the
+    smallest cycles of degree 2 vertices and strips them off. It is kept for comparison
+    (see tests/benchmark.py), it may not find the right number of cycles for some cages."""
+    ncycles = len( self.edges) - len( self.vertices) + len( self.get_connected_components())
+    if ncycles < 0:
+      warnings.warn( "The number of edges is smaller than number of vertices-1, the molecule must be disconnected, which means there is something wrong with it.", UserWarning, 4)
+      ncycles = 0
+    if ncycles == 0:
+      return set()
+
+    w = _edge_mask( self)
+    w.strip_bridges()
+    cycles = set()
+
+    vs = [i for i in range( len( self.vertices)) if w.deg[i]]
+    while vs and len( cycles) < ncycles:
+      new_cycles = set()
+      # disconnect something if there are no vertices of degree 2
+      removed_e = None
+      if not [i for i in vs if w.deg[i] == 2]:
+        for i in vs:
+          if w.deg[i] == 3:
+            removed_e = w.first_edge( i)
+            w.disconnect( removed_e)
+            break
+      vs2 = [i for i in vs if w.deg[i] == 2]
+      assert len( vs2) > 0
+      # get rings for all degree==2 vertices
+      for i in vs2:
+        new_cycles.update( w.get_smallest_cycles_for_vertex( i))
+      if removed_e is not None:
+        # only the end vertices of the removed edge have degree 2 now,
+        # see graph.get_smallest_independent_cycles_e
+        to_disconnect = set( [w.first_edge( self.edge_v1[ removed_e])])
+        w.reconnect( removed_e)
+      else:
+        # strip the cycles - disconnect the longest degree==2 chain in each cycle
+        to_disconnect = set()
+        for cycle in new_cycles:
+          path = w.get_longest_degree_2_chain( cycle)
+          to_disconnect.add( w.first_edge( path[0]))
+      for j in to_disconnect:
+        w.disconnect( j)
+      cycles.update( new_cycles)
+      w.strip_bridges()
+      vs = [i for i in range( len( self.vertices)) if w.deg[i]]
+
+    # remove extra cycles in some cases like adamantane
+    if len( cycles) > ncycles:
+      cs = sorted( cycles, key=lambda c: (_popcount( c), c))
+      attempts = 0
+      while len( cs) > ncycles and attempts < len( cs):
+        c = cs.pop( -1)
+        rest = 0
+        for c2 in cs:
+          rest |= c2
+        if c & ~rest:
+          cs.insert( 0, c)
+          attempts += 1
+        else:
+          attempts = 0
+      cycles = set( cs)
+
+    # count the cycles and report warnings if their number is wrong
+    if len( cycles) < ncycles:
+      warnings.warn( "The number of cycles found (%d) is smaller than the theoretical value %d (|E|-|V|+1)" % (len( cycles), ncycles), UserWarning, 3)
+    elif len( cycles) > ncycles:
+      warnings.warn( "The number of independent cycles found (%d) is larger than the theoretical value %d (|E|-|V|+1), but I cannot improve it." % (len( cycles), ncycles), UserWarning, 3)
+
+    return set( frozenset( mask_to_indexes( c)) for c in cycles)
+
+
+  ## CYCLE PROTOTYPES (Vismara)
+
+  def get_ring_edges( self):
+    """returns an edge mask of edges that are not bridges (edges in rings)"""
+    if self._ring_edges is None:
+      alive = bytearray( b'\x01' * len( self.edges))
+      for j in self.get_bridges():
+        alive[j] = 0
+      self._ring_edges = alive
+    return self._ring_edges
+
+
+  def _get_shortest_paths_from( self, r, max_depth=None):
+    """breadth-first search from vertex r through ring edges and vertices with lower index only
+    (not further than max_depth);
+    returns the reached vertices in the order of distance, their distances,
+    the vertex and edge bitmasks of one shortest path to each of them and the
+    predecessors (vertex, edge) on all the shortest paths"""
+    ptr, ind, eids = self.indptr, self.indices, self.edge_ids
+    alive = self.get_ring_edges()
+    dist = {r: 0}
+    path_v = {r: 1 << r}
+    path_e = {r: 0}
+    preds = {r: []}
+    order = [r]
+    for v in order:
+      d = dist[v] + 1
+      if max_depth is not None and d > max_depth:
+        break
+      for k in range( ptr[v], ptr[v+1]):
+        w = ind[k]
+        if w >= r or not alive[eids[k]]:
+          continue
+        if w not in dist:
+          dist[w] = d
+          path_v[w] = path_v[v] | (1 << w)
+          path_e[w] = path_e[v] | (1 << eids[k])
+          preds[w] = [(v, eids[k])]
+          order.append( w)
+        elif dist[w] == d:
+          preds[w].append( (v, eids[k]))
+    return order, dist, path_v, path_e, preds
+
+
+  def get_cycle_prototypes( self, max_size=None):
+    """returns the candidate cycles of Vismara's algorithm sorted by size, each one
+    as a tuple (size, edge bitmask, r, ends); ends are two (vertex, edge) pairs,
+    the cycle consists of shortest paths from r to both vertices joined by the edges
+    (the first edge is None for odd cycles, they are closed by the second one).
+    Every relevant cycle (a cycle that is not a sum of shorter cycles) is in the
+    family of some of the prototypes, the family is obtained by replacing the paths
+    from r by all the other shortest paths, see get_relevant_cycles_e.
+    When max_size is given only the prototypes up to this size are returned."""
+    alive = self.get_ring_edges()
+    ring_degrees = len( self.vertices) * [0]
+    for j in range( len( self.edges)):
+      if alive[j]:
+        ring_degrees[ self.edge_v1[j]] += 1
+        ring_degrees[ self.edge_v2[j]] += 1
+    protos = []
+    for r in range( len( self.vertices)):
+      if ring_degrees[r] < 2:
+        continue
+      order, dist, path_v, path_e, preds = self._get_shortest_paths_from( r, max_depth=max_size and max_size // 2)
+      root = 1 << r
+      for y in order:
+        dy = dist[y]
+        s = []
+        for e, z in self.neighbor_edge_pairs( y):
+          dz = dist.get( z)
+          if dz is None or not alive[e]:
+            continue
+          if dz + 1 == dy:
+            s.append( (z, e))
+          elif dz == dy and z < y and path_v[y] & path_v[z] == root and not (max_size and 2*dy+1 > max_size):
+            # odd cycle closed by the edge y-z
+            protos.append( (2*dy+1, path_e[y] | path_e[z] | (1 << e), r, ((y, None), (z, e))))
+        for i, (p, ep) in enumerate( s):
+          for q, eq in s[i+1:]:
+            if path_v[p] & path_v[q] == root:
+              # even cycle closed through y
+              protos.append( (2*dy, path_e[p] | path_e[q] | (1 << ep) | (1 << eq), r, ((p, ep), (q, eq))))
+    protos.sort( key=lambda p: (p[0], p[1]))
+    return protos
+
+
+  def _get_prototypes_by_size( self):
+    """yields lists of prototypes of the same size, the shortest first;
+    the prototypes are searched with a growing size limit so that the
+    breadth-first searches stay local as long as only small rings are needed"""
+    done = 0
+    limit = 8
+    while done < len( self.vertices):
+      protos = [p for p in self.get_cycle_prototypes( max_size=limit) if p[0] > done]
+      i = 0
+      while i < len( protos):
+        j = i
+        while j < len( protos) and protos[j][0] == protos[i][0]:
+          j += 1
+        yield protos[i:j]
+        i = j
+      done = limit
+      limit *= 2
+
+
+  def _get_prototype_family( self, proto):
+    """returns the edge bitmasks of all cycles in the family of a prototype"""
+    size, mask, r, ((a, ea), (b, eb)) = proto
+    order, dist, path_v, path_e, preds = self._get_shortest_paths_from( r, max_depth=size // 2)
+    paths = {r: [(1 << r, 0)]}
+    def all_paths( x):
+      if x not in paths:
+        paths[x] = [(pv | (1 << x), pe | (1 << e)) for v, e in preds[x] for pv, pe in all_paths( v)]
+      return paths[x]
+    root = 1 << r
+    closing = 0
+    for e in (ea, eb):
+      if e is not None:
+        closing |= 1 << e
+    ret = set()
+    for va, pa in all_paths( a):
+      for vb, pb in all_paths( b):
+        if va & vb == root:
+          ret.add( pa | pb | closing)
+    return ret
+
+
+  def get_relevant_cycles_e( self):
+    """returns the relevant cycles as a set of frozensets of edge indexes;
+    a cycle is relevant when it cannot be written as a sum of shorter cycles,
+    the union of all minimum cycle bases (Vismara 1997)"""
+    ncycles = len( self.edges) - len( self.vertices) + len( self.get_connected_components())
+    basis = {}
+    ret = set()
+    for same_size in self._get_prototypes_by_size():
+      if len( basis) == ncycles:
+        # no longer cycle can be independent of the shorter ones
+        break
+      # all the prototypes of one size are tested against the shorter ones only
+      for proto in same_size:
+        if _reduce( proto[1], basis):
+          ret.update( self._get_prototype_family( proto))
+      for proto in same_size:
+        _insert( proto[1], basis)
+    return set( frozenset( mask_to_indexes( c)) for c in ret)
+
+
+  ## ALL CYCLES (Hanser)
+
+  def get_all_cycles_e( self, max_size=None, max_count=None):
+    """returns all cycles as a set of frozensets of edge indexes.
+    It is the p-graph (path graph) reduction of Hanser et al. - vertices are removed
+    one by one (the one with the lowest number of paths first) and the paths going
+    through them are joined, a path joined with itself is a cycle. The paths are
+    kept as bitmasks of vertices and edges.
+    Cycles (and paths) longer than max_size are not followed; when more than max_count
+    cycles or paths are found, too_many_cycles_error is raised.
+    Th. Hanser, Ph. Jauffret, and G. Kaufmann, J. Chem. Inf. Comput. Sci.,
+    1996, 36 (6), 1146-1152 . DOI: 10.1021/ci960322f"""
+    alive = self.get_ring_edges()
+    # the paths - ends, vertex bitmask and edge bitmask, None for removed ones
+    paths = []
+    at_vertex = [[] for v in self.vertices]
+    for j in range( len( self.edges)):
+      if alive[j]:
+        i1, i2 = self.edge_v1[j], self.edge_v2[j]
+        at_vertex[i1].append( len( paths))
+        at_vertex[i2].append( len( paths))
+        paths.append( (i1, i2, (1 << i1) | (1 << i2), 1 << j))
+    cycles = set()
+    to_remove = set( i for i in range( len( self.vertices)) if at_vertex[i])
+    npaths = len( paths)
+    while to_remove:
+      v = min( to_remove, key=lambda i: (len( at_vertex[i]), i))
+      to_remove.discard( v)
+      here = at_vertex[v]
+      at_vertex[v] = []
+      vbit = 1 << v
+      # the other ends of the paths through v
+      ends = []
+      for p in here:
+        a, b, vmask, emask = paths[p]
+        paths[p] = None
+        ends.append( (b if a == v else a, vmask, emask))
+        npaths -= 1
+      for u, vmask, emask in ends:
+        at_vertex[u] = [p for p in at_vertex[u] if paths[p] is not None]
+      for i, (u1, vmask1, emask1) in enumerate( ends):
+        for u2, vmask2, emask2 in ends[i+1:]:
+          common = vmask1 & vmask2
+          if u1 == u2:
+            if common != vbit | (1 << u1):
+              continue
+            # the paths close a cycle
+            emask = emask1 | emask2
+            if max_size is None or _popcount( emask) <= max_size:
+              cycles.add( emask)
+              if max_count is not None and len( cycles) > max_count:
+                raise too_many_cycles_error( max_count)
+          elif common == vbit:
+            emask = emask1 | emask2
+            if max_size is not None and _popcount( emask) >= max_size:
+              # the path would make a cycle longer than max_size
+              continue
+            at_vertex[u1].append( len( paths))
+            at_vertex[u2].append( len( paths))
+            paths.append( (u1, u2, vmask1 | vmask2, emask))
+            npaths += 1
+            if max_count is not None and npaths > max_count:
+              raise too_many_cycles_error( max_count)
+    return set( frozenset( mask_to_indexes( c)) for c in cycles)
+
+
+
+class _edge_mask(object):
+  """mutable view of a compact_graph with some of the edges switched off,
+  edge sets are represented as integer bitmasks of edge indexes"""
+
+  def __init__( self, cg):
+    self.cg = cg
+    self.alive = bytearray( b'\x01' * len( cg.edges))
+    self.deg = cg.get_degrees()
+
+
+  def disconnect( self, j):
+    self.alive[j] = 0
+    i1, i2 = self.cg.edge_v1[j], self.cg.edge_v2[j]
+    self.deg[i1] -= 1
+    if i1 != i2:
+      self.deg[i2] -= 1
+
+
+  def reconnect( self, j):
+    self.alive[j] = 1
+    i1, i2 = self.cg.edge_v1[j], self.cg.edge_v2[j]
+    self.deg[i1] += 1
+    if i1 != i2:
+      self.deg[i2] += 1
+
+
+  def first_edge( self, i):
+    cg = self.cg
+    for k in range( cg.indptr[i], cg.indptr[i+1]):
+      if self.alive[ cg.edge_ids[k]]:
+        return cg.edge_ids[k]
+    return None
+
+
+  def neighbor_edge_pairs( self, i):
+    cg = self.cg
+    alive = self.alive
+    for k in range( cg.indptr[i], cg.indptr[i+1]):
+      e = cg.edge_ids[k]
+      if alive[e]:
+        yield e, cg.indices[k]
+
+
+  def strip_bridges( self):
+    """disconnect all bridges"""
+    # removal of a bridge does not change the status of any other edge
+    for j in self.cg.get_bridges( alive=self.alive):
+      self.disconnect( j)
+
+
+  def get_smallest_cycles_for_vertex( self, i):
+    """breadth-first search over simple paths starting at vertex i; returns the
+    set of the smallest cycles going through i (as edge bitmasks)"""
+    frontier = [(i, -1, 1 << i, 0)]
+    while frontier:
+      found = set()
+      for v, came_from, visited, path in frontier:
+        if came_from < 0:
+          continue
+        for e, n in self.neighbor_edge_pairs( v):
+          if n == i and e != came_from:
+            found.add( path | (1 << e))
+      if found:
+        return found
+      new_frontier = []
+      for v, came_from, visited, path in frontier:
+        for e, n in self.neighbor_edge_pairs( v):
+          if e != came_from and not (visited >> n) & 1:
+            new_frontier.append( (n, e, visited | (1 << n), path | (1 << e)))
+      frontier = new_frontier
+    return set()
+
+
+  def get_longest_degree_2_chain( self, cycle):
+    """returns the vertices of the longest chain of degree==2 vertices in a cycle"""
+    cg = self.cg
+    deg = self.deg
+    to_go = set()
+    for j in mask_to_indexes( cycle):
+      for i in (cg.edge_v1[j], cg.edge_v2[j]):
+        if deg[i] == 2:
+          to_go.add( i)
+    best = []
+    for i in sorted( to_go):
+      if i not in to_go:
+        continue
+      to_go.discard( i)
+      path = [i]
+      for v in path:
+        for e, n in self.neighbor_edge_pairs( v):
+          if n in to_go:
+            to_go.discard( n)
+            path.append( n)
+      if len( path) > len( best):
+        best = path
+    return best
+
+
+
+def mask_to_indexes( mask):
+  """converts an integer bitmask to a list of the indexes of set bits"""
+  ret = []
+  while mask:
+    low = mask & -mask
+    ret.append( low.bit_length() - 1)
+    mask ^= low
+  return ret
+
+
+def _popcount( mask):
+  return bin( mask).count( "1")
+
+
+def _reduce( mask, basis):
+  """reduces a bitmask by a basis over GF(2) (dict of highest bit -> vector);
+  returns 0 when the mask is a sum of the basis vectors"""
+  while mask:
+    top = mask.bit_length() - 1
+    if top not in basis:
+      return mask
+    mask ^= basis[ top]
+  return 0
+
+
+def _insert( mask, basis):
+  """adds a bitmask to a basis over GF(2), returns False when it was dependent"""
+  mask = _reduce( mask, basis)
+  if mask:
+    basis[ mask.bit_length() - 1] = mask
+    return True
+  return False
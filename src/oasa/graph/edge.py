@@ -29,9 +29,10 @@ class edge(object):
 
   def __init__(self, vs=[]):
     self._vertices = []
-    self.set_vertices(vs)
+    if vs:
+      self.set_vertices(vs)
     self.properties_ = {}
-    self.disconnected = False
+    self._disconnected = False
 
 
   def __str__(self):
@@ -31,6 +31,7 @@ import warnings
 
 from .edge import edge
 from .vertex import vertex
+from .compact_graph import compact_graph
 
 
 
@@ -52,6 +53,7 @@ class graph(object):
     self.edges = set()
     self.disconnected_edges = set()
     self._cache = {}
+    self._reindex_vertices()
 
 
   def __str__( self):
@@ -74,18 +76,51 @@ class graph(object):
     """provides a deep copy of the graph. The result is an isomorphic graph,
     all the used objects are different"""
     c = self.create_graph()
+    old_v_to_new_v = {}
     for v in self.vertices:
       new = v.copy()
       c.add_vertex( new)
+      old_v_to_new_v[v] = new
     for e in self.edges:
       v1, v2 = e.get_vertices()
-      i1 = self.vertices.index( v1)
-      i2 = self.vertices.index( v2)
       new_e = e.copy()
-      c.add_edge( c.vertices[i1], c.vertices[i2], new_e)
+      c.add_edge( old_v_to_new_v[v1], old_v_to_new_v[v2], new_e)
     return c
 
 
+  @classmethod
+  def from_edge_list( cls, vertices, edge_list, edges=None):
+    """creates a new graph in one linear pass;
+    vertices is either a list of vertex objects or the number of vertices to create,
+    edge_list is a sequence of (i, j) pairs of vertex indexes,
+    edges is an optional sequence of edge objects to use (in the order of edge_list)"""
+    g = cls()
+    if isinstance( vertices, int):
+      vertices = [g.create_vertex() for i in range( vertices)]
+    g.add_vertices_and_edges( vertices, edge_list, edges=edges)
+    return g
+
+
+  def add_vertices_and_edges( self, vertices, edge_list, edges=None):
+    """adds new vertices and edges between them without the checks of add_vertex
+    and add_edge; edge_list is a sequence of (i, j) pairs of indexes into vertices,
+    edges is an optional sequence of edge objects to use (in the order of edge_list)"""
+    for v in vertices:
+      self._vertex_index[v] = len( self.vertices)
+      self.vertices.append( v)
+      v._clean_cache()
+    for k, (i, j) in enumerate( edge_list):
+      v1 = vertices[i]
+      v2 = vertices[j]
+      e = edges and edges[k] or self.create_edge()
+      e.set_vertices( (v1,v2))
+      self.edges.add( e)
+      # the same as add_neighbor, the caches were cleaned above
+      v1._neighbors[e] = v2
+      v2._neighbors[e] = v1
+    self._flush_cache()
+
+
   def create_vertex( self):
     return vertex()
 
@@ -99,7 +134,14 @@ class graph(object):
 
 
   def delete_vertex( self, v):
-    self.vertices.remove( v)
+    i = self._get_vertex_index( v)
+    if i is None or isinstance( v, int):
+      raise ValueError( "Cannot delete vertex not present in the graph")
+    del self.vertices[i]
+    # only the vertices after the removed one change their index
+    del self._vertex_index[v]
+    for j in range( i, len( self.vertices)):
+      self._vertex_index[ self.vertices[j]] = j
     self._flush_cache()
 
 
@@ -108,7 +150,8 @@ class graph(object):
     returns None if vertex is already present or the vertex instance if successful"""
     if not v:
       v = self.create_vertex()
-    if v not in self.vertices:
+    if self._get_vertex_index( v) is None:
+      self._vertex_index[v] = len( self.vertices)
       self.vertices.append( v)
     else:
       warnings.warn( "Added vertex is already present in graph %s" % str( v), UserWarning, 2)
@@ -140,7 +183,9 @@ class graph(object):
 
   def insert_a_graph( self, gr):
     """inserts all edges and vertices to the graph"""
-    self.vertices.extend( gr.vertices)
+    for v in gr.vertices:
+      self._vertex_index[v] = len( self.vertices)
+      self.vertices.append( v)
     self.edges.update( gr.edges)
     self._flush_cache()
 
@@ -257,36 +302,50 @@ class graph(object):
 
   def is_edge_a_bridge( self, e):
     """tells whether an edge is bridge"""
-    start = list( e.vertices)[0]
-    # find number of vertices accessible from one of the edge endpoints
-    self.mark_vertices_with_distance_from( start)
-    c1 = len( [v for v in self.vertices if 'd' in v.properties_])
-    # disconnect the eddge
-    self.temporarily_disconnect_edge( e)
-    # find the number of vertices accessible now
-    self.mark_vertices_with_distance_from( start)
-    c2 = len( [v for v in self.vertices if 'd' in v.properties_])
-    # if they differ, we've got a bridge
-    if c1 > c2:
-      x = 1
-    else:
-      x = 0
-    self.reconnect_temporarily_disconnected_edge( e)
-    return x
+    return e in self.get_bridges() and 1 or 0
 
 
   def is_edge_a_bridge_fast_and_dangerous( self, e):
-    """should be used only in case of repetitive questions for the same edge in cases
-    where no edges are added to the graph between the questions (if brigde==1 the value
-    is stored and returned, which is safe only in case no edges are added)"""
-    try:
-      return e.properties_['bridge']
-    except:
-      if self.is_edge_a_bridge( e):
-        e.properties_['bridge'] = 1
-        return 1
+    """kept for backward compatibility, is_edge_a_bridge is now both fast and safe
+    as the bridges are cached until the graph changes"""
+    return self.is_edge_a_bridge( e)
+
+
+  def get_bridges( self):
+    """returns the set of all bridges in the graph, they are found in one depth-first
+    search together with the ring blocks (see get_ring_blocks_e) and cached"""
+    bridges = self._get_cache( "bridges")
+    if bridges is None:
+      bridges, blocks = self._find_blocks()
+    return bridges
+
+
+  def get_ring_blocks_e( self):
+    """returns the biconnected blocks that contain cycles as a list of sets of edges,
+    each ring system (without spiro connections) is one block"""
+    blocks = self._get_cache( "ring_blocks")
+    if blocks is None:
+      bridges, blocks = self._find_blocks()
+    return blocks
+
+
+  def get_ring_blocks( self):
+    """returns the biconnected blocks that contain cycles as a list of sets of vertices"""
+    return list(map(self.edge_subgraph_to_vertex_subgraph, self.get_ring_blocks_e()))
+
+
+  def _find_blocks( self):
+    cg = self.get_compact_graph()
+    bridges = set()
+    blocks = []
+    for block in cg.get_biconnected_components():
+      if len( block) == 1:
+        bridges.add( cg.edges[ block[0]])
       else:
-        return 0
+        blocks.append( set( cg.edges[i] for i in block))
+    self._set_cache( "bridges", bridges)
+    self._set_cache( "ring_blocks", blocks)
+    return bridges, blocks
 
 
   def get_pieces_after_edge_removal( self, e):
@@ -307,24 +366,12 @@ class graph(object):
   ## ANALYSIS
   def get_connected_components( self):
     """returns the connected components of graph in a form o list of lists of vertices"""
-    comp = set() # just processed component
-    comps = []
-    not_processed = set( self.vertices)
-    if not_processed:
-      recent = set() # [not_processed.pop()])
-    while not_processed:
-      recent = set(j for i in [a.neighbors for a in recent]
-                         for j in i) & not_processed
-      if not recent:
-        if comp:
-          yield comp
-        recent = set( [not_processed.pop()])
-        comp = recent
-      else:
-        comp.update( recent)
-        not_processed -= recent
-    # when there is only one atom in the last piece it is not yielded in the loop
-    yield comp
+    cg = self.get_compact_graph()
+    comps = cg.get_connected_components()
+    if not comps:
+      yield set()
+    for comp in comps:
+      yield set( cg.vertices[i] for i in comp)
 
 
   def get_disconnected_subgraphs( self):
@@ -405,11 +452,12 @@ class graph(object):
 
 
   def get_smallest_independent_cycles_dangerous_and_cached( self):
-    try:
-      return self._cache['cycles']
-    except KeyError:
-      self._cache['cycles'] = self.get_smallest_independent_cycles()
-      return self._cache['cycles']
+    """cached version of get_smallest_independent_cycles, do not modify the result"""
+    cycles = self._get_cache( "cycles")
+    if cycles is None:
+      cycles = self.get_smallest_independent_cycles()
+      self._set_cache( "cycles", cycles)
+    return cycles
 
 
   def get_almost_all_cycles_e( self):
@@ -491,176 +539,9 @@ class graph(object):
   def get_smallest_independent_cycles_e( self):
     """returns a set of smallest possible independent cycles as list of Sets of edges,
     other cycles in graph are guaranteed to be combinations of them.
-    Gasteiger J. (Editor), Engel T. (Editor), Chemoinformatics : A Textbook, John Wiley & Sons 2001,
-    ISBN 3527306811, 174."""
-    #assert self.is_connected()
-    ncycles = len( self.edges) - len( self.vertices) + len( list( self.get_connected_components()))
-    # check if the graph is connected, don't know if we should do it...
-    if ncycles < 0:
-      warnings.warn( "The number of edges is smaller than number of vertices-1, the molecule must be disconnected, which means there is something wrong with it.", UserWarning, 3)
-      ncycles = 0
-
-    # trivial case of tree graph
-    if ncycles == 0:
-      return set()
-
-    # the code itself
-    self.temporarily_strip_bridge_edges()
-    cycles = set()
-
-    vs = [v for v in self.vertices if v.degree]
-    while vs and len( cycles) < ncycles:
-      new_cycles = set()
-      vs2 = [v for v in vs if v.degree == 2]
-      # disconnect something if there are no vertices of degree 2
-      removed_e = None
-      if not vs2:
-        for v in vs:
-          if v.degree == 3:
-            removed_e = list( v.neighbor_edges)[0]
-            self.temporarily_disconnect_edge( removed_e)
-            break
-      vs2 = [v for v in vs if v.degree == 2]
-      assert len( vs2) > 0
-      # get rings for all degree==2 vertices
-      for v in vs2:
-        gen = self._get_smallest_cycles_for_vertex( v, to_reach=v)
-        for x in gen:
-          if x:
-            new_cycles.update( set( x))
-            break
-      if removed_e:
-        # we removed an edge - we need to check what cycles it would influence
-        # we can also assume that there are only two vertices with degree 2
-        # after the removal of this edge and these are the end vertices
-        # therefore the code to detect longest path of degree 2 vertices is
-        # superfluous
-        to_disconnect = [list( removed_e.vertices[0].neighbor_edges)[0]]
-        # reconnect the edge removed on the top
-        if removed_e:
-          self.reconnect_temporarily_disconnected_edge( removed_e)
-      else:
-        # strip the cycles
-        to_disconnect = set()
-        for cycle in new_cycles:
-          # find the longest degree==2 chain in each cycle
-          paths = set()
-          to_go = set( [v for v in self.edge_subgraph_to_vertex_subgraph( cycle) if v.degree == 2])
-          while to_go:
-            now = set( [to_go.pop()])
-            path = set( now)
-            while now:
-              now = set().union(*(set(n for n in v.neighbors if n.degree == 2) for v in now))
-              now &= to_go
-              to_go -= now
-              path.update( now)
-            if path:
-              paths.add( frozenset( path))
-          l = max( map( len, paths))
-          path = [p for p in paths if len( p) == l][0]
-          # now mark them for disconnection
-          v1 = set( path).pop()
-          to_disconnect.add( list( v1.neighbor_edges)[0])
-      # disconnect what needs to be disconnected
-      [self.temporarily_disconnect_edge( e) for e in to_disconnect]
-
-      # add new_cycles to cycles
-      cycles.update( new_cycles)
-
-      # strip the degree==1 vertices
-      vs1 = [v for v in self.vertices if v.degree == 1]
-      while vs1:
-        for v in vs1:
-          # we have to ask the degree, because the bond might have been stripped in this run
-          if v.degree:
-            e = v.neighbor_edges[0]
-            self.temporarily_disconnect_edge( e)
-        vs1 = [v for v in self.vertices if v.degree == 1]
-
-      self.temporarily_strip_bridge_edges()
-      vs = [v for v in self.vertices if v.degree]
-
-    # remove extra cycles in some cases like adamantane
-    if len( cycles) - ncycles > 0:
-      # sort cycles according to length
-      cs = sorted((len(c), c) for c in cycles)
-      cs = [c[1] for c in cs]
-      # now try to remove the biggest ones
-      while len( cs) - ncycles > 0:
-        c = set( cs.pop( -1))
-        if not c <= set().union(*map(set, cs)):
-          cs.insert( 0, c)
-      cycles = set( [frozenset( _c) for _c in cs])
-
-    # count the cycles and report warnings if their number is wrong
-    if len( cycles) < ncycles:
-      warnings.warn( "The number of cycles found (%d) is smaller than the theoretical value %d (|E|-|V|+1)" % (len( cycles), ncycles), UserWarning, 2)
-    elif len( cycles) > ncycles:
-      warnings.warn( "The number of independent cycles found (%d) is larger than the theoretical value %d (|E|-|V|+1), but I cannot improve it." % (len( cycles), ncycles), UserWarning, 2)
-
-    self.reconnect_temporarily_disconnected_edges()
-
-    return cycles
-
-
-  def _get_smallest_cycle_for_vertex( self, v, to_reach=None, came_from=None, went_through=None):
-    """ingenious generator-based breadth-first search (BFS) to find one (random) smallest
-    cycle for given vertex. It yields None or cycle for each depth level"""
-    for e, neigh in v.get_neighbor_edge_pairs():
-      if neigh == to_reach and e != came_from:
-        yield set( [came_from, e])
-    gens = []
-    yield None
-    w = went_through and went_through+[v] or [v]
-    for e, neigh in v.get_neighbor_edge_pairs():
-      if (not went_through or neigh not in went_through) and not e == came_from:
-        gens.append( self._get_smallest_cycle_for_vertex( neigh, to_reach=to_reach, came_from=e, went_through=w))
-    while 1:
-      for i, gen in enumerate( gens):
-        ret = next(gen)
-        if ret:
-          if came_from:
-            yield set( [came_from]) | ret
-          else:
-            yield ret
-      yield None
-
-
-  def _get_smallest_cycles_for_vertex( self, v, to_reach=None, came_from=None, went_through=None):
-    """ingenious generator-based breadth-first search (BFS) to find smallest
-    cycles for given vertex. It yields None or cycles for each depth level"""
-    ret = []
-    for e, neigh in v.get_neighbor_edge_pairs():
-      if neigh == to_reach and e != came_from:
-        ret.append( frozenset( [came_from, e]))
-    yield ret
-
-    gens = []
-    w = went_through and went_through+[v] or [v]
-    for e, neigh in v.get_neighbor_edge_pairs():
-      # we dont want to go back, therefore we use went_through
-      if (not went_through or neigh not in went_through) and not e == came_from:
-        gens.append( self._get_smallest_cycles_for_vertex( neigh, to_reach=to_reach, came_from=e, went_through=w))
-
-    counter = 0
-    while 1:
-      counter += 1
-      if counter > 10000:
-        raise Exception( "This exception is triggered when ring-searching code does not find anything in 10000 steps. This means that there is with high probability something wrong with the code and it would be futile to continue in an endless search. Please let me know at beda@zirael.org where this happened")
-
-      all_rets = []
-      for gen in gens:
-        rets = next(gen)
-        new_rets = []
-        if rets:
-          for ret in rets:
-            if came_from:
-              ret = set( ret)
-              ret.update( set( [came_from]))
-              ret = frozenset( ret)
-            new_rets.append( ret)
-          all_rets.extend( frozenset( new_rets))
-      yield all_rets
+    It is a minimum cycle basis, see compact_graph.get_smallest_independent_cycles_e"""
+    cg = self.get_compact_graph()
+    return set( frozenset( cg.edges[i] for i in c) for c in cg.get_smallest_independent_cycles_e())
 
 
   def get_all_cycles_old( self):
@@ -671,72 +552,38 @@ class graph(object):
     return map( self.edge_subgraph_to_vertex_subgraph, self.get_all_cycles_e_old())
 
 
-  def get_all_cycles_e( self):
-    return map( self.vertex_subgraph_to_edge_subgraph, self.get_all_cycles())
+  def get_all_cycles_e( self, max_size=None, max_count=None):
+    """returns all cycles found in the graph as sets of edges,
+    see compact_graph.get_all_cycles_e for the meaning of max_size and max_count"""
+    cg = self.get_compact_graph()
+    return set( frozenset( cg.edges[i] for i in c) for c in cg.get_all_cycles_e( max_size=max_size, max_count=max_count))
 
 
-  def get_all_cycles( self):
+  def get_all_cycles( self, max_size=None, max_count=None):
     """
-    implementation of:
+    returns all cycles found in the graph as sets of vertices, implementation of:
     A New Algorithm for Exhaustive Ring Perception in a Molecular Graph
     Th. Hanser, Ph. Jauffret, and G. Kaufmann
     J. Chem. Inf. Comput. Sci., 1996, 36 (6), 1146-1152 . DOI: 10.1021/ci960322f
+    see compact_graph.get_all_cycles_e for the meaning of max_size and max_count
     """
-    pgraph = self._get_p_graph()
-    rings = set()
-    for pv in copy.copy( pgraph.vertices):
-      rings |= graph._p_graph_remove( pv, pgraph)
-    final_rings = set()
-    for ring in rings:
-      final_ring = frozenset( [v.properties_['original'] for v in ring])
-      final_rings.add( final_ring)
-    return final_rings
-
-
-  def _get_p_graph( self):
-    """helper method for p-graph (path graph) generation"""
-    p = self.deep_copy()
-    p.temporarily_strip_bridge_edges()
-    # we count on order of vertices remaining the same
-    for i,v in enumerate( self.vertices):
-      p.vertices[i].properties_['original'] = v
-    for e in p.edges:
-      e.path_ = set( e.vertices)
-    to_remove = [v for v in p.vertices if not v.neighbors]
-    for v in to_remove:
-      p.delete_vertex( v)
-    return p
-
-
-  @staticmethod
-  def _p_graph_remove( v, pgraph):
-    rings = set()
-    neighbor_edge_vertex_pairs = list( v.get_neighbor_edge_pairs())
-    new_edges = []
-    for i,(ne1,nv1) in enumerate( neighbor_edge_vertex_pairs):
-      for ne2,nv2 in neighbor_edge_vertex_pairs[i+1:]:
-        if (nv1 is nv2 and (ne1.path_ & ne2.path_ == set( [v,nv2]))) or (ne1.path_ & ne2.path_ == set( [v])):
-          new_path = ne1.path_ | ne2.path_
-          new_edge = pgraph.create_edge()
-          new_edge.path_ = new_path
-          pgraph.add_edge( nv1, nv2, new_edge)
-          new_edges.append( new_edge)
-    for ne,nv in neighbor_edge_vertex_pairs:
-      pgraph.disconnect_edge( ne)
-    for e in new_edges:
-      end1, end2 = e.vertices
-      if end1 is end2:
-        # we have a loop here
-        rings.add( frozenset( e.path_))
-        pgraph.disconnect_edge( e)
-    pgraph.remove_vertex( v)
-    return rings
+    return set( map( frozenset, map( self.edge_subgraph_to_vertex_subgraph, self.get_all_cycles_e( max_size=max_size, max_count=max_count))))
 
 
   def mark_vertices_with_distance_from( self, v):
     """returns the maximum d"""
-    self.clean_distance_from_vertices()
-    return self._mark_vertices_with_distance_from( v)
+    cg = self.get_compact_graph()
+    i = cg.vertex_index.get( v)
+    if i is None:
+      self.clean_distance_from_vertices()
+      return self._mark_vertices_with_distance_from( v)
+    dist, max_d = cg.get_distances_from( i)
+    for v, d in zip( cg.vertices, dist):
+      if d < 0:
+        v.properties_.pop( 'd', None)
+      else:
+        v.properties_['d'] = d
+    return max_d
 
 
   def clean_distance_from_vertices( self):
@@ -957,23 +804,9 @@ class graph(object):
 
   def temporarily_strip_bridge_edges( self):
     """strip all edges that are a bridge, thus leaving only the cycles connected"""
-    bridge_found = True
-    while bridge_found:
-      vs = [v for v in self.vertices if v.degree == 1]
-      while vs:
-        for v in vs:
-          # we have to ask the degree, because the bond might have been stripped in this run
-          if v.degree:
-            e = v.neighbor_edges[0]
-            self.temporarily_disconnect_edge( e)
-        vs = [v for v in self.vertices if v.degree == 1]
-      bridge_found = False
-      for e in self.edges:
-        if self.is_edge_a_bridge( e):
-          bridge_found = True
-          break
-      if bridge_found:
-        self.temporarily_disconnect_edge( e)
+    # removal of a bridge does not change the status of any other edge
+    for e in list( self.get_bridges()):
+      self.temporarily_disconnect_edge( e)
 
 
   def dump_simple_text_file( self, f):
@@ -982,10 +815,9 @@ class graph(object):
     count.
     f is an file-like object opened for writing"""
     f.write( "%d\n" % len( self.vertices))
-    for v in self.vertices:
-      i1 = self.vertices.index( v)
+    for i1, v in enumerate( self.vertices):
       for n in v.neighbors:
-        i2 = self.vertices.index( n)
+        i2 = self._get_vertex_index( n)
         f.write( "%d %d\n" % (i1, i2))
 
 
@@ -1033,7 +865,7 @@ class graph(object):
     for i,v in enumerate( self.vertices[:-1]):
       if mate[i] == 0:
         for n in v.neighbors:
-          j = self.vertices.index( n)
+          j = self._get_vertex_index( n)
           if mate[j] == 0:
             mate[j] = v
             mate[i] = n
@@ -1047,42 +879,40 @@ class graph(object):
     it is not the most sophisticated algorithm and does not treat blossoms very
     effectively, but it should work.
     """
-    def add_copy_vertex( _v):
-      _new_v = alt_tree.create_vertex()
-      alt_tree.add_vertex( _new_v)
-      _new_v.properties_['original'] = _v
-      return _new_v
-
-    alt_tree = self.create_graph() # alternating tree
-    copy_root = add_copy_vertex( start)
-    new_layer = [copy_root]
+    def get_path( node):
+      # from node to the root of the alternating tree
+      path = []
+      while node:
+        path.append( node[0])
+        node = node[1]
+      return path
+
+    # nodes of the alternating tree are (vertex, parent node)
+    root = (start, None)
+    new_layer = [root]
     inner = True # we are now going to process inner vertices
     hit = None
     while new_layer and not hit:
       next_new_layer = []
-      for copy_parent in new_layer:
+      for parent in new_layer:
         if inner:
           # to prevent backtracking to already walked path
-          path_from_root_to_copy_parent_original = [x.properties_['original'] for x in alt_tree.find_path_between( copy_root, copy_parent)]
-          for child in copy_parent.properties_['original'].neighbors:
-            if child not in path_from_root_to_copy_parent_original:
-              new_v = add_copy_vertex( child)
-              alt_tree.add_edge( copy_parent, new_v)
+          path_from_root_to_parent = get_path( parent)
+          for child in parent[0].neighbors:
+            if child not in path_from_root_to_parent:
+              node = (child, parent)
               if mate[child] == 0:
-                hit = new_v
+                hit = node
                 break
-              next_new_layer.append( new_v)
+              next_new_layer.append( node)
         else:
-          m = mate[copy_parent.properties_['original']]
-          new_v = add_copy_vertex( m)
-          alt_tree.add_edge( copy_parent, new_v)
-          next_new_layer.append( new_v)
+          next_new_layer.append( (mate[parent[0]], parent))
       inner = not inner
       new_layer = next_new_layer
     if hit:
-      path = alt_tree.find_path_between( hit, copy_root)
-      aug_p = [v.properties_['original'] for v in path]
-      return aug_p
+      path = get_path( hit)
+      path.reverse()
+      return path
     return None
 
 
@@ -1114,7 +944,7 @@ class graph(object):
     print("MATE", end='')
     for k,v in mate.items():
       if v:
-        print("%d-%d" % (self.vertices.index(k), self.vertices.index(v)), end='')
+        print("%d-%d" % (self._get_vertex_index(k), self._get_vertex_index(v)), end='')
     print("END")
 
   ## STATIC METHODS
@@ -1149,10 +979,22 @@ class graph(object):
     """if v is already an index, return v, otherwise return index of v on None"""
     if isinstance(v, int) and v < len(self.vertices):
       return v
-    try:
-      return self.vertices.index( v)
-    except ValueError:
+    i = self._vertex_index.get( v)
+    if i is not None and i < len( self.vertices) and self.vertices[i] is v:
+      return i
+    n = len( self.vertices)
+    if i is None and len( self._vertex_index) == n and (not n or self._vertex_index.get( self.vertices[-1]) == n-1):
+      # the map is in sync with the vertices list (a vertex appended to it or replacing
+      # a removed one behind our back would be seen at its end), so v is not there
       return None
+    # the vertices list was changed behind our back
+    self._reindex_vertices()
+    return self._vertex_index.get( v)
+
+
+  def _reindex_vertices( self):
+    """rebuilds the vertex => index map used by _get_vertex_index"""
+    self._vertex_index = dict( (v,i) for i,v in enumerate( self.vertices))
 
 
   def _read_file( self, name="/home/beda/oasa/oasa/mol.graph"):
@@ -1224,6 +1066,17 @@ class graph(object):
         yield vs_ver
 
 
+  def get_compact_graph( self):
+    """returns a compact_graph (CSR) snapshot of the current connectivity;
+    the snapshot is created lazily and thrown away with the rest of the cache
+    on any change of the topology made through the graph methods"""
+    cg = self._get_cache( "compact_graph")
+    if cg is None:
+      cg = compact_graph( self)
+      self._set_cache( "compact_graph", cg)
+    return cg
+
+
   def _flush_cache( self):
     self._cache = {}
 
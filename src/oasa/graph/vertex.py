@@ -38,7 +38,7 @@ class vertex(object):
     self.properties_ = {} # used to store intermediate properties such as distances etc.
     self.value = None  # used to store any object associated with the vertex
     self._neighbors = {} # set of all neighbors
-    self._clean_cache()
+    self._cache = {}
 
 
   def __str__(self):
@@ -46,7 +46,9 @@ class vertex(object):
 
 
   def _clean_cache(self):
-    self._cache = {}
+    # called on every change, most of the time there is nothing to clean
+    if self._cache:
+      self._cache = {}
 
 
   def copy(self):
@@ -24,6 +24,10 @@ import os
 import sys
 import string
 import select
+import threading
+import subprocess
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import xml.dom.minidom as dom
 
 from . import misc
@@ -36,6 +40,14 @@ from .molecule import molecule
 from .stereochemistry import cis_trans_stereochemistry
 from .oasa_exceptions import oasa_not_implemented_error, oasa_inchi_error, oasa_unsupported_inchi_version_error
 
+try:
+  import queue
+except ImportError:
+  import Queue as queue
+
+
+
+_connectivity_token = re.compile( r"\d+|.")
 
 
 class inchi( plugin):
@@ -142,8 +154,7 @@ class inchi( plugin):
       raise oasa_unsupported_inchi_version_error( self.layers[0])
 
     self.hs_in_hydrogen_layer = self.get_number_of_hydrogens_in_hydrogen_layer()
-    self.read_sum_layer()
-    self.read_connectivity_layer()
+    self.structure.add_vertices_and_edges( self.read_sum_layer(), self.read_connectivity_layer())
     self._charge_mover = self._move_charge_somewhere_else()
     repeat = True
     run = 0
@@ -218,54 +229,52 @@ class inchi( plugin):
 
 
   def read_sum_layer( self):
+    """returns the atoms of the formula layer, hydrogens from the hydrogen layer are left out"""
     if "." in self.layers[1]:
       raise oasa_not_implemented_error( "INChI", "multiple compound systems are not supported by the library")
 
     form = pt.formula_dict( self.layers[1])
-    processed_hs = 0 #for diborane and similar compounds we must process some Hs here
-    j = 0
+    atoms = []
     for k in form.sorted_keys():
-      for i in range( form[k]):
-        if k == 'H':
-          # we want to process only the Hs that are not in the h-layer
-          if processed_hs >= form[k] - self.hs_in_hydrogen_layer:
-            continue
-          else:
-            processed_hs += 1
-        j += 1
+      count = form[k]
+      if k == 'H':
+        # for diborane and similar compounds we must process some Hs here
+        count -= self.hs_in_hydrogen_layer
+      for i in range( count):
         a = self.structure.create_vertex()
         a.symbol = k
-        self.structure.add_vertex( a)
-        a.properties_['inchi_number'] = j
+        atoms.append( a)
+        a.properties_['inchi_number'] = len( atoms)
+    return atoms
 
 
 
   def read_connectivity_layer( self):
+    """returns the bonds of the connectivity layer as pairs of atom indexes"""
     layer = self.get_layer( "c")
     if not layer:
-      return
-    chunks = re.split( "([0-9]*)", layer)
-    chunks = filter( None, chunks)
-    chunks = filter( lambda x: x!='-', chunks)
+      return []
+    pairs = []
     last_atom = None
     bracket_openings = []
-    for c in chunks:
+    for c in _connectivity_token.findall( layer):
       if c == '(':
         bracket_openings.append( last_atom)
       elif c == ')':
         last_atom = bracket_openings.pop(-1)
       elif c == ",":
-        last_atom = bracket_openings.pop(-1)
-        bracket_openings.append( last_atom)
-      else:
-        try:
-          i = int( c)
-        except:
-          raise ValueError("unexpected character %s in the connectivity layer" % c)
+        last_atom = bracket_openings[-1]
+      elif c == '-':
+        pass
+      elif c.isdigit():
         # atom
+        i = int( c)
         if last_atom:
-          self.structure.add_edge( last_atom-1, i-1)
+          pairs.append( (last_atom-1, i-1))
         last_atom = i
+      else:
+        raise ValueError("unexpected character %s in the connectivity layer" % c)
+    return pairs
 
 
   def read_hydrogen_layer( self, run=0):
@@ -315,8 +324,8 @@ class inchi( plugin):
     if not layer:
       return
 
-    charge = int( layer[1:]) - self.forced_charge
-    self.charge = int( layer[1:])
+    charge = int( layer) - self.forced_charge
+    self.charge = int( layer)
 
 
     if charge > 0:
@@ -411,7 +420,7 @@ class inchi( plugin):
       return
 
 
-    p = int( layer[1:]) - self._protonation_dealt_with_already
+    p = int( layer) - self._protonation_dealt_with_already
     self.charge += p
     charges = self.forced_charge
     old_p = p
@@ -471,7 +480,7 @@ class inchi( plugin):
                 # the charge can normaly be delt with
                 v.charge -= 1
               break
-      assert p < old_p
+      assert abs( p) < abs( old_p)
 
 
   def read_double_bond_stereo_layer( self):
@@ -599,12 +608,15 @@ class inchi( plugin):
 
     while hs:
       for v in vs:
-        h = self.structure.create_vertex()
-        h.symbol = 'H'
-        self.structure.add_vertex( h)
-        self.structure.add_edge( v, h)
-        self._added_hs.add( h)
-        hs -= 1
+        # an atom takes all the hydrogens it has room for before the next one gets
+        # any, otherwise urea would be read as isourea (N=C(N)O)
+        for j in range( max( min( hs, v.free_valency), 1)):
+          h = self.structure.create_vertex()
+          h.symbol = 'H'
+          self.structure.add_vertex( h)
+          self.structure.add_edge( v, h)
+          self._added_hs.add( h)
+          hs -= 1
         if not hs:
           break
 
@@ -722,7 +734,7 @@ class inchi( plugin):
           if n.symbol == "O" and n.degree == 1:
             v.raise_valency()
             break
-      elif v.symbol == "S" and v.symbol > 2:
+      elif v.symbol == "S" and v.degree > 2:
         for n in v.neighbors:
           if n.symbol == "O" and n.degree == 1:
             v.raise_valency()
@@ -771,8 +783,6 @@ class inchi( plugin):
 #        elif x == 0:
 #          break
 
-import subprocess
-
 def _run_command(command, inputs):
   p = subprocess.Popen(command,
                        stdin=subprocess.PIPE,
@@ -789,17 +799,31 @@ def generate_inchi_and_inchikey( m, program=None, fixed_hs=True, ignore_key_erro
     from . import config
     program = config.Config.inchi_binary_path
   mf = molfile.mol_to_text( m)
+  command = [os.path.abspath( program)] + _get_inchi_options( fixed_hs)
+  text = _run_command( command, mf)
+  inchi, key, warnings, errors = _parse_inchi_output( text.splitlines())
+  if not inchi:
+    raise oasa_inchi_error( "InChI program did not create any output InChI")
+  if not key:
+    key = _get_key_from_inchi( inchi, ignore_key_error)
+  return inchi, key, warnings
+
+
+def _get_inchi_options( fixed_hs):
   if os.name == 'nt':
     options = "/AUXNONE /STDIO /Key" + (fixed_hs and " /FixedH" or "")
   else:
     options = "-AUXNONE -STDIO -Key" + (fixed_hs and " -FixedH" or "")
-  #print(options)
-  command = [os.path.abspath( program)] + options.split()
-  text = _run_command( command, mf)
+  return options.split()
+
+
+def _parse_inchi_output( lines):
+  """returns inchi, key, warnings and errors from the output lines of one structure"""
   inchi = ""
   key = ""
   warnings = []
-  for line in text.splitlines():
+  errors = []
+  for line in lines:
     if line.startswith( "Warning"):
       warnings.append(line.strip() + "\n")
     elif line.startswith( "End of file detected"):
@@ -810,21 +834,20 @@ def generate_inchi_and_inchikey( m, program=None, fixed_hs=True, ignore_key_erro
     elif line.startswith( "InChI="):
       inchi = inchi + line.strip()
     elif line.startswith( "Error"):
+      errors.append( line.strip())
       break
-  if not inchi:
-    raise oasa_inchi_error( "InChI program did not create any output InChI")
-  if not key:
-    # probably old version of the InChI software
-    try:
-      from . import inchi_key
-    except ImportError:
-      if ignore_key_error:
-        key = None
-      else:
-        raise oasa_inchi_error( "InChIKey could not be generated - inchi_key module failed to load properly.")
-    else:
-      key = inchi_key.key_from_inchi( inchi)
-  return inchi, key, warnings
+  return inchi, key, warnings, errors
+
+
+def _get_key_from_inchi( inchi, ignore_key_error=False):
+  # probably old version of the InChI software
+  try:
+    from . import inchi_key
+  except ImportError:
+    if ignore_key_error:
+      return None
+    raise oasa_inchi_error( "InChIKey could not be generated - inchi_key module failed to load properly.")
+  return inchi_key.key_from_inchi( inchi)
 
 
 def generate_inchi( m, program=None, fixed_hs=True):
@@ -837,6 +860,223 @@ def generate_inchi_key( m, program=None, fixed_hs=True):
 
 
 
+##################################################
+## BATCH GENERATION OF INCHIS
+
+_structure_label = re.compile( r"^Structure:\s*(\d+)")
+_structure_reference = re.compile( r"structure #(\d+)", re.IGNORECASE)
+
+# methane is sent after each batch, its label in the output tells that the batch is done
+_closing_molfile = """
+
+
+  1  0  0  0  0  0  0  0  0  0999 V2000
+    0.0000    0.0000    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
+M  END
+$$$$
+"""
+
+
+class inchi_worker( object):
+  """a long running InChI program reading molfiles from its standard input;
+  process_batch sends a batch of molfiles and waits for all their results.
+  When the program gives no output for timeout seconds or terminates,
+  the structure it was working on is reported as an error and the program
+  is started again for the rest of the batch. The program has to write the
+  output of each structure before it reads the next one. The molfiles are
+  written by a separate thread, so a program stuck on a structure cannot
+  block the sending of a batch larger than the pipe buffer."""
+
+  def __init__( self, program=None, fixed_hs=True, timeout=60):
+    if not program:
+      from . import config
+      program = config.Config.inchi_binary_path
+    self.command = [os.path.abspath( program)] + _get_inchi_options( fixed_hs)
+    self.timeout = timeout
+    self.process = None
+    self.writer = None
+
+  def __enter__( self):
+    return self
+
+  def __exit__( self, *args):
+    self.close()
+
+  def start( self):
+    self.process = subprocess.Popen( self.command,
+                                     stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT)
+    # number of structures sent to the program and the label of the last one in the output
+    self.sent = 0
+    self.label = 0
+    self.output = queue.Queue()
+    reader = threading.Thread( target=_read_process_output, args=(self.process.stdout, self.output))
+    reader.daemon = True
+    reader.start()
+
+  def close( self):
+    if self.process:
+      if self.process.poll() is None:
+        self.process.kill()
+      self.process.wait()
+      # the writer stops when the program is killed
+      if self.writer:
+        self.writer.join()
+        self.writer = None
+      try:
+        self.process.stdin.close()
+      except (IOError, OSError):
+        pass # the rest of the batch cannot be flushed to a killed program
+      self.process = None
+
+  def process_batch( self, texts):
+    """returns (inchi, key, warnings, error) for each of the molfile texts,
+    error is None or the message describing why there is no InChI"""
+    results = []
+    while len( results) < len( texts):
+      if not self.process:
+        self.start()
+      outputs, error = self._send( texts[ len( results):])
+      for lines in outputs:
+        inchi, key, warnings, errors = _parse_inchi_output( lines)
+        if not inchi:
+          results.append( (None, None, warnings, " ".join( errors) or "InChI program did not create any output InChI"))
+        else:
+          results.append( (inchi, key or _get_key_from_inchi( inchi, True), warnings, None))
+      if error:
+        # the program is stuck or dead, the structure it was working on is skipped
+        self.close()
+        if len( results) < len( texts):
+          results.append( (None, None, [], error))
+    return results
+
+  def _send( self, texts):
+    """sends the texts followed by the closing molfile and returns the output
+    lines of the structures that were finished and an error when the program
+    stopped working before the closing molfile"""
+    first = self.sent + 1
+    closing = first + len( texts)
+    outputs = [[] for text in texts]
+    data = "".join( [text.rstrip( "\n") + "\n$$$$\n" for text in texts] + [_closing_molfile])
+    self.writer = threading.Thread( target=_write_process_input, args=(self.process.stdin, data.encode( 'utf-8')))
+    self.writer.daemon = True
+    self.writer.start()
+    self.sent = closing
+    error = None
+    while self.label < closing:
+      try:
+        line = self.output.get( timeout=self.timeout)
+      except queue.Empty:
+        error = "InChI program timed out"
+        break
+      if line is None:
+        error = "InChI program terminated"
+        break
+      m = _structure_label.match( line)
+      if m:
+        self.label = int( m.group( 1))
+        continue
+      m = _structure_reference.search( line)
+      number = m and int( m.group( 1)) or self.label
+      if first <= number < closing:
+        outputs[ number-first].append( line)
+    if error:
+      # the structure in progress is finished only if its InChI was written already
+      done = max( self.label - first, 0)
+      if done < len( outputs) and [line for line in outputs[ done] if line.startswith( "InChI=")]:
+        done += 1
+      return outputs[:done], error
+    # the program has read the closing molfile, so the writer is done
+    self.writer.join()
+    self.writer = None
+    return outputs, None
+
+
+def _write_process_input( stream, data):
+  try:
+    stream.write( data)
+    stream.flush()
+  except (IOError, OSError, ValueError):
+    pass # the program has terminated, it is found out when reading
+
+
+def _read_process_output( stream, output):
+  for line in iter( stream.readline, b""):
+    output.put( line.decode( 'utf-8', 'replace'))
+  stream.close()
+  output.put( None)
+
+
+def generate_inchis( mols, program=None, fixed_hs=True, workers=1, chunk_size=100, timeout=60):
+  """generates InChIs of many molecules and yields (index, (inchi, key, warnings), error)
+  in the order of mols; error is None or the message describing why the molecule
+  has no InChI (the result is None then) - failed molecules do not stop the others.
+
+  Instead of starting the InChI program for each molecule, workers programs
+  (None for the number of CPUs) run during the whole generation and are sent
+  chunks of chunk_size molfiles; only a few chunks are prepared ahead.
+  timeout is the number of seconds one structure may take."""
+  if workers is None:
+    workers = multiprocessing.cpu_count()
+  idle = queue.Queue()
+  for i in range( max( workers, 1)):
+    idle.put( inchi_worker( program=program, fixed_hs=fixed_hs, timeout=timeout))
+  def process( chunk):
+    worker = idle.get()
+    try:
+      return _process_inchi_chunk( worker, chunk)
+    finally:
+      idle.put( worker)
+  chunks = _iter_molfile_chunks( mols, chunk_size)
+  try:
+    if workers <= 1:
+      for chunk in chunks:
+        for record in process( chunk):
+          yield record
+      return
+    pool = ThreadPool( workers)
+    try:
+      for records in misc.iter_async_results( pool, process, ((chunk,) for chunk in chunks), 2*workers):
+        for record in records:
+          yield record
+    finally:
+      pool.terminate()
+      pool.join()
+  finally:
+    while not idle.empty():
+      idle.get().close()
+
+
+def _iter_molfile_chunks( mols, chunk_size):
+  """yields lists of (index, molfile text, error)"""
+  chunk = []
+  for i, mol in enumerate( mols):
+    try:
+      chunk.append( (i, molfile.mol_to_text( mol), None))
+    except Exception as e:
+      chunk.append( (i, None, "%s: %s" % (e.__class__.__name__, e)))
+    if len( chunk) >= chunk_size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
+def _process_inchi_chunk( worker, chunk):
+  results = iter( worker.process_batch( [text for i, text, error in chunk if text is not None]))
+  records = []
+  for i, text, error in chunk:
+    if text is not None:
+      inchi, key, warnings, error = next( results)
+    records.append( (i, error is None and (inchi, key, warnings) or None, error))
+  return records
+
+# END OF BATCH GENERATION
+##################################################
+
+
+
 ##################################################
 # MODULE INTERFACE
 
@@ -1116,68 +1116,59 @@ doublets = [
 
 def get_sha256( text):
   # standard library hashlib since Python 2.5
-  hasher = hashlib.sha256()
+  if not isinstance( text, bytes):
+    text = text.encode( 'ascii')
+  return hashlib.sha256( text).digest()
 
-  hasher.update( text)
-  return hasher.digest()
 
+# the functions below take the digest as a bytearray
 
-def triplet1( key):
-  b0 = ord( key[0])
-  b1 = ord( key[1]) & 0x3f
+def triplet1( a):
+  b0 = a[0]
+  b1 = a[1] & 0x3f
   h = b0 | b1 << 8
   return triplets[h]
 
 def triplet2( a):
-  b0 = ord( a[1]) & 0xc0   # 1100 0000
-  b1 = ord(a[2])           # 1111 1111
-  b2 = ord(a[3]) & 0x0f    # 0000 1111
+  b0 = a[1] & 0xc0   # 1100 0000
+  b1 = a[2]          # 1111 1111
+  b2 = a[3] & 0x0f   # 0000 1111
   h = ( b0 | b1 << 8  | b2 << 16 ) >> 6
   return triplets[h];
 
 
 def triplet3( a):
-  b0 = ord(a[3]) & 0xf0    # 1111 0000
-  b1 = ord(a[4])           # 1111 1111
-  b2 = ord(a[5]) & 0x03    # 0000 0011
+  b0 = a[3] & 0xf0   # 1111 0000
+  b1 = a[4]          # 1111 1111
+  b2 = a[5] & 0x03   # 0000 0011
   h =  (b0 | b1 << 8  | b2 << 16 ) >> 4
   return triplets[h];
 
 def triplet4( a):
-  b0 = ord(a[5]) & 0xfc    # 1111 1100 
-  b1 = ord(a[6])           # 1111 1111 
+  b0 = a[5] & 0xfc   # 1111 1100
+  b1 = a[6]          # 1111 1111
   h =  (b0 | b1 << 8 ) >> 2
   return triplets[h];
 
 def dublet_28_to_36( a):
-  b0 = ord(a[3]) & 0xf0    # 1111 0000 
-  b1 = ord(a[4]) & 0x1f    # 0001 1111 
+  b0 = a[3] & 0xf0   # 1111 0000
+  b1 = a[4] & 0x1f   # 0001 1111
   h =  ( b0 | b1 << 8 ) >> 4
   return doublets[h];
 
 def dublet_56_to_64( a):
-  b0 = ord(a[7])           # 1111 1111 
-  b1 = ord(a[8]) & 0x01    # 0000 0001 
+  b0 = a[7]          # 1111 1111
+  b1 = a[8] & 0x01   # 0000 0001
   h =  ( b0 | b1 << 8);
   return doublets[h];
 
 def major_digest( major):
-  dig = get_sha256( major)
-  part1 = triplet1( dig)
-  part2 = triplet2( dig)
-  part3 = triplet3( dig)
-  part4 = triplet4( dig)
-  part5 = dublet_56_to_64( dig)
-  ret = part1+part2+part3+part4+part5
-  return ret
+  dig = bytearray( get_sha256( major))
+  return triplet1( dig) + triplet2( dig) + triplet3( dig) + triplet4( dig) + dublet_56_to_64( dig)
 
 def minor_digest( minor):
-  dig = get_sha256( minor)
-  part1 = triplet1( dig)
-  part2 = triplet2( dig)
-  part3 = dublet_28_to_36( dig)
-  ret = part1+part2+part3
-  return ret
+  dig = bytearray( get_sha256( minor))
+  return triplet1( dig) + triplet2( dig) + dublet_28_to_36( dig)
 
 def compute_inchi_check( key):
   """this is not used in new InChIKey - starting from 1.02 version of InChI software"""
@@ -1250,7 +1241,7 @@ def key_from_inchi_old( inp):
 def check_inchi_key( key):
   """checks the InChIKey using the algorithm described in the manual to InChI 1.02beta;
   check character is not used in 1.02 final"""
-  assert myisstr(key)
+  assert misc.myisstr(key)
   if key.startswith( "InChIKey="):
     key = key[9:]
   m = re.match( "^([A-Z]{14})-([A-Z]{9})([A-Z])$", key)
@@ -1267,61 +1258,88 @@ def check_inchi_key( key):
 ## new code
 import string
 
+
+class _digest_cache( object):
+  """digests of recently hashed texts; when it is full the least recently
+  used half is dropped"""
+
+  def __init__( self, digest, size=100000):
+    self.digest = digest
+    self.size = size
+    self.items = {}
+    self.tick = 0
+
+  def get( self, text):
+    self.tick += 1
+    item = self.items.get( text)
+    if item is None:
+      if len( self.items) >= self.size:
+        ticks = sorted( x[1] for x in self.items.values())
+        limit = ticks[ len( ticks) // 2]
+        self.items = dict( (k, x) for k, x in self.items.items() if x[1] > limit)
+      item = [self.digest( text), 0]
+      self.items[ text] = item
+    item[1] = self.tick
+    return item[0]
+
+# the major layers (formula, connections and hydrogens) are shared by all stereoisomers
+_major_digests = _digest_cache( major_digest)
+
+
 def key_from_inchi( inp):
   """this is for new InChIKey starting with 1.02 release"""
-  assert myisstr(inp)
+  assert misc.myisstr(inp)
+  return _key_from_inchi( inp)
+
+
+def keys_from_inchis( inchis):
+  """yields the InChIKeys of InChI strings from an iterable (e.g. lines of a file),
+  None for the strings which are not valid InChIs"""
+  for inp in inchis:
+    try:
+      yield _key_from_inchi( inp.strip())
+    except Exception:
+      yield None
+
+
+def _key_from_inchi( inp):
   if inp.startswith("InChI="):
     inp = inp[6:]
   parts = inp.split( "/")
-  if not parts:
-    raise Exception( "Invalid InChI string '%s'" % inp)
-  m = re.match( "(\d)(S)?", parts[0])
-  if not m:
-    raise Exception( "Invalid data in version part of InChI - '%s' in '%s'" % (parts[0], inp))
-  else:
-    version, standard = m.groups()
+  version = parts[0][:1]
   if not version.isdigit():
     if len( parts) == 1:
       raise Exception( "Invalid InChI string '%s'" % inp)
     else:
-      raise Exception( "Invalid data in version part of InChI - '%s' in '%s'" % (version, inp))
+      raise Exception( "Invalid data in version part of InChI - '%s' in '%s'" % (parts[0], inp))
   elif version not in "123":
     raise Exception( "Unsupported InChI version '%s' in '%s'" % (version, inp))
-  elif standard != "S":
+  elif parts[0][1:2] != "S":
     return key_from_inchi_old( inp)
     #raise Exception( "InChIKey generation from InChI is only supported for standard InChI (starting with '1S/'); sorry - invalid version part '%s'" % parts[0])
-  del parts[0]
-  i = 1
-  next = True
-  parts_major = [parts[0]]
+  if len( parts) < 2:
+    raise Exception( "Invalid InChI string '%s'" % inp)
+  i = 2
   p_count = 0
   # sort the layers into a major and minor part - these are hashed separately
-  while next:
-    if i >= len( parts):
-      break
-    if parts[i][0] in "chq":
-      parts_major.append( parts[i])
+  while i < len( parts):
+    layer = parts[i][:1]
+    if layer and layer in "chq":
       i += 1
-    elif parts[i][0] == "p":
+    elif layer == "p":
       p_count += int( parts[i][1:])
-      i += 1
+      del parts[i]
     else:
-      next = False
-  major = "/".join( parts_major)
-  parts_minor = parts[i:]
-  minor = "/".join( parts_minor)
+      break
+  major = "/".join( parts[1:i])
+  minor = "/".join( parts[i:])
   minor = minor and "/"+minor or minor
   if len( minor) < 255: # interesting property of the original algorithm
     minor = 2*minor
-  base = major_digest( major) + "-" + minor_digest( minor) + standard + string.ascii_uppercase[int(version)-1]
+  base = _major_digests.get( major) + "-" + minor_digest( minor) + "S" + string.ascii_uppercase[int(version)-1]
   # last letter - we must check bounds
-  index = 13+p_count
-  if index < 0:
-    index = 0
-  elif index >= len( string.ascii_uppercase):
-    index = len( string.ascii_uppercase) -1
-  p_part = string.ascii_uppercase[index]
-  return base + "-"+p_part
+  index = min( max( 13+p_count, 0), len( string.ascii_uppercase)-1)
+  return base + "-" + string.ascii_uppercase[index]
 
 
 
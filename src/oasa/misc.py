@@ -32,6 +32,7 @@ import time
 import types
 import string
 import base64
+import collections
 
 from warnings import warn
 
@@ -222,7 +223,7 @@ def gen_combinations(items, n):
 
 
 def x_over_y( x, y):
-  return factorial( x) / factorial( y) / factorial( x-y)
+  return factorial( x) // factorial( y) // factorial( x-y)
 
 
 def factorial( x):
@@ -238,3 +239,15 @@ def gen_variations_and_one( items, length):
     for vs in vars:
       yield vs + [i]
 
+
+def iter_async_results( pool, function, arguments, ahead):
+  """applies function to each tuple from arguments in the pool (a process or
+  thread pool) and yields the results in the order of arguments; at most ahead
+  tasks are in flight so that the memory stays bounded for any number of them"""
+  pending = collections.deque()
+  for args in arguments:
+    pending.append( pool.apply_async( function, args))
+    if len( pending) >= ahead:
+      yield pending.popleft().get()
+  while pending:
+    yield pending.popleft().get()
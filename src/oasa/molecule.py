@@ -21,15 +21,19 @@ from __future__ import print_function
 
 import copy
 import math
+import hashlib
 
 from . import graph
 from . import common
 from . import misc
+from . import stereochemistry
 from . import transform3d
 from . import periodic_table as PT
 from .atom import atom
 from .bond import bond
-from .query_atom import query_atom
+from .ring_info import ring_info
+from .spatial_index import spatial_index
+from .substructure_matcher import substructure_matcher
 
 
 
@@ -41,6 +45,8 @@ class molecule(graph.graph):
     self.atoms = self.vertices
     self.bonds = self.edges
     self.stereochemistry = []
+    # data of the molecule, e.g. the data items of SDF files
+    self.properties_ = {}
 
 
   def __str__( self):
@@ -63,6 +69,31 @@ class molecule(graph.graph):
     return config.Config.molecule_class()
 
 
+  @classmethod
+  def from_arrays( cls, symbols, bond_list, orders=None, charges=None, coords=None):
+    """creates a new molecule in one linear pass;
+    symbols is a sequence of atom symbols, bond_list a sequence of (i, j) pairs of atom
+    indexes, orders the bond orders (1 for all bonds if not given), charges and coords
+    (tuples of 2 or 3 numbers) are optional per-atom sequences"""
+    factory = cls()
+    atoms = []
+    for i, symbol in enumerate( symbols):
+      a = factory.create_vertex()
+      a.symbol = symbol
+      if charges:
+        a.charge = charges[i]
+      if coords:
+        a.coords = coords[i]
+      atoms.append( a)
+    bonds = []
+    for k in range( len( bond_list)):
+      b = factory.create_edge()
+      if orders:
+        b.order = orders[k]
+      bonds.append( b)
+    return cls.from_edge_list( atoms, bond_list, edges=bonds)
+
+
   def add_stereochemistry( self, stereo):
     self.stereochemistry.append( stereo)
 
@@ -182,7 +213,51 @@ class molecule(graph.graph):
 ##             e.order = 4
 ##       self.localize_aromatic_bonds()
 
-    # now we process it
+    # chains are filled in from their ends, what is left are mostly ring systems
+    # which are solved as a whole by maximum matching
+    self._add_bond_orders_to_leaves()
+    if not self._add_bond_orders_by_matching():
+      self._add_missing_bond_orders_stepwise()
+
+
+  def _add_bond_orders_to_leaves( self):
+    """atoms with free valency and only one such neighbor get the bond order
+    raised toward it"""
+    todo = [v for v in self.vertices if v.free_valency > 0]
+    while todo:
+      v = todo.pop()
+      free = v.free_valency
+      if free <= 0:
+        continue
+      pairs = [(e, n) for e, n in v.get_neighbor_edge_pairs() if n.free_valency > 0]
+      if len( pairs) == 1:
+        e, n = pairs[0]
+        e.order += min( free, n.free_valency)
+        # the neighbor and its neighbors may have become leaves
+        todo.append( n)
+        todo.extend( n.neighbors)
+
+
+  def _add_bond_orders_by_matching( self):
+    """raises the order of bonds of a perfect matching of the atoms with free
+    valency 1, returns False (and changes nothing) when there is no such matching"""
+    if not [v for v in self.vertices if v.free_valency]:
+      return True
+    cg = self.get_compact_graph()
+    free = [v.free_valency for v in cg.vertices]
+    if [f for f in free if f not in (0, 1)]:
+      return False
+    alive = bytearray( free[i] and free[j] and 1 or 0 for i, j in zip( cg.edge_v1, cg.edge_v2))
+    mate_edge = cg.get_maximum_matching( alive=alive)
+    if [i for i, f in enumerate( free) if f and mate_edge[i] < 0]:
+      return False
+    for j in set( mate_edge):
+      if j >= 0:
+        cg.edges[j].order += 1
+    return True
+
+
+  def _add_missing_bond_orders_stepwise( self):
     processed = [1]
     step = 0
     while processed:
@@ -241,13 +316,41 @@ class molecule(graph.graph):
         done.add( v)
 
 
-  def mark_aromatic_bonds( self):
-    sssr = self.get_smallest_independent_cycles()
-    if len( sssr) > 10:
-      # turn off processing of all cycles - it would be too slow, just use SSSR
-      rings = sssr
-    else:
-      rings = self.get_all_cycles()   #self.get_smallest_independent_cycles()
+  def get_ring_info( self):
+    """returns the ring_info of the molecule - the SSSR, ring membership
+    of atoms and bonds etc.; it is cached until the topology changes"""
+    ri = self._get_cache( "ring_info")
+    if ri is None:
+      ri = ring_info( self)
+      self._set_cache( "ring_info", ri)
+    return ri
+
+
+  def get_spatial_index( self, cell_size=None):
+    """returns a spatial_index of the atoms with coords for finding atoms close
+    to a place or to each other; it is made from the current coords and is not
+    cached. The cell_size defaults to the mean bond length."""
+    atoms = [v for v in self.vertices if v.x is not None and v.y is not None]
+    if not cell_size:
+      lengths = [math.sqrt( (a1.x-a2.x)**2 + (a1.y-a2.y)**2) for a1, a2 in (e.vertices for e in self.edges)
+                 if a1.x is not None and a1.y is not None and a2.x is not None and a2.y is not None]
+      cell_size = lengths and sum( lengths) / len( lengths) or 1.0
+    return spatial_index( atoms, cell_size=cell_size)
+
+
+  def get_smallest_independent_cycles_dangerous_and_cached( self):
+    return self.get_ring_info().get_sssr()
+
+
+  def mark_aromatic_bonds( self, max_cycles=1000):
+    """marks bonds in aromatic rings as aromatic, all cycles of the molecule are checked;
+    when there are more than max_cycles of them, only SSSR is used"""
+    ri = self.get_ring_info()
+    try:
+      rings = ri.get_all_cycles( max_count=max_cycles)
+    except graph.too_many_cycles_error:
+      # processing of all cycles would be too slow, just use SSSR
+      rings = ri.get_sssr()
     solved = [1]
     # we need to repeat it to mark such things as 'badly' drawn naphtalene (no double bond in the centre)
     while solved:
@@ -300,13 +403,13 @@ class molecule(graph.graph):
     for those that are not aromatic but marked so
     (it is for instance possible to misuse 'cccc' in smiles to create butadiene)
     they will be properly localized but marked as non-aromatic"""
-    # at first get all clusters of aromatic bonds
-    for b in copy.copy( self.edges):
-      if not b.aromatic:
-        self.temporarily_disconnect_edge( b)
-    self.temporarily_strip_bridge_edges()
-    ring_clusters = map( list, [sub for sub in self.get_connected_components() if len( sub) > 1])
-    self.reconnect_temporarily_disconnected_edges()
+    # at first get all clusters of aromatic bonds - the aromatic bonds that are not
+    # bridges in the graph made of aromatic bonds only
+    cg = self.get_compact_graph()
+    aromatic = bytearray( b.aromatic and 1 or 0 for b in cg.edges)
+    for i in cg.get_bridges( alive=aromatic):
+      aromatic[i] = 0
+    ring_clusters = [[cg.vertices[i] for i in sub] for sub in cg.get_connected_components( alive=aromatic) if len( sub) > 1]
     # now proceed in localizing double bonds in each one
     for cluster in ring_clusters:
       els = [self._get_atoms_possible_aromatic_electrons( a, cluster) for a in cluster]
@@ -336,7 +439,7 @@ class molecule(graph.graph):
           to_process_atoms = self.edge_subgraph_to_vertex_subgraph( to_process)
           processed = [v for v in cluster if not v in to_process_atoms]
           # now we use the maximum_matching graph algorithm to localize the bonds
-          work_graph = self.get_induced_copy_subgraph_from_vertices_and_edges( to_process_atoms, to_process, add_back_links=True)
+          work_graph = self._get_matching_graph( to_process_atoms, to_process)
           #return work_graph
           mate,nrex = work_graph.get_maximum_matching()
           ok = True
@@ -374,10 +477,24 @@ class molecule(graph.graph):
       if [b for b in current_bonds if b.order == 4]:
         # we did not find a matching
         raise ValueError( "Localization of aromatic bonds failed")
-    self.reconnect_temporarily_disconnected_edges()
     self.localize_fake_aromatic_bonds()
 
 
+  def _get_matching_graph( self, vertices, edges):
+    """graph.graph with the connectivity of vertices and edges for the maximum matching,
+    its vertices and edges link to the original ones via properties_['original'];
+    plain vertices and edges are much cheaper to create than copies of atoms and bonds"""
+    vertices = list( vertices)
+    index = dict( (v, i) for i, v in enumerate( vertices))
+    work_edges = [graph.edge() for e in edges]
+    work_graph = graph.graph.from_edge_list( len( vertices), [(index[v1], index[v2]) for v1, v2 in (e.vertices for e in edges)], edges=work_edges)
+    for v, work_v in zip( vertices, work_graph.vertices):
+      work_v.properties_['original'] = v
+    for e, work_e in zip( edges, work_edges):
+      work_e.properties_['original'] = e
+    return work_graph
+
+
   def localize_aromatic_bonds_old( self):
     """localizes aromatic bonds (does not relocalize already localized ones),
     for those that are not aromatic but marked so
@@ -565,20 +682,105 @@ class molecule(graph.graph):
 
 
   def number_atoms_uniquely( self):
-    out = {}
-    for v in self.vertices:
-      out[v] = [i for i in self._get_atom_distance_matrix( v)]
-      v.properties_['distance_matrix'] = out[v]
-    ms = sorted(out.values())
-    #self.remove_all_hydrogens()
-    i = 1
+    """returns the atoms sorted by their canonical ranks"""
+    ranks = self.get_canonical_ranks()
+    return sorted( self.vertices, key=ranks.get)
+
+
+  def get_canonical_ranks( self, bond_orders=True, break_ties=True, stereo=False):
+    """returns a dictionary {atom: rank}, the ranks are 0..n-1 and do not
+    depend on the order of atoms (CANON algorithm). Atoms are ranked by their
+    invariants (degree, element, isotope, charge, hydrogens, aromaticity,
+    valency, multiplicity) refined by the ranks of their neighbors and the
+    bond orders; ties of equivalent atoms are broken by splitting off one
+    atom of the lowest tied rank and refining again. The tied atoms are
+    usually symmetrical, for some highly symmetrical cages (e.g. fullerenes)
+    the result may depend on the order of atoms. With bond_orders=False the
+    bond orders and aromaticity are not used. With break_ties=False the
+    ties are kept, equivalent atoms have the same rank (the rank of a class
+    is the number of atoms in it and in the lower ranked ones minus one).
+    With stereo=True each atom of the tied class is tried and the one giving
+    the lowest parities of self.stereochemistry (see _get_stereo_parities)
+    is split off, so that the ranks of stereoisomers do not depend on the
+    order of atoms either."""
+    atoms = self.vertices
+    n = len( atoms)
+    index = dict( (a, i) for i, a in enumerate( atoms))
+    if bond_orders:
+      code = lambda e: e.aromatic and 4 or e.order
+    else:
+      code = lambda e: 1
+    neighbors = [[(index[ nb], code( e)) for e, nb in a.get_neighbor_edge_pairs()] for a in atoms]
+    invariants = [self._get_atom_invariant( a, bond_orders and 4 in [c for j, c in ns]) for a, ns in zip( atoms, neighbors)]
+    ranks = _refine_ranks( _get_sorted_ranks( invariants), neighbors, range( n))
+    while break_ties:
+      counts = {}
+      for r in ranks:
+        counts[r] = counts.get( r, 0) + 1
+      tied = [r for r, c in counts.items() if c > 1]
+      if not tied:
+        break
+      # the first atom of the lowest tied rank is split off below the others
+      tied = min( tied)
+      if stereo and self.stereochemistry:
+        candidates = [i for i, r in enumerate( ranks) if r == tied]
+      else:
+        candidates = [ranks.index( tied)]
+      best = None
+      for first in candidates:
+        new_ranks = list( ranks)
+        new_ranks[ first] = tied - counts[ tied] + 1
+        new_ranks = _refine_ranks( new_ranks, neighbors, [first])
+        if len( candidates) > 1:
+          parities = self._get_stereo_parities( dict( zip( atoms, new_ranks)))
+        else:
+          parities = None
+        if best is None or parities < best[0]:
+          best = (parities, new_ranks)
+      ranks = best[1]
+    return dict( zip( atoms, ranks))
+
+
+  def _get_stereo_parities( self, ranks):
+    """returns the parities of the stereochemistry relative to the ranks
+    {atom: rank} ordered by the ranks of the atoms they are at; the parity is
+    0 when some of the references cannot be told apart by their ranks"""
     ret = []
-    for m in ms:
-      ret.append(list(out.keys())[list(out.values()).index(m)])
-      #if ret.symbol != 'H':
-      #  print("%3d: " % i, ret, ret.free_valency)
-      i += 1
-    return ret
+    for st in self.stereochemistry:
+      if isinstance( st, stereochemistry.tetrahedral_stereochemistry):
+        if st.center not in ranks:
+          continue
+        # explicit hydrogens are not in the molecule, they are the lowest
+        refs = [isinstance( r, stereochemistry.explicit_hydrogen) and -1 or ranks.get( r, -1) for r in st.references]
+        parity = 0
+        if len( set( refs)) == 4:
+          swaps = len( [1 for i in range( 4) for j in range( i) if refs[j] > refs[i]])
+          parity = st.value
+          if swaps % 2:
+            parity = st.value == st.CLOCKWISE and st.ANTICLOCKWISE or st.CLOCKWISE
+        ret.append( ((0, ranks[ st.center]), parity))
+      elif isinstance( st, stereochemistry.cis_trans_stereochemistry):
+        end1, inside1, inside2, end2 = st.references
+        if inside1 not in ranks or inside2 not in ranks:
+          continue
+        parity = st.value
+        for end, inside in ((end1, inside1), (end2, inside2)):
+          # the substituents, not the atoms of the double bond(s)
+          others = [ranks[ n] for e, n in inside.get_neighbor_edge_pairs() if e.order != 2]
+          if len( others) != len( set( others)):
+            parity = 0
+            break
+          if ranks[ end] != max( others):
+            parity = parity == st.SAME_SIDE and st.OPPOSITE_SIDE or st.SAME_SIDE
+        ret.append( ((1,) + tuple( sorted( (ranks[ inside1], ranks[ inside2]))), parity))
+    return sorted( ret)
+
+
+  @staticmethod
+  def _get_atom_invariant( a, aromatic):
+    hs = (getattr( a, "explicit_hydrogens", 0) or 0) + max( 0, getattr( a, "free_valency", 0))
+    return (a.degree, getattr( a, "symbol", ""), getattr( a, "isotope", None) or 0, getattr( a, "charge", 0),
+            hs, aromatic, getattr( a, "valency", 0), getattr( a, "multiplicity", 1))
 
 
   def _read_file( self, name="/home/beda/oasa/oasa/mol.graph"):
@@ -632,190 +834,28 @@ class molecule(graph.graph):
     as lists of atoms in the order of other.vertices; however when other has
     explicit hydrogens that match implicit hydrogens on self the length of the
     returned fragment might be shorter of the matched implicit hydrogens;
+    neither of the molecules is modified, see substructure_matcher.
+    auto_cleanup is ignored and kept for compatibility"""
+    return substructure_matcher( other, self, implicit_freesites=implicit_freesites).get_matches()
 
-    IF YOU DON'T LET THE GENERATOR RUN TO THE END OR SET THE auto_cleanup TO FALSE, YOU HAVE TO
-    RUN clean_after_search MANUALLY NOT TO CLUTTER THE STRUCTURE"""
 
-    # at first decide if we need to add implicit hydrogens to self
-    add_implicit = False
-    for v in other.vertices:
-      if (isinstance( v, atom) and v.symbol == 'H') or \
-         (isinstance( v, atom) and v.explicit_hydrogens > 0) or \
-         (isinstance( v, query_atom) and ('H' in v.symbols or 'R' in v.symbols)):
-        add_implicit = True
-        break
-    if add_implicit:
-      added_hs = self.add_missing_hydrogens()
-      for h in added_hs:
-        h.properties_['implicit_hydrogen'] = True
-    # here we add explicit hydrogens to other, we call them implicit_hydrogen to make it
-    # work the same way as implicit_hydrogen
-    for v in other.vertices:
-      for i in range( v.explicit_hydrogens):
-        h = other.create_vertex()
-        other.add_vertex( h)
-        h.symbol = 'H'
-        e = other.create_edge()
-        e.order = 1
-        other.add_edge( v, h, e=e)
-        h.properties_['implicit_hydrogen'] = True
-      v.explicit_hydrogens = 0  # make it 0 and after search put it back
-    # for implicit_freesites we add the free_sites here
-    if implicit_freesites:
-      for v in other.vertices:
-        v.properties_['old_free_sites'] = v.free_sites
-        v.free_sites = v.free_valency
-
-    # then we create the dicts for storing threads in each of the atoms
-    i = 0
-    for a in other.vertices:
-      a.properties_['subsearch'] = {}
-    for e in other.edges | self.edges:
-      e.properties_['subsearch'] = {}
-    # here we select the vertex to start from
-    vs = [v for v in other.vertices if isinstance( v, atom)]
-    sym = common.least_common_item( [v.symbol for v in vs])
-    v = [v for v in vs if v.symbol == sym][0]
-    for a in self.vertices:
-      a.properties_['subsearch'] = {}
-      if v.matches( a):
-        i += 1
-        a.properties_['subsearch'][i] = v
-        v.properties_['subsearch'][i] = a
-
-    # now we can proceed with the search
-    yielded = set()
-    for thread in self._mark_matching_threads( v, other):
-      vs = [v.properties_['subsearch'][thread] for v in other.vertices]
-      # for symetrical fragments we have to get rid of copies (O1=N=O2 and O2=N=O1)
-      vsset = frozenset( vs)
-      if vsset not in yielded:
-        if self._freesites_match( other, thread):
-          yield [v for v in vs if not 'implicit_hydrogen' in v.properties_.keys()]
-      yielded.add( vsset)
-
-    if auto_cleanup:
-      self.clean_after_search( other)
+  def get_substructure_mappings( self, other, implicit_freesites=False, unique=False):
+    """yields all the mappings of molecule 'other' onto self as dictionaries
+    {atom of other: atom of self}, atoms of other matched to implicit
+    hydrogens of self are not included; with unique only one mapping
+    for each set of atoms of self is given"""
+    return substructure_matcher( other, self, implicit_freesites=implicit_freesites).get_mappings( unique=unique)
 
 
   def clean_after_search( self, other):
-    # for implicit_freesites we restore original free_sites here
-    for v in other.vertices:
-      if "old_free_sites" in v.properties_:
-        v.free_sites = v.properties_['old_free_sites']
-        del v.properties_['old_free_sites']
-    # finally we remove the added implicit hydrogens
-    hs = [v for v in self.vertices if 'implicit_hydrogen' in v.properties_.keys()]
-    for v in hs:
-      del v.properties_['implicit_hydrogen']
-      self.remove_vertex( v)
-    # we also remove implicit_hydrogen (that represent atom.explicit_hydrogens) on other
-    # and also set the explicit_hydrogens count back to the original atoms
-    for v in other.vertices:
-      if 'implicit_hydrogen' not in v.properties_:
-        v.explicit_hydrogens = len( [h for h in v.neighbors if 'implicit_hydrogen' in h.properties_])
-    hs = [v for v in other.vertices if 'implicit_hydrogen' in v.properties_.keys()]
-    for v in hs:
-      del v.properties_['implicit_hydrogen']
-      other.remove_vertex( v)
-    for v in self.vertices + other.vertices:
-      del v.properties_['subsearch']
-    for e in self.edges | other.edges:
-      del e.properties_['subsearch']
-
-
-  def _mark_matching_threads( self, v, other):
-    """v is other vertex, other is the other molecule"""
-    thread = 0
-    threads = list(v.properties_['subsearch'].keys())
-    while threads:
-      thread = min( threads)
-      threads.remove( thread)
-
-      mirror = v.properties_['subsearch'][thread]
-      for e, n in v.get_neighbor_edge_pairs():
-        if thread not in n.properties_['subsearch']:
-          candidates = set()
-          for me, mn in mirror.get_neighbor_edge_pairs():
-            if thread not in mn.properties_['subsearch'] and mn.matches( n) and me.matches( e) and thread not in e.properties_['subsearch']:
-              candidates.add( (mn, me, e))
-
-          if candidates:
-            if len( candidates) > 1:
-              new_threads = self._spawn_thread( other, thread, len( candidates)-1)
-              ths = [thread] + new_threads
-            else:
-              ths = [thread]
-            for c, me, e in candidates:
-              th = ths.pop()
-              n.properties_['subsearch'][th] = c
-              c.properties_['subsearch'][th] = n
-              e.properties_['subsearch'][th] = me
-              me.properties_['subsearch'][th] = e
-            [x for x in self._mark_matching_threads( n, other)] # just make the generator run
-            if thread not in v.properties_['subsearch']:
-              # the thread already died
-              break
-            else:
-              pass
-          else:
-            self._delete_thread( other, thread)
-            break
-        # for proper handling of rings we have to check also the ones that are in this thread already
-        elif thread not in e.properties_['subsearch']:
-          me = self.get_edge_between( mirror, n.properties_['subsearch'][thread])
-          if me and e.matches( me):
-            e.properties_['subsearch'][thread] = me
-            me.properties_['subsearch'][thread] = e
-          else:
-            self._delete_thread( other, thread)
-            break
-        else:
-          pass
-
-      threads = [i for i in v.properties_['subsearch'].keys() if i >= thread]
-      if thread in threads:
-        threads.remove( thread)
-        yield thread
-
-
-  def _spawn_thread( self, other, thread, number):
-    my_vs = [v for v in self.vertices if thread in v.properties_['subsearch']]
-    my_es = [e for e in self.edges if thread in e.properties_['subsearch']]
-    other_vs = [v for v in other.vertices if thread in v.properties_['subsearch']]
-    other_es = [e for e in other.edges if thread in e.properties_['subsearch']]
-    max_thread = max( [max( v.properties_['subsearch'].keys()) for v in other.vertices if v.properties_['subsearch']])
-    for i in range( max_thread +1, max_thread +number +1, 1):
-      for v in my_vs + my_es + other_vs + other_es:
-        v.properties_['subsearch'][ i] = v.properties_['subsearch'][thread]
-    return list(range(max_thread + 1, max_thread + number + 1, 1))
-
-
-  def _delete_thread( self, other, thread):
-    for v in self.vertices + other.vertices:
-      try:
-        del v.properties_['subsearch'][thread]
-      except KeyError:
-        pass
-
-
-  def _freesites_match( self, other, thread):
-    for v in other.vertices:
-      mirror = v.properties_['subsearch'][thread]
-      unmatched_ns = [n for n in mirror.neighbors if thread not in n.properties_['subsearch']] # and not n.symbol == 'H']
-      # if there is more unmatched neighbors then free-site it does not match (Hs don't count)
-      if not len( unmatched_ns)+mirror.explicit_hydrogens <= v.free_sites:
-        return False
-    return True
+    """the search does not modify the molecules anymore, nothing to clean"""
+    pass
 
 
   def contains_substructure( self, other, implicit_freesites=True):
-    found = False
-    for i in self.select_matching_substructures( other, implicit_freesites=implicit_freesites, auto_cleanup=False):
-      found = True
-      break
-    self.clean_after_search( other)
-    return found
+    for match in self.select_matching_substructures( other, implicit_freesites=implicit_freesites):
+      return True
+    return False
 
 
   # // --- end of the fragment matching routines ---
@@ -950,16 +990,26 @@ class molecule(graph.graph):
     return bl
 
 
-  def get_structure_hash( self):
-    vs = self.number_atoms_uniquely()
+  def get_structure_hash( self, bond_orders=True):
+    """returns a hexadecimal SHA-1 digest of the canonically numbered molecule,
+    molecules with the same hash are the same up to stereochemistry;
+    bond_orders has the same meaning as in get_canonical_ranks"""
+    return self._get_ranks_hash( self.get_canonical_ranks( bond_orders=bond_orders), bond_orders)
+
+
+  def get_key( self):
+    """returns a hashable key for use of molecules in sets and dictionaries,
+    e.g. to remove duplicates; molecules with the same key are equal at
+    level 4 (see equals), stereochemistry is not taken into account"""
+    return self.get_structure_hash()
+
+
+  def _get_ranks_hash( self, ranks, bond_orders):
     ret = []
-    for v in vs:
-      ret.append( str(v.properties_['distance_matrix']))
-    res = "*".join( ret)
-    import sha
-    ss = sha.new()
-    ss.update( res)
-    return ss.hexdigest()
+    for v in sorted( self.vertices, key=ranks.get):
+      ns = sorted( (ranks[n], bond_orders and (e.aromatic and 4 or e.order) or 1) for e, n in v.get_neighbor_edge_pairs())
+      ret.append( "%r%r" % (self._get_atom_invariant( v, bond_orders and 4 in [o for r, o in ns]), ns))
+    return hashlib.sha1( "*".join( ret).encode( 'utf-8')).hexdigest()
 
   def create_CIP_digraph( self, center):
     """creates a digraph according to rules described in CIP paper."""
@@ -989,7 +1039,9 @@ def equals( mol1, mol2, level=0):
   """don't forget to put all hydrogens and bond orders to the bonds
      level 1 - number of atoms and bonds,
      level 2 - the number of atoms with same symbols is the same,
-     level 3 - the whole connecivity (no stereo)
+     level 3 - the whole connecivity (no stereo), bond orders are not compared
+     level 4 - the same as 3 with bond orders (aromatic bonds are all the same)
+     level 0 means levels 1 to 3
      """
   # level 1
   if not level or level >= 1:
@@ -1003,18 +1055,88 @@ def equals( mol1, mol2, level=0):
     symbols2 = sorted(v.symbol for v in mol2.vertices)
     if symbols2 != symbols1:
       return False
-  # level 3
+  # level 3 and 4 - isomorphism
   if not level or level >= 3:
-    vs1 = mol1.number_atoms_uniquely()
-    vs2 = mol2.number_atoms_uniquely()
-    for i, v1 in enumerate( vs1):
-      v2 = vs2[ i]
-      if v1.properties_['distance_matrix'] != v2.properties_['distance_matrix']:
-        return False
+    bond_orders = level >= 4
+    # atoms are split to classes of equivalent ones, unlike the canonical numbering
+    # they do not depend on the order of atoms, so different classes mean different
+    # molecules; the same ones must be confirmed by a match
+    ranks1 = mol1.get_canonical_ranks( bond_orders=bond_orders, break_ties=False)
+    ranks2 = mol2.get_canonical_ranks( bond_orders=bond_orders, break_ties=False)
+    if mol1._get_ranks_hash( ranks1, bond_orders) != mol2._get_ranks_hash( ranks2, bond_orders):
+      return False
+    matcher = substructure_matcher( mol1, mol2, same_size=True, bond_orders=bond_orders)
+    for mapping in matcher.get_mappings():
+      return True
+    return False
   return True
 
 
 
+def _refine_ranks( ranks, neighbors, changed):
+  """splits the classes of atoms of the same rank by the ranks of their
+  neighbors until it is not possible; the rank of a class is the number of
+  atoms with a lower or the same rank minus one, so a split changes neither
+  the other ranks nor the rank of its highest part. Only the atoms next to
+  the ones whose rank changed are examined, the other members of their
+  classes share one key as in the previous round and are not touched unless
+  they have to be moved to a lower rank."""
+  ranks = list( ranks)
+  classes = {}
+  for i, r in enumerate( ranks):
+    classes.setdefault( r, set()).add( i)
+  key_of = lambda i: tuple( sorted( [(ranks[j], order) for j, order in neighbors[i]]))
+  while changed:
+    adjacent = {}
+    for i in changed:
+      for j, order in neighbors[i]:
+        adjacent.setdefault( ranks[j], set()).add( j)
+    splits = []
+    for r, touched in adjacent.items():
+      members = classes[r]
+      if len( members) < 2:
+        continue
+      groups = {}
+      for i in touched:
+        groups.setdefault( key_of( i), []).append( i)
+      rest_key = None
+      if len( touched) < len( members):
+        for i in members:
+          if i not in touched:
+            rest_key = key_of( i)
+            break
+        groups.setdefault( rest_key, [])
+      if len( groups) > 1:
+        splits.append( (r, members, touched, groups, rest_key))
+    changed = []
+    for r, members, touched, groups, rest_key in splits:
+      end = r
+      for key in sorted( groups, reverse=True):
+        group = groups[key]
+        size = len( group)
+        if key == rest_key:
+          size += len( members) - len( touched)
+          if end != r:
+            group = group + [i for i in members if i not in touched]
+        if end != r:
+          for i in group:
+            ranks[i] = end
+          members.difference_update( group)
+          classes[ end] = set( group)
+          changed.extend( group)
+        end -= size
+  return ranks
+
+
+def _get_sorted_ranks( keys):
+  """the rank of each key is the number of keys lower than or equal to it minus one"""
+  ranks = {}
+  for i, k in enumerate( sorted( keys)):
+    ranks[k] = i
+  return [ranks[k] for k in keys]
+
+
+
 #import psyco
 #psyco.profile()
 
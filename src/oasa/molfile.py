@@ -19,8 +19,34 @@
 
 from __future__ import print_function
 
+import os
+import re
+import mmap
+import array
+import pickle
+import itertools
+import multiprocessing
+
+from . import misc
 from .plugin import plugin
 from .molecule import molecule
+from .atom import atom
+from .bond import bond
+from . import oasa_exceptions
+
+
+_rad_property = re.compile( r"M\s+RAD\s+(\d+)(.*)")
+_chg_property = re.compile( r"M\s+CHG\s+(\d+)(.*)")
+_pair = re.compile( r"(\d+)\s+(-?\d+)")
+_data_header = re.compile( r"<([^>]*)>")
+_bond_type_remap = { 0: 'n', 1: 'w', 6: 'h', 4: 'a'}
+_bond_type_map = { 'n': 0, 'w': 1, 'h': 6, 'a': 4, 'b': 0, 'd': 0}
+_bond_cfg_remap = { 1: 'w', 2: 'a', 3: 'h'}
+_bond_cfg_map = { 'w': 1, 'a': 2, 'h': 3}
+_v3000_property = re.compile( r'(\w+)=(\([^)]*\)|"[^"]*"|\S+)')
+
+# larger structures are written as V3000
+V2000_LIMIT = 999
 
 
 
@@ -30,8 +56,12 @@ class molfile( plugin):
   read = 1
   write = 1
 
-  def __init__( self, structure=None):
+  def __init__( self, structure=None, version=None):
     self.structure = structure
+    # "V2000" or "V3000" for writing, None chooses by the size of the structure
+    self.version = version
+    # number of lines read, used in error messages
+    self.lines_read = 0
 
   def set_structure( self, structure):
     self.structure = structure
@@ -40,124 +70,196 @@ class molfile( plugin):
     return self.structure
 
   def read_file( self, file):
-    self._read_header( file)
-    self._read_body( file)
-
-  def _read_header( self, file):
-    for i in range( 3):
-      file.readline()
-
-  def _read_body( self, file):
-    atoms = read_molfile_value( file, 3, conversion=int)
-    bonds = read_molfile_value( file, 3, conversion=int)
-    # nothing more interesting
-    file.readline()
-    # read the structure
-    self.structure = molecule()
-    for i in range( atoms):
-      a = self._read_atom( file)
-      self.structure.add_vertex( v=a)
-    for k in range( bonds):
-      b, i, j = self._read_bond( file)
-      self.structure.add_edge( i, j, e=b)
-    for line in file:
-      if line.strip() == "M  END":
+    """file may be a text or binary file or a mmap"""
+    self.read_lines( iter_text_lines( file))
+
+  def read_lines( self, lines):
+    """reads one record from an iterator of text lines; the SDF data items
+    (a '> <TAG>' line followed by value lines) up to $$$$ are stored in
+    structure.properties_ as {TAG: value}"""
+    header = self._take_lines( lines, 4)
+    counts = header[3]
+    if counts[33:39].strip() == "V3000":
+      self.structure = self._read_v3000_ctab( lines)
+    else:
+      try:
+        atoms = int( counts[0:3])
+        bonds = int( counts[3:6])
+      except ValueError:
+        raise oasa_exceptions.oasa_molfile_error( "invalid counts line '%s'" % counts.rstrip(), self.lines_read)
+      atom_lines = self._take_lines( lines, atoms)
+      bond_lines = self._take_lines( lines, bonds)
+      try:
+        self.structure = self._create_structure( atom_lines, bond_lines)
+      except (ValueError, IndexError):
+        raise oasa_exceptions.oasa_molfile_error( "invalid atom or bond line", self.lines_read)
+    for line in lines:
+      self.lines_read += 1
+      if line.startswith( "M  END") or line.startswith( "$$$$"):
         break
-      if line.strip().startswith( "M  "):
+      if line.startswith( "M  "):
         self._read_property( line.strip())
-      #print(line.strip())
-
-  def _read_atom( self, file):
-    x = read_molfile_value( file, 10, conversion=float)
-    y = read_molfile_value( file, 10, conversion=float)
-    z = read_molfile_value( file, 10, conversion=float)
-    read_molfile_value( file, 1) # empty space
-    symbol = read_molfile_value( file, 3)
-    mass_diff = read_molfile_value( file, 2)
-    charge, multi = self._read_molfile_charge( read_molfile_value( file, 3, conversion=int))
-    file.readline() # next line please
-    ret = self.structure.create_vertex()
-    ret.coords = (x,y,z)
-    ret.charge = charge
-    ret.symbol = symbol
-    ret.multiplicity = multi
+    else:
+      return
+    if not line.startswith( "$$$$"):
+      self._read_data_items( lines)
+
+  def _take_lines( self, lines, count):
+    ret = list( itertools.islice( lines, count))
+    self.lines_read += len( ret)
+    if len( ret) < count:
+      raise oasa_exceptions.oasa_molfile_error( "unexpected end of file", self.lines_read)
     return ret
 
-  def _read_bond( self, file):
-    a1 = read_molfile_value( file, 3, conversion=int) -1 # molfiles index from 1
-    a2 = read_molfile_value( file, 3, conversion=int) -1
-    order = read_molfile_value( file, 3, conversion=int)
-    type = read_molfile_value( file, 3, conversion=int)
-    type_remap = { 0: 'n', 1: 'w', 6: 'h', 4: 'a'}
-    type = type_remap.get( type, 'n')
-    file.readline() # next line please
-    b = self.structure.create_edge()
-    b.order = order
-    b.type = type
-    return b, a1, a2
+  def _create_structure( self, atom_lines, bond_lines):
+    """the atoms and bonds are made from fixed columns of whole lines and added at once"""
+    atoms = []
+    for line in atom_lines:
+      a = atom( symbol=line[31:34].strip(), coords=(float( line[0:10]), float( line[10:20]), float( line[20:30])))
+      charge = _get_int( line[36:39])
+      if charge:
+        a.charge, a.multiplicity = self._read_molfile_charge( charge)
+      atoms.append( a)
+    bonds = []
+    pairs = []
+    for line in bond_lines:
+      b = bond()
+      b.order = _get_int( line[6:9])
+      b.type = _bond_type_remap.get( _get_int( line[9:12]), 'n')
+      bonds.append( b)
+      pairs.append( (int( line[0:3])-1, int( line[3:6])-1)) # molfiles index from 1
+    return molecule.from_edge_list( atoms, pairs, edges=bonds)
+
+  def _read_v3000_ctab( self, lines):
+    """reads the atoms and bonds of a V3000 CTAB, other blocks are skipped"""
+    atoms = []
+    numbers = {}
+    bonds = []
+    pairs = []
+    block = None
+    text = ""
+    for line in lines:
+      self.lines_read += 1
+      if not line.startswith( "M  V30 "):
+        raise oasa_exceptions.oasa_molfile_error( "V3000 line expected", self.lines_read)
+      text += line[7:].rstrip( "\r\n")
+      if text.endswith( "-"):
+        # continued on the next line
+        text = text[:-1]
+        continue
+      fields = text.split( None, 6)
+      text = ""
+      try:
+        if fields[0] in ("BEGIN", "END"):
+          if fields[:2] == ["END", "CTAB"]:
+            break
+          block = fields[0] == "BEGIN" and fields[1] or None
+        elif block == "ATOM":
+          a = atom( symbol=fields[1], coords=(float( fields[2]), float( fields[3]), float( fields[4])))
+          props = dict( _v3000_property.findall( len( fields) > 6 and fields[6] or ""))
+          a.charge = int( props.get( "CHG", 0))
+          a.multiplicity = int( props.get( "RAD", 0)) or 1
+          numbers[ fields[0]] = len( atoms)
+          atoms.append( a)
+        elif block == "BOND":
+          b = bond()
+          b.order = int( fields[1])
+          props = dict( _v3000_property.findall( " ".join( fields[4:])))
+          b.type = _bond_cfg_remap.get( int( props.get( "CFG", 0)), 'n')
+          bonds.append( b)
+          pairs.append( (numbers[ fields[2]], numbers[ fields[3]]))
+      except (ValueError, IndexError, KeyError):
+        raise oasa_exceptions.oasa_molfile_error( "invalid V3000 line", self.lines_read)
+    else:
+      raise oasa_exceptions.oasa_molfile_error( "unexpected end of file", self.lines_read)
+    return molecule.from_edge_list( atoms, pairs, edges=bonds)
 
   def _read_property( self, prop):
-    import re
-    m = re.match( "M\s+RAD\s+(\d+)(.*)", prop)
+    m = _rad_property.match( prop)
     if m:
-      for at,rad in re.findall( "(\d+)\s+(\d+)", m.group( 2)):
+      for at,rad in _pair.findall( m.group( 2)):
         index = int( at)
         multi = int( rad)
         self.structure.vertices[index-1].multiplicity = multi
-    m = re.match( "M\s+CHG\s+(\d+)(.*)", prop)
+    m = _chg_property.match( prop)
     if m:
-      for at,chg in re.findall( "(\d+)\s+(-?\d+)", m.group( 2)):
+      for at,chg in _pair.findall( m.group( 2)):
         index = int( at)
         charge = int( chg)
         self.structure.vertices[index-1].charge = charge
 
+  def _read_data_items( self, lines):
+    data = self.structure.properties_
+    tag = None
+    for line in lines:
+      self.lines_read += 1
+      if line.startswith( "$$$$"):
+        break
+      line = line.rstrip( "\r\n")
+      if tag is None:
+        if line.startswith( ">"):
+          m = _data_header.search( line)
+          tag = m and m.group( 1) or line[1:].strip()
+          value = []
+      elif line:
+        value.append( line)
+      else:
+        # an empty line ends the value
+        data[ tag] = "\n".join( value)
+        tag = None
+    if tag is not None:
+      data[ tag] = "\n".join( value)
+
 
   def write_file( self, file):
-    """file should be a writable file object"""
+    """file should be a writable file object; the lines are written one by one,
+    structures with more than 999 atoms or bonds are written as V3000 unless
+    version is set"""
     if not self.structure:
       raise Exception("No structure to write")
-    self._write_header( file)
-    self._write_counts_line( file)
-    self._write_body( file)
-    self._write_m_lines( file)
+    # atom numbers used in bond lines
+    self._numbers = dict( (v, i) for i, v in enumerate( self.structure.vertices, 1))
+    file.write( self._get_header())
+    if self._get_version() == "V3000":
+      lines = self._get_v3000_lines()
+    else:
+      lines = self._get_v2000_lines()
+    file.writelines( line+"\n" for line in lines)
     file.write( 'M  END\n')
 
   def get_text( self):
-    return ''.join( (self._get_header(), self._get_counts_line(), self._get_body(), 'M  END'))
+    f = StringIO()
+    self.write_file( f)
+    return f.getvalue()[:-1]
 
-  def _write_header( self, file):
-    file.write( self._get_header())
+  def _get_version( self):
+    if self.version:
+      return self.version
+    if max( len( self.structure.vertices), len( self.structure.edges)) > V2000_LIMIT:
+      return "V3000"
+    return "V2000"
 
   def _get_header( self):
     return "\n\n\n"
 
-  def _write_counts_line( self, file):
-    file.write( self._get_counts_line())
-
-  def _get_counts_line( self):
-    atoms = len( self.structure.vertices)
-    bonds = len( self.structure.edges)
+  def _get_counts_line( self, atoms, bonds, version):
     atom_lists = 0
     fff = 0 # obsolete
     chiral = 0
     stexts = 0
     obsolete = "  0  0  0  0"
     extras = 999
-    mol_version = " V2000"
     #         1  2 3 4 5 6 7 8 9
-    return "%3d%3d%3d%3d%3d%3d%s%s%s\n" % (atoms,bonds,atom_lists,fff,chiral,stexts,obsolete,extras,mol_version)
-
-  def _write_body( self, file):
-    file.write( self._get_body())
+    return "%3d%3d%3d%3d%3d%3d%s%3d %s" % (atoms,bonds,atom_lists,fff,chiral,stexts,obsolete,extras,version)
 
-  def _get_body( self):
-    lines = []
+  def _get_v2000_lines( self):
+    yield self._get_counts_line( len( self.structure.vertices), len( self.structure.edges), "V2000")
     for a in self.structure.vertices:
-      lines.append( self._get_atom_line( a))
+      yield self._get_atom_line( a)
     for b in self.structure.edges:
-      lines.append( self._get_bond_line( b))
-    return '\n'.join( lines)+'\n'
-
+      yield self._get_bond_line( b)
+    for line in self._get_m_lines():
+      yield line
 
   def _get_atom_line( self, a):
     x = a.get_x()
@@ -172,39 +274,54 @@ class molfile( plugin):
 
   def _get_bond_line( self, b):
     v1, v2 = b.get_vertices()
-    a1 = self.structure.vertices.index( v1) +1
-    a2 = self.structure.vertices.index( v2) +1
+    a1 = self._numbers[ v1]
+    a2 = self._numbers[ v2]
     order = b.order
-    type_remap = { 'n': 0, 'w': 1, 'h': 6, 'a': 4, 'b': 0, 'd': 0}
-    type = type_remap.get( b.type, 0)
+    type = _bond_type_map.get( b.type, 0)
     rest = "  0  0  0"
     #         1  2  3  4 5
     return "%3d%3d%3d%3d%s" % (a1,a2,order,type,rest)
 
-  def _write_m_lines( self, file):
-    m_lines = self._get_m_lines()
-    if m_lines:
-      file.write( "\n".join( m_lines) + "\n")
-
   def _get_m_lines( self):
-    # radicals
-    radicals = {}
-    i = 1
-    for v in self.structure.vertices:
-      if v.multiplicity != 1:
-        radicals[i] = v.multiplicity
-      i += 1
-    if radicals:
-      assert len( radicals) <= 8
-      nums = sorted(radicals.keys())
-      rads = " ".join( ["%3d %3d" % (n,radicals[n]) for n in nums])
-      rad_line = "M  RAD%3d %s" % (len(nums), rads)
-    else:
-      rad_line = None
-    # return m_lines
-    m_lines = filter( None, [rad_line])
+    """M  RAD lines with at most 8 atoms each"""
+    radicals = [(i, v.multiplicity) for i, v in enumerate( self.structure.vertices, 1) if v.multiplicity != 1]
+    m_lines = []
+    for i in range( 0, len( radicals), 8):
+      rads = radicals[i:i+8]
+      m_lines.append( "M  RAD%3d %s" % (len( rads), " ".join( ["%3d %3d" % rad for rad in rads])))
     return m_lines
 
+  def _get_v3000_lines( self):
+    yield self._get_counts_line( 0, 0, "V3000")
+    yield "M  V30 BEGIN CTAB"
+    yield "M  V30 COUNTS %d %d 0 0 0" % (len( self.structure.vertices), len( self.structure.edges))
+    yield "M  V30 BEGIN ATOM"
+    for i, a in enumerate( self.structure.vertices, 1):
+      yield self._get_v3000_atom_line( i, a)
+    yield "M  V30 END ATOM"
+    if self.structure.edges:
+      yield "M  V30 BEGIN BOND"
+      for i, b in enumerate( self.structure.edges, 1):
+        yield self._get_v3000_bond_line( i, b)
+      yield "M  V30 END BOND"
+    yield "M  V30 END CTAB"
+
+  def _get_v3000_atom_line( self, i, a):
+    line = "M  V30 %d %s %.4f %.4f %.4f 0" % (i, a.symbol, a.get_x(), a.get_y(), a.get_z())
+    if a.charge:
+      line += " CHG=%d" % a.charge
+    if a.multiplicity != 1:
+      line += " RAD=%d" % a.multiplicity
+    return line
+
+  def _get_v3000_bond_line( self, i, b):
+    v1, v2 = b.get_vertices()
+    line = "M  V30 %d %d %d %d" % (i, b.order, self._numbers[ v1], self._numbers[ v2])
+    cfg = _bond_cfg_map.get( b.type)
+    if cfg:
+      line += " CFG=%d" % cfg
+    return line
+
   def _read_molfile_charge( self, value):
     if value == 0:
       return (0,1)
@@ -236,6 +353,30 @@ def read_molfile_value( file, length, strip=1, conversion=None):
   return str
 
 
+def _get_int( text):
+  """int value of a fixed column, 0 when it is empty"""
+  try:
+    return int( text)
+  except ValueError:
+    if text.strip():
+      raise
+    return 0
+
+
+def iter_text_lines( f):
+  """returns an iterator over the lines of a text or binary file or of a mmap as text"""
+  if isinstance( f, mmap.mmap):
+    lines = iter( f.readline, b"")
+  else:
+    lines = iter( f)
+  for line in lines:
+    lines = itertools.chain( [line], lines)
+    if isinstance( line, bytes) and not isinstance( line, str):
+      return (l.decode( "utf-8", "replace") for l in lines)
+    return lines
+  return iter( [])
+
+
 
 
 ##################################################
@@ -299,18 +440,15 @@ class molfile_converter( converter_base):
       yield mol
 
   def read_file( self, f):
+    """f may be a text or binary file or a mmap, the molecules are read one by one"""
     converter_base.read_file( self, f)
-    chunk = []
+    lines = iter_text_lines( f)
     m = molfile()
-    for line in f:
-      if line.strip() != "$$$$":
-        chunk.append( line)
-      else:
-        m.read_file( StringIO( "".join( chunk)))
-        yield m.structure
-        chunk = []
-    if [line for line in chunk if line.strip()]: # non empty lines
-      m.read_file( StringIO("".join( chunk)))
+    while True:
+      head = list( itertools.islice( lines, 4))
+      if not [line for line in head if line.strip()]: # only empty lines are left
+        break
+      m.read_lines( itertools.chain( head, lines))
       yield m.structure
 
   def mols_to_file( self, structures, f):
@@ -333,6 +471,262 @@ converter = molfile_converter
 ##################################################
 
 
+
+##################################################
+## INDEXED SDF FILES
+
+# the index file holds INDEX_VERSION, the size and the modification time of
+# the SDF file and the byte offsets of the records as 64-bit integers
+INDEX_VERSION = 1
+
+
+def build_sdf_index( name, index_name=None):
+  """scans the SDF file once for the $$$$ lines and returns the byte offsets
+  of the records, record i is between offsets[i] and offsets[i+1]; the offsets
+  are saved to index_name (name+'.idx' by default) when it is possible"""
+  with open( name, 'rb') as f:
+    size = os.fstat( f.fileno()).st_size
+    if size:
+      mm = mmap.mmap( f.fileno(), 0, access=mmap.ACCESS_READ)
+      try:
+        offsets = _scan_sdf_offsets( mm)
+      finally:
+        mm.close()
+    else:
+      offsets = [0]
+  _save_sdf_index( name, offsets, index_name=index_name)
+  return offsets
+
+
+def read_sdf_index( name, index_name=None):
+  """returns the record offsets saved by build_sdf_index or None when there
+  are none or the SDF file has changed since"""
+  index = array.array( 'q')
+  try:
+    with open( index_name or name+".idx", 'rb') as f:
+      index.frombytes( f.read())
+  except (IOError, OSError, ValueError):
+    return None
+  if len( index) < 4 or index[0] != INDEX_VERSION or list( index[1:3]) != _get_file_stamp( name):
+    return None
+  return index[3:].tolist()
+
+
+def _save_sdf_index( name, offsets, index_name=None):
+  index = array.array( 'q', [INDEX_VERSION] + _get_file_stamp( name) + offsets)
+  try:
+    with open( index_name or name+".idx", 'wb') as f:
+      index.tofile( f)
+  except (IOError, OSError):
+    pass # e.g. a read-only directory, the index is just not reused
+
+
+def _get_file_stamp( name):
+  st = os.stat( name)
+  return [st.st_size, int( st.st_mtime * 1000000)]
+
+
+def _scan_sdf_offsets( mm):
+  offsets = [0]
+  pos = 0
+  while True:
+    i = mm.find( b"$$$$", pos)
+    if i < 0:
+      break
+    if i == 0 or mm[i-1:i] == b"\n":
+      end = mm.find( b"\n", i)
+      pos = end < 0 and len( mm) or end+1
+      offsets.append( pos)
+    else:
+      pos = i + 4
+  # the last record does not need to end with $$$$
+  if mm[ offsets[-1]:].strip():
+    offsets.append( len( mm))
+  return offsets
+
+
+def _read_sdf_record( data):
+  m = molfile()
+  m.read_lines( iter( data.decode( "utf-8", "replace").splitlines( True)))
+  return m.structure
+
+
+
+class sdf_dataset( object):
+  """Random access to the records of an SDF file through an index of their
+  byte offsets (see build_sdf_index), the index is made when the file is
+  opened for the first time and reused later.
+
+  len( dataset) is the number of records, dataset[i] parses record i and
+  dataset[i:j] gives a list of molecules; map processes the records in a
+  pool of processes, each of them reads its own range of records directly
+  from the file. Files written by write_sdf come with their index.
+  """
+
+  def __init__( self, name, index_name=None):
+    self.name = name
+    self.offsets = read_sdf_index( name, index_name=index_name)
+    if self.offsets is None:
+      self.offsets = build_sdf_index( name, index_name=index_name)
+    self._file = open( name, 'rb')
+    if len( self.offsets) > 1:
+      self._mmap = mmap.mmap( self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+      self._mmap = None
+
+
+  def __len__( self):
+    return len( self.offsets) - 1
+
+
+  def __getitem__( self, i):
+    if isinstance( i, slice):
+      return [self[j] for j in range( *i.indices( len( self)))]
+    if i < 0:
+      i += len( self)
+    if not 0 <= i < len( self):
+      raise IndexError( "record index out of range")
+    return _read_sdf_record( self._mmap[ self.offsets[i]:self.offsets[i+1]])
+
+
+  def __enter__( self):
+    return self
+
+
+  def __exit__( self, *args):
+    self.close()
+
+
+  def close( self):
+    if self._mmap:
+      self._mmap.close()
+      self._mmap = None
+    self._file.close()
+
+
+  def map( self, func, workers=None, chunk_size=500):
+    """yields (record index, result, error) for each record in the order of
+    the file, result is func(molecule) and error is None or the message
+    describing why the record could not be read or processed (result is None
+    then). With workers > 1 (None for the number of CPUs) the records are
+    split to ranges of chunk_size and processed in a pool of processes, func
+    must be a top-level function then and its results are sent back pickled."""
+    if workers is None:
+      workers = multiprocessing.cpu_count()
+    ranges = [(i, min( i+chunk_size, len( self))) for i in range( 0, len( self), chunk_size)]
+    if workers <= 1:
+      for start, end in ranges:
+        for record in _map_sdf_range( self._mmap, self.offsets[start:end+1], start, func, transfer=False):
+          yield record
+      return
+    pool = multiprocessing.Pool( workers)
+    try:
+      arguments = ((self.name, self.offsets[start:end+1], start, func) for start, end in ranges)
+      for records in misc.iter_async_results( pool, _map_sdf_file_range, arguments, 2*workers):
+        for record in _load_sdf_records( records):
+          yield record
+    finally:
+      pool.terminate()
+      pool.join()
+
+
+
+def _map_sdf_file_range( name, offsets, start, func):
+  """the worker part of sdf_dataset.map, the file is opened in the worker"""
+  with open( name, 'rb') as f:
+    mm = mmap.mmap( f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+      return _map_sdf_range( mm, offsets, start, func)
+    finally:
+      mm.close()
+
+
+def _map_sdf_range( mm, offsets, start, func, transfer=True):
+  """processes the records between the offsets, when transfer is True the results
+  are pickled here so that a result which cannot be pickled spoils only its own record"""
+  records = []
+  for k in range( len( offsets)-1):
+    try:
+      result = func( _read_sdf_record( mm[ offsets[k]:offsets[k+1]]))
+      if transfer:
+        result = pickle.dumps( result, pickle.HIGHEST_PROTOCOL)
+      error = None
+    except Exception as e:
+      result = None
+      error = "%s: %s" % (e.__class__.__name__, e)
+    records.append( (start+k, result, error))
+  return records
+
+
+def _load_sdf_records( records):
+  for i, result, error in records:
+    if result is not None:
+      result = pickle.loads( result)
+    yield i, result, error
+
+
+
+def write_sdf( mols, name, workers=1, chunk_size=500, index_name=None):
+  """writes the molecules to the SDF file name together with the index of the
+  records (see build_sdf_index), so that sdf_dataset does not have to scan the
+  file again; returns a list of (index, error) for the molecules which could not
+  be written, they are left out of the file.
+
+  With workers > 1 (None for the number of CPUs) the molfiles of chunks of
+  chunk_size molecules are made in a pool of processes and written in the order
+  of mols, only a few chunks are prepared ahead so mols may be a generator."""
+  if workers is None:
+    workers = multiprocessing.cpu_count()
+  chunks = _iter_mol_chunks( mols, chunk_size)
+  errors = []
+  offsets = [0]
+  pool = workers > 1 and multiprocessing.Pool( workers) or None
+  try:
+    if pool:
+      results = misc.iter_async_results( pool, _get_sdf_records, ((chunk,) for chunk in chunks), 2*workers)
+    else:
+      results = (_get_sdf_records( chunk) for chunk in chunks)
+    with open( name, 'wb') as f:
+      for records in results:
+        for i, data, error in records:
+          if error is None:
+            f.write( data)
+            offsets.append( offsets[-1] + len( data))
+          else:
+            errors.append( (i, error))
+  finally:
+    if pool:
+      pool.terminate()
+      pool.join()
+  _save_sdf_index( name, offsets, index_name=index_name)
+  return errors
+
+
+def _iter_mol_chunks( mols, chunk_size):
+  chunk = []
+  for i, mol in enumerate( mols):
+    chunk.append( (i, mol))
+    if len( chunk) >= chunk_size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
+def _get_sdf_records( chunk):
+  """the worker part of write_sdf, returns (index, encoded record, error) for each molecule"""
+  records = []
+  for i, mol in chunk:
+    try:
+      records.append( (i, (mol_to_text( mol) + "\n$$$$\n").encode( "utf-8"), None))
+    except Exception as e:
+      records.append( (i, None, "%s: %s" % (e.__class__.__name__, e)))
+  return records
+
+# END OF INDEXED SDF FILES
+##################################################
+
+
 if __name__ == "__main__":
 
   import sys
@@ -102,14 +102,30 @@ class oasa_unsupported_inchi_version_error( oasa_error):
 
 class oasa_smiles_error( oasa_error):
   
-  def __init__( self, value):
+  def __init__( self, value, position=None):
     oasa_error.__init__(self)
     self.value = value
+    self.position = position
 
   def __str__( self):
+    if self.position is not None:
+      return "SMILES Error: %s at position %d" % (self.value, self.position)
     return "SMILES Error: %s" % self.value
 
 
+class oasa_molfile_error( oasa_error):
+
+  def __init__( self, value, line=None):
+    oasa_error.__init__(self)
+    self.value = value
+    self.line = line
+
+  def __str__( self):
+    if self.line is not None:
+      return "Molfile Error: %s on line %d" % (self.value, self.line)
+    return "Molfile Error: %s" % self.value
+
+
 class oasa_stereochemistry_error( oasa_error):
   
   def __init__( self, value):
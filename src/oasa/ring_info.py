@@ -0,0 +1,148 @@
+#--------------------------------------------------------------------------
+#     This file is part of OASA - a free chemical python library
+#     Copyright (C) 2003-2008 Beda Kosata <beda@zirael.org>
+
+#     This program is free software; you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation; either version 2 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     Complete text of GNU GPL can be found in the file gpl.txt in the
+#     main directory of the program
+
+#--------------------------------------------------------------------------
+
+"""Ring perception results of one molecule.
+
+"""
+
+
+
+class ring_info(object):
+  """Rings of a molecule - the smallest set of smallest rings (SSSR),
+  the relevant cycles, all cycles, ring membership of atoms and bonds and
+  the ring systems.
+
+  Use molecule.get_ring_info() to obtain it, the object is cached in the
+  molecule and thrown away when its topology changes. The attributes are
+  shared by all users and hold frozensets; the get_* methods return
+  fresh sets that may be modified by the caller.
+  """
+
+  def __init__( self, mol):
+    self.molecule = mol
+    cycles_e = sorted( mol.get_smallest_independent_cycles_e(), key=len)
+    # SSSR as frozensets of bonds and of atoms
+    self.sssr_e = tuple( frozenset( c) for c in cycles_e)
+    self.sssr = tuple( frozenset( mol.edge_subgraph_to_vertex_subgraph( c)) for c in cycles_e)
+    # indexes of SSSR rings for each atom and bond
+    self.atom_rings = {}
+    self.bond_rings = {}
+    for i, (ring, ring_e) in enumerate( zip( self.sssr, self.sssr_e)):
+      for a in ring:
+        self.atom_rings.setdefault( a, []).append( i)
+      for b in ring_e:
+        self.bond_rings.setdefault( b, []).append( i)
+    self.ring_systems = tuple( frozenset( s) for s in self._find_ring_systems())
+    self._relevant_cycles = None
+    self._all_cycles = {}
+
+
+  def __str__( self):
+    return "ring info, %d rings in %d ring systems" % (len( self.sssr), len( self.ring_systems))
+
+
+  def _find_ring_systems( self):
+    """rings sharing at least one atom (fused, bridged and spiro rings)
+    belong to the same ring system"""
+    parent = list( range( len( self.sssr)))
+    def find( i):
+      while parent[i] != i:
+        parent[i] = parent[ parent[i]]
+        i = parent[i]
+      return i
+    for idxs in self.atom_rings.values():
+      for i in idxs[1:]:
+        parent[ find( i)] = find( idxs[0])
+    systems = {}
+    for i, ring in enumerate( self.sssr):
+      systems.setdefault( find( i), set()).update( ring)
+    return [systems[i] for i in sorted( systems)]
+
+
+  ## SSSR
+
+  def get_sssr( self):
+    """smallest set of smallest rings as a list of sets of atoms"""
+    return [set( r) for r in self.sssr]
+
+
+  def get_sssr_e( self):
+    """smallest set of smallest rings as a list of sets of bonds"""
+    return [set( r) for r in self.sssr_e]
+
+
+  def get_ring_count( self):
+    return len( self.sssr)
+
+
+  ## MEMBERSHIP
+
+  def is_atom_in_ring( self, a):
+    return a in self.atom_rings
+
+
+  def is_bond_in_ring( self, b):
+    return b in self.bond_rings
+
+
+  def get_atom_rings( self, a):
+    """SSSR rings (sets of atoms) containing the atom a"""
+    return [set( self.sssr[i]) for i in self.atom_rings.get( a, [])]
+
+
+  def get_bond_rings( self, b):
+    """SSSR rings (sets of atoms) containing the bond b"""
+    return [set( self.sssr[i]) for i in self.bond_rings.get( b, [])]
+
+
+  def get_smallest_ring_size( self, x):
+    """size of the smallest SSSR ring containing atom or bond x, 0 if x is not in a ring"""
+    idxs = self.atom_rings.get( x) or self.bond_rings.get( x) or []
+    return min( [len( self.sssr[i]) for i in idxs] or [0])
+
+
+  ## RING SYSTEMS
+
+  def get_ring_systems( self):
+    """ring systems as a list of sets of atoms"""
+    return [set( s) for s in self.ring_systems]
+
+
+  ## RELEVANT AND ALL CYCLES
+
+  def get_relevant_cycles( self):
+    """relevant cycles (the union of all minimum cycle bases) as a list of sets of atoms;
+    unlike SSSR they do not depend on the order of atoms, e.g. all 4 six-membered rings
+    of adamantane are relevant"""
+    if self._relevant_cycles is None:
+      mol = self.molecule
+      cg = mol.get_compact_graph()
+      cycles = sorted( cg.get_relevant_cycles_e(), key=lambda c: (len( c), sorted( c)))
+      self._relevant_cycles = tuple( frozenset( mol.edge_subgraph_to_vertex_subgraph( [cg.edges[j] for j in c])) for c in cycles)
+    return [set( r) for r in self._relevant_cycles]
+
+
+  def get_all_cycles( self, max_size=None, max_count=None):
+    """all cycles as a list of sets of atoms, cycles longer than max_size are skipped;
+    graph.too_many_cycles_error is raised when there are more than max_count cycles"""
+    key = (max_size, max_count)
+    if key not in self._all_cycles:
+      cycles = self.molecule.get_all_cycles( max_size=max_size, max_count=max_count)
+      self._all_cycles[ key] = tuple( sorted( cycles, key=len))
+    return [set( r) for r in self._all_cycles[ key]]
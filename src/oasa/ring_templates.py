@@ -0,0 +1,127 @@
+#--------------------------------------------------------------------------
+#     This file is part of OASA - a free chemical python library
+#     Copyright (C) 2003-2008 Beda Kosata <beda@zirael.org>
+
+#     This program is free software; you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation; either version 2 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     Complete text of GNU GPL can be found in the file gpl.txt in the
+#     main directory of the program
+
+#--------------------------------------------------------------------------
+
+"""Templates of 2D coordinates of ring systems.
+
+Bridged ring systems (adamantane, norbornane, cubane, ...) and some large
+fused ones (steroids, porphyrins) are hard to lay out ring by ring, the
+coords_generator places them from the templates stored here instead.
+
+Only the topology of a ring system is used - its skeleton is made of the
+ring atoms and bonds taken as carbons and single bonds - so the norbornane
+template serves camphor as well. The templates are looked up by a key of
+the skeleton that does not depend on the order of atoms and each match is
+confirmed by the substructure_matcher. The shipped templates are read from
+ring_templates_data when they are needed for the first time.
+"""
+
+from math import sqrt
+
+from .molecule import molecule
+from .substructure_matcher import substructure_matcher
+
+
+
+class ring_template(object):
+
+  def __init__( self, name, skeleton, coords):
+    self.name = name
+    self.skeleton = skeleton
+    # (x, y) for each vertex of the skeleton, bond length 1, centered to (0, 0)
+    self.coords = coords
+
+
+  def __str__( self):
+    return "ring template %s, %d atoms" % (self.name, len( self.coords))
+
+
+
+# {skeleton key: [ring_template, ...]}, None until the data are read
+_templates = None
+# (number of atoms, number of bonds) of the templates, most ring systems
+# are told apart by it without computing the key
+_sizes = set()
+
+
+def _get_skeleton( atoms):
+  """returns a molecule of carbons and single bonds with the topology of atoms
+  and the list of atoms in the order of its vertices"""
+  order = list( atoms)
+  index = dict( (a, i) for i, a in enumerate( order))
+  bonds = [(i, index[n]) for i, a in enumerate( order) for n in a.neighbors if index.get( n, -1) > i]
+  return molecule.from_arrays( len( order)*["C"], bonds), order
+
+
+def _get_skeleton_key( skeleton):
+  # ties are not broken, so the key does not depend on the order of atoms
+  ranks = skeleton.get_canonical_ranks( bond_orders=False, break_ties=False)
+  return skeleton._get_ranks_hash( ranks, False)
+
+
+def _get_bond_count( atoms):
+  return sum( len( [n for n in a.neighbors if n in atoms]) for a in atoms) // 2
+
+
+def _get_templates():
+  global _templates
+  if _templates is None:
+    _templates = {}
+    from . import smiles
+    from . import ring_templates_data
+    for name, smiles_string, coords in ring_templates_data.templates:
+      mol = smiles.text_to_mol( smiles_string, calc_coords=0)
+      for i, a in enumerate( mol.vertices):
+        a.x, a.y = coords[2*i:2*i+2]
+      add_template( mol, name=name)
+  return _templates
+
+
+def add_template( mol, name=""):
+  """adds the ring systems of mol (it must have coords) to the templates,
+  a later template of the same ring system takes precedence"""
+  templates = _get_templates()
+  for system in mol.get_ring_info().get_ring_systems():
+    skeleton, order = _get_skeleton( system)
+    lengths = [sqrt( (a1.x-a2.x)**2 + (a1.y-a2.y)**2) for a1, a2 in (e.vertices for e in mol.vertex_subgraph_to_edge_subgraph( system))]
+    scale = sum( lengths) / len( lengths)
+    x0 = sum( a.x for a in order) / len( order)
+    y0 = sum( a.y for a in order) / len( order)
+    coords = [((a.x-x0)/scale, (a.y-y0)/scale) for a in order]
+    templates.setdefault( _get_skeleton_key( skeleton), []).insert( 0, ring_template( name, skeleton, coords))
+    _sizes.add( (len( order), len( lengths)))
+
+
+def find_template_coords( atoms):
+  """returns coords of the ring system made of atoms from its template as a list
+  of dictionaries {atom: (x, y)} with bond length 1 and the center in (0, 0),
+  one for each symmetrical way the template matches; an empty list is returned
+  when there is no template for the ring system"""
+  templates = _get_templates()
+  atoms = set( atoms)
+  if (len( atoms), _get_bond_count( atoms)) not in _sizes:
+    return []
+  skeleton, order = _get_skeleton( atoms)
+  index = dict( (v, i) for i, v in enumerate( skeleton.vertices))
+  for t in templates.get( _get_skeleton_key( skeleton), []):
+    coords = dict( zip( t.skeleton.vertices, t.coords))
+    matcher = substructure_matcher( t.skeleton, skeleton, same_size=True, bond_orders=False)
+    ret = [dict( (order[ index[v]], coords[q]) for q, v in mapping.items()) for mapping in matcher.get_mappings()]
+    if ret:
+      return ret
+  return []
@@ -0,0 +1,46 @@
+#--------------------------------------------------------------------------
+#     This file is part of OASA - a free chemical python library
+#     Copyright (C) 2003-2008 Beda Kosata <beda@zirael.org>
+
+#     This program is free software; you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation; either version 2 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     Complete text of GNU GPL can be found in the file gpl.txt in the
+#     main directory of the program
+
+#--------------------------------------------------------------------------
+
+## 2D coordinates of ring system templates, see ring_templates
+## each template is (name, smiles, coords) - the smiles gives the skeleton
+## (only its topology is used) and coords are x and y of its atoms in the
+## order of the smiles with bond length about 1
+templates = [
+('adamantane', 'C1C2CC3CC1CC(C2)C3',
+ (0.099, -1.277, 0.644, -0.424, -0.121, 0.35, -0.871, 0.994, -1.051, 0.0, -0.871, -0.994, -0.121, -0.35, 0.644, 0.424, 1.55, 0.0, 0.099, 1.277)) ,
+('cubane', 'C12C3C4C1C5C2C3C45',
+ (0.924, -0.216, -0.242, -0.373, -0.573, 0.757, 0.594, 0.914, 0.242, 0.373, 0.573, -0.757, -0.594, -0.914, -0.924, 0.216)) ,
+('bicyclo[1.1.1]pentane', 'C1C2CC1C2',
+ (0.0, 0.0, 0.864, 0.0, 0.0, 0.656, -0.864, 0.0, 0.0, -0.656)) ,
+('norbornane', 'C1CC2CCC1C2',
+ (0.376, -0.562, 1.303, -0.186, 0.376, 0.19, -0.376, -0.562, -1.303, -0.186, -0.376, 0.19, 0.0, 1.117)) ,
+('bicyclo[2.2.2]octane', 'C1CC2CCC1CC2',
+ (0.425, -0.129, -0.425, 0.129, -1.104, -0.483, -0.099, -0.811, 0.957, -0.584, 1.104, 0.483, 0.099, 0.811, -0.957, 0.584)) ,
+('bicyclo[3.2.1]octane', 'C1CC2CCC(C1)C2',
+ (0.017, -0.783, 1.027, -0.433, 1.023, 0.627, 0.461, -0.111, -0.445, -0.099, -1.063, 0.591, -1.0, -0.465, -0.02, 0.673)) ,
+('bicyclo[3.3.1]nonane', 'C1CC2CCCC(C1)C2',
+ (0.39, -0.836, -0.361, -0.087, -0.966, 0.703, -1.221, -0.269, -0.39, -0.836, 0.361, -0.087, 0.966, 0.703, 1.221, -0.269, 0.0, 0.977)) ,
+('gonane', 'C1CCC2C(C1)CCC3C2CCC4CCCC34',
+ (-2.851, -1.206, -2.851, -0.206, -1.985, 0.294, -1.119, -0.206, -1.119, -1.206, -1.985, -1.706, -0.253, -1.706, 0.613, -1.206,
+  0.613, -0.206, -0.253, 0.294, -0.253, 1.294, 0.613, 1.794, 1.479, 1.294, 2.43, 1.603, 3.018, 0.794, 2.43, -0.015, 1.479, 0.294)) ,
+('porphin', 'C1CC2CC3CCC(CC4CCC(CC5CCC(CC1N2)N5)N4)N3',
+ (2.985, 0.5, 2.985, -0.5, 2.034, -0.809, 1.775, -1.775, 0.809, -2.034, 0.5, -2.985, -0.5, -2.985, -0.809, -2.034,
+  -1.775, -1.775, -2.034, -0.809, -2.985, -0.5, -2.985, 0.5, -2.034, 0.809, -1.775, 1.775, -0.809, 2.034, -0.5, 2.985,
+  0.5, 2.985, 0.809, 2.034, 1.775, 1.775, 2.034, 0.809, 1.446, 0.0, 0.0, 1.446, -1.446, 0.0, 0.0, -1.446)) ,
+]
@@ -20,7 +20,10 @@
 from __future__ import print_function
 
 import re
+import pickle
+import multiprocessing
 
+from . import misc
 from . import reaction
 from . import oasa_exceptions
 from . import stereochemistry
@@ -31,6 +34,22 @@ from .molecule import molecule, equals
 
 
 
+# precompiled patterns and character sets of the parser
+_bracket_atom_simple = re.compile( r"\[(\d*)([A-Za-z][a-z]?)(@*)(?:H(\d*))?(\+{1,10}|-{1,10}|[-+]\d)?\]$")
+_bracket_atom = re.compile( r"^\[(\d*)([A-z][a-z]?)(.*?)\]")
+_bracket_hydrogens = re.compile( r"H(\d*)")
+_bracket_charges = re.compile( r"[-+]{2,10}")
+_bracket_charge = re.compile( r"([-+])(\d?)")
+_bracket_stereo = re.compile( r"@+")
+# the place of the @ or @@ of a stereo center in the SMILES being written
+_stereo_placeholder = re.compile( r"\{\{stereo(\d+)\}\}")
+_uppercase = frozenset( "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_lowercase = frozenset( "abcdefghijklmnopqrstuvwxyz")
+_digits = frozenset( "0123456789")
+_bond_chars = frozenset( "-=#:.\\/")
+
+
+
 class smiles( plugin):
 
   name = "smiles"
@@ -63,10 +82,22 @@ class smiles( plugin):
         else:
           v1 = inside2
           v2 = end2
-        last_order = self._processed_atoms.index( v2) - self._processed_atoms.index( v1)
+        positions = self._atom_positions
+        last_order = positions[ v2] - positions[ v1]
         last_code = self._stereo_bonds_to_code[ other] == "\\" and 1 or -1
         relation = st.value == st.OPPOSITE_SIDE and -1 or 1
-        if relation*last_code*last_order < 0:
+        # the order of the atoms of this bond, the end one is usually written after the inside one
+        if set( b.vertices) == set( [end1,inside1]):
+          inside, end = inside1, end1
+        else:
+          inside, end = inside2, end2
+        if end not in positions:
+          this_order = 1
+        elif inside not in positions:
+          this_order = -1
+        else:
+          this_order = positions[ end] - positions[ inside]
+        if relation*last_code*last_order*this_order < 0:
           code = "/"
         else:
           code = "\\"
@@ -87,176 +118,227 @@ class smiles( plugin):
     return self.structure
 
   def read_smiles( self, text, explicit_hydrogens_to_real_atoms=False):
+    """parses the SMILES in one pass over the text, the atoms and bonds are
+    created directly; oasa_smiles_error with the position of the problem
+    is raised for malformed input"""
     self.explicit_hydrogens_to_real_atoms = explicit_hydrogens_to_real_atoms
     mol = Config.create_molecule()
     text = "".join( text.split())
-    is_text = re.compile("^[A-Z][a-z]?$")
-    # internally revert \/ bonds before numbers, this makes further processing much easier
-    text = re.sub( r"([\\/])([0-9])", lambda m: (m.group(1)=="/" and "\\" or "/")+m.group(2), text)
-    # // end
-    chunks = re.split( "(\[.*?\]|[A-Z][a-z]?|%[0-9]{1,2}|[^A-Z]|[a-z])", text)
-    chunks = self._check_the_chunks( chunks)
-    last_atom = None
+    n = len( text)
+    atoms = []
+    bonds = []
+    bond_list = []  # pairs of atom indexes of bonds
+    aromatic = []  # per atom
+    explicit_valency = []  # per atom, atoms in [] have explicit valency
+    occupied = []  # per atom, sum of bond orders with aromatic bonds counted as single
+    last = None  # index of the last atom
     last_bond = None
-    numbers = {}
-    bracket_openings = []
-    for c in chunks:
+    last_bond_at = 0
+    rings = {}  # ring closure number -> (atom index, bond or None, position)
+    branches = []  # atom indexes of open branches
+    i = 0
+    while i < n:
+      c = text[i]
+      at = i
+      i += 1
       # atom
-      if is_text.match( c) or c.islower() or c[0] == "[":
+      if c in _uppercase or c in _lowercase or c == "[":
         a = mol.create_vertex()
-        if c[0] == "[":
+        if c == "[":
           # atom spec in square brackets
-          self._parse_atom_spec( c, a)
-        else:
+          j = text.find( "]", at)
+          if j < 0:
+            raise oasa_exceptions.oasa_smiles_error( "unclosed '['", position=at)
+          arom = self._parse_atom_spec( text[at:j+1], a, position=at)
+          i = j+1
+        elif c in _lowercase:
           # just atom symbol
-          if c.islower():
-            symbol = c.capitalize()
-            a.properties_['aromatic'] = 1
-          else:
-            symbol = c
-          a.symbol = symbol
-
-        mol.add_vertex( a)
-        if last_bond: # and not (not 'aromatic' in a.properties_ and last_bond.aromatic):
+          arom = True
+          c = c.upper()
+          if a.symbol != c:
+            a.symbol = c
+        else:
+          arom = False
+          # two letter symbols ("Sc" is S-c not scandium)
+          if i < n and text[i] in _lowercase and c+text[i] in PT.periodic_table and c+text[i] != "Sc":
+            c += text[i]
+            i += 1
+          if a.symbol != c:
+            a.symbol = c
+        atoms.append( a)
+        aromatic.append( arom)
+        explicit_valency.append( c == "[")
+        occupied.append( 0)
+        new = len( atoms) - 1
+        if last_bond:
+          if last is None:
+            raise oasa_exceptions.oasa_smiles_error( "bond without an atom before it", position=last_bond_at)
           # make last bond aromatic if it was stereo and atoms are aromatic
-          if 'stereo' in last_bond.properties_ and \
-             'aromatic' in last_atom.properties_ and \
-             'aromatic' in a.properties_ and \
-             not last_bond.aromatic:
+          if 'stereo' in last_bond.properties_ and aromatic[last] and arom and not last_bond.aromatic:
             last_bond.aromatic = True
-          mol.add_edge( last_atom, a, e=last_bond)
+          b = last_bond
           last_bond = None
-        elif last_atom:
-          b = mol.add_edge( last_atom, a)
-          if 'aromatic' in a.properties_:
+        elif last is not None:
+          b = mol.create_edge()
+          if arom:
             # aromatic bond
             b.order = 4
-            b.type = 'n'
-        last_atom = a
-        last_bond = None
+        else:
+          b = None
+        if b:
+          bonds.append( b)
+          bond_list.append( (last, new))
+          order = b.order
+          if order == 4:
+            order = 1
+          occupied[last] += order
+          occupied[new] += order
+        last = new
       # bond
-      elif c in r'-=#:.\/':
-        order = self.smiles_to_oasa_bond_recode[ c]
+      elif c in _bond_chars:
+        if last_bond:
+          raise oasa_exceptions.oasa_smiles_error( "two bonds in a row", position=at)
         last_bond = mol.create_edge()
-        last_bond.order = order
+        last_bond.order = self.smiles_to_oasa_bond_recode[ c]
         last_bond.type = 'n'
-        if c in r'\/':
+        last_bond_at = at
+        if c in "\\/":
           last_bond.properties_['stereo'] = c
       # ring closure
-      elif c.isdigit():
-        if c in numbers:
-          if last_bond:
-            b = last_bond
-          else:
+      elif c in _digits or c == "%":
+        if c == "%":
+          j = i
+          while j < n and j < i+2 and text[j] in _digits:
+            j += 1
+          if j == i:
+            raise oasa_exceptions.oasa_smiles_error( "'%' not followed by a ring closure number", position=at)
+          c = str( int( text[i:j]))
+          i = j
+        if last is None:
+          raise oasa_exceptions.oasa_smiles_error( "ring closure without an atom", position=at)
+        if c in rings:
+          other, bond, other_at = rings.pop( c)
+          if last_bond and 'stereo' in last_bond.properties_:
+            # \/ at the closing number goes from this atom to the earlier one, it is reverted
+            # so that all the bonds go in the order of atoms, this makes further processing much easier
+            stereo = last_bond.properties_['stereo']
+            last_bond.properties_['stereo'] = stereo == "/" and "\\" or "/"
+          b = last_bond or bond
+          if not b:
             b = mol.create_edge()
-            if "aromatic" in numbers[c].properties_:
+            if aromatic[other]:
               b.order = 4
-          mol.add_edge( last_atom, numbers[c], e=b)
-          last_bond = None
-          del numbers[ c]
+          bonds.append( b)
+          bond_list.append( (last, other))
+          order = b.order
+          if order == 4:
+            order = 1
+          occupied[last] += order
+          occupied[other] += order
         else:
-          numbers[c] = last_atom
-          last_bond = None
+          rings[c] = (last, last_bond, at)
+        last_bond = None
       elif c == '(':
-        bracket_openings.append( last_atom)
+        if last is None:
+          raise oasa_exceptions.oasa_smiles_error( "branch without an atom", position=at)
+        branches.append( (last, at))
       elif c == ')':
-        last_atom = bracket_openings.pop(-1)
+        if not branches:
+          raise oasa_exceptions.oasa_smiles_error( "unmatched ')'", position=at)
+        last = branches.pop()[0]
+      else:
+        raise oasa_exceptions.oasa_smiles_error( "unexpected character '%s'" % c, position=at)
+    if last_bond:
+      raise oasa_exceptions.oasa_smiles_error( "bond without an atom after it", position=last_bond_at)
+    if rings:
+      other, bond, at = min( rings.values(), key=lambda x: x[2])
+      raise oasa_exceptions.oasa_smiles_error( "unclosed ring", position=at)
+    if branches:
+      raise oasa_exceptions.oasa_smiles_error( "unclosed '('", position=branches[-1][1])
+    mol.add_vertices_and_edges( atoms, bond_list, edges=bonds)
 
     ## FINISH
     # deal with explicit valency, etc.
-    for a in mol.vertices:
-      if not "explicit_valency" in a.properties_:
-        a.raise_valency_to_senseful_value()
+    for a, explicit, occupied_valency in zip( atoms, explicit_valency, occupied):
+      if not explicit:
+        # the same as a.raise_valency_to_senseful_value(), but with the occupied valency
+        # collected during parsing (atoms outside [] have no charge or hydrogens)
+        if occupied_valency > a.valency:
+          for v in PT.periodic_table[ a.symbol]['valency']:
+            if v > a.valency:
+              a.valency = v
+              if occupied_valency <= v:
+                break
       else:
         # detect radicals (but not biradicals - problem of triplet vs. singlet)
-        del a.properties_['explicit_valency']
         if a.valency - a.occupied_valency == 1:
           a.multiplicity += 1
         else:
           a.valency = a.occupied_valency
-      try:
-        del a.properties_['aromatic']
-      except:
-        pass
 
     # stereochemistry
-    self._process_stereochemistry( mol)
+    if "/" in text or "\\" in text or "@" in text:
+      self._process_stereochemistry( mol)
 
     if len(mol.vertices) == 0:
       mol = None
     self.structure = mol
 
 
-  def _parse_atom_spec( self, c, a):
+  def _parse_atom_spec( self, c, a, position=None):
     """c is the text spec,
-    a is an empty prepared vertex (atom) instance"""
-    bracketed_atom = re.compile("^\[(\d*)([A-z][a-z]?)(.*?)\]")
-    m = bracketed_atom.match( c)
+    a is an empty prepared vertex (atom) instance;
+    returns True for aromatic atoms"""
+    m = _bracket_atom_simple.match( c)
     if m:
-      isotope, symbol, rest = m.groups()
+      # the usual order - isotope, symbol, stereo, hydrogens, charge
+      isotope, symbol, stereo, hs, charge = m.groups()
+      h_count = hs is not None and int( hs or 1) or 0
+      if not charge:
+        charge = 0
+      elif charge[-1] in _digits:
+        charge = int( charge)
+      else:
+        charge = charge[0] == "-" and -len( charge) or len( charge)
     else:
-      raise ValueError( "unparsable square bracket content '%s'" % c)
-    if symbol.islower():
+      m = _bracket_atom.match( c)
+      if not m:
+        raise oasa_exceptions.oasa_smiles_error( "unparsable square bracket content '%s'" % c, position=position)
+      isotope, symbol, rest = m.groups()
+      # hydrogens
+      _hydrogens = _bracket_hydrogens.search( rest)
+      h_count = 0
+      if _hydrogens:
+        h_count = int( _hydrogens.group(1) or 1)
+      # charge
+      charge = 0
+      # one possible spec of charge
+      _charge = _bracket_charges.search( rest)
+      if _charge:
+        charge = len( _charge.group(0))
+        if _charge.group(0)[0] == "-":
+          charge *= -1
+      # second one, only if the first one failed
+      else:
+        _charge = _bracket_charge.search( rest)
+        if _charge:
+          charge = int( _charge.group(2) or 1)
+          if _charge.group(1) == "-":
+            charge *= -1
+      # stereo
+      _stereo = _bracket_stereo.search( rest)
+      stereo = _stereo and _stereo.group(0)
+    aromatic = symbol.islower()
+    if aromatic:
       symbol = symbol.capitalize()
-      a.properties_['aromatic'] = 1
     a.symbol = symbol
     if isotope:
       a.isotope = int( isotope)
-    # hydrogens
-    _hydrogens = re.search( "H(\d*)", rest)
-    h_count = 0
-    if _hydrogens:
-      if _hydrogens.group(1):
-        h_count = int( _hydrogens.group(1))
-      else:
-        h_count = 1
     a.explicit_hydrogens = h_count
-    # charge
-    charge = 0
-    # one possible spec of charge
-    _charge = re.search( "[-+]{2,10}", rest)
-    if _charge:
-      charge = len( _charge.group(0))
-      if _charge.group(0)[0] == "-":
-        charge *= -1
-    # second one, only if the first one failed
-    else:
-      _charge = re.search( "([-+])(\d?)", rest)
-      if _charge:
-        if _charge.group(2):
-          charge = int( _charge.group(2))
-        else:
-          charge = 1
-        if _charge.group(1) == "-":
-          charge *= -1
     a.charge = charge
-    # stereo
-    _stereo = re.search( "@+", rest)
-    if _stereo:
-      stereo = _stereo.group(0)
+    if stereo:
       a.properties_['stereo'] = stereo
-    # using [] means valency is explicit
-    a.properties_['explicit_valency'] = True
-
-  def _check_the_chunks( self, chunks):
-    is_text = re.compile("^[A-Z][a-z]?$")
-    is_long_num = re.compile( "^%[0-9]{1,2}$")
-    ret = []
-    for c in chunks:
-      if not c:
-        continue
-      if is_text.match( c):
-        if (not c in PT.periodic_table and len(c)==2) or c == "Sc": # Sc is S-c not scandium
-          a,b = c
-          ret.append( a)
-          ret.append( b)
-        else:
-          ret.append( c)
-      elif is_long_num.match( c):
-        ret.append( str( int( c[1:])))
-      else:
-        ret.append( c)
-    return ret
+    return aromatic
 
 
 
@@ -283,7 +365,7 @@ class smiles( plugin):
         if len( path2)%2 and not [_e for _e in path2 if _e.order != 2]:
           # only odd number of double bonds, double bonds only
           for _e in path[1:-1]:
-            if not mol.is_edge_a_bridge_fast_and_dangerous( _e):
+            if not mol.is_edge_a_bridge( _e):
               break
           else:
             # only stereo related to non-cyclic bonds
@@ -358,6 +440,7 @@ class smiles( plugin):
     self.molecule = mol
     self.ring_joins = []
     self._processed_atoms = []
+    self._atom_positions = {} # atom => its position in _processed_atoms
     self.branches = {}
     self._stereo_bonds_to_code = {} # for bond it will contain character it uses
     self._stereo_bonds_to_others = {} # for bond it will contain the other bonds
@@ -382,98 +465,104 @@ class smiles( plugin):
       else:
         pass # we cannot handle this
 
-    ret = ''.join( [i for i in self._get_smiles( mol)])
-    mol.reconnect_temporarily_disconnected_edges()
-    # this is needed because the way temporarily_disconnected edges are handled is not compatible with the way smiles
-    # generation works - it splits the molecule while reusing the same atoms and bonds and thus disconnected bonds accounting fails
-    for e in mol.edges:
-      e.disconnected = False
-    # here tetrahedral stereochemistry is added
+    ret = ''.join( self._get_smiles( mol))
+    # here tetrahedral stereochemistry is added, the placeholders are keyed by the
+    # positions of the centers, the neighbors are taken in the order they were written
+    positions = self._atom_positions
+    symbols = {}
     for v, st in self._stereo_centers.items():
-      processed_neighbors = []
-      for n in self._processed_atoms:
-        if n in v.neighbors:
-          processed_neighbors.append( n)
-        elif v.explicit_hydrogens and n is v:
-          processed_neighbors.append( stereochemistry.explicit_hydrogen())
-      count = match_atom_lists( st.references, processed_neighbors)
+      processed_neighbors = [(positions[n], n) for n in v.neighbors]
+      if v.explicit_hydrogens:
+        processed_neighbors.append( (positions[v], stereochemistry.explicit_hydrogen()))
+      processed_neighbors.sort( key=lambda pn: pn[0])
+      count = match_atom_lists( st.references, [n for p, n in processed_neighbors])
       clockwise = st.value == st.CLOCKWISE
       if count % 2 == 1:
         clockwise = not clockwise
-      ch_symbol = clockwise and "@@" or "@"
-      ret = ret.replace( "{{stereo%d}}" % mol.vertices.index(v), ch_symbol)
+      symbols[ positions[v]] = clockwise and "@@" or "@"
+    if symbols:
+      ret = _stereo_placeholder.sub( lambda m: symbols[ int( m.group( 1))], ret)
     return ret
 
 
 
-  def _get_smiles( self, mol, start_from=None):
-    # single atoms
-    if len( mol.vertices) == 1:
-      v = mol.vertices[0]
+  def _get_smiles( self, mol):
+    """yields the parts of canonical SMILES - the atoms are ranked by
+    molecule.get_canonical_ranks, the lowest ranked one is the first and the
+    neighbors are visited in the order of their ranks, the last one
+    continues the chain and the others are written as branches"""
+    ranks = mol.get_canonical_ranks( stereo=True)
+    key = lambda en: ranks[ en[1]]
+    start = min( mol.vertices, key=ranks.get)
+    # depth first search gives the spanning tree and the ring closures,
+    # the atoms are written in the order they were found
+    position = {start: 0}
+    parent_edge = {start: None}
+    children = {start: []}
+    closures = {start: []}
+    closure_edges = set()
+    stack = [(start, iter( sorted( start.get_neighbor_edge_pairs(), key=key)))]
+    while stack:
+      v, neighbors = stack[-1]
+      for e, n in neighbors:
+        if n not in position:
+          position[n] = len( position)
+          parent_edge[n] = e
+          children[v].append( (e, n))
+          children[n] = []
+          closures[n] = []
+          stack.append( (n, iter( sorted( n.get_neighbor_edge_pairs(), key=key))))
+          break
+        elif e is not parent_edge[v] and e not in closure_edges:
+          closure_edges.add( e)
+          closures[v].append( (e, n))
+          closures[n].append( (e, v))
+      else:
+        stack.pop()
+    # writing - ring closure numbers are reused when the ring is closed
+    ring_numbers = {}
+    free_numbers = []
+    to_write = [(start, None)]
+    while to_write:
+      item = to_write.pop()
+      if item in ('(', ')'):
+        yield item
+        continue
+      v, e = item
+      if e:
+        yield self.recode_oasa_to_smiles_bond( e)
       yield self._create_atom_smiles( v)
-      for e in self.ring_joins:
-        if v in e.get_vertices():
-          yield self.recode_oasa_to_smiles_bond( e)
-          yield self._create_ring_join_smiles( self.ring_joins.index( e))
-      return
-    while not (is_line(mol) and (not start_from or start_from.degree <= 1)):
-      if is_pure_ring( mol):
-        if start_from:
-          self.ring_joins.append( mol.temporarily_disconnect_edge( start_from.neighbor_edges[0]))
+      closed = []
+      for e, n in sorted( closures[v], key=lambda en: position[ en[1]]):
+        if position[n] < position[v]:
+          number = ring_numbers.pop( e)
+          closed.append( number)
         else:
-          self.ring_joins.append( mol.temporarily_disconnect_edge( list( mol.edges)[0]))
-      else:
-        e, mol, branch_vertex, branch = self.disconnect_something( mol, start_from=start_from)
-        if branch_vertex:
-          if branch_vertex in self.branches:
-            self.branches[ branch_vertex].append((e, branch))
+          if free_numbers:
+            number = free_numbers.pop( 0)
           else:
-            self.branches[ branch_vertex] = [(e, branch)]
-        else:
-          self.ring_joins.append( e)
-    try:
-      start, end = filter(lambda x: x.degree == 1, mol.vertices)
-    except:
-      #print(filter(lambda x: x.degree == 1, mol.vertices))
-      raise Exception("shit")
-    if start_from == end:
-      start, end = end, start
-    v = start
-    last = None
-    was_end = False
-    while True:
-      yield self._create_atom_smiles( v)
-      # the atom
-      for e in self.ring_joins:
-        if v in e.get_vertices():
-          _b = self.recode_oasa_to_smiles_bond( e)
-          if _b not in "/\\":
-            yield _b
-          yield self._create_ring_join_smiles( self.ring_joins.index( e))
-      # branches
-      if v in self.branches:
-        for edg, branch in self.branches[ v]:
-          yield '('
-          yield self.recode_oasa_to_smiles_bond( edg)
-          v1, v2 = edg.vertices
-          vv = (v1 != v) and v1 or v2
-          for i in self._get_smiles( branch, start_from=vv):
-            yield i
-          yield ')'
-      # bond leading to the neighbor
-      for e, neighbor in v.get_neighbor_edge_pairs():
-        if neighbor != last:
+            number = len( ring_numbers) + len( closed)
+          ring_numbers[e] = number
+        if e not in self._stereo_bonds_to_others:
           yield self.recode_oasa_to_smiles_bond( e)
-          last = v
-          v = neighbor
-          break
-      if was_end:
-        break
-      if v == end:
-        was_end = True
+        elif position[n] < position[v]:
+          # stereo bonds are written only at the closing number,
+          # where \/ is reverted (see read_smiles)
+          _b = self.recode_oasa_to_smiles_bond( e)
+          yield {"/": "\\", "\\": "/"}.get( _b, _b)
+        yield self._create_ring_join_smiles( number)
+      free_numbers = sorted( free_numbers + closed)
+      kids = children[v]
+      if kids:
+        to_write.append( (kids[-1][1], kids[-1][0]))
+        for e, n in reversed( kids[:-1]):
+          to_write.append( ')')
+          to_write.append( (n, e))
+          to_write.append( '(')
 
 
   def _create_atom_smiles( self, v):
+    self._atom_positions[v] = len( self._processed_atoms)
     self._processed_atoms.append( v)
     if 'aromatic' in v.properties_.keys():
       symbol = v.symbol.lower()
@@ -496,7 +585,7 @@ class smiles( plugin):
       h_spec = (num_h and "H" or "") + (num_h > 1 and str( num_h) or "")
       # stereo
       if stereo:
-        stereo = "{{stereo%d}}" % self.molecule.vertices.index( v)
+        stereo = "{{stereo%d}}" % self._atom_positions[v]
       else:
         stereo = ""
       return "[%s%s%s%s%s]" % (isotope, symbol, stereo, h_spec, charge)
@@ -505,121 +594,6 @@ class smiles( plugin):
       return symbol
 
 
-  def disconnect_something( self, mol, start_from=None):
-    """returns (broken edge, resulting mol, atom where mol was disconnected, disconnected branch)"""
-    # we cannot do much about this part
-    if start_from and start_from.degree != 1:
-      for e,n in start_from.get_neighbor_edge_pairs():
-        if n.degree > 2:
-          mol.temporarily_disconnect_edge( e)
-          return e, mol, None, None
-      mol.temporarily_disconnect_edge( e)
-      return e, mol, None, None
-    # at first try to find edges for which degree of neighbors is bigger
-    # than [2,2] and at best they are not bridges
-    # when no non-bridges are present use the other ones
-    #
-    # the edges with crowded atoms
-    for e in mol.edges:
-      d1, d2 = [x.degree for x in e.get_vertices()]
-      if d1 > 2 and d2 > 2 and not mol.is_edge_a_bridge_fast_and_dangerous( e):
-        mol.temporarily_disconnect_edge( e)
-        return e, mol, None, None
-    # the other valuable non-bridge edges
-    for e in mol.edges:
-      d1, d2 = [x.degree for x in e.get_vertices()]
-      if (d1 > 2 or d2 > 2) and not mol.is_edge_a_bridge_fast_and_dangerous( e):
-        mol.temporarily_disconnect_edge( e)
-        return e, mol, None, None
-    # there are no non-bridges
-    # we want to split off the smallest possible chunks
-    min_size = None
-    the_right_edge = None
-    the_right_mol = None
-    the_right_branch = None
-    the_right_branch_atom = None
-    ring_joints_in_branch = 1000
-    ring_join_vertices = set(j for i in (e.vertices for e in self.ring_joins)
-                                   for j in i)
-    for e in mol.edges:
-      d1, d2 = [x.degree for x in e.get_vertices()]
-      if d1 > 2 or d2 > 2:
-        ps = mol.get_pieces_after_edge_removal( e)
-        if len( ps) == 1:
-          print("impossible")
-          continue
-        lenghts = map( len, ps)
-        ms = min( lenghts)
-        p1, p2 = ps
-        the_mol = (len( p1) < len( p2)) and p2 or p1
-        the_branch = (p1 == the_mol) and p2 or p1
-        ring_joints = len( [i for i in the_branch if i in ring_join_vertices])
-        if not min_size or ms < min_size or ring_joints_in_branch > ring_joints:
-          min_size = ms
-          the_right_edge = e
-          the_right_mol = the_mol
-          the_right_branch = the_branch
-          ring_joints_in_branch = ring_joints
-    if the_right_edge:
-      # what is possible to make here instead in the loop is made here
-      # it saves time
-      v1, v2 = the_right_edge.vertices
-      mol.temporarily_disconnect_edge( the_right_edge)
-      the_right_branch_atom = (v1 in the_right_mol) and v1 or v2
-      the_right_mol = mol.get_induced_subgraph_from_vertices( the_right_mol)
-      the_right_branch = mol.get_induced_subgraph_from_vertices( the_right_branch)
-      return (the_right_edge,
-              the_right_mol,
-              the_right_branch_atom,
-              the_right_branch)
-    #print(mol, mol.is_connected())
-    raise Exception("fuck, how comes!?")
-
-
-
-
-  def disconnect_something_simple( self, mol, start_from=None):
-    """returns (broken edge, resulting mol, atom where mol was disconnected, disconnected branch)"""
-    # we cannot do much about this part
-    if not mol.is_connected():
-      print("unconnected ", mol)
-    if start_from and start_from.degree > 1:
-      e = list(start_from._neighbors.keys())[0]
-      mol.disconnect_edge( e)
-      ps = [i for i in mol.get_connected_components()]
-      if len( ps) == 1:
-        return e, mol, None, None
-      else:
-        p1 = mol.get_induced_subgraph_from_vertices( ps[0])
-        p2 = mol.get_induced_subgraph_from_vertices( ps[1])
-        v1, v2 = e.get_vertices()
-        p = (start_from in p1.vertices) and p1 or p2
-        px = (p1 == p) and p2 or p1
-        v = (v1 in p.vertices) and v1 or v2
-        return e, p, v, px
-
-    for e in mol.edges:
-      d1, d2 = [x.degree for x in e.get_vertices()]
-      if (d1 > 2 or d2 > 2):
-        mol.disconnect_edge( e)
-        ps = [i for i in mol.get_connected_components()]
-        if len( ps) == 1:
-          return e, mol, None, None
-        else:
-          p1 = mol.get_induced_subgraph_from_vertices( ps[0])
-          p2 = mol.get_induced_subgraph_from_vertices( ps[1])
-          v1, v2 = e.get_vertices()
-          if start_from:
-            p = (start_from in p1.vertices) and p1 or p2
-            px = (p1 == p) and p2 or p1
-            v = (v1 in p.vertices) and v1 or v2
-            return e, p, v, px
-
-          v = (v1 in p1.vertices) and v1 or v2
-          return e, p1, v, p2
-    print(mol, mol.is_connected(), ',', map( len, mol.get_connected_components()), ',', start_from)
-    raise Exception("fuck, how comes!?")
-
   @staticmethod
   def _create_ring_join_smiles( index):
     i = index +1
@@ -761,11 +735,15 @@ class smiles_converter( converter_base):
     f.write( self.mols_to_text( structures))
 
   def read_file( self, f):
+    """reads a SMILES file - one SMILES per line optionally followed by a name,
+    for large files see iter_smiles_file"""
     converter_base.read_file( self, f)
     mols = []
     for line in f:
-      mol = self.text_to_mols( line)
-      mols.extend( mol)
+      parts = line.split( None, 1)
+      if parts:
+        mols.extend( self.read_text( parts[0]))
+    self.result = mols
     return mols
 
 converter = smiles_converter
@@ -812,6 +790,91 @@ def file_to_mol( f):
 
 
 
+##################################################
+## BATCH READING OF SMILES FILES
+
+def iter_smiles_file( f, workers=1, chunk_size=1000, calc_coords=0, localize_aromatic_bonds=True, process=None):
+  """reads a SMILES file (one SMILES per line optionally followed by a name)
+  and yields (line_number, name, result, error) for each non-empty line in
+  the order of the file; result is the molecule or process(molecule) when
+  process is given, error is None or the message describing why the line
+  could not be read (result is None then) - bad lines do not stop the reading.
+
+  f is a file name or an open file. With workers > 1 (None for the number of
+  CPUs) chunks of chunk_size lines are processed in a pool of processes, only
+  a few chunks are read ahead so that files of any size may be read; process
+  must be a top-level function then. Transferring small results of process
+  (formula, SMILES, fingerprint...) is much cheaper than the molecules."""
+  if not hasattr( f, "read"):
+    with open( f, 'r') as fo:
+      for record in iter_smiles_file( fo, workers=workers, chunk_size=chunk_size, calc_coords=calc_coords,
+                                      localize_aromatic_bonds=localize_aromatic_bonds, process=process):
+        yield record
+    return
+  if workers is None:
+    workers = multiprocessing.cpu_count()
+  options = (calc_coords, localize_aromatic_bonds, process)
+  chunks = _iter_line_chunks( f, chunk_size)
+  if workers <= 1:
+    for chunk in chunks:
+      for record in _read_smiles_chunk( chunk, options, transfer=False):
+        yield record
+    return
+  pool = multiprocessing.Pool( workers)
+  try:
+    arguments = ((chunk, options) for chunk in chunks)
+    for records in misc.iter_async_results( pool, _read_smiles_chunk, arguments, 2*workers):
+      for record in _load_records( records):
+        yield record
+  finally:
+    pool.terminate()
+    pool.join()
+
+
+def _iter_line_chunks( f, chunk_size):
+  chunk = []
+  for i, line in enumerate( f):
+    parts = line.split( None, 1)
+    if parts:
+      chunk.append( (i+1, parts[0], len( parts) > 1 and parts[1].strip() or ""))
+      if len( chunk) >= chunk_size:
+        yield chunk
+        chunk = []
+  if chunk:
+    yield chunk
+
+
+def _read_smiles_chunk( chunk, options, transfer=True):
+  """reads one chunk of lines, when transfer is True the results are pickled
+  here so that a result which cannot be pickled spoils only its own line"""
+  calc_coords, localize, process = options
+  records = []
+  for line_number, text, name in chunk:
+    try:
+      result = text_to_mol( text, calc_coords=calc_coords, localize_aromatic_bonds=localize)
+      if process:
+        result = process( result)
+      if transfer:
+        result = pickle.dumps( result, pickle.HIGHEST_PROTOCOL)
+      error = None
+    except Exception as e:
+      result = None
+      error = "%s: %s" % (e.__class__.__name__, e)
+    records.append( (line_number, name, result, error))
+  return records
+
+
+def _load_records( records):
+  for line_number, name, result, error in records:
+    if result is not None:
+      result = pickle.loads( result)
+    yield line_number, name, result, error
+
+# END OF BATCH READING
+##################################################
+
+
+
 ##################################################
 # DEMO
 
@@ -0,0 +1,124 @@
+#--------------------------------------------------------------------------
+#     This file is part of OASA - a free chemical python library
+#     Copyright (C) 2003-2008 Beda Kosata <beda@zirael.org>
+
+#     This program is free software; you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation; either version 2 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     Complete text of GNU GPL can be found in the file gpl.txt in the
+#     main directory of the program
+
+#--------------------------------------------------------------------------
+
+"""Uniform grid index of atoms for queries of atoms within a distance.
+
+"""
+
+from math import floor, ceil
+
+
+
+class spatial_index(object):
+  """The plane is split to square cells of cell_size and each item (an object
+  with x and y, usually an atom) is stored in the cell it falls to, so only
+  the cells around a place are searched for the items close to it. Finding
+  all close pairs takes time linear in the number of items as long as the
+  cells are not crowded.
+
+  The index is not updated automatically, call move for items whose coords
+  were changed.
+  """
+
+  def __init__( self, items=(), cell_size=1.0):
+    self.cell_size = float( cell_size)
+    self.cells = {}
+    # the cell of each item
+    self._cell_of = {}
+    for item in items:
+      self.add( item)
+
+
+  def __len__( self):
+    return len( self._cell_of)
+
+
+  def _get_cell( self, x, y):
+    return int( floor( x / self.cell_size)), int( floor( y / self.cell_size))
+
+
+  def add( self, item):
+    cell = self._get_cell( item.x, item.y)
+    self.cells.setdefault( cell, []).append( item)
+    self._cell_of[ item] = cell
+
+
+  def remove( self, item):
+    cell = self._cell_of.pop( item)
+    items = self.cells[ cell]
+    items.remove( item)
+    if not items:
+      del self.cells[ cell]
+
+
+  def move( self, item):
+    """updates the index after the coords of item changed"""
+    if self._get_cell( item.x, item.y) != self._cell_of[ item]:
+      self.remove( item)
+      self.add( item)
+
+
+  def get_items_near( self, x, y, radius):
+    """returns the items in the cells within radius from the point (x, y),
+    some of them may be further than radius"""
+    x1, y1 = self._get_cell( x-radius, y-radius)
+    x2, y2 = self._get_cell( x+radius, y+radius)
+    ret = []
+    for i in range( x1, x2+1):
+      for j in range( y1, y2+1):
+        items = self.cells.get( (i, j))
+        if items:
+          ret.extend( items)
+    return ret
+
+
+  def get_items_within( self, x, y, radius):
+    """returns the items closer than radius to the point (x, y)"""
+    r2 = radius * radius
+    return [item for item in self.get_items_near( x, y, radius) if (item.x-x)**2 + (item.y-y)**2 < r2]
+
+
+  def iter_close_pairs( self, radius):
+    """yields the pairs of items closer than radius, each pair once; the pairs
+    are found one cell after another, so the caller may stop early without paying
+    for all of them. Items may be moved while iterating, the cells not visited yet
+    are then searched with the new coords."""
+    n = int( ceil( radius / self.cell_size))
+    # half of the neighboring cells, so that each pair of cells is visited once
+    offsets = [(i, j) for i in range( -n, n+1) for j in range( n+1) if j > 0 or i > 0]
+    r2 = radius * radius
+    for x, y in list( self.cells.keys()):
+      items = list( self.cells.get( (x, y), ()))
+      for k, item in enumerate( items):
+        for other in items[k+1:]:
+          if (item.x-other.x)**2 + (item.y-other.y)**2 < r2:
+            yield item, other
+      for i, j in offsets:
+        others = self.cells.get( (x+i, y+j))
+        if others:
+          others = list( others)
+          for item in items:
+            for other in others:
+              if (item.x-other.x)**2 + (item.y-other.y)**2 < r2:
+                yield item, other
+
+
+  def get_close_pairs( self, radius):
+    """returns the pairs of items closer than radius, each pair once"""
+    return list( self.iter_close_pairs( radius))
@@ -20,9 +20,12 @@
 from __future__ import print_function
 
 import os
+import zlib
 
 from . import smiles
+from . import fingerprint
 from .graph.digraph import digraph
+from .substructure_matcher import substructure_matcher
 
 
 
@@ -31,17 +34,30 @@ class substructure_search_manager( object):
   substructure_def_file = os.path.join( os.path.dirname( __file__), "subsearch_data.txt")
   ring_def_file = os.path.join( os.path.dirname( __file__), "subsearch_rings.txt")
 
-  def __init__( self):
+  def __init__( self, use_compiled=True):
     self.structures = digraph()  # graph describing the relations between individual structures
     self.search_trees = []  # list of substructure instances that for a tree
     self.rings = {}
-    self.fill_data()
-
-  def fill_data( self):
+    # statistics of the fingerprint screening, see get_screening_report
+    self.screened = 0
+    self.screen_passed = 0
+    self.matched = 0
+    self.fill_data( use_compiled=use_compiled)
+
+  def fill_data( self, use_compiled=True):
+    """reads the data from subsearch_data; the parsed structures, their
+    dependencies and the search trees are taken from subsearch_compiled
+    when it is up to date (see _compiled_data_to_python_module)"""
     from . import subsearch_data
-    for struct in subsearch_data.structures:
+    compiled = use_compiled and self._get_compiled_data()
+    for i, struct in enumerate( subsearch_data.structures):
       compound_type, name, smiles_string, to_ignore = struct
-      sub = substructure( name, compound_type, smiles=smiles_string, atoms_to_ignore=to_ignore)
+      if compiled:
+        sub = substructure( name, compound_type)
+        atoms, bonds, fp = compiled.structures[i]
+        sub.read_arrays( smiles_string, atoms, bonds, fp, atoms_to_ignore=to_ignore)
+      else:
+        sub = substructure( name, compound_type, smiles=smiles_string, atoms_to_ignore=to_ignore)
       v = self.structures.create_vertex()
       v.value = sub
       self.structures.add_vertex( v)
@@ -49,8 +65,35 @@ class substructure_search_manager( object):
       name, smiles_string, ring_hash = ring_desc
       rng = ring( name, smiles_string, ring_hash=ring_hash)
       self.rings[ ring_hash] = rng
-    # the following takes some time
-    self._analyze_structure_dependencies()
+    vs = self.structures.vertices
+    if compiled:
+      for i, j in compiled.dependencies:
+        self.structures.add_edge( vs[i], vs[j])
+      for i, children in enumerate( compiled.children):
+        vs[i].value.children = [vs[j].value for j in children]
+      self.search_trees = [vs[i].value for i in compiled.heads]
+    else:
+      # the following takes some time
+      self._analyze_structure_dependencies()
+      self.search_trees = self._compute_search_trees()
+    self._struct_order = dict( (v.value, i) for i, v in enumerate( vs))
+
+  @staticmethod
+  def _get_data_hash():
+    """checksum of the source data and of the fingerprint settings,
+    the compiled data is used only when it was made from the same ones"""
+    from . import subsearch_data
+    text = repr( (subsearch_data.structures, fingerprint.SIZE, fingerprint.MAX_PATH, fingerprint.MAX_COUNT))
+    return zlib.crc32( text.encode( 'utf-8')) & 0xffffffff
+
+  def _get_compiled_data( self):
+    try:
+      from . import subsearch_compiled
+    except ImportError:
+      return None
+    if subsearch_compiled.data_hash != self._get_data_hash():
+      return None
+    return subsearch_compiled
 
   def _read_structure_file( self, name=""):
     """may be used to read data directly from source txt files.
@@ -78,6 +121,8 @@ class substructure_search_manager( object):
           v.value = sub
           self.structures.add_vertex(v)
     self._analyze_structure_dependencies()
+    self.search_trees = self._compute_search_trees()
+    self._struct_order = dict( (v.value, i) for i, v in enumerate( self.structures.vertices))
 
   def _read_ring_file( self, name=""):
     """may be used to read data directly from source txt files.
@@ -94,19 +139,27 @@ class substructure_search_manager( object):
           self.rings[ring_hash] = rng
 
   def _analyze_structure_dependencies( self):
+    self._tree_links = set()
     for v1 in self.structures.vertices:
       for v2 in self.structures.vertices:
         if v1 is not v2:
           sub1 = v1.value
           sub2 = v2.value
-          if sub1.structure.contains_substructure( sub2.structure):
+          if fingerprint.may_contain( sub1.fingerprint, sub2.fingerprint) and \
+             sub1.structure.contains_substructure( sub2.structure):
             self.structures.add_edge( v2, v1)
+            # sub2 may be a parent of sub1 in the search trees only when every
+            # molecule matching sub1 matches sub2 as well, which is not the case
+            # when sub2 matches the implicit hydrogens (any atom) of sub1
+            for m in substructure_matcher( sub2.structure, sub1.structure, implicit_freesites=True, implicit_hydrogens=False).get_matches():
+              self._tree_links.add( (v2, v1))
+              break
 
   def _find_head_structures( self):
     for v1 in self.structures.vertices:
       v1.properties_['in_links'] = []
       for v2 in self.structures.vertices:
-        if v1 in v2.neighbors:
+        if (v2, v1) in self._tree_links:
           v1.properties_['in_links'].append( v2.value)
     heads = []
     for v in self.structures.vertices:
@@ -116,19 +169,31 @@ class substructure_search_manager( object):
     return heads
 
   def _compute_search_trees( self):
+    """the children of a substructure in the search trees contain it, the search
+    in a molecule descends into them only when the substructure matched"""
     heads = self._find_head_structures()
     assert heads
-    for head in heads:
+    reached = set( heads)
+    i = 0
+    while i < len( heads):
+      head = heads[i]
+      i += 1
       d = self.structures.mark_vertices_with_distance_from( head)
       dv = [(v.properties_['d'],v) for v in self.structures.vertices if 'd' in v.properties_]
-      dv.sort( reverse=True)
+      dv.sort( key=lambda x: x[0], reverse=True)
       for d,v in dv:
         for d,parent in dv:
           if parent.value in v.properties_['in_links']:
             if v.value not in parent.value.children:
               # this ensures only one copy of a substructure in a tree
               parent.value.children.append( v.value)
+            reached.add( v)
             break
+      if i == len( heads):
+        # structures not attached to any tree (they contain each other)
+        # would never be searched, they start trees of their own
+        heads += [v for v in self.structures.vertices if v not in reached][:1]
+        reached.update( heads)
     return [h.value for h in heads]
 
   def which_substructure_is_more_specific( self, s1, s2):
@@ -162,13 +227,47 @@ class substructure_search_manager( object):
     if p2:
       return 1
 
+  def find_matches_in_mol( self, mol):
+    """returns matches of all the substructures in mol; the search descends
+    the search trees - the children of a substructure are tried only when
+    it matched and the substructures whose fingerprint is not contained
+    in the one of mol are skipped"""
+    fp = fingerprint.get_fingerprint( mol)
+    self.screened += len( self.structures.vertices)
+    found = []
+    tried = set()
+    to_try = list( self.search_trees)
+    while to_try:
+      struct = to_try.pop()
+      if struct in tried:
+        continue
+      tried.add( struct)
+      if not fingerprint.may_contain( fp, struct.fingerprint):
+        continue
+      self.screen_passed += 1
+      ms = struct.find_matches( mol)
+      if ms:
+        self.matched += 1
+        found.append( (self._struct_order[ struct], ms))
+        to_try += struct.children
+    found.sort( key=lambda x: x[0])
+    hits = []
+    for i, ms in found:
+      hits += ms
+    return hits
+
+  def get_screening_report( self):
+    """how many matcher calls were saved by the search trees and the fingerprint screening"""
+    if not self.screened:
+      return "No substructures screened"
+    return "Screened %d substructures: %d passed to the matcher (%.1f%%), %d of them matched (%.1f%% of passed); %d matcher calls saved (%.1f%%)" % \
+           (self.screened, self.screen_passed, 100.0*self.screen_passed/self.screened,
+            self.matched, 100.0*self.matched/max( 1, self.screen_passed),
+            self.screened-self.screen_passed, 100.0*(self.screened-self.screen_passed)/self.screened)
+
   def find_substructures_in_mol( self, mol):
     # get the hits
-    hits2 = []
-    for v in self.structures.vertices:
-      struct = v.value
-      ms = struct.find_matches( mol)
-      hits2 += ms
+    hits2 = self.find_matches_in_mol( mol)
     # weed out the hits that match inside a ring
     ring_hits = self.find_rings_in_mol( mol)
     hits = []
@@ -209,7 +308,7 @@ class substructure_search_manager( object):
       # this is necessary to correctly process fused aromatic rings
       # with improperly localized bonds
       mol.mark_aromatic_bonds()
-    for ering in mol.get_smallest_independent_cycles_e():
+    for ering in mol.get_ring_info().get_sssr_e():
       vring = mol.edge_subgraph_to_vertex_subgraph( ering)
       ring_mol = mol.get_new_induced_subgraph( vring, ering)
       # here we need to take care of aromatic bonds
@@ -264,7 +363,7 @@ class substructure_search_manager( object):
               print("Invalid line in src file:", line[:-1], file=sys.stderr)
             elif len(parts) == 3:
               parts.append("")
-            to_ignore = map(int, filter(None, parts[3].split(",")))
+            to_ignore = list( map(int, filter(None, parts[3].split(","))))
             parts[3] = to_ignore
             if not parts[1]:
               parts[1] = parts[0]
@@ -280,6 +379,34 @@ class substructure_search_manager( object):
             print(tuple(parts), ",", file=out)
         print("]", file=out)
 
+  @classmethod
+  def _compiled_data_to_python_module( self):
+    """writes subsearch_compiled.py with the parsed structures of subsearch_data
+    (atoms as (symbol, charge, explicit_hydrogens, valency), bonds as
+    (atom index, atom index, order)), their fingerprints, the dependency
+    graph and the search trees"""
+    ssm = self( use_compiled=False)
+    vs = ssm.structures.vertices
+    index = dict( (v, i) for i, v in enumerate( vs))
+    sub_index = dict( (v.value, i) for i, v in enumerate( vs))
+    with open("subsearch_compiled.py", 'w') as out:
+      with open( "subsearch_data.py", 'r') as f:
+        # the license header
+        for line in f:
+          if line.startswith( "##"):
+            break
+          out.write( line)
+      print("## automatically generated file - may be overwritten at any time", file=out)
+      print("## made from subsearch_data by subsearch._compiled_data_to_python_module", file=out)
+      print("data_hash = %d" % self._get_data_hash(), file=out)
+      print("structures = [", file=out)
+      for v in vs:
+        print(repr( v.value.get_arrays()), ",", file=out)
+      print("]", file=out)
+      print("dependencies = %r" % sorted( tuple( index[ v] for v in e.get_vertices()) for e in ssm.structures.edges), file=out)
+      print("children = %r" % [[sub_index[ch] for ch in v.value.children] for v in vs], file=out)
+      print("heads = %r" % [sub_index[h] for h in ssm.search_trees], file=out)
+
 
 class substructure( object):
 
@@ -297,19 +424,43 @@ class substructure( object):
   def read_smiles( self, smiles_string, atoms_to_ignore=None):
     self.smiles_string = smiles_string.strip()
     self.structure = smiles.text_to_mol( smiles_string, calc_coords=False)
+    self.fingerprint = fingerprint.get_fingerprint( self.structure)
     if atoms_to_ignore:
       self.atoms_to_ignore = [self.structure.vertices[x-1] for x in atoms_to_ignore]
     else:
       self.atoms_to_ignore = []
 
+  def read_arrays( self, smiles_string, atoms, bonds, fp, atoms_to_ignore=None):
+    """sets the structure from data made by get_arrays, this is much
+    faster than parsing the smiles_string"""
+    from .molecule import molecule
+    self.smiles_string = smiles_string.strip()
+    symbols, charges, hydrogens, valencies = zip( *atoms) if atoms else 4*[()]
+    bonds = bonds or []
+    self.structure = molecule.from_arrays( symbols, [b[:2] for b in bonds], orders=[b[2] for b in bonds], charges=charges)
+    for a, hs, valency in zip( self.structure.vertices, hydrogens, valencies):
+      a.explicit_hydrogens = hs
+      a.valency = valency
+    self.fingerprint = fp
+    if atoms_to_ignore:
+      self.atoms_to_ignore = [self.structure.vertices[x-1] for x in atoms_to_ignore]
+    else:
+      self.atoms_to_ignore = []
+
+  def get_arrays( self):
+    """returns the structure and fingerprint in the form accepted by read_arrays"""
+    vs = self.structure.vertices
+    index = dict( (v, i) for i, v in enumerate( vs))
+    atoms = tuple( (v.symbol, v.charge, v.explicit_hydrogens, v.valency) for v in vs)
+    bonds = tuple( sorted( tuple( sorted( index[ v] for v in e.get_vertices())) + (e.order,) for e in self.structure.edges))
+    return atoms, bonds, self.fingerprint
+
   def find_matches( self, mol):
     ret = []
-    ms = list( mol.select_matching_substructures( self.structure, implicit_freesites=True, auto_cleanup=False))
-    for atoms in ms:
-      num = min( atoms[0].properties_['subsearch'].keys())
-      atoms_in_fragment = [a.properties_['subsearch'][num] for a in atoms]
+    for mapping in mol.get_substructure_mappings( self.structure, implicit_freesites=True, unique=True):
+      atoms_in_fragment = [a for a in self.structure.vertices if a in mapping]
+      atoms = [mapping[a] for a in atoms_in_fragment]
       ret.append( substructure_match( atoms, atoms_in_fragment, self))
-    mol.clean_after_search( self.structure)
     return ret
 
 
@@ -322,11 +473,23 @@ class ring( object):
     if ring_hash:
       self.ring_hash = ring_hash
     else:
-      self.ring_hash = None # read smiles and generate hash here?
+      self.ring_hash = self.get_smiles_hash( self.smiles_string)
 
   def __str__( self):
     return "<Ring: %s: %s>" % (self.name, self.smiles_string)
 
+  @staticmethod
+  def get_smiles_hash( smiles_string):
+    """structure hash of a ring given as smiles, aromatic bonds are treated
+    the same way as in substructure_search_manager.find_rings_in_mol"""
+    mol = smiles.text_to_mol( smiles_string, calc_coords=False)
+    mol.mark_aromatic_bonds()
+    for e in mol.edges:
+      if e.aromatic:
+        e.order = 4
+    mol.localize_aromatic_bonds()
+    return mol.get_structure_hash()
+
 
 class substructure_match( object):
 
@@ -367,8 +530,9 @@ class ring_match( object):
 
 
 if __name__ == "__main__":
-  # update the subsearch_data.py module
+  # update the subsearch_data.py and subsearch_compiled.py modules
   substructure_search_manager._data_files_to_python_module()
+  substructure_search_manager._compiled_data_to_python_module()
   import time
   t = time.time()
   ssm = substructure_search_manager()
@@ -0,0 +1,60 @@
+#--------------------------------------------------------------------------
+#     This file is part of OASA - a free chemical python library
+#     Copyright (C) 2003-2008 Beda Kosata <beda@zirael.org>
+
+#     This program is free software; you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation; either version 2 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     Complete text of GNU GPL can be found in the file gpl.txt in the
+#     main directory of the program
+
+#--------------------------------------------------------------------------
+
+
+## automatically generated file - may be overwritten at any time
+## made from subsearch_data by subsearch._compiled_data_to_python_module
+data_hash = 3465708444
+structures = [
+((('H', 0, 0, 1), ('C', 0, 0, 4), ('O', 0, 0, 2)), ((0, 1, 1), (1, 2, 2)), 60383398797144661635864873295859936357306176419842087339093049069093386838488385709776635344536042657049293646795328307591447429000245173083998358569158879089845398929408) ,
+((('C', 0, 0, 4), ('C', 0, 0, 4), ('O', 0, 0, 2), ('C', 0, 0, 4)), ((0, 1, 1), (1, 2, 2), (1, 3, 1)), 894965747452342537638086997927338702835054349130332891545045303197220750167278315362938930451681272597040780523030098558501321740745882114937976157185735873500808940579859711518912505151356301468196368053205174141385680970194649232194697807519547392) ,
+((('H', 0, 0, 1), ('O', 0, 0, 2), ('C', 0, 0, 4), ('O', 0, 0, 2)), ((0, 1, 1), (1, 2, 1), (2, 3, 2)), 60383398797144661635864873295859936357306176419842087339093049069093386838488385709776637241673632721237839466582346689934129696975673934941534882242690170285628535603200) ,
+((('O', -1, 0, 2), ('C', 0, 0, 4), ('O', 0, 0, 2)), ((0, 1, 1), (1, 2, 2)), 60383398797144661635864873295859936357306176419842087339093049069093386838488385709776637241673632721237839466582346689934129696975673934941534882242690170285628535603200) ,
+((('C', 0, 0, 4), ('O', 0, 0, 2), ('C', 0, 0, 4), ('O', 0, 0, 2)), ((0, 1, 1), (1, 2, 1), (2, 3, 2)), 531137992816827482088385351214104492202888977663389229375863980287742652909921336126000990667235350116806891809115304362088186972754388518433985657790733611299538965794068286039654400) ,
+((('O', 0, 0, 2), ('C', 0, 0, 4), ('O', 0, 0, 2), ('C', 0, 0, 4), ('O', 0, 0, 2)), ((0, 1, 2), (1, 2, 1), (2, 3, 1), (3, 4, 2)), 531137992816827482088385351214104492202888977663389229375864641343711443158520288041309023438275178521489856090334589010883461378545624829779810847001173326584386557006093309397958656) ,
+((('O', 0, 0, 2), ('C', 0, 0, 4), ('Cl', 0, 0, 1)), ((0, 1, 2), (1, 2, 1)), 10715086071862673209484250490600018105614048117055336074437503883703510511249361224931983788156958581275946729175531468251871452856983523834781722236334439677230427711181537161840916692401464190947047568991534860693358576611934810216214837596086267310680624457770711525426753395266189253492636737601536) ,
+((('O', 0, 0, 2), ('C', 0, 0, 4), ('F', 0, 0, 1)), ((0, 1, 2), (1, 2, 1)), 894965747452342537638086997927338702835054349130332891545045303197220750167278322910863780094763977080149942499567880392343762573626738867350576648434056385824441271013145269556029671651614956167858362019201826749960025336770453716962028169335930880) ,
+((('O', 0, 0, 2), ('C', 0, 0, 4), ('Br', 0, 0, 1)), ((0, 1, 2), (1, 2, 1)), 60383398797144661635864873295859936357308949089536208153952627483277809890284594372378330841396284192164673679478357929557105171415117606314806392740276096545816242552832) ,
+((('O', 0, 0, 2), ('C', 0, 0, 4), ('I', 0, 0, 1)), ((0, 1, 2), (1, 2, 1)), 60383398797144661635864876417608486673298407801439317132259354817691669487505922681696754810050317004582296369945008536679349838145986531482570014076220863221460180664384) ,
+((('C', 0, 0, 4), ('N', 0, 0, 3)), ((0, 1, 3),), 36499524940977561749129372845602330599145828057988479492267642778631094516709909091046342203249112947113227393148222586955294831751483300627953520850208183247475000166424217267241746699361714176) ,
+((('C', 0, 0, 4), ('O', 0, 0, 2), ('N', 0, 0, 3)), ((0, 1, 2), (0, 2, 1)), 36499524940977561749129433229001127743807464127448688298078764325194977231481705198636499461617359029320558759232462069834461143787258144320005083941567819850313350644324174542351998826745692160) ,
+((('C', 0, 0, 4), ('Cl', 0, 0, 1)), ((0, 1, 1),), 47634102635436893179040485073748265163400240214004076398607741693502376385799649516981345217557760116514317298313465281458111217918560698368) ,
+((('C', 0, 0, 4), ('Br', 0, 0, 1)), ((0, 1, 1),), 47634102635436893179040485073748265163680208306776301924927421978573431920565057678329253042194977041358426268698903197207937536474759561216) ,
+((('C', 0, 0, 4), ('F', 0, 0, 1)), ((0, 1, 1),), 894965747452342537638086997927338702835054349130332891545045303197220750167278254979540133307019636732167484710727843887761795077699028095637172227199133327145103720732092071698213925220864402417117670607812599245334292203803618744814503358036443136) ,
+((('C', 0, 0, 4), ('I', 0, 0, 1)), ((0, 1, 1),), 47634102635436893179040485073748265163540224260390189161767581836037904153182249146682422295508458351400369607937020296138428495662365540416) ,
+((('C', 0, 0, 4), ('O', 0, 1, 2)), ((0, 1, 1),), 47634102635436893179040485073748265163400240214004076398607741693502376385799646303106789195118074921448490965550711746692201194448480108544) ,
+((('C', 0, 0, 4), ('O', -1, 0, 2)), ((0, 1, 1),), 47634102635436893179040485073748265163400240214004076398607741693502376385799646303106789195118074921448490965550711746692201194448480108544) ,
+((('C', 0, 0, 4), ('O', 0, 0, 2), ('C', 0, 0, 4)), ((0, 1, 1), (1, 2, 1)), 531137992816767098689588206552468627329593165361134558636337317240888633609117406139402716269305684276631022988622886814992882444441902357484441427257634032293992569718283456516980736) ,
+((('C', 0, 0, 4), ('S', 0, 1, 2)), ((0, 1, 1),), 19595533242629369747791401605606558418088927130487463844933662250099384100703094161498132308983794002135250572904572083175652991517284684139817188618427809320458537123276123670761254197505236715926716416) ,
+((('C', 0, 0, 4), ('S', -1, 0, 2)), ((0, 1, 1),), 19595533242629369747791401605606558418088927130487463844933662250099384100703094161498132308983794002135250572904572083175652991517284684139817188618427809320458537123276123670761254197505236715926716416) ,
+((('C', 0, 0, 4), ('S', 0, 0, 2), ('C', 0, 0, 4)), ((0, 1, 1), (1, 2, 1)), 19595533242629369747791401605606558418088927130487463844933662250099384100703094161498132308983794002135250572904572083175652991517284684139817188618427809320458537123276204800399706583118795462093570048) ,
+((('C', 0, 0, 4), ('N', 0, 2, 3)), ((0, 1, 1),), 36499524940977561749129372845602330599145828057988479492267642778631094516709904165795567653939211412233214875196496952002020800088876881727944370140930094222768444558147308317759495481203884032) ,
+((('C', 0, 0, 4), ('N', 0, 1, 3), ('C', 0, 0, 4)), ((0, 1, 1), (1, 2, 1)), 36499524940977561749129372845602330599145828057988479492267642778631094516709904165795567653939211412233214875196496952002020800088876881727944370140930094222768545970195326576111615217460314112) ,
+((('C', 0, 0, 4), ('N', 0, 0, 3), ('C', 0, 0, 4), ('C', 0, 0, 4)), ((0, 1, 1), (1, 2, 1), (1, 3, 1)), 36499524940977561749129372845602330599145828057988479492267642778631094516709904165795567653939211412233214875196496959239026377421139095701130933183924335052142587572730579042210615712030916608) ,
+((('C', 0, 0, 4), ('N', 1, 0, 3), ('C', 0, 0, 4), ('C', 0, 0, 4), ('C', 0, 0, 4)), ((0, 1, 1), (1, 2, 1), (1, 3, 1), (1, 4, 1)), 36499524940977561749129372845602330599145828057988479492267642778631094516709904165795572240936443392376238096838287563412907970551117432263378408361603108897894764542346719079316835963404025856) ,
+((('C', 0, 0, 4), ('B', 0, 2, 3)), ((0, 1, 1),), 5357543035931336604742125245300009052807024058527668037218751941851755255624680612465991894078479290637973364623409801451109126574095723387525814763077635114846705979164692475691803586834051401281584329733701302338832621919099193270724077255087246075334092008205659562164911569502934239593390351056896) ,
+((('C', 0, 0, 4), ('B', 0, 1, 3), ('C', 0, 0, 4)), ((0, 1, 1), (1, 2, 1)), 5357543035931336604742125245300009052807024058527668037218751941851755255624680612465991894078479290637973364623409801451109126574095723387525814763077635114846705979164692475691803586834051401281584329733701302338832622393383590786771213710034000670919762575199516752709791513535805017701358361378816) ,
+((('C', 0, 0, 4), ('B', 0, 0, 3), ('C', 0, 0, 4), ('C', 0, 0, 4)), ((0, 1, 1), (1, 2, 1), (1, 3, 1)), 5357543035931336604742125245300009052807024058527668037218751941851755255624680612465991894078479290637973364623409801451109126574095723387525814763077635114846705979164692475691803586834051401281584329733701302338832622393390827792348545972247973857482805569440346126751394048788271116701852931981312) ,
+((('C', 0, 0, 4), ('N', 0, 0, 5), ('O', 0, 0, 2), ('O', 0, 0, 2)), ((0, 1, 1), (1, 2, 2), (1, 3, 2)), 36499524940977561749129372845602334113922230044860653563000851908304421758660777839169111535195889431845269515096687444856308848573882977058924286288030771825478714827119918077250793244427550720) ,
+((('C', 0, 0, 4), ('S', 0, 0, 6), ('O', 0, 0, 2), ('O', 0, 0, 2), ('O', 0, 0, 2)), ((0, 1, 1), (1, 2, 2), (1, 3, 2), (1, 4, 1)), 436998327880430569633234206882603711622577473385989757783179097872075432042801210269041115002586945818098252722772472108017646884563045414582678417802981013160189920353304555095897646917682065994622680351864710865750024012769418047779261210689536) ,
+((('C', 0, 0, 4), ('S', 0, 0, 6), ('O', 0, 0, 2), ('O', 0, 0, 2), ('O', -1, 0, 2)), ((0, 1, 1), (1, 2, 2), (1, 3, 2), (1, 4, 1)), 436998327880430569633234206882603711622577473385989757783179097872075432042801210269041115002586945818098252722772472108017646884563045414582678417802981013160189920353304555095897646917682065994622680351864710865750024012769418047779261210689536) ,
+]
+dependencies = [(0, 2), (0, 3), (0, 4), (0, 5), (0, 6), (0, 7), (0, 8), (0, 9), (0, 11), (4, 5), (12, 6), (13, 8), (14, 7), (15, 9), (16, 2), (17, 3), (18, 4), (18, 5), (22, 11), (30, 31)]
+children = [[], [], [], [], [5], [], [], [], [], [], [], [], [6], [8], [7], [9], [2], [3], [4], [], [], [], [], [], [], [], [], [], [], [], [31], []]
+heads = [0, 1, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30]
@@ -54,273 +54,273 @@ structures = [
 ('sulfate anion', 'sulfate', 'C-S(=O)(=O)[O-]', [1]) ,
 ]
 rings = [
-('benzene', 'C1=CC=CC=C1', '350796d8048c08e039528ff682c2886fb617caaf') ,
-('pyridine', 'C1=CC=NC=C1', 'cf57c9c221dcef058588e5718cc0f4d6cff5d9cc') ,
-('thiolane', 'C1CCSC1', '17e910702bcda3fb1ee721f24bddd3f04c5ff9b8') ,
-('piperazine', 'C1CNCCN1', '84846557d99c1bc92e8e2f839f438c1124608c0e') ,
-('cyclopropane', 'C1CC1', '0d4d50316ada08de65c5ad9bdbe6b4f69c44344f') ,
-('oxirane', 'C1CO1', '6f929e37b37d323fc6dc236bd574f23014f9cc58') ,
-('1H-pyrrole', 'C1=CNC=C1', '29e0fc670f81762d5654a0293a6699dfaa01b50b') ,
-('oxolane', 'C1CCOC1', '18ee72a2a84912feffeb31dc1405e7d018c95f0e') ,
-('furan', 'C1=COC=C1', '3d7f9eb442fc790ee6dfd16d715041f710a2e90a') ,
-('thiophene', 'C1=CSC=C1', '348f4f456ec4f9ea7c148b9b588bcd58fb4d905c') ,
-('cyclohexane', 'C1CCCCC1', '431733eb3addf4944ce5bedb02524754ea459a70') ,
-('cyclohexene', 'C1CCC=CC1', '0023eb1833d1884c2e8123996cc38b69bae3becc') ,
-('piperidine', 'C1CCNCC1', '8fb354481a85c3017b0ffe644c7cdf0be99aa530') ,
-('morpholine', 'C1COCCN1', '0da779e5e31bfbfb025f6e4c176d3291a3c1d68a') ,
-('azepane', 'C1CCCNCC1', 'ff46e572cbe148da06eb262e89f15b682b2f5227') ,
-('cyclopentene', 'C1CC=CC1', '40517ae1a62ef40c8dbe7546312298dabf35850c') ,
-('oxane', 'C1CCOCC1', '36ad6ab83ec9c6d43251967854bd0dc84325a778') ,
-('aziridine', 'C1CN1', '54f2a460a8357bb5e5ecbc2f2d51dae167a256dc') ,
-('cyclobutane', 'C1CCC1', 'e97ad0643bc6ba7b72d701695d05185a55199291') ,
-('thietane', 'C1CSC1', 'b2d1abc89d0d540ff4dfaf7e35f74f0e65395e36') ,
-('cyclopentane', 'C1CCCC1', '4ca53e63f47ae1c479fedcee520bbecfe7017b82') ,
-('pyridazine', 'C1=CC=NN=C1', '2855bb8bb1cc163a8e4b6add5642c1d9f37073c6') ,
-('pyrimidine', 'C1=CN=CN=C1', '959bceeb09fbb4f48e46f3582d39b6beccdd27fd') ,
-('pyrazine', 'C1=CN=CC=N1', '0a2d9f7e5b882c36eb7d875b01be66ad7fdc98ca') ,
-('cycloheptane', 'C1CCCCCC1', 'c77a5b0844a6a6f884bd0137d9d4ca3f75bc56b5') ,
-('cyclooctane', 'C1CCCCCCC1', '14f4b482684afd368b6fab21d5010fc18e7e36ff') ,
-('cyclodecane', 'C1CCCCCCCCC1', 'f0ac50914527659ad2613cdcd95da846ac328247') ,
-('cyclododecane', 'C1CCCCCCCCCCC1', '51261d03082ed6a57cfbe27c54f87cb01bc0c6a5') ,
-('thiirane', 'C1CS1', '9af082c9d2cd9b93716df861f2ac1ba1a439226d') ,
-('azetidine', 'C1CNC1', 'f7f6de01b36bed0ef503e453965da50ff54eec92') ,
-('oxetane', 'C1COC1', '7a5f0c189b422f154f6dd74cd2ba0338bb327339') ,
-('oxepane', 'C1CCCOCC1', '0385e44b970128e523484e2bbb247337bcf2e12e') ,
-('cycloheptene', 'C1CCC=CCC1', '4e1d399678ea912ed47b635df708b27895850507') ,
-('cyclooctatetraene', 'C1=CC=CC=CC=C1', '16731e44f910160a6670509592f883e3ead4e357') ,
-('cyclooctene', 'C1CCCC=CCC1', '99bca2a4525fd8bd4b407bb0b29c5e40c3a93913') ,
-('cyclodecene', 'C1CCCCC=CCCC1', '46797f868adb9aa5b634083701a7230ddff5bd35') ,
-('azocane', 'C1CCCNCCC1', '04a249f214d4d31b9488cf2674682dfdc04e08ef') ,
-('cyclododecene', 'C1CCCCCC=CCCCC1', '99049ae96447c87becf0a83b7291e69bcf3f8505') ,
-('thiane', 'C1CCSCC1', '0fcce6b3d6f5e5d3bbae896d926ff67ebd44c27c') ,
-('azecane', 'C1CCCCNCCCC1', '27a623104ec68af70355c2ce66ac6493b6c2e128') ,
-('pyrrolidine', 'C1CCNC1', '997bd7dc868ea899cb064de29b6f096a459445c0') ,
-('thiomorpholine', 'C1CSCCN1', '68e58d8fd06ba90a84701b7ed187f4a5cc710561') ,
-('thiadiazole', 'C1=CSN=N1', 'b6fbe37f0950f8bd1637330cbcc08d1397071a02') ,
-('cyclotetradecane', 'C1CCCCCCCCCCCCC1', '51ee0d72c6e802ea649701ad4641d65ee711ee81') ,
-('cyclopentadecane', 'C1CCCCCCCCCCCCCC1', '86f3d9da03d0ddb76560a105c2e943174e1755e8') ,
-('cyclohexadecane', 'C1CCCCCCCCCCCCCCC1', 'ab6827c71f1e330cb56a6da147d157ea8b5585c8') ,
-('cyclobutene', 'C1CC=C1', '801c06baea3fd40bd10a95845bb9fbec44392883') ,
-('phospholane', 'C1CCPC1', '5d1c6067c37a19a88b7b766e149fec4de7aac54f') ,
-('thiepane', 'C1CCCSCC1', '2fd7591c33b05c6e097e199de637eb17801be2a4') ,
-('pyrazolidine', 'C1CNNC1', '577a673e5d3d568ab3b3379d69c9a7a7da324406') ,
-('dithiolane', 'C1CSSC1', 'ded6dbb77dda101cdbd2e1683b8e70737ca60cc1') ,
-('azonane', 'C1CCCCNCCC1', '451d9f0d0037cc6b4c3b4ad2cd76672b8b139d70') ,
-('hexathiepane', 'C1SSSSSS1', '45f5a5aa67df5e1c370156076681804dc2afb87d') ,
-('azaboretidine', 'B1CCN1', '774654a93af38313389d3c20a5a64a0d67efaaba') ,
-('dioxetane', 'C1COO1', '982ef947b7bc7c43514a14c4172714a8d2bebadf') ,
-('phosphinine', 'C1=CC=PC=C1', '135c35e52dfae56eacbedf706d88fb85c43d23b0') ,
-('triazine', 'C1=CN=NN=C1', 'a1af4d8c97e8b076a7143a73891842a25b94040c') ,
-('cyclopropene', 'C1C=C1', 'd1f3db031419f8c22f6f7c500992f01e722ecb75') ,
-('trithiane', 'C1CSSSC1', '134d7d93d8858632f4014889a086c4d9df504954') ,
-('cyclononane', 'C1CCCCCCCC1', '66e6c25e69eda88d7bd27929b78e10c6e3de3d96') ,
-('cycloundecane', 'C1CCCCCCCCCC1', '2e90d677a596d98387272806222e2a412680e68f') ,
-('cyclotridecane', 'C1CCCCCCCCCCCC1', 'cd63ad2dcee7fa54c252d36b070a484e0ad6e59e') ,
-('cycloheptadecane', 'C1CCCCCCCCCCCCCCCC1', 'cf535eecb259e341659e4f4e1cd56b721cc1e193') ,
-('cyclooctadecane', 'C1CCCCCCCCCCCCCCCCC1', 'c21f462611d018f7c3421ff246e188c7abe68f91') ,
-('diazinane', 'C1CCNNC1', '3a4dafe6d15aeb9ba8d32a0ff7928b333eccdbcb') ,
-('dithiane', 'C1CCSSC1', '87c14e137db7023dffdfc04ababe2350a236a19c') ,
-('dioxepane', 'C1CCOOCC1', 'b8985532e75bdbfeb1f89c38c003151de4cbaa2c') ,
-('cycloundecyne', 'C1CCCCC#CCCCC1', 'f3706b74c5045ef990a2387782bc2b81edc5d8c7') ,
-('cyclobutadiene', 'C1=CC=C1', 'a600e8a75d931a6d7eb2bcd8999c418ab08b346c') ,
-('cyclododecyne', 'C1CCCCCC#CCCCC1', '443f57fe0cb9b6fb1fc1dc95ed9244e5eee344e5') ,
-('cyclooctyne', 'C1CCCC#CCC1', 'bf0ef0e62fe7392f42e36f1e31c8a67e681f0046') ,
-('cyclodecyne', 'C1CCCCC#CCCC1', '650a888751e6b496022ee42405f3297177d0a7d9') ,
-('dioxolane', 'C1COOC1', 'b26104001ab13f31d096ad8dff1c9e665bb07dcc') ,
-('phosphinane', 'C1CCPCC1', '0a8cc7bf4ffe603977712d57bac305cc680b7a4e') ,
-('oxathiolane', 'C1COSC1', '4d20d194fa55b745d4f01401019fffea9a911c63') ,
-('dioxane', 'C1CCOOC1', 'd96577e0fbbd49e3f112bf3be4914ce0ae29ba75') ,
-('dioxocane', 'C1CCCOOCC1', 'cd5cfcfa6681b5bc07a5ddb0ff99269a2e0b43b4') ,
-('cyclononyne', 'C1CCCC#CCCC1', '044a001e9c37cf41ccba1e0a306bf9845219e503') ,
-('dithiete', 'C1=CSS1', '0f93f7d4f0f4229fd95bda655265968dcdb4512e') ,
-('oxazinane', 'C1CCONC1', 'aa65ea759150de6e715fa071f3e1b34e5f50416e') ,
-('oxirene', 'C1=CO1', '2c836bcf1d872fe7a2206089ac63599d755e5b93') ,
-('oxonane', 'C1CCCCOCCC1', 'f90e9088e9da9c3035fd8160a4fb5b80f3394679') ,
-('thiocane', 'C1CCCSCCC1', '3824ce63ab7add7310957fb862efdd1f224cd0ff') ,
-('imidazolidine', 'C1CNCN1', '6b8b5e6ba3ef5ec0b47769c32cf6c71fa8a17997') ,
-('dioxirane', 'C1OO1', '14d8dc16520e67e60161e5980bd7b66182fe382e') ,
-('cycloicosane', 'C1CCCCCCCCCCCCCCCCCCC1', 'f83f352fb286c8f8196441716e464732fae15baf') ,
-('cyclotetracosane', 'C1CCCCCCCCCCCCCCCCCCCCCCC1', '813de51ca763c71756ebefaafa049883b8e846e3') ,
-('dithiepane', 'C1CCSSCC1', '2860adab37f68c6ac4d76fb3700580e8f14b543d') ,
-('oxadithiole', 'C1=CSSO1', 'b55537faa488df8529f2a4ded6c560c410968ab7') ,
-('tetrathiepane', 'C1CSSSSC1', 'be64ca38faea662875fd211a4312c2dbb3a327a6') ,
-('dithiocane', 'C1CCCSSCC1', '8e9ad5c8fe1b3e5845857f49f3277b89ce2e0461') ,
-('trithiolane', 'C1CSSS1', '8d153a99f1e39e4b2f084d19e00f2d26b78e1f80') ,
-('tetrathiine', 'C1=CSSSS1', 'd4791f2954ab58a34b49450147067cc73885aa1b') ,
-('tetrathiane', 'C1CSSSS1', '385385a3f4441c84f1d1997abdd315c84402fbd5') ,
-('oxathietane', 'C1CSO1', 'b2fe37b651ac8133b4c6d6725355e0b430f450cf') ,
-('diaziridine', 'C1NN1', '4f538486d12df7d88605346dcc5ec5c19bcfa186') ,
-('tetrazolidine', 'C1NNNN1', '9f78cf3fbb3524148a620de2233f497e6829c426') ,
-('oxazirene', 'C1=NO1', '8cf80d062b1b24c165c8dab8f8db344390d407f1') ,
-('thiirene', 'C1=CS1', '6c69bc937c11775b5e14dadf47ae2d9357f67d71') ,
-('cyclobutatetraene', 'C=1=C=C=C1', '961cd73ed9bb150af834c1f0f53778352af9842e') ,
-('pentazine', 'C1=NN=NN=N1', '355086e0fe424b0ee6e6e1f7b58cbd579b3517e5') ,
-('oxepine', 'C1=CC=COC=C1', 'cdcf5031b069c89472ea145e4d4dc190f8e17c1b') ,
-('oxadiazole', 'C1=CON=N1', '5aae07d09ecdc69362b3d1050127bac612c72e3c') ,
-('cycloheptyne', 'C1CCC#CCC1', '2827288cd65a0e1ba0aad43d0d7bfa65c9c8c84a') ,
-('borinine', 'B1=CC=CC=C1', 'e1e1b60e3d204e73088193fa93553910130206a4') ,
-('cyclohexyne', 'C1CCC#CC1', 'dcb5ebafcb32befb46b2aba7393871813b6658fd') ,
-('cyclotridecyne', 'C1CCCCCC#CCCCCC1', '1f737da455b3305283e49d1eca61320eabf7fecf') ,
-('thionane', 'C1CCCCSCCC1', '297a2a259a078df7e5111712d81b8d8ad698aac2') ,
-('dioxazine', 'C1=COON=C1', '91dc380b4410faa1174dac90b2cde032889ef1a5') ,
-('dithiine', 'C1=CSSC=C1', 'dcec36bd6e9dcdb8066d7616038860cd7d0cb5eb') ,
-('cyclohexacosane', 'C1CCCCCCCCCCCCCCCCCCCCCCCCC1', 'cd8fc040b9b526588dd9f0920b0822d8c3c9871a') ,
-('dithietane', 'C1CSS1', '7eeca53bbdd3bfddbedabbb8faf8a2ec0b328348') ,
-('tetrazine', 'C1=CN=NN=N1', '7cf758d32dd71d641703429489ee22e64fbeea13') ,
-('thiazepine', 'C1=CC=NSC=C1', '16fed730a19c040eda525e52b0002964cf558698') ,
-('thiepine', 'C1=CC=CSC=C1', '4019c280163f87d00cbed500f891fed25bd203a5') ,
-('oxathiane', 'C1CCSOC1', '9a9c05cbc93c34a351b8a9bb1b7b5b1fc6914f91') ,
-('diazocane', 'C1CCCNNCC1', '1f71308fa16c925352a8321c12c6005d8dfaa34f') ,
-('trithiepane', 'C1CCSSSC1', '3a0550857269121171d4cfa02b4a60e391008f8e') ,
-('oxocane', 'C1CCCOCCC1', 'f810d3c6d7033ca9d544f22caacc458ec3586d13') ,
-('trithionane', 'C1CCCSSSCC1', '343040278bd1da3b558df9dc94d865b0cace1984') ,
-('diazepane', 'C1CCNNCC1', '2df73e7034e5449cc5ef63b21d5d8d5ca7999d84') ,
-('dithionane', 'C1CCCSSCCC1', '3a1ec9f7282eab0b935d2af57fdd3ffe032f0e3f') ,
-('oxonine', 'C1=CC=COC=CC=C1', 'f49d94491c44b840dd0df00e5b836f328d0e1b3e') ,
-('thionine', 'C1=CC=CSC=CC=C1', '9ec69f6b3dc4a2a093b3a21653b49ab3a3770cf4') ,
-('cyclohenicosane', 'C1CCCCCCCCCCCCCCCCCCCC1', '2973544d8f8196cd188373364a3d814edb9a90cc') ,
-('cyclodocosane', 'C1CCCCCCCCCCCCCCCCCCCCC1', 'fe1ead29e43ffcbf2cd523de0d225416a250b9f8') ,
-('cyclotricosane', 'C1CCCCCCCCCCCCCCCCCCCCCC1', '119b5f17605d30602e61fbb19b4af2839ec60e2b') ,
-('oxazepine', 'C1=CC=NOC=C1', '57ab48a5b9e6cd15eb2a3de800aa1c45653b6d65') ,
-('thiatriazole', 'C1=NN=NS1', '4a4eefec8072df698e17aef07683b17a4828d96f') ,
-('oxecane', 'C1CCCCOCCCC1', 'd89283583bb20cc014e25f6065442ace7ffa0ecf') ,
-('phosphepane', 'C1CCCPCC1', 'fa0dc617ad23b30170f59c85952ac45f3fd280de') ,
-('cyclodecapentaene', 'C1=CC=CC=CC=CC=C1', '4169cf9eb9e401cf5213a2a36cd57f631843c4d0') ,
-('dioxine', 'C1=COOC=C1', '635f53e36526a0a7739cf658748b3fd56e952df4') ,
-('phosphirane', 'C1CP1', '3a448f3692483c4d9848411779fef0d322370934') ,
-('oxaziridine', 'C1NO1', '715029842446df199ac78a81d16f32f15fd21280') ,
-('triazinane', 'C1CNNNC1', 'dfde7e3d21db5538b768592e02676187e0c4167d') ,
-('pentathiepane', 'C1CSSSSS1', '3e8584bb02f40e13387ce008f53b5f56d30aae1a') ,
-('diphospholane', 'C1CPPC1', '9e874a73f57247f11967f34318c7810b45ea3f43') ,
-('azaphosphiridine', 'C1NP1', '66044516871e9ad5e1fc38eaf61e32c8fade3334') ,
-('oxadiazepane', 'C1CCONNC1', '5e5cff7ebf29b7bde84fb602aa36579ef954f2db') ,
-('dioxaphospholane', 'C1CPOO1', 'f5b4ba19aeac0177345200a384322895597c397d') ,
-('tetrathiolane', 'C1SSSS1', '636168f3883d7dcd603ca1841d58347ed904212c') ,
-('dioxathiolane', 'C1CSOO1', 'db310b8d6a4f2f5de3dd8da794c56e9f1f285226') ,
-('dithiazolidine', 'C1CSSN1', 'c9d59e75872fa09d054d580415da90907fd95e99') ,
-('dithiazinane', 'C1CNSSC1', 'f12a1fbaf7c6af33b2c10f79827eec2b7515dd56') ,
-('thiazetidine', 'C1CSN1', '1d5158a5e94d7120b6aa6a9971b75ea478ded917') ,
-('diazaborinine', 'B1=CC=CN=N1', 'f1eeb5081c91763ab861b6f91174e0fea245eca3') ,
-('cyclopropyne', 'C1C#C1', '5cdc00b7c84f012faf32667fb41a666131f0d380') ,
-('oxazetidine', 'C1CON1', '9e92f5f2c1a5ddeba2e6942b39185bb55aea2f3b') ,
-('hexaoxecane', 'C1CCOOOOOOC1', 'aa985362e8f0251701aca17edd11c156b4407424') ,
-('triazete', 'C1=NN=N1', 'edf50618d184779e0b0f0fb577b23fcceb412242') ,
-('oxadiazolidine', 'C1CONN1', '3a61a99d3ef0e01e4d1178ca9165fa748891ec43') ,
-('azaphospholidine', 'C1CNPC1', 'bbbb2d6d166f64f4c1abf0f43809a928ed1d92b8') ,
-('diazetidine', 'C1CNN1', '53c8dbfcf7c0e4f7d11cc353098fde0696261ddf') ,
-('hexathiocane', 'C1CSSSSSS1', '2d1ca01e0f1d74c57956eb330de3136502c0b47e') ,
-('oxathiirane', 'C1OS1', '110bb8900719882698322a2a482b58884b697115') ,
-('oxazonane', 'C1CCCNOCCC1', '2fa4399ae035509c892450109ac9319afee7f6dc') ,
-('oxathiazinane', 'C1CNSOC1', '587722dfa53b283dd48f72237ab5eaa14955aca0') ,
-('oxadiazinane', 'C1CNNOC1', '6c5353238ffe463bc0f68df6db49cfba1d3d7779') ,
-('oxaphosphepine', 'C1=CC=POC=C1', '4990add5c563d2732e7ef9c0a9737b75c9bcb833') ,
-('azaborinine', 'B1=NC=CC=C1', 'c5608dd6c838e533b27fe79ce67897e54e69aaa9') ,
-('trioxetane', 'C1OOO1', '8b53555333fff059db3977adc7246d50f0accf40') ,
-('oxathiine', 'C1=COSC=C1', '57ef13e1e7ff73b7ab75da35ab1e45fd143bc937') ,
-('diphosphetane', 'C1CPP1', '8458108160ffdba74fcade3b55fa08d4621daf8b') ,
-('dithiadiazine', 'C1=CSSN=N1', '0cdeb2316f6f9770157ee8dc485362ce2fe49fc2') ,
-('triazaborinine', 'B1=CC=NN=N1', 'b094bce4fdc27e8ec136eadb3342ecf6439215d6') ,
-('dioxatriazine', 'C1=NN=NOO1', '21f6196c1610891139b3274ef0d7514dac6f06d0') ,
-('trioxane', 'C1COOOC1', '522e8a3d04d891ed21d440c5db0de92f41c99bf9') ,
-('dioxaphosphinine', 'C1=COOP=C1', 'ed4b8ddb7b836bfea5c0869db6f19e31a17ec7fc') ,
-('dioxazolidine', 'C1COON1', '6cea07386b7ed0462fb3d967eb6475f58606a83c') ,
-('dioxaphosphinane', 'C1COOPC1', 'e48686307c03dc4e2beba3e7f5baf7cb276c215f') ,
-('oxazaphosphinane', 'C1CONPC1', 'b633f8c5a3532d0b14d4901572fddc2d992792f6') ,
-('tetraoxecane', 'C1CCCOOOOCC1', '303d769622ea32fd9942a59c69652e2c1b1ffb2b') ,
-('thiazepane', 'C1CCNSCC1', '5427cfdb1f1a1259f2d97e86142255fbeb16032d') ,
-('oxazepane', 'C1CCNOCC1', 'e9de69f1bb6d04af47123bb26ba59033fc12fb59') ,
-('trithiazole', 'C1=NSSS1', 'b51693d0b45cf5143b8d93c9992dfd8daeb9503a') ,
-('oxazaphospholidine', 'C1CPNO1', '7b304fa46adf627e4319a7cbf81c1ab14fb34550') ,
-('dithiaphosphetane', 'C1PSS1', 'd9d0754bf2ed9862525c361a75d189ae40a9dc51') ,
-('cyclobutyne', 'C1CC#C1', '22eafeec6ab23da517a42a852b69ce8e2f72c781') ,
-('cyclooctadecyne', 'C1CCCCCCCCC#CCCCCCCC1', '0091a553fe3cddb3ada8a474b47addd0e3b61d86') ,
-('thiazocane', 'C1CCCSNCC1', '5d16343e31e84d28dd164faa25b0366d0709dd51') ,
-('oxazocane', 'C1CCCONCC1', 'badc1ba6a20263389ff0e39cf40e17e023a004b8') ,
-('azete', 'C1=CN=C1', '71c5464586b37647a6bfbb6129eab332827c9da9') ,
-('thiadiphosphinane', 'C1CPPSC1', '391b958ce0fd68dad4e158a2442c26754025c8f5') ,
-('hexaoxocane', 'C1COOOOOO1', '23584e4502e4d0ef5f081c22ed79f1fba458d854') ,
-('oxathiadiazine', 'C1=COSN=N1', 'c43f8bd421c1e398ea7bc273be15f75adbe772e6') ,
-('oxadithiane', 'C1COSSC1', '193bb93ecb815d6d74c9e98734ea41d465bfeca2') ,
-('dioxazepane', 'C1CCOONC1', '1c88f4337a309538eff2bdd2aaaa236336f56861') ,
-('diazaphosphinane', 'C1CNNPC1', '66f183b133681b1afdf4bdaea70e0c1a651652a2') ,
-('dioxadiazecane', 'C1CCCOONNCC1', '1c8f5eab329af07b4570b5f4c7c2ae6db2d46a0f') ,
-('dioxadiazonane', 'C1CCNNOOCC1', '5c9daa9121f71cb15ee1b031f21e5848af2df8bf') ,
-('dioxadiazocane', 'C1CCOONNC1', 'efc1a204dc7c21702f187dc156588fec6f43e667') ,
-('oxadiazecane', 'C1CCCNNOCCC1', '585510072c8e0c9cfac51db25c622bb2be9fc0c2') ,
-('oxadiazonane', 'C1CCCONNCC1', '221b6da6d3a3aada0f12a90d965c28e6288b7dce') ,
-('oxadiazocane', 'C1CCNNOCC1', 'acead1b345487fdae399ff97045ee91366298a6c') ,
-('dioxazaborinine', 'B1=NOOC=C1', '030f0983333da5470200390f87ca76b65ca08c81') ,
-('dioxecane', 'C1CCCCOOCCC1', 'e0294012a81603b0a77e0d88847dc9e960621f97') ,
-('dioxazinane', 'C1CNOOC1', '5a6cc06023c137f0f7b9b3c11cece0bd603d26aa') ,
-('oxathiepane', 'C1CCOSCC1', '371c969316608f47f1c7090fda71284feb669dc8') ,
-('thiaziridine', 'C1NS1', 'c0b88d6ebc38b3aeb8bfbe301b09279c0443144e') ,
-('trioxazolidine', 'C1NOOO1', '5f3c6fe44e62fccce5aa856416018173300b2b0a') ,
-('tetrazocane', 'C1CCNNNNC1', '63388a7ab542aa8d42cbb7b1c22bcaa233bdb261') ,
-('tetraoxane', 'C1COOOO1', '544c64fcb3dd03c3aad864dacc127f3b65c7b90c') ,
-('triazecane', 'C1CCCNNNCCC1', '9490e0ed8f1791e391e26bb8b89a56911a6eddf2') ,
-('dioxocine', 'C1=CC=COOC=C1', 'b8d2746ba5fe8d040e2248651300978514edc529') ,
-('cyclononadecane', 'C1CCCCCCCCCCCCCCCCCC1', '7f937f8028b7096bed706dd6dce7c6b207c67d3e') ,
-('thiazinane', 'C1CCSNC1', '8fb6179aedb4d70bd9bba28559bbe6f1a484e971') ,
-('azadiborinine', 'B1=CC=CN=B1', '680fd74b389ce272569cd58931c0f820af9693d9') ,
-('oxatetrathiane', 'C1OSSSS1', 'c7d26e4cac672ce8249511ca244de80d7b6bc509') ,
-('oxatriazole', 'C1=NN=NO1', 'a08ba137c2fa6059a440a892db8b73eeb19bf655') ,
-('dithiirane', 'C1SS1', 'f90fe2671584c5761388a026856ae140e21e18c7') ,
-('oxathiazine', 'C1=COSN=C1', 'ecf57d3aef19b75cc4b9a1d227f3dc62cf76ff44') ,
-('dithiazine', 'C1=CSSN=C1', 'e2ec6255ce4f957b7a0687d6a687128cb14c16f4') ,
-('thiadiazepine', 'C1=CN=NSC=C1', '37d8ab83307a220c52cdf655793500b274b0d2ac') ,
-('triazolidine', 'C1CNNN1', '83374cb6d6936e5e0e0f1db02ee350888c4de666') ,
-('oxadiazepine', 'C1=CN=NOC=C1', 'f6c4a58a86462ee7f874ba61ce7e958b473edef6') ,
-('tetrazonane', 'C1CCNNNNCC1', 'a87bd0bf3616220e955efcbffec5f01e44e37716') ,
-('thiadiazolidine', 'C1CSNN1', '6854276625fc20d6ede0a7a3afbc0f402b209c9c') ,
-('thiadiazepane', 'C1CCSNNC1', '5d18321fd58647b0f043c6a3abddf8481e1f6850') ,
-('thiadiazinane', 'C1CNNSC1', '0d82137ec152069685ff0438d13efc543c37d31c') ,
-('triazonane', 'C1CCCNNNCC1', '97d5d32aa687f65cbe69f89c8f3492ccde5f7f65') ,
-('oxathiazolidine', 'C1COSN1', '0f7b095cb0cba97bee79ff3fa6c1c2570a7ade48') ,
-('dioxazocine', 'C1=CC=NOOC=C1', '16a01f0ed74d90b104ab32afaf0ae9309fc6141a') ,
-('trioxolane', 'C1COOO1', '485f6481058ecc384ea4d59ecce5613ff0e30fac') ,
-('dithiadiphosphinane', 'C1CSSPP1', '3cc665eed72417b07b5133c51941d19d304b8dfa') ,
-('diphosphinane', 'C1CCPPC1', '7ef5852616d3c724a0b35cb9764bb8f358ae072b') ,
-('diphosphepane', 'C1CCPPCC1', '20c0aa7d09532a45f1342080398a5f0e5d4cffe6') ,
-('thiazonane', 'C1CCCNSCCC1', '3a27b0523db52326917da97a1d15ec0e5c1d1e13') ,
-('tetrazinane', 'C1CNNNN1', '81abe199380d51d88414b1385f6f51b49549a167') ,
-('trithiole', 'C1=CSSS1', '9204e479bd47a1e7a44ce8a2d8930fba40805b46') ,
-('trioxole', 'C1=COOO1', '6ff1f27d2eee426adcbbe81a47ce81ec44aa9c3b') ,
-('oxadithiolane', 'C1CSSO1', '112aa6a6bb089c6cb62a53057dca158a1e70d16f') ,
-('trioxepane', 'C1CCOOOC1', 'cf3b4298b5554a1fa231cc78e2dba6ccd6436f41') ,
-('diazaphospholidine', 'C1CPNN1', '2e74649eb87672d23f242f9b4f12a007c050afdd') ,
-('dioxaborinine', 'B1=CC=COO1', 'bef359904126ce3f4699930a5b9d41671fe3827e') ,
-('tetrazecane', 'C1CCCNNNNCC1', 'ed1abc4c9823a8786d4ebb9f0a74e395fc1e8955') ,
-('dioxathiane', 'C1COOSC1', '50154b3a766e04da5debb23f23b703cfbe018732') ,
-('oxadithiazole', 'C1=NSSO1', '8dbb4edb6cee44dae6c526580e9e360fb6e91742') ,
-('oxathiaphospholane', 'C1CPSO1', '0827fbd02a7b4345198259617cb34af0357469c2') ,
-('dioxaphosphocine', 'C1=CC=POOC=C1', '581ffacbef62f591556f7b9eb1dd0b88fcac2791') ,
-('thiatriazolidine', 'C1NNNS1', 'b154a07a59dbef28df1057d845fe310983768f44') ,
-('oxatriazolidine', 'C1NNNO1', 'e354367317f6027f75a541516f543190c6c85dd3') ,
-('diazonane', 'C1CCCNNCCC1', 'ff04eed2d94092952561106545e4a3cb8e913466') ,
-('triazepane', 'C1CCNNNC1', '439f8f0f9b04a588292680344a5e96b06a3b9dd3') ,
-('triphosphinane', 'C1CPPPC1', '907e429ec178db85e99a661df31a1a6a4005b5db') ,
-('dioxete', 'C1=COO1', 'bc12a49992d17807de6798dc7fd11a67ab09762f') ,
-('oxaphospholane', 'C1COPC1', 'a6cca1c3f2929b11e3dcdeb1ca4cc5e0a6fbd185') ,
-('trioxazole', 'C1=NOOO1', 'ea253efca5d4bf9987ee0d41d6109c298a74eb23') ,
-('triphosphinine', 'C1=CP=PP=C1', 'cdfe8af6dfd6d4dc25c450607867e48b354a6801') ,
-('oxathiocine', 'C1=CC=CSOC=C1', 'fb49d5ea2b73dfa0a9c94ac2b207757509c838cd') ,
-('azaphosphepane', 'C1CCNPCC1', 'eb74fd435a478a70fd2a9a195b94665345a88120') ,
-('dioxaphosphepane', 'C1CCPOOC1', '06397f029c0cb79f4d68500b0d1dfd9a7d67a4b8') ,
-('azaphosphinane', 'C1CCPNC1', '70e3ef4924d0055a402f57065dc552bcbf90f9ee') ,
-('triazetidine', 'C1NNN1', 'da5ec424bba6b7ab69ea4fa992125eae8b248209') ,
-('dioxaphosphonane', 'C1CCCPOOCC1', 'd30ec082388e5d8e20aa0cc5abb16397f2217571') ,
-('pentazecane', 'C1CCNNNNNCC1', 'ff09f109b2265802230ed82dbc49aab2293b6df1') ,
-('thiadiazonane', 'C1CCCSNNCC1', '27e002205d75e109bf5dd0987c623ed5e9cdd82e') ,
-('thiadiazocane', 'C1CCNNSCC1', '546170f8c647cf582b53ed3a73db17d55d6353e1') ,
-('tetrathiecane', 'C1CCCSSSSCC1', '92f2b03540740806b778e2afab19af56cd3f04cf') ,
-('oxazecane', 'C1CCCCONCCC1', 'f81e12755c6bb4dfb881e58209a7d6469f4eaf3a') ,
-('oxathiazocane', 'C1CCNSOCC1', '0f815be8e796692e2519651332d03578f33bfec3') ,
-('diazecane', 'C1CCCCNNCCC1', '97c7d7f99033994f0723b113a8531735fe65e493') ,
-('phosphetane', 'C1CPC1', '00194707c5ebc3653d7497d107811b312b9abf8a') ,
-('trioxocane', 'C1CCOOOCC1', '34c09eb9a24bf8e280495ff3594bb5c155fdfc19') ,
-('oxaphosphetane', 'C1CPO1', '95f6e955f3967cdca678530d1f49ddba069951a8') ,
-('phosphecane', 'C1CCCCPCCCC1', 'f6ec97611287768b60598d87275c708147b1894a') ,
-('phosphocane', 'C1CCCPCCC1', 'f5ed7c2040ea55bff0cdf27ce2d3816d024e306d') ,
-('phosphonane', 'C1CCCCPCCC1', '2c608a8f710660ae48421f0e68b780274738c645') ,
-('tetrazocine', 'C1=CN=NN=NC=C1', '2c5b47cd32e43d55b00dbdbf99077d8392f3579a') ,
+('benzene', 'C1=CC=CC=C1', 'cd3b469fc8854741894e89de3f235945ffe59e28') ,
+('pyridine', 'C1=CC=NC=C1', '998e6472a83f8048f00a33f79e418fa9e576d2cb') ,
+('thiolane', 'C1CCSC1', '6641887f3d8b30122ac61a092d724af8cc5649b9') ,
+('piperazine', 'C1CNCCN1', '18284a3b4642f546ae1d46080d5718a69b409d16') ,
+('cyclopropane', 'C1CC1', '01fa550a0abd47fd700080ffc57295084e3c5dae') ,
+('oxirane', 'C1CO1', '3b7fc9cb2512f12aadc9bd7008a60a5becc1c487') ,
+('1H-pyrrole', 'C1=CNC=C1', 'f0e69453759847a10defe354d751e0362e51d9a4') ,
+('oxolane', 'C1CCOC1', 'f1f826f8ec06ebb9cdeacb33e4bdee223c5fc02a') ,
+('furan', 'C1=COC=C1', '3752c44d9ec3b80466fd55d88afc54d73f69123c') ,
+('thiophene', 'C1=CSC=C1', '18e549327979da7158d4eb04ee5f5c1924c23b6b') ,
+('cyclohexane', 'C1CCCCC1', 'c54b81c4f20ea375fe27b1eb3bfde6433f96dbcc') ,
+('cyclohexene', 'C1CCC=CC1', '181209e0e7607c8b248815518a9de296d3736ce7') ,
+('piperidine', 'C1CCNCC1', '18f39444d28d6a3a0b9df786504d8bbd61f8394d') ,
+('morpholine', 'C1COCCN1', '5c45972f638950c69b7bf5ea222bc2606f4de9cc') ,
+('azepane', 'C1CCCNCC1', '87721da24709c8d69d2c7e825289c0025139b539') ,
+('cyclopentene', 'C1CC=CC1', '8e10a1e6a4e6230afe3812e0b89b5909420f1d96') ,
+('oxane', 'C1CCOCC1', 'b7c70036a6a69d24ce777dfc3ba0c40c114d6973') ,
+('aziridine', 'C1CN1', '2bb1579b37f1e08d1b08666385f2fbbbdd59797d') ,
+('cyclobutane', 'C1CCC1', '631477f50edbab1e89a41837e05bdc8f83d8b3be') ,
+('thietane', 'C1CSC1', 'fad03c92986b63265161c6d2dc13ff88670f5b97') ,
+('cyclopentane', 'C1CCCC1', '8134af41d1fdd16bb3f4565d04f2e7cbd1aaf805') ,
+('pyridazine', 'C1=CC=NN=C1', 'b3d86511cc2a2ac57e0e1ca80e4e214559577f0c') ,
+('pyrimidine', 'C1=CN=CN=C1', '4bfcc0a2199c4c5fb6fb6597fe5fe3e8aa1ca48e') ,
+('pyrazine', 'C1=CN=CC=N1', '3d725591bdc1340bd96c1a5075382fc511179a7e') ,
+('cycloheptane', 'C1CCCCCC1', '51167ed420a1bced176e71e2d5b8f56cb654b387') ,
+('cyclooctane', 'C1CCCCCCC1', 'b628537a7ec7a76130680c58268e7262ba3546af') ,
+('cyclodecane', 'C1CCCCCCCCC1', 'af166308d4f2b1ff25cc23cd6f27691ad1d410c3') ,
+('cyclododecane', 'C1CCCCCCCCCCC1', '0f622a87e20a3ccca6ddc175f0b8e7fbe3ac5ea0') ,
+('thiirane', 'C1CS1', 'b172468dea3fc1ff66260da2fccdf4bd50347918') ,
+('azetidine', 'C1CNC1', 'ace1696e792c68ea32b9212d5c42b56da3366fba') ,
+('oxetane', 'C1COC1', '88a7b1b39d820a9a1e539d188e16d73e2de6f054') ,
+('oxepane', 'C1CCCOCC1', '971d78a1d847fdbf79520f180bbdcf3d0b513e75') ,
+('cycloheptene', 'C1CCC=CCC1', '1bcbcb2ac7d2344e3d90f28474ea060fc2cf5d83') ,
+('cyclooctatetraene', 'C1=CC=CC=CC=C1', '92fd0319f36e12e8ab07266aea9b0e21916a0613') ,
+('cyclooctene', 'C1CCCC=CCC1', '74e865af22b2a706e0517bd3b7b107f33b1ae584') ,
+('cyclodecene', 'C1CCCCC=CCCC1', '7f74646f68732ac1d2e649631d71c24ca59adf2b') ,
+('azocane', 'C1CCCNCCC1', 'a4e2132088f78965f4f0f2a9ce2efee1cfc70ed9') ,
+('cyclododecene', 'C1CCCCCC=CCCCC1', 'dcb117407e48ef5e81585cd772457a45ea86f281') ,
+('thiane', 'C1CCSCC1', '6b8d8ba0647d82e90a2b1a58ca5dc3c6b5287e60') ,
+('azecane', 'C1CCCCNCCCC1', 'ecd5074cedf2754035764ba93f334dac76976ad9') ,
+('pyrrolidine', 'C1CCNC1', '776b9b98065f6459f07f1db1b6e503c2ca4b90af') ,
+('thiomorpholine', 'C1CSCCN1', '5bdd5d1b3f5d102577201f5fed6d68d50b6ac782') ,
+('thiadiazole', 'C1=CSN=N1', '934842de2f730922f31b7cfea9a9d0fdda2458f3') ,
+('cyclotetradecane', 'C1CCCCCCCCCCCCC1', '3cdc5cc7e02737c0f1147aa8e7c48b5dba342ff2') ,
+('cyclopentadecane', 'C1CCCCCCCCCCCCCC1', 'f892b2846a4cd15e07925c1b0235f5141067878a') ,
+('cyclohexadecane', 'C1CCCCCCCCCCCCCCC1', '8349c75ecf5aaafb102ec0ff7a7aeb31041c1519') ,
+('cyclobutene', 'C1CC=C1', '7acab1075691f2e4ddd72a75254e0637a1ef68cb') ,
+('phospholane', 'C1CCPC1', '8d9fa8f61e5dce8c1eb2ab94cc0b9a2cc667203f') ,
+('thiepane', 'C1CCCSCC1', '77be202924c6732921b4d936fb1dda60cd2aec33') ,
+('pyrazolidine', 'C1CNNC1', '87c3723514e4031e4d48248993ef6881387e7113') ,
+('dithiolane', 'C1CSSC1', '2d4ecded97862deacd69bd641e60c3f88f27fbd5') ,
+('azonane', 'C1CCCCNCCC1', '94a1c629b88566cb0aac886b9c94017a2f4a9020') ,
+('hexathiepane', 'C1SSSSSS1', 'b79c2650a0ae1744c4a23f7b9eab1898a46c1bae') ,
+('azaboretidine', 'B1CCN1', '2261b0df7fe5149c937ab92c6f86b2b7cd8152aa') ,
+('dioxetane', 'C1COO1', '64be20fb5875acb9d721e2a38cfc53f51ff81450') ,
+('phosphinine', 'C1=CC=PC=C1', '58af665119ba96ecf19fd163a507cebc79ead024') ,
+('triazine', 'C1=CN=NN=C1', '7b5556c08abf4ab66b4063fce79c905d90644c4b') ,
+('cyclopropene', 'C1C=C1', '2f0dcc2c5af19fd289532bf55e73aa16635b559e') ,
+('trithiane', 'C1CSSSC1', 'c1eb0a665dd86bc5dffad2c843fa134ef4099342') ,
+('cyclononane', 'C1CCCCCCCC1', '2921aeacbb5f5b0d7995d016c392602887649a1d') ,
+('cycloundecane', 'C1CCCCCCCCCC1', 'edf3322d90cf93fc4c20f753028276c4a2ffbee3') ,
+('cyclotridecane', 'C1CCCCCCCCCCCC1', '40d3bb4813019bc7abd80a7807f965d172b25695') ,
+('cycloheptadecane', 'C1CCCCCCCCCCCCCCCC1', '1fa41ef9b61296d210cb54366225081dd609cc47') ,
+('cyclooctadecane', 'C1CCCCCCCCCCCCCCCCC1', 'c1fd9b7e3317c6831ea0e8eb2cd9d9e3e371a8e3') ,
+('diazinane', 'C1CCNNC1', 'e9ff458a161f5c33b3b7048d2cd0bf1c12f00a0a') ,
+('dithiane', 'C1CCSSC1', '36858f1c6eedefe3359a8d7d9a7cf290985745b1') ,
+('dioxepane', 'C1CCOOCC1', 'e8fc6af17d650654849ef7cb50a228f5b78877a9') ,
+('cycloundecyne', 'C1CCCCC#CCCCC1', '7ca0d398e4ed4a19580de1388e5e564f402dd866') ,
+('cyclobutadiene', 'C1=CC=C1', 'd6ec1e2415ec8a9462170548ef530195e8dc6fa4') ,
+('cyclododecyne', 'C1CCCCCC#CCCCC1', '40ba35b8a23ce0be7c172618028acdcd9e163ad3') ,
+('cyclooctyne', 'C1CCCC#CCC1', '21aa78e12022d40f7b59c89bdb0f88f90a8e57ab') ,
+('cyclodecyne', 'C1CCCCC#CCCC1', '8525bcf7c2387e31c9abbc91e68b4b5292b11170') ,
+('dioxolane', 'C1COOC1', '08592c524f2458194d0dfed9938da287b8e7c6a9') ,
+('phosphinane', 'C1CCPCC1', 'ad11c0a1b6449019d0b9c161efff90afa74a83af') ,
+('oxathiolane', 'C1COSC1', 'd5c319d26f6ed81cdf4f7489a1f0f1b61555bdf1') ,
+('dioxane', 'C1CCOOC1', '7e73cc495d6e7414b14f25ca56d66ee55e30d8cc') ,
+('dioxocane', 'C1CCCOOCC1', 'b10df26c82ad95c9591963a6b3c9542af072964d') ,
+('cyclononyne', 'C1CCCC#CCCC1', 'f988d96b3e4ac964b9649d6689e05deb63baa596') ,
+('dithiete', 'C1=CSS1', 'f2c1d6b7c5a1adda46fb8d379cbe0f0815a4bfe0') ,
+('oxazinane', 'C1CCONC1', '3b943e7674a3e3142ff3deabee1ddae0a4d1232f') ,
+('oxirene', 'C1=CO1', '024d3172dd64947a8fbe3784747a8dabec5b27f9') ,
+('oxonane', 'C1CCCCOCCC1', '6b0f2a4b5148073e012270db113e31fe5124c1f4') ,
+('thiocane', 'C1CCCSCCC1', '3faa455047db3e2531b88e9cc12f992ac4439298') ,
+('imidazolidine', 'C1CNCN1', '993fe3dbcce7ef92876ab3aef92d4bfde80d0a19') ,
+('dioxirane', 'C1OO1', '2c7a36f30dca85d4a653ec927de2c080bcccd544') ,
+('cycloicosane', 'C1CCCCCCCCCCCCCCCCCCC1', 'd14ec12f1921fda74efbfbf772164cf6bbe2ee8c') ,
+('cyclotetracosane', 'C1CCCCCCCCCCCCCCCCCCCCCCC1', '523f7c9a0e6c255bf11eed7e4563c24b5274e694') ,
+('dithiepane', 'C1CCSSCC1', 'dbb3e02b45572967b82879aabf700ab275a14e0b') ,
+('oxadithiole', 'C1=CSSO1', '89ffd5d26983d83636c83eb7c51b281845e214bc') ,
+('tetrathiepane', 'C1CSSSSC1', '79756de66db0d68c476d383ea87486e54014830c') ,
+('dithiocane', 'C1CCCSSCC1', '31999c7354138e22086311b289c63b10306d65a7') ,
+('trithiolane', 'C1CSSS1', '89a4eb99d64dbec5fdc9e54fded54fd9f3581dd2') ,
+('tetrathiine', 'C1=CSSSS1', '95cf7db47ea292cdc79f775970f37ffc8325d49b') ,
+('tetrathiane', 'C1CSSSS1', '8c5ee5438c8a4943d5a7231de511c9754ef2a019') ,
+('oxathietane', 'C1CSO1', '205bd769f1043eee999edc7c1115ff9a352c3f69') ,
+('diaziridine', 'C1NN1', 'e4b447504f31f3d2280775417960457b69dea085') ,
+('tetrazolidine', 'C1NNNN1', 'bbb53cc1d04bafcb2785dfad46af24941537cc29') ,
+('oxazirene', 'C1=NO1', 'b453b7e7ce73a7e7c01a5c043a640eae1309469c') ,
+('thiirene', 'C1=CS1', 'dcacceae73eb52bac5259ad098c053f8f4dc58f2') ,
+('cyclobutatetraene', 'C=1=C=C=C1', '022a6080597f3cc721e2fa4fec7a14d5d42efe8f') ,
+('pentazine', 'C1=NN=NN=N1', '851b2c8b22995d01d29bfdc3a2af48a5e6499e31') ,
+('oxepine', 'C1=CC=COC=C1', 'ec0a53085664bf720d35e206700f2a68a2b8ae3b') ,
+('oxadiazole', 'C1=CON=N1', '9f65afd799eb8c681ab57aa174a7d6f46932e26b') ,
+('cycloheptyne', 'C1CCC#CCC1', '7548c449c04a13339d5d8dea4864acbbe796dde8') ,
+('borinine', 'B1=CC=CC=C1', '53d83b9b8d2790d38c76c7f0c7fc7860b5608792') ,
+('cyclohexyne', 'C1CCC#CC1', 'b9c943a4793a02d3b074c4f0125790ec59d3425d') ,
+('cyclotridecyne', 'C1CCCCCC#CCCCCC1', 'e44a236aedc57074f49960d1688d6996c1af36c4') ,
+('thionane', 'C1CCCCSCCC1', 'e898e12b302c0c9e67cc4337148d922a6ce2d307') ,
+('dioxazine', 'C1=COON=C1', 'baace53a4ffc0d5d413e02145c5b38d693072be5') ,
+('dithiine', 'C1=CSSC=C1', '605dd4b1dc3786ee4789d728f2fc354f72ed1ea0') ,
+('cyclohexacosane', 'C1CCCCCCCCCCCCCCCCCCCCCCCCC1', '2cead43d26492554c074662d889d2f180ccad91c') ,
+('dithietane', 'C1CSS1', 'c28745a16a83b39736ebc5c8ed3a73a706f2d905') ,
+('tetrazine', 'C1=CN=NN=N1', '59ecad3b5602a5247e6dabbdf8f54eca194e454c') ,
+('thiazepine', 'C1=CC=NSC=C1', '0bb6490183bd8066bdcfa4c0c1e0056a77b63835') ,
+('thiepine', 'C1=CC=CSC=C1', '9fbd784184b81697ebbc1e560661d143731876d0') ,
+('oxathiane', 'C1CCSOC1', 'dcd561ca764a226174df6063fb9a4794ab9b67f5') ,
+('diazocane', 'C1CCCNNCC1', 'f26755af95dc9bcd97413f69c4efd75c1e911021') ,
+('trithiepane', 'C1CCSSSC1', '26abfa590609fa5685b92c6b840611c8d3ab4124') ,
+('oxocane', 'C1CCCOCCC1', 'c24fae217f04b2879b5a90d7376b78c1d9f87792') ,
+('trithionane', 'C1CCCSSSCC1', 'dc5cd777bc39f76a3e638aac699d71dda78b9f56') ,
+('diazepane', 'C1CCNNCC1', '7049d81b52708aa44a7bfb1e1639043a21eb6ccb') ,
+('dithionane', 'C1CCCSSCCC1', '23dbd1b938fbc028431a1ad448a3da22a9079ae8') ,
+('oxonine', 'C1=CC=COC=CC=C1', 'b8bac274640529e100e9485546f618c53b86f02e') ,
+('thionine', 'C1=CC=CSC=CC=C1', '2d2bf5a55eda6c7a85d213a29b2f2f33c551063f') ,
+('cyclohenicosane', 'C1CCCCCCCCCCCCCCCCCCCC1', '6bd4f6906023e02cff39bdad2d95c0628ada5995') ,
+('cyclodocosane', 'C1CCCCCCCCCCCCCCCCCCCCC1', 'c00a5871f06758cc77c03b4720a5955d6f37d2f2') ,
+('cyclotricosane', 'C1CCCCCCCCCCCCCCCCCCCCCC1', 'df435cf926b3b99afa2f557488e6e9b261c0dc6e') ,
+('oxazepine', 'C1=CC=NOC=C1', '301c9dc6bfe4826e4982d239667d65affaf20f36') ,
+('thiatriazole', 'C1=NN=NS1', 'e097f63f0767ea22de09dfd3b57925d6cdd9f0e5') ,
+('oxecane', 'C1CCCCOCCCC1', '26b0917fa70b422f4203a7c249d2c46b4c7f5181') ,
+('phosphepane', 'C1CCCPCC1', '835220130d0628ebdf1ae7c051950b3734c9b84b') ,
+('cyclodecapentaene', 'C1=CC=CC=CC=CC=C1', 'a90321db592dbb35b99b5731d610afa8cd4f3eba') ,
+('dioxine', 'C1=COOC=C1', 'e26cb029c56993cf94402996df95eb46d9edc90c') ,
+('phosphirane', 'C1CP1', '5835e124c2464fd38a9cd5a6c9f5eb0bdd7305c0') ,
+('oxaziridine', 'C1NO1', '19709f698f0dc6b4414e94dd2947949303487798') ,
+('triazinane', 'C1CNNNC1', '63d761be367c6150d1da508c5683caed2301982e') ,
+('pentathiepane', 'C1CSSSSS1', '8d9461d7bbf54e61ad1624b60ab806e55d77099c') ,
+('diphospholane', 'C1CPPC1', '1ac0dab14fb562ed32146645f6c9745e3ca9cc1a') ,
+('azaphosphiridine', 'C1NP1', '051faaa8a8456dbfa83937be847269a3e8fac572') ,
+('oxadiazepane', 'C1CCONNC1', '48adc32d73b6a940b0c104259f18114388a5bbba') ,
+('dioxaphospholane', 'C1CPOO1', '6c21f59c1548a42df06521507c1e143b199d52f1') ,
+('tetrathiolane', 'C1SSSS1', 'bfdd3240a0fec750127ba23e272eb6a9840b22af') ,
+('dioxathiolane', 'C1CSOO1', '469d0c3bf0619301d13cc09e85d64440193f5a4c') ,
+('dithiazolidine', 'C1CSSN1', '0451feecf4b747b6dd2df273e035bdf4e8e252a2') ,
+('dithiazinane', 'C1CNSSC1', '4aab63000620b0ddc250a9331f3926596534ef64') ,
+('thiazetidine', 'C1CSN1', '5c4f957db2790bb98fce6c72257435ffaa6f4baf') ,
+('diazaborinine', 'B1=CC=CN=N1', 'bef03e207b97860d3919697263727d607c34bc7d') ,
+('cyclopropyne', 'C1C#C1', '3c9949ae97a751a9abf73bcfdde4c38e5b05cbc1') ,
+('oxazetidine', 'C1CON1', '1b7c12f587f25b69dd047b15ab4b13fef298cd8e') ,
+('hexaoxecane', 'C1CCOOOOOOC1', '23f9dba1192918dfc30e3bb3f6a3b806c9d87cf4') ,
+('triazete', 'C1=NN=N1', 'd0dcf6daecebaeafd4f2db24365ca54cb1f1a1ee') ,
+('oxadiazolidine', 'C1CONN1', '34061f9f1688bde01589fbada0d1090bdecffb90') ,
+('azaphospholidine', 'C1CNPC1', '35440b2aff489c1440143d4b0358224728f379e2') ,
+('diazetidine', 'C1CNN1', '7d354916742b985394c623bcb54e7b5501151bde') ,
+('hexathiocane', 'C1CSSSSSS1', '4dd8a38e85a58a0fce898129cbfa8ddba4f11536') ,
+('oxathiirane', 'C1OS1', '6ca58558cecb39570b8734d9f00bf91924f3315b') ,
+('oxazonane', 'C1CCCNOCCC1', 'b9caf13b3f0d2fa52787516f132c70ececf34117') ,
+('oxathiazinane', 'C1CNSOC1', 'cfa0e48a08ca7b1166b9c17849d911205660ebb8') ,
+('oxadiazinane', 'C1CNNOC1', 'a4b20bc556aec6787125e4a18ec203a84632918b') ,
+('oxaphosphepine', 'C1=CC=POC=C1', 'd451fffac62a23e8755646a105ce549603060629') ,
+('azaborinine', 'B1=NC=CC=C1', '3c09fb6bdde7d974f4144877cd2458c918f1896e') ,
+('trioxetane', 'C1OOO1', 'a4249adaabe81e76f95d11d00b6c3151282f3153') ,
+('oxathiine', 'C1=COSC=C1', '6aca1e677d8f84f4267de530584e87ffe6d92bbf') ,
+('diphosphetane', 'C1CPP1', '392b897c781740d7e110b75e53b4b95844e9d64a') ,
+('dithiadiazine', 'C1=CSSN=N1', '8254be4e60d5b319bd637092baa3400f3b15a6f1') ,
+('triazaborinine', 'B1=CC=NN=N1', 'b149aea2f37bb2be45861989ad4246ca9e00a452') ,
+('dioxatriazine', 'C1=NN=NOO1', '9f9d081c019c930a89a2cda3df203fcf4ad0da31') ,
+('trioxane', 'C1COOOC1', '7ae36b6244c649b962e1744019d1357f6f80e39d') ,
+('dioxaphosphinine', 'C1=COOP=C1', 'c542e3ce829975ce8e13c1f0456b65dcb4f7aabd') ,
+('dioxazolidine', 'C1COON1', '1b7119d153f66223bd6e7d582e3c116e30c87666') ,
+('dioxaphosphinane', 'C1COOPC1', 'e8a787cbe55b0d0a42e83275d299ba5841f31679') ,
+('oxazaphosphinane', 'C1CONPC1', 'd038dc7254dc10630a03b8daf7d62a5304d86e93') ,
+('tetraoxecane', 'C1CCCOOOOCC1', 'dbb53a23244818e67c2f101db0bc2ad0c64bd7c0') ,
+('thiazepane', 'C1CCNSCC1', '73c234ff6b475f050d00968d35fe8f422c3fcaf6') ,
+('oxazepane', 'C1CCNOCC1', 'd064c896da3d4f6e94df1fae7b85c8beb33de5da') ,
+('trithiazole', 'C1=NSSS1', 'e02a571853385467ec2fbd8621aed49ead084521') ,
+('oxazaphospholidine', 'C1CPNO1', 'e071a122efc9890901ca0db0f4f2d3df429014c2') ,
+('dithiaphosphetane', 'C1PSS1', '4129d2aad5ab04356ef7fac32961bdfb764d4a94') ,
+('cyclobutyne', 'C1CC#C1', 'c90ca990ed67cda49f33ea144b3ab631b71ead03') ,
+('cyclooctadecyne', 'C1CCCCCCCCC#CCCCCCCC1', 'e8ba7fa3a157f913812a6a9834fd7e547f1547e2') ,
+('thiazocane', 'C1CCCSNCC1', '8d46ca307a1466d6c94ca128f6747b80a92ad13d') ,
+('oxazocane', 'C1CCCONCC1', '9b9a0c49d1ae9d70f0134621207442e9b2e27dff') ,
+('azete', 'C1=CN=C1', '296e6c0b5919707a4a590841ce9cd40dadc1ff45') ,
+('thiadiphosphinane', 'C1CPPSC1', '2e7973ab67749cadf7d520272be0eacea8296d6b') ,
+('hexaoxocane', 'C1COOOOOO1', '5ac21daa69e45c928556cca7cd64d2b979e1b393') ,
+('oxathiadiazine', 'C1=COSN=N1', '72bf0850db1cfb21f1b43fe68bc2db473d7fab47') ,
+('oxadithiane', 'C1COSSC1', '615cb7b4795fa77dffe8356a8dcc684fd0098188') ,
+('dioxazepane', 'C1CCOONC1', '41c7c5c2280d5a1c416d27b5d5a0ef2496536c3d') ,
+('diazaphosphinane', 'C1CNNPC1', '48d44a496042ec56caa3aab515a37c54b29f85f1') ,
+('dioxadiazecane', 'C1CCCOONNCC1', 'aa5ff93ce47828c8e6329b6ca6184cb8e05f1bdc') ,
+('dioxadiazonane', 'C1CCNNOOCC1', 'b80edcef6267a2c81b62463fd9b6a89bcbcb7172') ,
+('dioxadiazocane', 'C1CCOONNC1', '9de198e0fff3844a909d86dfa5913be652258726') ,
+('oxadiazecane', 'C1CCCNNOCCC1', 'c9e9f5b9d906d35d59b996ac840f3272c7216879') ,
+('oxadiazonane', 'C1CCCONNCC1', '26f1345166e7c04b44722942d67bae09b43aa85d') ,
+('oxadiazocane', 'C1CCNNOCC1', '60d624e3f7521c6e91c97f2870196b0177a87361') ,
+('dioxazaborinine', 'B1=NOOC=C1', '1106bc4bcd3dffcf5026c91de3a7c01fb7afe510') ,
+('dioxecane', 'C1CCCCOOCCC1', '7764c4fd9d1042df19a354cd712104ff993d882f') ,
+('dioxazinane', 'C1CNOOC1', '999dad86bb9f50562a39ffa9904ab8e14ddd6d32') ,
+('oxathiepane', 'C1CCOSCC1', '85c4ec59f06e6f2381c1d3c82d358382b5ae8c4a') ,
+('thiaziridine', 'C1NS1', '76525a4198ca592f2e1691777a78de23db2d8b8f') ,
+('trioxazolidine', 'C1NOOO1', 'f0219c96d4379e4c69631be43a05774414382111') ,
+('tetrazocane', 'C1CCNNNNC1', 'cbe9001c973cd9f9dc64ef7e79807a8ba0e1cf10') ,
+('tetraoxane', 'C1COOOO1', '6529133bd4359176d6e06019ce2b2bd85ce2f11a') ,
+('triazecane', 'C1CCCNNNCCC1', '83f211dae9d6eec4026f1f21ce5541c421fe37f1') ,
+('dioxocine', 'C1=CC=COOC=C1', 'c9fb228d0ed1b861f5241cba4e7696106fb40160') ,
+('cyclononadecane', 'C1CCCCCCCCCCCCCCCCCC1', '4e5a895f89699b303be370339e955289c6882591') ,
+('thiazinane', 'C1CCSNC1', '6976b9e6ba2577481fe78cabe48fb6745b3f314a') ,
+('azadiborinine', 'B1=CC=CN=B1', 'c9450fb072fc9deaf5d7d8537a49a93d770dbef2') ,
+('oxatetrathiane', 'C1OSSSS1', '3f219612165f3255d4391ce5fdd772545ab07893') ,
+('oxatriazole', 'C1=NN=NO1', '353f54e2ea9941f7a99edbb9fc5469cb588f1477') ,
+('dithiirane', 'C1SS1', 'ccd79c2abae122ef16a5bbfd54bcfcdea39e52e8') ,
+('oxathiazine', 'C1=COSN=C1', '73190019a8cee5b7dbb20a9c1ae66529496317c9') ,
+('dithiazine', 'C1=CSSN=C1', '6ba75dcd2f4eb7d0f2c44d0091e0893124f23569') ,
+('thiadiazepine', 'C1=CN=NSC=C1', 'eeb52d431437b760b1879c5b64611003133a6228') ,
+('triazolidine', 'C1CNNN1', 'ca8f90150179a6e73704fd1f95727a346be740aa') ,
+('oxadiazepine', 'C1=CN=NOC=C1', 'f75b51657051449c95a26b4884aca3fc27bd523d') ,
+('tetrazonane', 'C1CCNNNNCC1', 'd121f13f77653e94144a4b674462b9cba3d63222') ,
+('thiadiazolidine', 'C1CSNN1', 'ab21eb09de76dfc66a5ffdc1cf1cb71fb26669d7') ,
+('thiadiazepane', 'C1CCSNNC1', '642d3f48f6da0ad7c1ee50a3e6b172ddcbd73dda') ,
+('thiadiazinane', 'C1CNNSC1', '17cbf43881c13c5c5a9f5fe7992df20828164401') ,
+('triazonane', 'C1CCCNNNCC1', 'f0e50b7c6e5aef147a30af96f0a7b5bad6ee0c6d') ,
+('oxathiazolidine', 'C1COSN1', '64f5c6fc60aca368c641fbd92eb35f28fa813543') ,
+('dioxazocine', 'C1=CC=NOOC=C1', 'fb20ec44f877ffcf3298915005577a6a9bd0baf5') ,
+('trioxolane', 'C1COOO1', '566733fef108742ea3d3549ef4846999b0248806') ,
+('dithiadiphosphinane', 'C1CSSPP1', 'dd5845759b21d1dce4696b72c4d12654e243e274') ,
+('diphosphinane', 'C1CCPPC1', 'f9d11fe06f7ce36eb382c36be9b825add5cf77fa') ,
+('diphosphepane', 'C1CCPPCC1', 'e3848e6d2a0abac378ec569ac7a9746573c6231f') ,
+('thiazonane', 'C1CCCNSCCC1', '8fd324bafc3466ec81db6829ca7e3fd24d450155') ,
+('tetrazinane', 'C1CNNNN1', '753bc6a1db81a704c75f8603a43bf6b6df0dcc4d') ,
+('trithiole', 'C1=CSSS1', '7a3e940375918f9892b3f2d7f7cf270b7abf777e') ,
+('trioxole', 'C1=COOO1', '30e8718d23db57ce167956d51c3426561390d2ed') ,
+('oxadithiolane', 'C1CSSO1', 'b0b54668e7f2cfb26638fea442db64b28864c8f9') ,
+('trioxepane', 'C1CCOOOC1', 'df6f124d128452e4c21554266bf09fdebdb714c4') ,
+('diazaphospholidine', 'C1CPNN1', '6f3dcc5432ffe7f55c3369df6919724fb6350bc0') ,
+('dioxaborinine', 'B1=CC=COO1', 'cc453b1dbbb446239c46c6de4b0ce22f06727dcd') ,
+('tetrazecane', 'C1CCCNNNNCC1', '0f2f4ca4c462aba1a117cfc7034674e8c69a2a48') ,
+('dioxathiane', 'C1COOSC1', '7b554102157f8cb14e7dfdd6cd044ee4e611f1c4') ,
+('oxadithiazole', 'C1=NSSO1', 'f7c7d7f09b5e2e19fa5589386f7c1f3d65f30f9f') ,
+('oxathiaphospholane', 'C1CPSO1', '39465d219a36ba725e0f6261c832f7c3394749df') ,
+('dioxaphosphocine', 'C1=CC=POOC=C1', '9c15c111340f3c80f0b25e5c4d8a6be88e04a520') ,
+('thiatriazolidine', 'C1NNNS1', 'c25f300d4913ba69e012757980422e96d2b3348a') ,
+('oxatriazolidine', 'C1NNNO1', '117fc00e1876577845263d0e8eea0cd1521667cf') ,
+('diazonane', 'C1CCCNNCCC1', '38fa8640e4a79df65d4c3d277a221baa4bc169fc') ,
+('triazepane', 'C1CCNNNC1', '8101b5026838ab8f5af775ca733ae2cfa53a05a8') ,
+('triphosphinane', 'C1CPPPC1', 'e2d18713d5a63bb10f55d0ca30c5465d6f23ca84') ,
+('dioxete', 'C1=COO1', '81e87ab30f13463001da4d5392a27ddda466d0fd') ,
+('oxaphospholane', 'C1COPC1', 'bc95d51229c329bf132d0c8768644982993c261c') ,
+('trioxazole', 'C1=NOOO1', '289758f43d7f217d5e144b595b0ca937d2313cf3') ,
+('triphosphinine', 'C1=CP=PP=C1', 'cda45e7ab7092d1168aa254241defcfae5abb941') ,
+('oxathiocine', 'C1=CC=CSOC=C1', 'f5f41a8aff1d9aec6e39995fc4c7b6c521ac136a') ,
+('azaphosphepane', 'C1CCNPCC1', 'fc43682eefb23c86060457b61cf83c74add16d1e') ,
+('dioxaphosphepane', 'C1CCPOOC1', '7fafd142f2fc1a02c843782ddf929b6939c6d8d6') ,
+('azaphosphinane', 'C1CCPNC1', '40f4f02788410baf04d9aadc6770e84190c9ea39') ,
+('triazetidine', 'C1NNN1', 'c094f4e7f067b7f115de993c5c4e8e86f3860f0e') ,
+('dioxaphosphonane', 'C1CCCPOOCC1', '8895a7f77734d6b156b500e5d08113a59e2efbef') ,
+('pentazecane', 'C1CCNNNNNCC1', 'cfbf0a33deda7530f4dbc501b9ac4638f36f4a63') ,
+('thiadiazonane', 'C1CCCSNNCC1', '5e01c3dbeab3b83536a853d5eb5617d06b70ba39') ,
+('thiadiazocane', 'C1CCNNSCC1', 'b10b6b739486f34a5ea179acf96f1f2f9a1a88ad') ,
+('tetrathiecane', 'C1CCCSSSSCC1', '0f2f14f9a8cd4794a12d3c22fa842217c4ee1faf') ,
+('oxazecane', 'C1CCCCONCCC1', 'eb4a8ad0da6af3cf4a0b9fb34a2a168c4ca65a34') ,
+('oxathiazocane', 'C1CCNSOCC1', '2ca4ed5d67750955d3be242ec5422be78c16fb5f') ,
+('diazecane', 'C1CCCCNNCCC1', '45317461bffb890854557540ad62f05705b45e95') ,
+('phosphetane', 'C1CPC1', '24eed04765998b184a4f48ce74aae78ca2cbc1dc') ,
+('trioxocane', 'C1CCOOOCC1', '2201c718d62b4851e6f8f6f1d84d69bb944adbb3') ,
+('oxaphosphetane', 'C1CPO1', '284a479ba110c4359d5a72103f7dcdcf3e4f0b06') ,
+('phosphecane', 'C1CCCCPCCCC1', 'd8775b32f1813d30d4ebd75fb098ea8b4f0b854d') ,
+('phosphocane', 'C1CCCPCCC1', 'f84639322ff72afee40bce13c1947cd17a2b307b') ,
+('phosphonane', 'C1CCCCPCCC1', '51fcedcdbc6202d44929467e5ce57f06ebe286ce') ,
+('tetrazocine', 'C1=CN=NN=NC=C1', '23369433fcdbd1df081e1a0c247373739c0c7435') ,
 ]
@@ -0,0 +1,360 @@
+#--------------------------------------------------------------------------
+#     This file is part of OASA - a free chemical python library
+#     Copyright (C) 2003-2008 Beda Kosata <beda@zirael.org>
+
+#     This program is free software; you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation; either version 2 of the License, or
+#     (at your option) any later version.
+
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+
+#     Complete text of GNU GPL can be found in the file gpl.txt in the
+#     main directory of the program
+
+#--------------------------------------------------------------------------
+
+"""Backtracking (VF2-like) substructure matching.
+
+"""
+
+from .atom import atom
+from .bond import bond
+from .query_atom import query_atom
+
+
+
+class substructure_matcher(object):
+  """Finds all the occurrences of a query molecule in a target molecule.
+
+  Neither of the molecules is modified, all the search state is local to
+  one call of get_matches, so several threads may search the same target
+  at the same time.
+
+  Query atoms are placed one by one, each next atom is a neighbor of an
+  already placed one (VF2 order) and its candidates are the neighbors of
+  the image of that atom. The candidates are pruned by the atom and bond
+  matching, degree and ring membership.
+
+  Hydrogens of the target that are not present as atoms (implicit ones)
+  are matched by hydrogens of the query when the query contains hydrogens
+  (atoms or explicit_hydrogens) or query atoms with H or R, they are
+  only counted, not created. The explicit_hydrogens of the query atoms
+  are matched by hydrogen atoms or by implicit hydrogens of the target.
+
+  With implicit_hydrogens=False the implicit hydrogens of the target are
+  never matched, they only occupy the free sites of the query atoms. This
+  is used to compare two queries - the implicit hydrogens of a query stand
+  for any atom.
+
+  With same_size=True the matches are isomorphisms - the molecules must
+  have the same number of atoms and bonds and the matched atoms the same
+  element, isotope, charge, hydrogens, valency, multiplicity and degree.
+  The bonds are compared by order (aromatic bonds are all the same) or not
+  at all with bond_orders=False.
+  """
+
+  def __init__( self, query, target, implicit_freesites=False, implicit_hydrogens=True, same_size=False, bond_orders=True):
+    self.query = query
+    self.target = target
+    self.implicit_freesites = implicit_freesites
+    self.implicit_hydrogens = implicit_hydrogens
+    self.same_size = same_size
+    self.bond_orders = bond_orders
+    # templates used to check what matches a hydrogen
+    self._h = atom( symbol='H')
+    self._single = bond( order=1)
+    self._prepare_query()
+    self._prepare_target()
+
+
+  def _prepare_query( self):
+    q = self.query
+    self.q_vertices = list( q.vertices)
+    self.q_index = dict( (v,i) for i,v in enumerate( self.q_vertices))
+    self.q_neighbors = [[(self.q_index[n], e) for e, n in v.get_neighbor_edge_pairs() if not e.disconnected]
+                        for v in self.q_vertices]
+    self.q_hs = [getattr( v, "explicit_hydrogens", 0) or 0 for v in self.q_vertices]
+    cg = q.get_compact_graph()
+    ring_edges = cg.get_ring_edges()
+    self.q_ring_edges = set( cg.edges[j] for j in range( len( cg.edges)) if ring_edges[j])
+    self.q_in_ring = [bool( [1 for n, e in ns if e in self.q_ring_edges]) for ns in self.q_neighbors]
+    # do we need to count the implicit hydrogens of the target?
+    self.implicit_hs = False
+    for v, hs in zip( self.q_vertices, self.q_hs):
+      if (isinstance( v, atom) and v.symbol == 'H') or hs > 0 or \
+         (isinstance( v, query_atom) and ('H' in v.symbols or 'R' in v.symbols)):
+        self.implicit_hs = True
+        break
+    if self.same_size:
+      # all the hydrogens are compared in _get_atom_key
+      self.implicit_hs = False
+      self.q_keys = [self._get_atom_key( v) for v in self.q_vertices]
+    # vertices that may match an implicit hydrogen of the target
+    self.q_can_be_implicit_h = [self.implicit_hs and self.implicit_hydrogens and len( ns) == 1 and not hs and self._vertex_matches( v, self._h) and self._single.matches( ns[0][1])
+                                for v, ns, hs in zip( self.q_vertices, self.q_neighbors, self.q_hs)]
+
+
+  def _prepare_target( self):
+    cg = self.target.get_compact_graph()
+    self.cg = cg
+    self.t_ring_edges = cg.get_ring_edges()
+    self.t_in_ring = bytearray( len( cg.vertices))
+    for j in range( len( cg.edges)):
+      if self.t_ring_edges[j]:
+        self.t_in_ring[ cg.edge_v1[j]] = 1
+        self.t_in_ring[ cg.edge_v2[j]] = 1
+    if self.implicit_hs or not self.implicit_hydrogens:
+      self.t_implicit_hs = [max( 0, getattr( v, "free_valency", 0)) for v in cg.vertices]
+    else:
+      self.t_implicit_hs = len( cg.vertices) * [0]
+    self.t_explicit_hs = [getattr( v, "explicit_hydrogens", 0) or 0 for v in cg.vertices]
+    if self.same_size:
+      self.t_keys = [self._get_atom_key( v) for v in cg.vertices]
+
+
+  @staticmethod
+  def _vertex_matches( q, t):
+    """query_atoms know how to match, for atoms we ask the target atom
+    (its charge must be the same only when the query is charged)"""
+    if isinstance( q, query_atom):
+      return q.matches( t)
+    return t.matches( q)
+
+
+  @staticmethod
+  def _get_atom_key( v):
+    hs = (getattr( v, "explicit_hydrogens", 0) or 0) + max( 0, getattr( v, "free_valency", 0))
+    return (getattr( v, "symbol", None), getattr( v, "isotope", None) or 0, getattr( v, "charge", 0),
+            hs, getattr( v, "valency", 0), getattr( v, "multiplicity", 1))
+
+
+  @staticmethod
+  def _get_bond_code( e):
+    return e.aromatic and 4 or e.order
+
+
+  def _get_domains( self):
+    """for each query vertex the set of target vertex indexes it may be mapped on"""
+    cg = self.cg
+    if self.same_size:
+      t_degrees = cg.get_degrees()
+      return [set( j for j in range( len( cg.vertices))
+                   if t_degrees[j] == len( self.q_neighbors[i]) and self.t_keys[j] == self.q_keys[i] and (not self.q_in_ring[i] or self.t_in_ring[j]))
+              for i in range( len( self.q_vertices))]
+    t_degrees = [d + h + x for d, h, x in zip( cg.get_degrees(), self.t_implicit_hs, self.t_explicit_hs)]
+    domains = []
+    for i, v in enumerate( self.q_vertices):
+      degree = len( self.q_neighbors[i]) + self.q_hs[i]
+      in_ring = self.q_in_ring[i]
+      domains.append( set( j for j, t in enumerate( cg.vertices)
+                           if t_degrees[j] >= degree and (not in_ring or self.t_in_ring[j]) and self._vertex_matches( v, t)))
+    return domains
+
+
+  def _get_order( self, domains):
+    """order in which the query vertices are placed and the already placed
+    neighbor (parent) of each of them (None for the first one of a component)"""
+    n = len( self.q_vertices)
+    placed = n * [False]
+    order = []
+    parents = []
+    while len( order) < n:
+      # a new component starts from the vertex with the least candidates,
+      # the ones that may be implicit hydrogens are left for later
+      root = min( [i for i in range( n) if not placed[i]],
+                  key=lambda i: (self.q_can_be_implicit_h[i], len( domains[i]), i))
+      placed[root] = True
+      order.append( root)
+      parents.append( None)
+      while True:
+        best = None
+        for i in range( n):
+          if placed[i]:
+            continue
+          links = [m for m, e in self.q_neighbors[i] if placed[m]]
+          if not links:
+            continue
+          key = (-len( links), self.q_can_be_implicit_h[i], len( domains[i]), i)
+          if best is None or key < best[0]:
+            best = (key, i, links[0])
+        if best is None:
+          break
+        placed[ best[1]] = True
+        order.append( best[1])
+        parents.append( best[2])
+    return order, parents
+
+
+  def _find_edge( self, t1, t2):
+    cg = self.cg
+    for k in range( cg.indptr[t1], cg.indptr[t1+1]):
+      if cg.indices[k] == t2:
+        yield cg.edge_ids[k]
+
+
+  def _edge_fits( self, qe, j):
+    if self.same_size:
+      if self.bond_orders and self._get_bond_code( self.cg.edges[j]) != self._get_bond_code( qe):
+        return False
+    elif not self.cg.edges[j].matches( qe):
+      return False
+    return qe not in self.q_ring_edges or self.t_ring_edges[j]
+
+
+  def _get_candidates( self, i, parent, mapping, used, implicit_used, domains):
+    """candidates for query vertex i; the target vertex index or -1-t for an implicit
+    hydrogen of target vertex t"""
+    cg = self.cg
+    domain = domains[i]
+    placed = [(mapping[m], e) for m, e in self.q_neighbors[i] if mapping[m] is not None]
+    if parent is None:
+      for t in sorted( domain):
+        if not used[t]:
+          yield t
+      return
+    tp = mapping[ parent]
+    if tp < 0:
+      # implicit hydrogens have no other neighbors
+      return
+    qe = [e for m, e in self.q_neighbors[i] if m == parent][0]
+    for k in range( cg.indptr[tp], cg.indptr[tp+1]):
+      t = cg.indices[k]
+      if used[t] or t not in domain or not self._edge_fits( qe, cg.edge_ids[k]):
+        continue
+      for tm, e in placed:
+        if tm == tp and e is qe:
+          continue
+        if tm < 0 or not [j for j in self._find_edge( t, tm) if self._edge_fits( e, j)]:
+          break
+      else:
+        yield t
+    if self.q_can_be_implicit_h[i] and implicit_used[tp] < self.t_implicit_hs[tp]:
+      # the implicit hydrogens are all the same, we try just one of them
+      yield -1-tp
+
+
+  def _place_query_hydrogens( self, mapping, used, implicit_used):
+    """the explicit_hydrogens of query atoms are matched by hydrogen atoms or implicit
+    hydrogens of the target (the first free ones, they are all equivalent);
+    returns the hydrogen atoms and the implicit hydrogens used and success"""
+    cg = self.cg
+    hs = []
+    implicit = []
+    for i, n in enumerate( self.q_hs):
+      if not n:
+        continue
+      t = mapping[i]
+      if t < 0:
+        return hs, implicit, False
+      for k in range( cg.indptr[t], cg.indptr[t+1]):
+        h = cg.indices[k]
+        if n and not used[h] and cg.vertices[h].matches( self._h) and cg.edges[ cg.edge_ids[k]].matches( self._single):
+          used[h] = 1
+          hs.append( h)
+          n -= 1
+      m = min( n, self.t_implicit_hs[t] - implicit_used[t])
+      if m and self.implicit_hydrogens:
+        implicit_used[t] += m
+        implicit.append( (t, m))
+        n -= m
+      if n:
+        return hs, implicit, False
+    return hs, implicit, True
+
+
+  def _freesites_match( self, mapping, used, implicit_used):
+    """unmatched neighbors of the target atoms must fit into the free_sites of the query atoms"""
+    cg = self.cg
+    for i, v in enumerate( self.q_vertices):
+      t = mapping[i]
+      if t < 0:
+        continue
+      unmatched = len( [1 for k in range( cg.indptr[t], cg.indptr[t+1]) if not used[ cg.indices[k]]])
+      unmatched += self.t_explicit_hs[t] + self.t_implicit_hs[t] - implicit_used[t]
+      if self.implicit_freesites:
+        free_sites = v.free_valency
+      else:
+        free_sites = v.free_sites
+      if unmatched > free_sites:
+        return False
+    return True
+
+
+  def get_matches( self):
+    """yields the matches as lists of target vertices in the order of query.vertices
+    followed by the hydrogen atoms matched by explicit_hydrogens of the query; query
+    vertices matched to implicit hydrogens are left out. Matches made of the same
+    atoms are reported only once."""
+    for mapping, hs in self._get_raw_matches( unique=True):
+      yield [self.cg.vertices[t] for t in mapping if t >= 0] + [self.cg.vertices[h] for h in hs]
+
+
+  def get_mappings( self, unique=False):
+    """yields the matches as dictionaries {query vertex: target vertex}, query vertices
+    matched to implicit hydrogens are left out; all the mappings are reported (also
+    the symmetrical ones) unless unique is set"""
+    for mapping, hs in self._get_raw_matches( unique=unique):
+      yield dict( (self.q_vertices[i], self.cg.vertices[t]) for i, t in enumerate( mapping) if t >= 0)
+
+
+  def _get_raw_matches( self, unique=True):
+    n = len( self.q_vertices)
+    if not n:
+      return
+    if self.same_size and (n != len( self.cg.vertices) or len( self.query.edges) != len( self.cg.edges)):
+      return
+    domains = self._get_domains()
+    for i in range( n):
+      if not domains[i] and not self.q_can_be_implicit_h[i]:
+        return
+    order, parents = self._get_order( domains)
+    mapping = n * [None]
+    used = bytearray( len( self.cg.vertices))
+    implicit_used = len( self.cg.vertices) * [0]
+    seen = set()
+    # explicit stack of candidate generators, one for each placed query vertex
+    stack = [self._get_candidates( order[0], parents[0], mapping, used, implicit_used, domains)]
+    while stack:
+      depth = len( stack) - 1
+      i = order[depth]
+      # undo the previous candidate of this level
+      t = mapping[i]
+      if t is not None:
+        if t < 0:
+          implicit_used[-1-t] -= 1
+        else:
+          used[t] = 0
+        mapping[i] = None
+      try:
+        t = next( stack[-1])
+      except StopIteration:
+        stack.pop()
+        continue
+      mapping[i] = t
+      if t < 0:
+        implicit_used[-1-t] += 1
+      else:
+        used[t] = 1
+      if depth + 1 < n:
+        stack.append( self._get_candidates( order[depth+1], parents[depth+1], mapping, used, implicit_used, domains))
+        continue
+      # a complete mapping
+      if self.same_size:
+        # all the atoms are matched and have the same hydrogens
+        yield list( mapping), []
+        continue
+      hs, implicit, ok = self._place_query_hydrogens( mapping, used, implicit_used)
+      if ok and self._freesites_match( mapping, used, implicit_used):
+        key = frozenset( [t for t in mapping if t >= 0] + hs)
+        if not unique or key not in seen:
+          seen.add( key)
+          yield list( mapping), hs
+      # return the hydrogens taken by _place_query_hydrogens
+      for h in hs:
+        used[h] = 0
+      for t, m in implicit:
+        implicit_used[t] -= m
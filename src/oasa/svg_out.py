@@ -122,7 +122,7 @@ class svg_out(object):
       side = 0
       # find how to center the bonds
       # rings have higher priority in setting the positioning
-      for ring in self.molecule.get_smallest_independent_cycles():
+      for ring in self.molecule.get_ring_info().sssr:
         if v1 in ring and v2 in ring:
           side += sum(geometry.on_which_side_is_point(start + end, self.transformer.transform_xy(a.x, a.y))
                           for a in ring
@@ -0,0 +1,532 @@
+"""Timing of selected OASA algorithms.
+
+Run from the main directory as 'python -m tests.benchmark [name ...]',
+without names all the benchmarks are run.
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+import warnings
+
+from src.oasa import smiles
+from src.oasa.molecule import molecule
+
+
+def timeit( f, repeat=3):
+  """returns the best time of repeat calls of f and its last result"""
+  best = None
+  for i in range( repeat):
+    t = time.time()
+    ret = f()
+    t = time.time() - t
+    if best is None or t < best:
+      best = t
+  return best, ret
+
+
+def honeycomb( rows, cols):
+  """molecule with a rows x cols patch of fused hexagons (a graphene sheet)
+  built as a brick wall - vertex (r,c) is bonded to (r+1,c) when r+c is even"""
+  width = 2*cols + 1
+  index = lambda r, c: r*(width+1) + c
+  bonds = []
+  for r in range( rows+1):
+    for c in range( width):
+      bonds.append( (index( r, c), index( r, c+1)))
+  for r in range( rows):
+    for c in range( width+1):
+      if (r+c) % 2 == 0:
+        bonds.append( (index( r, c), index( r+1, c)))
+  return molecule.from_arrays( (rows+1)*(width+1)*["C"], bonds)
+
+
+
+## GRAPH BUILDING
+
+def graph_building_benchmark( sizes=(4000, 8000, 16000)):
+  """chains built atom by atom with add_vertex and add_edge, as the readers do"""
+  def build( n):
+    mol = molecule()
+    last = None
+    for i in range( n):
+      v = mol.add_vertex( mol.create_vertex())
+      if last:
+        mol.add_edge( last, v)
+      last = v
+    return mol
+  print( "%6s %10s" % ("atoms", "time [s]"))
+  for n in sizes:
+    t, mol = timeit( lambda: build( n))
+    print( "%6d %10.3f" % (n, t))
+
+
+
+## RING PERCEPTION
+
+fused_rings = [("adamantane", "C1C2CC3CC1CC(C2)C3"),
+               ("cubane", "C12C3C4C1C5C2C3C45"),
+               ("cholesterol", "CC(C)CCCC(C)C1CCC2C1(CCC3C2CC=C4C3(CCC(C4)O)C)C"),
+               ("coronene", "c1cc2ccc3ccc4ccc5ccc6ccc1c7c2c3c4c5c67"),
+               ("porphin", "c1cc2cc3ccc(cc4ccc(cc5ccc(cc1n2)[nH]5)n4)[nH]3"),
+               ("dodecahedrane", "C12C3C4C5C1C6C7C2C8C3C9C4C%10C5C6C%11C7C8C9C%10%11"),
+               ("C60", "c12c3c4c5c1c1c6c7c2c2c8c3c3c9c4c4c%10c5c5c1c1c6c6c%11c7c2c2c7c8c3c3c8c9c4c4c9c%10c5c5c1c1c6c6c%11c2c2c7c3c3c8c4c4c9c5c1c1c6c2c3c41"),
+               ]
+
+def ring_perception_benchmark():
+  """minimum cycle basis (Vismara) compared to the previous SSSR code"""
+  mols = [(name, smiles.text_to_mol( smile, calc_coords=0)) for name, smile in fused_rings]
+  mols += [("honeycomb %dx%d" % (n,n), honeycomb( n, n)) for n in (3, 6, 10)]
+  print( "%-18s %5s %5s %6s %10s %10s %6s" % ("molecule", "atoms", "bonds", "rings", "old [ms]", "new [ms]", "same"))
+  for name, mol in mols:
+    cg = mol.get_compact_graph()
+    ncycles = len( cg.edges) - len( cg.vertices) + len( cg.get_connected_components())
+    with warnings.catch_warnings():
+      warnings.simplefilter( "ignore")
+      t_old, old = timeit( cg.get_smallest_independent_cycles_e_old)
+    t_new, new = timeit( cg.get_smallest_independent_cycles_e)
+    assert len( new) == ncycles
+    same = sorted( map( len, old)) == sorted( map( len, new))
+    print( "%-18s %5d %5d %6d %10.2f %10.2f %6s" % (name, len( cg.vertices), len( cg.edges), ncycles, 1000*t_old, 1000*t_new, same and "yes" or "no"))
+
+
+## SUBSTRUCTURE SCREENING
+
+annotation_workload = ["CC(=O)Oc1ccccc1C(=O)O", "CN1C=NC2=C1C(=O)N(C(=O)N2C)C", "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
+                       "CC(=O)Nc1ccc(O)cc1", "OC(=O)C(N)Cc1ccccc1", "CCOC(=O)C", "CC(C)=NO", "ClCC(=O)Cl",
+                       "C[N+](=O)[O-]", "OCC(O)CO", "CC(=O)OC(C)=O", "CS(=O)(=O)O", "CC#N", "CN(C)C",
+                       "O=C1CCCC1", "NCCc1ccc(O)c(O)c1", "COc1ccc2[nH]cc(CCN(C)C)c2c1", "CC(C)NCC(O)c1ccc(O)c(O)c1",
+                       "OC(=O)c1ccccc1O", "CCN(CC)C(=O)C1CN(C)C2Cc3c[nH]c4cccc(C2=C1)c34",
+                       "CC(C)CCCC(C)C1CCC2C1(CCC3C2CC=C4C3(CCC(C4)O)C)C", "Brc1ccc(cc1)C(=O)Cl",
+                       "CCSCC", "CC(=O)SC", "C=CC(=O)OC", "OC1C(O)C(O)C(O)C(O)C1O"]
+
+def substructure_screening_benchmark():
+  """functional group annotation with and without the fingerprint screening"""
+  from src.oasa import subsearch
+  ssm = subsearch.substructure_search_manager()
+  mols = [smiles.text_to_mol( smile, calc_coords=0) for smile in annotation_workload]
+  structs = [v.value for v in ssm.structures.vertices]
+  def unscreened():
+    return sum( len( s.find_matches( mol)) for mol in mols for s in structs)
+  def screened():
+    return sum( len( ssm.find_matches_in_mol( mol)) for mol in mols)
+  t_all, n_all = timeit( unscreened, repeat=1)
+  t_scr, n_scr = timeit( screened, repeat=1)
+  assert n_all == n_scr
+  print( "%d molecules, %d substructures, %d matches" % (len( mols), len( structs), n_all))
+  print( "without screening %.1f ms, with screening %.1f ms" % (1000*t_all, 1000*t_scr))
+  print( ssm.get_screening_report())
+
+
+def subsearch_manager_benchmark():
+  """creation of the substructure search manager from the compiled data and from smiles"""
+  from src.oasa import subsearch
+  t_comp, ssm = timeit( subsearch.substructure_search_manager)
+  t_parse, ssm = timeit( lambda: subsearch.substructure_search_manager( use_compiled=False))
+  print( "%d substructures in %d search trees" % (len( ssm.structures.vertices), len( ssm.search_trees)))
+  print( "compiled %.1f ms, parsed %.1f ms" % (1000*t_comp, 1000*t_parse))
+
+
+
+## CANONICAL RANKING
+
+def distance_matrix_numbering( mol):
+  """the previous molecule.number_atoms_uniquely - the atoms sorted by
+  their distance matrices"""
+  out = dict( (v, mol._get_atom_distance_matrix( v)) for v in mol.vertices)
+  return [list( out.keys())[ list( out.values()).index( m)] for m in sorted( out.values())]
+
+def canonical_ranking_benchmark():
+  """canonical ranks compared to the distance matrices of all atoms"""
+  mols = [("chain %d" % n, smiles.text_to_mol( n*"C", calc_coords=0)) for n in (50, 200, 500)]
+  mols += [("polyglycine %d" % n, smiles.text_to_mol( "N"+n*"CC(=O)N"+"CC(=O)O", calc_coords=0)) for n in (10, 40, 120)]
+  mols += [("honeycomb %dx%d" % (n,n), honeycomb( n, n)) for n in (3, 8, 14)]
+  print( "%-18s %5s %10s %10s" % ("molecule", "atoms", "old [ms]", "new [ms]"))
+  for name, mol in mols:
+    t_old, old = timeit( lambda: distance_matrix_numbering( mol), repeat=1)
+    t_new, new = timeit( mol.get_canonical_ranks)
+    print( "%-18s %5d %10.1f %10.1f" % (name, len( mol.vertices), 1000*t_old, 1000*t_new))
+
+
+def equality_benchmark():
+  """equals at level 3 compared to the distance matrices and dedup by keys"""
+  from src.oasa.molecule import equals
+  texts = [smile for name, smile in fused_rings] + annotation_workload
+  pairs = [(smiles.text_to_mol( t, calc_coords=0), smiles.text_to_mol( t, calc_coords=0)) for t in texts]
+  pairs += [(honeycomb( n, n), honeycomb( n, n)) for n in (8, 14)]
+  def old():
+    for m1, m2 in pairs:
+      vs1 = [m1._get_atom_distance_matrix( v) for v in distance_matrix_numbering( m1)]
+      vs2 = [m2._get_atom_distance_matrix( v) for v in distance_matrix_numbering( m2)]
+      assert vs1 == vs2
+  def new():
+    for m1, m2 in pairs:
+      assert equals( m1, m2, level=3)
+  t_old, ret = timeit( old, repeat=1)
+  t_new, ret = timeit( new)
+  print( "%d pairs, distance matrices %.1f ms, equals %.1f ms" % (len( pairs), 1000*t_old, 1000*t_new))
+  mols = [m1 for m1, m2 in pairs[:-2]]
+  t, keys = timeit( lambda: set( m.get_key() for i in range( 20) for m in mols))
+  print( "%d unique of %d molecules, %.0f keys/s" % (len( keys), 20*len( mols), 20*len( mols)/t))
+
+
+
+## SMILES PARSING
+
+def smiles_parsing_benchmark( repeat=20):
+  """SMILES parsing throughput on the fused rings and the annotation workload"""
+  texts = [smile for name, smile in fused_rings] + annotation_workload
+  def parse():
+    for text in texts:
+      smiles.smiles().read_smiles( text)
+  def parse_and_localize():
+    for text in texts:
+      smiles.text_to_mol( text, calc_coords=0)
+  for title, f in (("read_smiles", parse), ("text_to_mol", parse_and_localize)):
+    t, ret = timeit( lambda: [f() for i in range( repeat)], repeat=5)
+    print( "%-12s %8.0f molecules/s" % (title, repeat*len( texts)/t))
+
+
+def smiles_writing_benchmark():
+  """canonical SMILES writing of growing chains and graphene sheets"""
+  mols = [("chain %d" % n, smiles.text_to_mol( n*"C", calc_coords=0)) for n in (100, 1000, 5000)]
+  mols += [("honeycomb %dx%d" % (n,n), honeycomb( n, n)) for n in (5, 10, 20)]
+  # every alanine is a stereo center
+  mols += [("stereo peptide %d" % n, smiles.text_to_mol( "N" + n*"[C@@H](C)C(=O)N" + "C/C=C/C", calc_coords=0))
+           for n in (100, 400, 800)]
+  print( "%-18s %5s %10s" % ("molecule", "atoms", "time [ms]"))
+  for name, mol in mols:
+    t, ret = timeit( lambda: smiles.mol_to_text( mol))
+    print( "%-18s %5d %10.2f" % (name, len( mol.vertices), 1000*t))
+
+
+
+## SMILES FILES
+
+def formula_of( mol):
+  return str( mol.get_formula_dict())
+
+def smiles_file_benchmark( lines=5000):
+  """reading of a SMILES file serially and in a pool of processes"""
+  import multiprocessing
+  import tempfile
+  import os
+  fd, name = tempfile.mkstemp( suffix=".smi")
+  with os.fdopen( fd, 'w') as f:
+    for i in range( lines):
+      f.write( "%s mol%d\n" % (annotation_workload[ i % len( annotation_workload)], i))
+  try:
+    runs = [("serial, molecules", dict( workers=1)),
+            ("serial, formulas", dict( workers=1, process=formula_of))]
+    for n in sorted( set( [2, max( 2, multiprocessing.cpu_count())])):
+      runs.append( ("%d workers, formulas" % n, dict( workers=n, process=formula_of)))
+    print( "%d lines, %d CPUs" % (lines, multiprocessing.cpu_count()))
+    for title, kw in runs:
+      t, n = timeit( lambda: sum( 1 for r in smiles.iter_smiles_file( name, **kw)), repeat=1)
+      print( "%-22s %8.2f s %8.0f lines/s" % (title, t, n/t))
+  finally:
+    os.remove( name)
+
+
+
+## SDF FILES
+
+def make_sdf_file( records):
+  """temporary SDF file with records of the annotation workload, the caller removes it"""
+  import tempfile
+  import os
+  from src.oasa import molfile
+  mols = [smiles.text_to_mol( smile) for smile in annotation_workload]
+  fd, name = tempfile.mkstemp( suffix=".sdf")
+  with os.fdopen( fd, 'w') as f:
+    for i in range( records):
+      f.write( molfile.mol_to_text( mols[ i % len( mols)]))
+      f.write( "\n> <ID>\nmol%d\n\n$$$$\n" % i)
+  return name
+
+def sdf_reading_benchmark( records=5000):
+  """reading of an SDF file with data items from a text file, a binary file and a mmap"""
+  import mmap
+  import os
+  from src.oasa import molfile
+  name = make_sdf_file( records)
+  size = os.path.getsize( name)
+  def read( mode, use_mmap=False):
+    with open( name, mode) as f:
+      if use_mmap:
+        f = mmap.mmap( f.fileno(), 0, access=mmap.ACCESS_READ)
+      return sum( 1 for m in molfile.converter().read_file( f))
+  try:
+    print( "%d records, %.1f MB" % (records, size/1e6))
+    for title, args in (("text file", ('r',)), ("binary file", ('rb',)), ("mmap", ('rb', True))):
+      t, n = timeit( lambda: read( *args), repeat=1)
+      assert n == records
+      print( "%-12s %8.2f s %8.0f records/s %6.1f MB/s" % (title, t, n/t, size/t/1e6))
+  finally:
+    os.remove( name)
+
+
+def sdf_dataset_benchmark( records=20000):
+  """indexing of an SDF file, random access to its records and processing in a pool of processes"""
+  import multiprocessing
+  import random
+  import os
+  from src.oasa import molfile
+  name = make_sdf_file( records)
+  try:
+    print( "%d records, %.1f MB, %d CPUs" % (records, os.path.getsize( name)/1e6, multiprocessing.cpu_count()))
+    t, offsets = timeit( lambda: molfile.build_sdf_index( name), repeat=1)
+    print( "index built in %.1f ms" % (1000*t))
+    t, data = timeit( lambda: molfile.sdf_dataset( name), repeat=1)
+    print( "index loaded in %.1f ms" % (1000*t))
+    picks = [random.randrange( records) for i in range( 1000)]
+    t, mols = timeit( lambda: [data[i] for i in picks], repeat=1)
+    print( "random access %.2f ms per record" % (1000*t/len( picks)))
+    for n in sorted( set( [1, 2, max( 2, multiprocessing.cpu_count())])):
+      t, count = timeit( lambda: sum( 1 for r in data.map( formula_of, workers=n)), repeat=1)
+      print( "map, %d workers %8.2f s %8.0f records/s" % (n, t, count/t))
+    data.close()
+  finally:
+    os.remove( name)
+    if os.path.exists( name+".idx"):
+      os.remove( name+".idx")
+
+
+def molfile_writing_benchmark():
+  """molfile writing of graphene sheets, the largest ones are written as V3000"""
+  from src.oasa import molfile
+  try:
+    from io import StringIO
+  except ImportError:
+    from cStringIO import StringIO
+  print( "%-18s %5s %6s %10s" % ("molecule", "atoms", "format", "time [ms]"))
+  for n in (5, 10, 20, 40):
+    mol = honeycomb( n, n)
+    for i, a in enumerate( mol.vertices):
+      a.coords = (float( i), 0.0, 0.0)
+    writer = molfile.molfile( mol)
+    t, ret = timeit( lambda: writer.write_file( StringIO()))
+    print( "%-18s %5d %6s %10.2f" % ("honeycomb %dx%d" % (n,n), len( mol.vertices), writer._get_version(), 1000*t))
+
+
+
+
+## INCHI GENERATION
+
+def inchi_generation_benchmark( count=200):
+  """InChI program started for each molecule compared to long running programs,
+  a stub standing in for the InChI program shows the cost of starting it"""
+  import multiprocessing
+  import tempfile
+  import shutil
+  import os
+  from src.oasa import inchi
+  from tests.unittests import inchi_stub
+  mols = [smiles.text_to_mol( annotation_workload[ i % len( annotation_workload)]) for i in range( count)]
+  tmp = tempfile.mkdtemp()
+  try:
+    program = os.path.join( tmp, "inchi-stub")
+    with open( program, 'w') as f:
+      f.write( "#!%s\n" % sys.executable)
+      f.write( inchi_stub)
+    os.chmod( program, 0o755)
+    t, ret = timeit( lambda: [inchi.generate_inchi_and_inchikey( m, program=program) for m in mols], repeat=1)
+    print( "%d molecules, %d CPUs" % (count, multiprocessing.cpu_count()))
+    print( "%-22s %8.2f s %8.0f molecules/s" % ("process per molecule", t, count/t))
+    for n in sorted( set( [1, 2, multiprocessing.cpu_count()])):
+      t, ret = timeit( lambda: list( inchi.generate_inchis( mols, program=program, workers=n)), repeat=1)
+      assert [r[2] for r in ret] == count*[None]
+      print( "%-22s %8.2f s %8.0f molecules/s" % ("%d long running" % n, t, count/t))
+  finally:
+    shutil.rmtree( tmp)
+
+
+
+
+## INCHIKEYS
+
+def inchi_key_benchmark( count=1000000):
+  """InChIKeys of an InChI file with many stereoisomers, with and without the memo of major layers"""
+  import tempfile
+  import os
+  from src.oasa import inchi_key
+  bases = ["InChI=1S/C3H7NO2/c1-2(4)3(5)6/h2H,4H2,1H3,(H,5,6)",
+           "InChI=1S/C6H10/c1-3-5-6-4-2/h3-6H,1-2H3",
+           "InChI=1S/C8H10N4O2/c1-10-4-9-6-5(10)7(13)12(3)8(14)11(6)2/h4H,1-3H3",
+           "InChI=1S/C27H46O/c1-18(2)7-6-8-19(3)23-11-12-24-22-10-9-20-17-21(28)13-15-26(20,4)25(22)14-16-27(23,24)5/h9,18-19,21-25,28H,6-8,10-17H2,1-5H3"]
+  fd, name = tempfile.mkstemp( suffix=".txt")
+  with os.fdopen( fd, 'w') as f:
+    for i in range( count):
+      # few major layers, each with many isotopic and stereo layers
+      f.write( "%s/i%dD/t%d-/m%d/s1\n" % (bases[ i % len( bases)], i % 1000, (i // 1000) % 50, i % 2))
+  def run():
+    with open( name) as f:
+      return sum( 1 for key in inchi_key.keys_from_inchis( f) if key)
+  try:
+    t, n = timeit( run, repeat=1)
+    assert n == count
+    print( "%d InChIs" % count)
+    print( "%-18s %8.2f s %10.0f keys/s" % ("memo", t, n/t))
+    memo = inchi_key._major_digests
+    inchi_key._major_digests = inchi_key._digest_cache( inchi_key.major_digest, size=1)
+    try:
+      t, n = timeit( run, repeat=1)
+    finally:
+      inchi_key._major_digests = memo
+    print( "%-18s %8.2f s %10.0f keys/s" % ("no memo", t, n/t))
+  finally:
+    os.remove( name)
+
+
+
+
+## INCHI READING
+
+inchi_workload = ["InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3",
+                  "InChI=1S/C8H10N4O2/c1-10-4-9-6-5(10)7(13)12(3)8(14)11(6)2/h4H,1-3H3",
+                  "InChI=1S/C2H4O2/c1-2(3)4/h1H3,(H,3,4)/p-1",
+                  "InChI=1S/C3H7NO2/c1-2(4)3(5)6/h2H,4H2,1H3,(H,5,6)/t2-/m0/s1",
+                  "InChI=1S/C9H8O4/c1-6(10)13-8-5-3-2-4-7(8)9(11)12/h2-5H,1H3,(H,11,12)",
+                  "InChI=1S/C10H8/c1-2-6-10-8-4-3-7-9(10)5-1/h1-8H",
+                  "InChI=1S/C6H5NO2/c8-7(9)6-4-2-1-3-5-6/h1-5H",
+                  "InChI=1S/C13H18O2/c1-9(2)8-11-4-6-12(7-5-11)10(3)13(14)15/h4-7,9-10H,8H2,1-3H3,(H,14,15)",
+                  "InChI=1S/C8H7N/c1-2-4-8-7(3-1)5-6-9-8/h1-6,9H",
+                  "InChI=1S/C4H4S/c1-2-4-5-3-1/h1-4H",
+                  "InChI=1S/H2O4S/c1-5(2,3)4/h(H2,1,2,3,4)",
+                  "InChI=1S/C14H10/c1-2-6-12-10-14-8-4-3-7-13(14)9-11(12)5-1/h1-10H",
+                  "InChI=1S/C24H12/c1-2-14-5-6-16-9-11-18-12-10-17-8-7-15-4-3-13(1)19-20(14)22(16)24(18)23(17)21(15)19/h1-12H",
+                  "InChI=1S/C27H46O/c1-18(2)7-6-8-19(3)23-11-12-24-22-10-9-20-17-21(28)13-15-26(20,4)25(22)14-16-27(23,24)5/h9,18-19,21-25,28H,6-8,10-17H2,1-5H3",
+                  ]
+
+def inchi_reading_benchmark( count=3000):
+  """conversion of an InChI file to molecules"""
+  import tempfile
+  import os
+  from src.oasa import inchi
+  fd, name = tempfile.mkstemp( suffix=".txt")
+  with os.fdopen( fd, 'w') as f:
+    for i in range( count):
+      f.write( inchi_workload[ i % len( inchi_workload)] + "\n")
+  def read():
+    with open( name) as f:
+      return [inchi.text_to_mol( line.strip(), calc_coords=0) for line in f]
+  try:
+    t, mols = timeit( read, repeat=1)
+    print( "%d InChIs %8.2f s %8.0f molecules/s" % (count, t, count/t))
+  finally:
+    os.remove( name)
+
+
+## COORDINATES OPTIMIZATION
+
+def coords_optimizer_benchmark( sizes=(10, 40, 160, 640)):
+  """optimization of stretched coordinates of branched chains with lists and with numpy"""
+  from src.oasa import coords_optimizer
+  def optimize( mol, coords, numpy_min_atoms):
+    for v, (x, y) in zip( mol.vertices, coords):
+      v.x = 1.3 * x
+      v.y = y
+    opt = coords_optimizer.coords_optimizer()
+    opt.numpy_min_atoms = numpy_min_atoms
+    opt.optimize_coords( mol, bond_length=1)
+    return opt.i
+  print( "%6s %6s %12s %12s" % ("atoms", "steps", "lists [ms]", "numpy [ms]"))
+  for n in sizes:
+    mol = smiles.text_to_mol( (n//2) * "C(C)")
+    coords = [(v.x, v.y) for v in mol.vertices]
+    t_py, steps = timeit( lambda: optimize( mol, coords, None))
+    if coords_optimizer.numpy is not None:
+      t_np = "%12.1f" % (1000*timeit( lambda: optimize( mol, coords, 0))[0])
+    else:
+      t_np = "%12s" % "-"
+    print( "%6d %6d %12.1f %s" % (len( mol.vertices), steps, 1000*t_py, t_np))
+
+
+def coords_repulsion_benchmark( sizes=(250, 500, 1000, 2000)):
+  """20 optimization steps of disturbed chains with the repulsion of non-bonded atoms"""
+  import random
+  from src.oasa import coords_optimizer
+  def optimize( mol, coords):
+    for v, (x, y) in zip( mol.vertices, coords):
+      v.x, v.y = x, y
+    opt = coords_optimizer.coords_optimizer()
+    opt.numpy_min_atoms = None
+    opt.repulsion = 0.5
+    opt.max_iter_number = 20
+    opt.optimize_coords( mol, bond_length=1)
+  print( "%6s %10s" % ("atoms", "time [ms]"))
+  rnd = random.Random( 1)
+  for n in sizes:
+    mol = smiles.text_to_mol( n*"C")
+    coords = [(v.x + rnd.uniform( -0.3, 0.3), v.y + rnd.uniform( -0.3, 0.3)) for v in mol.vertices]
+    t, ret = timeit( lambda: optimize( mol, coords))
+    print( "%6d %10.1f" % (n, 1000*t))
+
+
+## COORDINATES GENERATION
+
+def acene( rings):
+  """molecule with a linear chain of fused hexagons built as a ladder - top and
+  bottom rails bonded at every other atom"""
+  length = 2*rings + 1
+  bonds = [(i, i+1) for i in range( length-1)]
+  bonds += [(length+i, length+i+1) for i in range( length-1)]
+  bonds += [(i, length+i) for i in range( 0, length, 2)]
+  return molecule.from_arrays( 2*length*["C"], bonds)
+
+
+def coords_generation_benchmark( sizes=(10, 100, 500, 2000)):
+  """2D coordinates of chains, macrocycles and fused rings, the ring perception
+  is done before the timing"""
+  from src.oasa import coords_generator
+  makers = [("chain", lambda n: smiles.text_to_mol( "C" + (n//3) * "C(C)C", calc_coords=0)),
+            ("macrocycle", lambda n: smiles.text_to_mol( "C1" + (n-2) * "C" + "C1", calc_coords=0)),
+            ("ring chain", lambda n: smiles.text_to_mol( (n//7) * "C1CCC(CC1)C", calc_coords=0)),
+            ("fused rings", lambda n: acene( n//4)),
+            ]
+  print( "%-12s %6s %10s %14s" % ("molecule", "atoms", "time [ms]", "per atom [us]"))
+  for name, maker in makers:
+    for n in sizes:
+      mol = maker( n)
+      mol.get_ring_info()
+      t, _ = timeit( lambda: coords_generator.calculate_coords( mol, bond_length=1, force=1))
+      print( "%-12s %6d %10.1f %14.1f" % (name, len( mol.vertices), 1000*t, 1e6*t/len( mol.vertices)))
+
+
+
+## OVERLAP RESOLUTION
+
+def overlap_resolution_benchmark():
+  """atoms closer than half of the bond length in 2D coords generated with and
+  without the overlap resolution"""
+  from src.oasa import coords_generator
+  texts = [("leucine hexapeptide", "CC(C)CC(C(=O)NC(CC(C)C)C(=O)NC(CC(C)C)C(=O)NC(CC(C)C)C(=O)O)NC(=O)C(CC(C)C)NC(=O)C(CC(C)C)N"),
+           ("maltotriose", "OCC1OC(OC2C(CO)OC(OC3C(CO)OC(O)C(O)C3O)C(O)C2O)C(O)C(O)C1O"),
+           ("boc peptide", "CC(C)(C)OC(=O)NC(Cc1ccccc1)C(=O)NC(CC(C)C)C(=O)NC(Cc1ccc(O)cc1)C(=O)OC(C)(C)C"),
+           ("tristearin", "CCCCCCCCCCCCCCCCCC(=O)OCC(COC(=O)CCCCCCCCCCCCCCCCC)OC(=O)CCCCCCCCCCCCCCCCC"),
+           ("ring chain", 100 * "C1CCC(CC1)C"),
+           ("leucine 100-peptide", "N" + 100 * "C(CC(C)C)C(=O)N" + "C(=O)O"),
+           ("leucine 400-peptide", "N" + 400 * "C(CC(C)C)C(=O)N" + "C(=O)O"),
+           ]
+  passes = coords_generator.coords_generator.max_overlap_passes
+  print( "%-20s %6s %16s %16s" % ("molecule", "atoms", "off [ms/clash]", "on [ms/clash]"))
+  for name, text in texts:
+    mol = smiles.text_to_mol( text, calc_coords=0)
+    mol.get_ring_info()
+    results = []
+    for p in (0, passes):
+      coords_generator.coords_generator.max_overlap_passes = p
+      t, _ = timeit( lambda: coords_generator.calculate_coords( mol, bond_length=1, force=1))
+      results.append( "%9.1f/%6d" % (1000*t, len( mol.get_spatial_index().get_close_pairs( 0.5))))
+    coords_generator.coords_generator.max_overlap_passes = passes
+    print( "%-20s %6d %16s %16s" % (name, len( mol.vertices), results[0], results[1]))
+
+
+
+if __name__ == '__main__':
+  names = sys.argv[1:] or sorted( k[:-len( "_benchmark")] for k in dir() if k.endswith( "_benchmark"))
+  for name in names:
+    print( "## %s" % name)
+    globals()[ name+"_benchmark"]()
+    print()
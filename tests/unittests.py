@@ -17,11 +17,26 @@
 
 #--------------------------------------------------------------------------
 
+import io
+import math
+import os
+import random
 import unittest
 
 from src.oasa import linear_formula
 from src.oasa import smiles
-from src.oasa.molecule import equals
+from src.oasa import molfile
+from src.oasa import inchi
+from src.oasa import inchi_key
+from src.oasa import coords_generator
+from src.oasa import ring_templates
+from src.oasa import coords_optimizer
+from src.oasa.spatial_index import spatial_index
+from src.oasa import graph
+from src.oasa import fingerprint
+from src.oasa import subsearch
+from src.oasa import oasa_exceptions
+from src.oasa.molecule import molecule, equals
 
 
 
@@ -97,6 +112,137 @@ for i in range( len( TestSubstructure.formulas)):
 ## // substructure testing
 
 
+## Substructure matcher testing
+
+class TestSubstructureMatcher(unittest.TestCase):
+  """tests the non-modifying substructure matcher"""
+
+  formulas = [("c1ccccc1","c1ccccc1",6,1),  # molecule, fragment, number of mappings, number of unique matches
+              ("CC(=O)OCC(=O)O","C(=O)O",2,2),
+              ("CCCC","CC",6,3),
+              ("C1CCCCC1CC","CCC",18,9),
+              ("C(=O)O","C(=O)OH",1,1),
+              ("OCCO","OCCO",2,1),
+              ("CCCCCC","C1CCCCC1",0,0),  # ring fragment does not match chain
+              ]
+
+  def _testformula(self, num):
+    smile1, smile2, mappings, matches = self.formulas[num]
+    m1 = smiles.text_to_mol( smile1, calc_coords=0)
+    m2 = smiles.text_to_mol( smile2, calc_coords=0)
+    atoms1, bonds1 = len( m1.vertices), len( m1.edges)
+    atoms2, bonds2 = len( m2.vertices), len( m2.edges)
+    self.assertEqual( len( list( m1.get_substructure_mappings( m2, implicit_freesites=True))), mappings)
+    self.assertEqual( len( list( m1.select_matching_substructures( m2, implicit_freesites=True))), matches)
+    for mapping in m1.get_substructure_mappings( m2, implicit_freesites=True):
+      for a2, a1 in mapping.items():
+        self.assertEqual( a1.symbol, a2.symbol)
+    # nothing is changed by the search
+    self.assertEqual( (len( m1.vertices), len( m1.edges)), (atoms1, bonds1))
+    self.assertEqual( (len( m2.vertices), len( m2.edges)), (atoms2, bonds2))
+    self.assertFalse( [a for a in m1.vertices + m2.vertices if 'subsearch' in a.properties_])
+
+  def test_threads(self):
+    import threading
+    mol = smiles.text_to_mol( "CC(=O)OCC(=O)OCC(=O)OCC(=O)O", calc_coords=0)
+    frag = smiles.text_to_mol( "C(=O)O", calc_coords=0)
+    results = []
+    def search():
+      for i in range( 20):
+        results.append( len( list( mol.select_matching_substructures( frag, implicit_freesites=True))))
+    threads = [threading.Thread( target=search) for i in range( 4)]
+    for t in threads:
+      t.start()
+    for t in threads:
+      t.join()
+    self.assertEqual( results, 80*[4])
+
+# this creates individual test for the substructure matcher
+for i in range( len( TestSubstructureMatcher.formulas)):
+  setattr( TestSubstructureMatcher, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Substructure matcher testing
+
+
+## Screening fingerprint testing
+
+class TestFingerprint(unittest.TestCase):
+  """fingerprint of a fragment must be contained in the one of a molecule containing it"""
+
+  def test_substructures(self):
+    for smile1, smile2, result in TestSubstructure.formulas:
+      m1 = smiles.text_to_mol( smile1, calc_coords=0)
+      m2 = smiles.text_to_mol( smile2, calc_coords=0)
+      may = fingerprint.may_contain( fingerprint.get_fingerprint( m1), fingerprint.get_fingerprint( m2))
+      if m1.contains_substructure( m2):
+        self.assertTrue( may)
+
+  def test_screening(self):
+    self.assertFalse( fingerprint.may_contain( fingerprint.get_fingerprint( smiles.text_to_mol( "CCCC", calc_coords=0)),
+                                               fingerprint.get_fingerprint( smiles.text_to_mol( "CO", calc_coords=0))))
+    self.assertFalse( fingerprint.may_contain( fingerprint.get_fingerprint( smiles.text_to_mol( "CCO", calc_coords=0)),
+                                               fingerprint.get_fingerprint( smiles.text_to_mol( "C=O", calc_coords=0))))
+    self.assertFalse( fingerprint.may_contain( fingerprint.get_fingerprint( smiles.text_to_mol( "OCCO", calc_coords=0)),
+                                               fingerprint.get_fingerprint( smiles.text_to_mol( "OCCCO", calc_coords=0))))
+
+  def test_manager(self):
+    ssm = subsearch.substructure_search_manager()
+    for smile in ("CC(=O)Oc1ccccc1C(=O)O", "CN1C=NC2=C1C(=O)N(C(=O)N2C)C", "NCC(=O)O", "ClCC(=O)Cl"):
+      mol = smiles.text_to_mol( smile, calc_coords=0)
+      all_hits = [(h.substructure, set( h.atoms_found)) for v in ssm.structures.vertices for h in v.value.find_matches( mol)]
+      hits = [(h.substructure, set( h.atoms_found)) for h in ssm.find_matches_in_mol( mol)]
+      self.assertEqual( len( all_hits), len( hits))
+      for hit in hits:
+        self.assertTrue( hit in all_hits)
+    self.assertTrue( ssm.screen_passed < ssm.screened)
+
+## // Screening fingerprint testing
+
+
+## Substructure search manager testing
+
+class TestSubsearchManager(unittest.TestCase):
+
+  def test_compiled_data(self):
+    """the compiled data must be up to date and give the same structures and trees"""
+    ssm = subsearch.substructure_search_manager()
+    self.assertTrue( ssm._get_compiled_data())
+    ssm2 = subsearch.substructure_search_manager( use_compiled=False)
+    subs = [v.value for v in ssm.structures.vertices]
+    subs2 = [v.value for v in ssm2.structures.vertices]
+    self.assertEqual( [s.get_arrays() for s in subs], [s.get_arrays() for s in subs2])
+    for s, s2 in zip( subs, subs2):
+      self.assertEqual( [subs.index( ch) for ch in s.children], [subs2.index( ch) for ch in s2.children])
+      self.assertEqual( len( s.atoms_to_ignore), len( s2.atoms_to_ignore))
+    self.assertEqual( [subs.index( h) for h in ssm.search_trees], [subs2.index( h) for h in ssm2.search_trees])
+    self.assertEqual( len( ssm.structures.edges), len( ssm2.structures.edges))
+
+  def test_search_trees(self):
+    """every structure is in a tree and its parent is contained in it"""
+    ssm = subsearch.substructure_search_manager()
+    subs = set()
+    to_visit = list( ssm.search_trees)
+    while to_visit:
+      s = to_visit.pop()
+      subs.add( s)
+      for ch in s.children:
+        self.assertTrue( ch.structure.contains_substructure( s.structure))
+        to_visit.append( ch)
+    self.assertEqual( subs, set( v.value for v in ssm.structures.vertices))
+
+  def test_ring_hashes(self):
+    """the stored ring hashes are the ones find_rings_in_mol computes"""
+    ssm = subsearch.substructure_search_manager()
+    for ring_hash, r in ssm.rings.items():
+      self.assertEqual( ring_hash, subsearch.ring.get_smiles_hash( r.smiles_string))
+    count = len( ssm.rings)
+    mol = smiles.text_to_mol( "c1ccc2[nH]ccc2c1", calc_coords=0)
+    self.assertEqual( sorted( m.substructure.name for m in ssm.find_rings_in_mol( mol)), ["1H-pyrrole", "benzene"])
+    self.assertEqual( len( ssm.rings), count)
+
+## // Substructure search manager testing
+
+
 ## SMILES equality testing
 
 class TestEqualSMILES(unittest.TestCase):
@@ -117,6 +263,7 @@ class TestEqualSMILES(unittest.TestCase):
               ("H","[H]", False),
               ("C","[2H]C", False),
               ("[C]","[CH0]", True),
+              ("C=1CC1","C1=CC1", True),
               ]
 
   def _testformula(self, num):
@@ -132,6 +279,171 @@ for i in range( len( TestEqualSMILES.formulas)):
 ## // SMILES equality testing
 
 
+## Canonical SMILES testing
+
+class TestCanonicalSMILES(unittest.TestCase):
+
+  formulas = [("OCC","C(O)C"),
+              ("c1ccccc1O","Oc1ccccc1"),
+              ("C1CC1C(=O)O","OC(=O)C1CC1"),
+              ("CN1C=NC2=C1C(=O)N(C(=O)N2C)C","O=C1N(C)C(=O)c2c(ncn2C)N1C"),
+              ("C1C2CC3CC1CC(C2)C3","C1C3CC2CC(CC1C2)C3"),
+              ("CC(C)(C)CCl","ClCC(C)(C)C"),
+              ("C1CCCCC12CCCCC2","C1CCC2(CC1)CCCCC2"),
+              ("[O-][N+](=O)c1ccccc1","c1cccc(c1)[N+](=O)[O-]"),
+              ]
+
+  def _testformula(self, num):
+    smile1, smile2 = self.formulas[num]
+    m1 = smiles.text_to_mol( smile1, calc_coords=0)
+    m2 = smiles.text_to_mol( smile2, calc_coords=0)
+    out = smiles.mol_to_text( m1)
+    self.assertEqual( out, smiles.mol_to_text( m2))
+    self.assertTrue( equals( m1, smiles.text_to_mol( out, calc_coords=0), level=3))
+
+  def test_long_chain(self):
+    mol = smiles.text_to_mol( 3000*"C", calc_coords=0)
+    self.assertEqual( smiles.mol_to_text( mol), 3000*"C")
+
+# this creates individual test for substructures
+for i in range( len( TestCanonicalSMILES.formulas)):
+  setattr( TestCanonicalSMILES, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+
+
+class TestCanonicalStereoSMILES(unittest.TestCase):
+  """the output must not depend on the order of atoms when stereochemistry
+  is present, the pairs are the same molecule written differently"""
+
+  formulas = [("C1CC[C@H]2CCCC[C@@H]2C1","C1CC[C@@H]2CCCC[C@H]2C1"),
+              ("O[C@H]1CC[C@@H](O)CC1","O[C@@H]1CC[C@H](O)CC1"),
+              ("O=C(O)[C@@H](O)[C@H](O)C(=O)O","OC(=O)[C@@H](O)[C@H](O)C(O)=O"),
+              ("O=C(O)[C@@H](O)[C@@H](O)C(=O)O","O[C@H](C(=O)O)[C@@H](O)C(=O)O"),
+              ("C/C=C/1CCCC[13CH2]1","C/C=C(/[13CH2]1)CCCC1"),
+              ("C/C=C1CCCC[13CH2]/1","C/C=C(\\[13CH2]1)CCCC1"),
+              ("C/C=C/%10CCCC[13CH2]%10","C/C=C/1CCCC[13CH2]1"),
+              ("F/C=C/C=C/C=C\\F","F\\C=C/C=C/C=C/F"),
+              ]
+
+  def _testformula(self, num):
+    smile1, smile2 = self.formulas[num]
+    m1 = smiles.text_to_mol( smile1, calc_coords=0)
+    out = smiles.mol_to_text( m1)
+    self.assertTrue( m1.stereochemistry)
+    self.assertEqual( out, smiles.mol_to_text( smiles.text_to_mol( smile2, calc_coords=0)))
+    # the output reads back to the same molecule
+    self.assertEqual( out, smiles.mol_to_text( smiles.text_to_mol( out, calc_coords=0)))
+    rnd = random.Random( num)
+    for i in range( 10):
+      rnd.shuffle( m1.vertices)
+      self.assertEqual( smiles.mol_to_text( m1), out)
+
+# this creates individual test for substructures
+for i in range( len( TestCanonicalStereoSMILES.formulas)):
+  setattr( TestCanonicalStereoSMILES, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Canonical SMILES testing
+
+
+## Canonical ranking testing
+
+class TestCanonicalRanks(unittest.TestCase):
+
+  formulas = [("OCC","C(O)C",True),
+              ("c1ccccc1O","Oc1ccccc1",True),
+              ("CC(C)(C)CCl","ClCC(C)(C)C",True),
+              ("C1CCCCC12CCCCC2","C1CCC2(CC1)CCCCC2",True),
+              ("CCCO","CC(C)O",False),
+              ("CC=CC","C=CCC",False),
+              ("CC[O-]","CCO",False),
+              ("C1CC1CC","CC1CC1C",False),
+              ]
+
+  def _testformula(self, num):
+    smile1, smile2, result = self.formulas[num]
+    m1 = smiles.text_to_mol( smile1, calc_coords=0)
+    m2 = smiles.text_to_mol( smile2, calc_coords=0)
+    self.assertEqual( m1.get_structure_hash() == m2.get_structure_hash(), result)
+    ranks = m1.get_canonical_ranks()
+    self.assertEqual( sorted( ranks.values()), list( range( len( m1.vertices))))
+    if result:
+      symbols = lambda m: [a.symbol for a in m.number_atoms_uniquely()]
+      self.assertEqual( symbols( m1), symbols( m2))
+
+  def test_symmetry(self):
+    """equivalent atoms are tied before the tie breaking, it does not matter
+    which of them gets the lower rank"""
+    mol = smiles.text_to_mol( "OC(=O)c1ccccc1", calc_coords=0)
+    h = mol.get_structure_hash()
+    mol.vertices.reverse()
+    self.assertEqual( mol.get_structure_hash(), h)
+
+# this creates individual test for substructures
+for i in range( len( TestCanonicalRanks.formulas)):
+  setattr( TestCanonicalRanks, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Canonical ranking testing
+
+
+## Isomorphism testing
+
+def permuted( mol, perm):
+  """copy of mol made by from_arrays with the atoms in the order given by perm"""
+  index = dict( (mol.vertices[j], i) for i, j in enumerate( perm))
+  bonds = [e.get_vertices() for e in mol.edges]
+  return molecule.from_arrays( [mol.vertices[j].symbol for j in perm],
+                               [(index[v1], index[v2]) for v1, v2 in bonds],
+                               orders=[e.order for e in mol.edges])
+
+class TestIsomorphism(unittest.TestCase):
+
+  formulas = [("OCC","C(O)C",True,True),
+              ("C=CC","CC=C",True,True),
+              ("CC=CC","C=CCC",False,False),
+              ("CCCO","CC(C)O",False,False),
+              ("C1CCCCC1","C1CCC1C1CC1",False,False),
+              ("C1CCCCC1","CC1CCCC1",False,False),
+              ("C1=CC=C2C=CC=CC2=C1","C1=CC2=C(C=C1)C=CC=C2",True,True),
+              ("c1ccc2ccccc2c1","c1cccc2c1cccc2",True,True),
+              ("C1=CC=CC=C1","C1=CCC=CC1",False,False),
+              ]
+
+  def _testformula(self, num):
+    smile1, smile2, result3, result4 = self.formulas[num]
+    m1 = smiles.text_to_mol( smile1, calc_coords=0)
+    m2 = smiles.text_to_mol( smile2, calc_coords=0)
+    self.assertEqual( equals( m1, m2, level=3), result3)
+    # aromatic bonds are all the same
+    m1.mark_aromatic_bonds()
+    m2.mark_aromatic_bonds()
+    self.assertEqual( equals( m1, m2, level=4), result4)
+    self.assertEqual( m1.get_key() == m2.get_key(), result4)
+
+  def test_kekule(self):
+    """without aromatic bonds the two Kekule structures of naphthalene differ"""
+    m1 = smiles.text_to_mol( "C1=CC=C2C=CC=CC2=C1", calc_coords=0)
+    m2 = smiles.text_to_mol( "C1=CC2=C(C=C1)C=CC=C2", calc_coords=0)
+    self.assertTrue( equals( m1, m2, level=3))
+    self.assertFalse( equals( m1, m2, level=4))
+    self.assertNotEqual( m1.get_key(), m2.get_key())
+
+  def test_permutations(self):
+    for text in ("C12C3C4C1C5C2C3C45", "C1C2CC3CC1CC(C2)C3", "CC(C)CCCC(C)C1CCC2C1(CCC3C2CC=C4C3(CCC(C4)O)C)C"):
+      mol = smiles.text_to_mol( text, calc_coords=0)
+      n = len( mol.vertices)
+      m1 = permuted( mol, range( n))
+      m2 = permuted( mol, [(7*i) % n for i in range( n)] if n % 7 else list( reversed( range( n))))
+      self.assertTrue( equals( m1, m2, level=4))
+      self.assertEqual( m1.get_key(), m2.get_key())
+      self.assertEqual( len( set( [m1.get_key(), m2.get_key(), mol.get_key()])), 1)
+
+# this creates individual test for substructures
+for i in range( len( TestIsomorphism.formulas)):
+  setattr( TestIsomorphism, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Isomorphism testing
+
+
 ## SMILES reading testing
 
 class TestSMILESReading(unittest.TestCase):
@@ -144,6 +456,10 @@ class TestSMILESReading(unittest.TestCase):
               ("O=C[O-].[NH4+]",("CHO2","H4N")),
               ("c1ccccc1-c1ccccc1",("C12H10",)),
               ("c1cscc1",("C4H4S",)),
+              ("CS(=O)(=O)C",("C2H6O2S",)),
+              ("OP(O)(O)=O",("H3O4P",)),
+              ("OCl(=O)(=O)=O",("ClHO4",)),
+              ("FS(F)(F)(F)(F)F",("F6S",)),
               ]
 
   def _testformula(self, num):
@@ -165,9 +481,403 @@ class TestSMILESReading(unittest.TestCase):
 for i in range( len( TestSMILESReading.formulas)):
   setattr( TestSMILESReading, "testformula"+str(i+1), create_test(i,"_testformula"))
 
+
+class TestSMILESErrors(unittest.TestCase):
+  """malformed SMILES are reported with the position of the problem"""
+
+  formulas = [("C)C", 1),
+              ("C1CC", 1),
+              ("CC(C", 2),
+              ("CC=", 2),
+              ("C[CH3", 1),
+              ("C%C", 1),
+              ("C*C", 1),
+              ("=CC", 0),
+              ("C=#C", 2),
+              ("C[@@]C", 1),
+              ]
+
+  def _testformula(self, num):
+    text, position = self.formulas[num]
+    try:
+      smiles.text_to_mol( text, calc_coords=0)
+    except oasa_exceptions.oasa_smiles_error as e:
+      self.assertEqual( e.position, position)
+    else:
+      self.fail( "no error for %s" % text)
+
+for i in range( len( TestSMILESErrors.formulas)):
+  setattr( TestSMILESErrors, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+
+def formula_of( mol):
+  # top-level so that it can be sent to the worker processes
+  return str( mol.get_formula_dict())
+
+class TestSMILESFile(unittest.TestCase):
+
+  lines = ["CCO ethanol", "C)C broken", "", "c1ccccc1 benzene ring", "[Xy]", "CC(=O)O\tacetic acid"]
+  expected = [(1, "ethanol", "C2H6O", False), (2, "broken", None, True), (4, "benzene ring", "C6H6", False),
+              (5, "", None, True), (6, "acetic acid", "C2H4O2", False)]
+
+  def _read(self, **kw):
+    f = io.StringIO( u"\n".join( self.lines))
+    return [(n, name, res, bool( err)) for n, name, res, err in smiles.iter_smiles_file( f, **kw)]
+
+  def test_serial(self):
+    recs = self._read( chunk_size=2)
+    self.assertEqual( [(n, name, res and formula_of( res), err) for n, name, res, err in recs], self.expected)
+
+  def test_workers(self):
+    self.assertEqual( self._read( workers=2, chunk_size=1, process=formula_of), self.expected)
+    self.assertEqual( self._read( workers=2, chunk_size=10, process=formula_of), self.expected)
+
+  def test_converter(self):
+    mols = smiles.converter().read_file( ["CCO ethanol\n", "\n", "[Na+].[Cl-]\n"])
+    self.assertEqual( [str( m.get_formula_dict()) for m in mols], ["C2H6O", "Na", "Cl"])
+
 ## // SMILES reading testing
 
 
+## Molfile reading testing
+
+sdf_text = """nitromethane
+  comment
+
+  4  3  0  0  0  0  0  0  0  0999 V2000
+    0.0000    0.0000    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
+    1.0000    0.0000    0.0000 N   0  3  0  0  0  0  0  0  0  0  0  0
+    1.5000   -0.8660    0.0000 O   0  0  0  0  0  0  0  0  0  0  0  0
+    1.5000    0.8660    0.0000 O   0  0
+  1  2  1  0  0  0  0
+  2  4  1  0  0  0  0
+  2  3  2  0
+M  CHG  1   4  -1
+M  END
+> <ID>
+mol1
+
+>  <NOTE> (1)
+line one
+line two
+
+$$$$
+
+
+
+  3  2  0  0  0  0  0  0  0  0999 V2000
+    0.0000    0.0000    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
+    1.0000    0.0000    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
+    1.5000   -0.8660    0.0000 O   0  0  0  0  0  0  0  0  0  0  0  0
+  2  3  2  0  0  0  0
+  1  2  1  0  0  0  0
+M  END
+$$$$
+
+"""
+
+class TestMolfileReading(unittest.TestCase):
+
+  def _check( self, mols):
+    self.assertEqual( [str( m.get_formula_dict()) for m in mols], ["CH3NO2", "C2H4O"])
+    self.assertEqual( [a.charge for a in mols[0].vertices], [0, 1, 0, -1])
+    self.assertEqual( mols[0].properties_, {"ID": "mol1", "NOTE": "line one\nline two"})
+    self.assertEqual( mols[1].properties_, {})
+    self.assertEqual( mols[0].vertices[3].coords, (1.5, 0.866, 0.0))
+
+  def test_text(self):
+    self._check( list( molfile.converter().read_text( sdf_text)))
+
+  def test_binary(self):
+    self._check( list( molfile.converter().read_file( io.BytesIO( sdf_text.replace( "\n", "\r\n").encode( "utf-8")))))
+
+  def test_mmap(self):
+    import mmap
+    import tempfile
+    with tempfile.TemporaryFile() as f:
+      f.write( sdf_text.encode( "utf-8"))
+      f.flush()
+      mm = mmap.mmap( f.fileno(), 0, access=mmap.ACCESS_READ)
+      self._check( list( molfile.converter().read_file( mm)))
+      mm.close()
+
+  def test_molfile(self):
+    mol = molfile.text_to_mol( sdf_text.split( "$$$$")[0])
+    self.assertEqual( str( mol.get_formula_dict()), "CH3NO2")
+
+  def test_errors(self):
+    lines = sdf_text.splitlines( True)
+    for text, line in (("".join( lines[:6]), 6), ("".join( lines[:3]) + "  x  3\n" + "".join( lines[4:]), 4)):
+      try:
+        list( molfile.converter().read_text( text))
+      except oasa_exceptions.oasa_molfile_error as e:
+        self.assertEqual( e.line, line)
+      else:
+        self.fail( "no error raised")
+
+
+
+class TestSDFDataset(unittest.TestCase):
+
+  def setUp(self):
+    import tempfile
+    self.dir = tempfile.mkdtemp()
+    self.name = os.path.join( self.dir, "test.sdf")
+    with open( self.name, 'w') as f:
+      f.write( sdf_text)
+      f.write( "\n\n  1  0  0  0  0  0  0  0  0  0999 V2000\n    0.0000    0.0000    0.0000 Xx  0  0\nM  END\n")
+
+  def tearDown(self):
+    import shutil
+    shutil.rmtree( self.dir)
+
+  def test_access(self):
+    with molfile.sdf_dataset( self.name) as data:
+      self.assertEqual( len( data), 3)
+      self.assertEqual( str( data[1].get_formula_dict()), "C2H4O")
+      self.assertEqual( data[0].properties_["ID"], "mol1")
+      self.assertEqual( [str( m.get_formula_dict()) for m in data[:2]], ["CH3NO2", "C2H4O"])
+      self.assertEqual( [str( m.get_formula_dict()) for m in data[1::-1]], ["C2H4O", "CH3NO2"])
+      self.assertRaises( oasa_exceptions.oasa_invalid_atom_symbol, data.__getitem__, -1)
+      self.assertRaises( IndexError, data.__getitem__, 3)
+
+  def test_index(self):
+    offsets = molfile.build_sdf_index( self.name)
+    self.assertEqual( molfile.read_sdf_index( self.name), offsets)
+    with open( self.name, 'a') as f:
+      f.write( "$$$$\n")
+    self.assertEqual( molfile.read_sdf_index( self.name), None)
+    with molfile.sdf_dataset( self.name) as data:
+      self.assertEqual( len( data), 3)
+    self.assertNotEqual( molfile.read_sdf_index( self.name), None)
+
+  def test_map(self):
+    expected = [(0, "CH3NO2", None), (1, "C2H4O", None)]
+    with molfile.sdf_dataset( self.name) as data:
+      for workers in (1, 2):
+        records = list( data.map( formula_of, workers=workers, chunk_size=2))
+        self.assertEqual( records[:2], expected)
+        self.assertEqual( records[2][:2], (2, None))
+        self.assertTrue( records[2][2].startswith( "oasa_invalid_atom_symbol"))
+
+  def test_write(self):
+    with molfile.sdf_dataset( self.name) as data:
+      mols = data[:2]
+    name = os.path.join( self.dir, "written.sdf")
+    for workers in (1, 2):
+      errors = molfile.write_sdf( [mols[0], None, mols[1]], name, workers=workers, chunk_size=2)
+      self.assertEqual( [i for i, error in errors], [1])
+      self.assertEqual( molfile.read_sdf_index( name), molfile.build_sdf_index( name))
+      with molfile.sdf_dataset( name) as data:
+        self.assertEqual( [str( m.get_formula_dict()) for m in data[:]], ["CH3NO2", "C2H4O"])
+
+## // Molfile reading testing
+
+
+
+## Molfile writing testing
+
+class TestMolfileWriting(unittest.TestCase):
+
+  def _round_trip( self, mol, version=None):
+    text = molfile.molfile( mol, version=version).get_text()
+    mol2 = molfile.text_to_mol( text)
+    self.assertEqual( str( mol2.get_formula_dict()), str( mol.get_formula_dict()))
+    self.assertEqual( [(a.symbol, a.charge, a.multiplicity) for a in mol2.vertices],
+                      [(a.symbol, a.charge, a.multiplicity) for a in mol.vertices])
+    self.assertEqual( sorted( (min( mol.vertices.index( v) for v in b.vertices), b.order, b.type) for b in mol.edges),
+                      sorted( (min( mol2.vertices.index( v) for v in b.vertices), b.order, b.type) for b in mol2.edges))
+    return text
+
+  def _mol( self, text):
+    mol = smiles.text_to_mol( text, calc_coords=0)
+    for i, a in enumerate( mol.vertices):
+      a.coords = (float( i), 0.0, 0.0)
+    return mol
+
+  def test_v2000(self):
+    mol = self._mol( "CC(=O)[O-].[NH4+]")
+    mol.vertices[0].neighbor_edges[0].type = 'w'
+    text = self._round_trip( mol)
+    self.assertTrue( "V2000" in text)
+    self.assertTrue( text.endswith( "\nM  END"))
+
+  def test_v3000(self):
+    mol = self._mol( "C[CH2]C#N")
+    mol.vertices[1].multiplicity = 2
+    mol.vertices[0].neighbor_edges[0].type = 'h'
+    text = self._round_trip( mol, version="V3000")
+    self.assertTrue( "M  V30 BEGIN CTAB" in text)
+
+  def test_large(self):
+    mol = self._mol( 1200*"C")
+    text = self._round_trip( mol)
+    self.assertTrue( "V3000" in text.splitlines()[3])
+
+  def test_radicals(self):
+    mol = self._mol( 10*"C")
+    for a in mol.vertices:
+      a.multiplicity = 2
+    text = self._round_trip( mol)
+    self.assertEqual( [line[:9] for line in text.splitlines() if line.startswith( "M  RAD")], ["M  RAD  8", "M  RAD  2"])
+    text = molfile.mol_to_text( self._mol( "CC"))
+    self.assertEqual( text.splitlines()[-2:], ["  1  2  1  0  0  0  0", "M  END"])
+
+## // Molfile writing testing
+
+
+
+## Batch InChI generation testing
+
+# stands in for the InChI program - it prints the element symbols as the InChI,
+# fails for uranium, hangs on plutonium and crashes on neptunium
+inchi_stub = """
+import sys, time
+def write( count, lines):
+  symbols = [l[31:34].strip() for l in lines[4:4+int( lines[3][:3])]]
+  print( "Structure: %d" % count)
+  if "U" in symbols:
+    print( "Error 190 (no InChI; stub) inp structure #%d." % count)
+  elif "Pu" in symbols:
+    time.sleep( 60)
+  elif "Np" in symbols:
+    sys.exit( 1)
+  else:
+    print( "InChI=1S/" + "".join( symbols))
+    print( "InChIKey=KEY-%d" % len( symbols))
+  sys.stdout.flush()
+count = 0
+lines = []
+for line in iter( sys.stdin.readline, ""):
+  if line.startswith( "$$$$"):
+    count += 1
+    write( count, lines)
+    lines = []
+  else:
+    lines.append( line)
+if "".join( lines).strip():
+  write( count+1, lines)
+"""
+
+class TestInChIBatch(unittest.TestCase):
+
+  def setUp(self):
+    import sys
+    import tempfile
+    self.dir = tempfile.mkdtemp()
+    self.program = os.path.join( self.dir, "inchi-stub")
+    with open( self.program, 'w') as f:
+      f.write( "#!%s\n" % sys.executable)
+      f.write( inchi_stub)
+    os.chmod( self.program, 0o755)
+
+  def tearDown(self):
+    import shutil
+    shutil.rmtree( self.dir)
+
+  def _generate( self, texts, **kw):
+    mols = [smiles.text_to_mol( text) for text in texts]
+    return list( inchi.generate_inchis( mols, program=self.program, **kw))
+
+  def test_order(self):
+    texts = ["C", "CO", "CCO", "CCCO", "OCCO"]
+    expected = [(i, ("InChI=1S/" + text, "KEY-%d" % len( text), []), None) for i, text in enumerate( texts)]
+    for workers in (1, 2):
+      self.assertEqual( self._generate( texts, workers=workers, chunk_size=2), expected)
+
+  def test_errors(self):
+    records = self._generate( ["C", "[U]", "CO", "[Pu]", "CCO", "[Np]", "CCCO"], chunk_size=3, timeout=0.5)
+    self.assertEqual( [r[1] and r[1][0] for r in records],
+                      ["InChI=1S/C", None, "InChI=1S/CO", None, "InChI=1S/CCO", None, "InChI=1S/CCCO"])
+    self.assertEqual( [r[2] for r in records[1::2]],
+                      ["Error 190 (no InChI; stub) inp structure #2.", "InChI program timed out", "InChI program terminated"])
+
+  def test_large_batch(self):
+    # the batch does not fit into the pipe buffer of the stuck program
+    import time
+    start = time.time()
+    records = self._generate( ["[Pu]"] + 100*[60*"C"], chunk_size=101, timeout=1)
+    self.assertTrue( time.time() - start < 30)
+    self.assertEqual( records[0], (0, None, "InChI program timed out"))
+    self.assertEqual( [r[1] and r[1][0] for r in records[1:]], 100*["InChI=1S/" + 60*"C"])
+
+  def test_unwritable(self):
+    records = list( inchi.generate_inchis( [None, smiles.text_to_mol( "CO")], program=self.program))
+    self.assertEqual( records[0][:2], (0, None))
+    self.assertEqual( records[0][2], "Exception: No structure to write")
+    self.assertEqual( records[1], (1, ("InChI=1S/CO", "KEY-2", []), None))
+
+## // Batch InChI generation testing
+
+
+
+## InChIKey testing
+
+class TestInChIKey(unittest.TestCase):
+
+  formulas = [("InChI=1S/C6H10/c1-3-5-6-4-2/h3-6H,1-2H3/b5-3+,6-4+", "APPOKADJQUIAHP-GGWOSOGESA-N"),
+              ("InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3", "LFQSCWFLJHTTHZ-UHFFFAOYSA-N"),
+              ("InChI=1S/CH4/h1H4", "VNWKTOKETHGBQD-UHFFFAOYSA-N"),
+              ("InChI=1S/C8H10N4O2/c1-10-4-9-6-5(10)7(13)12(3)8(14)11(6)2/h4H,1-3H3", "RYYVLZVUVIJVGH-UHFFFAOYSA-N"),
+              ("InChI=1S/C2H4O2/c1-2(3)4/h1H3,(H,3,4)/p-1", "QTBSBXVTEAMEQO-UHFFFAOYSA-M"),
+              ("InChI=1S/C3H7NO2/c1-2(4)3(5)6/h2H,4H2,1H3,(H,5,6)/t2-/m0/s1", "QNAYBMKLOCPYGJ-REOHCLBHSA-N"),
+              ]
+
+  def _testformula(self, num):
+    text, key = self.formulas[num]
+    self.assertEqual( inchi_key.key_from_inchi( text), key)
+
+  def test_batch(self):
+    texts = [text+"\n" for text, key in self.formulas] + ["not an InChI\n"]
+    self.assertEqual( list( inchi_key.keys_from_inchis( texts)), [key for text, key in self.formulas] + [None])
+
+  def test_memo(self):
+    cache = inchi_key._digest_cache( len, size=4)
+    for text in ["a", "bb", "a", "ccc", "dddd", "a", "eeeee"]:
+      self.assertEqual( cache.get( text), len( text))
+    self.assertEqual( sorted( cache.items), ["a", "eeeee"])
+
+for i in range( len( TestInChIKey.formulas)):
+  setattr( TestInChIKey, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // InChIKey testing
+
+
+
+## InChI reading testing
+
+class TestInChIReading(unittest.TestCase):
+
+  formulas = [("InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3", "CCO"),
+              ("InChI=1S/C2H4O2/c1-2(3)4/h1H3,(H,3,4)/p-1", "CC(=O)[O-]"),
+              ("InChI=1S/H3N/h1H3/p+1", "[NH4+]"),
+              ("InChI=1S/C4H4S/c1-2-4-5-3-1/h1-4H", "c1ccsc1"),
+              ("InChI=1S/C2H6OS/c1-4(2)3/h1-2H3", "CS(C)=O"),
+              ("InChI=1S/H2O4S/c1-5(2,3)4/h(H2,1,2,3,4)", "OS(=O)(=O)O"),
+              ("InChI=1S/C2H3N/c1-2-3/h1H3", "CC#N"),
+              ("InChI=1S/C6H5NO2/c8-7(9)6-4-2-1-3-5-6/h1-5H", "O=N(=O)c1ccccc1"),
+              ("InChI=1S/C8H10N4O2/c1-10-4-9-6-5(10)7(13)12(3)8(14)11(6)2/h4H,1-3H3", "Cn1cnc2c1c(=O)n(C)c(=O)n2C"),
+              ("InChI=1S/C24H12/c1-2-14-5-6-16-9-11-18-12-10-17-8-7-15-4-3-13(1)19-20(14)22(16)24(18)23(17)21(15)19/h1-12H",
+               "c1cc2ccc3ccc4ccc5ccc6ccc1c7c2c3c4c5c67"),
+              ("InChI=1S/CH4N2O/c2-1(3)4/h(H4,2,3,4)", "NC(N)=O"),
+              ("InChI=1S/C2H5NO/c1-2(3)4/h1H3,(H2,3,4)", "CC(N)=O"),
+              ("InChI=1S/C2H5N3O2/c3-1(6)5-2(4)7/h(H5,3,4,5,6,7)", "NC(=O)NC(N)=O"),
+              ("InChI=1S/C4H5N3O/c5-3-1-2-6-4(8)7-3/h1-2H,(H3,5,6,7,8)", "Nc1cc[nH]c(=O)n1"),
+              ]
+
+  def _testformula(self, num):
+    text, smile = self.formulas[num]
+    mol = inchi.text_to_mol( text, calc_coords=0)
+    self.assertEqual( [v for v in mol.vertices if v.free_valency], [])
+    mol.remove_unimportant_hydrogens()
+    self.assertEqual( smiles.mol_to_text( mol), smiles.mol_to_text( smiles.text_to_mol( smile, calc_coords=0)))
+
+for i in range( len( TestInChIReading.formulas)):
+  setattr( TestInChIReading, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // InChI reading testing
+
+
 ## SMILES Reaction support
 
 class TestSMILESReactionSupport(unittest.TestCase):
@@ -425,6 +1135,592 @@ for i in range( len( TestGraphMatching.formulas)):
 
 
 
+## Compact (CSR) graph snapshot testing
+
+class TestCompactGraph(unittest.TestCase):
+  """tests if the analysis running on the compact graph snapshot gives
+  the right answers and if the snapshot is dropped on topology changes"""
+
+  formulas = [("C1CCCCC1",6,6,[6]),  # smiles, vertices, edges, ring sizes
+              ("c1ccc2ccccc2c1CC",12,13,[6,6]),
+              ("C1C2CC3CC1CC(C2)C3",10,12,[6,6,6]),
+              ("CCCC.CC",6,4,[]),
+              ]
+
+  def _testformula(self, num):
+    smile1, vs_num, es_num, ring_sizes = self.formulas[num]
+    mol = smiles.text_to_mol( smile1, calc_coords=0)
+    mol.remove_zero_order_bonds()
+    cg = mol.get_compact_graph()
+    self.assertEqual( len( cg.vertices), vs_num)
+    self.assertEqual( len( cg.edges), es_num)
+    self.assertEqual( sum( cg.get_degrees()), 2*es_num)
+    self.assertEqual( sorted( map( len, mol.get_smallest_independent_cycles())), ring_sizes)
+
+  def test_cache_flush( self):
+    mol = smiles.text_to_mol( "C1CCCCC1", calc_coords=0)
+    cg = mol.get_compact_graph()
+    self.assertTrue( cg is mol.get_compact_graph())
+    e = list( mol.edges)[0]
+    self.assertFalse( mol.is_edge_a_bridge( e))
+    mol.temporarily_disconnect_edge( e)
+    self.assertFalse( cg is mol.get_compact_graph())
+    self.assertEqual( len( mol.get_compact_graph().edges), 5)
+    self.assertTrue( mol.is_edge_a_bridge( list( mol.edges)[0]))
+    mol.reconnect_temporarily_disconnected_edges()
+    self.assertEqual( len( mol.get_smallest_independent_cycles()), 1)
+
+  def test_distances( self):
+    mol = smiles.text_to_mol( "CCCC.CC", calc_coords=0)
+    mol.remove_zero_order_bonds()
+    self.assertEqual( mol.mark_vertices_with_distance_from( mol.vertices[0]), 3)
+    self.assertEqual( len( [v for v in mol.vertices if 'd' in v.properties_]), 4)
+    self.assertEqual( len( list( mol.get_connected_components())), 2)
+
+  def test_maximum_matching( self):
+    # the greedy matching 1-2, 3-4 leaves 0 and 5 exposed, the augmenting path
+    # from 0 leads through the blossom 1-2-3
+    g = graph.graph.from_edge_list( 6, [(0,1), (1,2), (2,3), (3,1), (3,4), (4,5)])
+    cg = g.get_compact_graph()
+    mate_edge = cg.get_maximum_matching()
+    self.assertFalse( -1 in mate_edge)
+    self.assertEqual( len( set( mate_edge)), 3)
+    alive = bytearray( len( cg.edges) * [1])
+    alive[ cg.edge_index[ g.get_edge_between( g.vertices[0], g.vertices[1])]] = 0
+    self.assertEqual( cg.get_maximum_matching( alive=alive).count( -1), 2)
+
+# this creates individual test for compact graphs
+for i in range( len( TestCompactGraph.formulas)):
+  setattr( TestCompactGraph, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Compact (CSR) graph snapshot testing
+
+
+## Graph building testing
+
+class TestGraphBuilding(unittest.TestCase):
+  """tests if the vertex => index map stays consistent and the bulk
+  constructors build the right structures"""
+
+  def test_vertex_index( self):
+    mol = smiles.text_to_mol( "CCOCN", calc_coords=0)
+    vs = list( mol.vertices)
+    mol.remove_vertex( vs[1])
+    self.assertEqual( [mol._get_vertex_index( v) for v in vs], [0,None,1,2,3])
+    self.assertTrue( mol.add_edge( vs[0], vs[2]) is not None)
+    mol.vertices.reverse()
+    self.assertEqual( mol._get_vertex_index( vs[0]), 3)
+    # replaced directly in the list, the length stays the same
+    mol.vertices.remove( vs[0])
+    mol.vertices.append( vs[1])
+    self.assertEqual( mol._get_vertex_index( vs[1]), 3)
+    self.assertEqual( mol._get_vertex_index( vs[0]), None)
+
+  def test_add_vertex( self):
+    # a new vertex must not be looked for in the whole vertices list
+    class scan_counting_list( list):
+      scans = 0
+      def __contains__( self, v):
+        scan_counting_list.scans += 1
+        return list.__contains__( self, v)
+      def __iter__( self):
+        scan_counting_list.scans += 1
+        return list.__iter__( self)
+    mol = molecule()
+    mol.vertices = scan_counting_list()
+    last = None
+    for i in range( 100):
+      v = mol.add_vertex( mol.create_vertex())
+      if last:
+        self.assertTrue( mol.add_edge( last, v) is not None)
+      last = v
+    self.assertEqual( len( mol.vertices), 100)
+    self.assertEqual( scan_counting_list.scans, 0)
+
+  def test_from_edge_list( self):
+    g = graph.graph.from_edge_list( 4, [(0,1),(1,2),(2,3),(3,0)])
+    self.assertEqual( len( g.vertices), 4)
+    self.assertEqual( len( g.edges), 4)
+    self.assertTrue( g.is_connected())
+
+  def test_from_arrays( self):
+    mol = molecule.from_arrays( ['C','C','O'], [(0,1),(1,2)], orders=[1,2])
+    self.assertTrue( equals( mol, smiles.text_to_mol( "CC=O"), level=3))
+    self.assertTrue( equals( mol.deep_copy(), mol, level=3))
+
+## // Graph building testing
+
+
+## Bridges and ring blocks testing
+
+class TestBridges(unittest.TestCase):
+  """tests the one-pass detection of bridges and ring blocks"""
+
+  formulas = [("CCCC",3,[]),  # smiles, number of bridges, sizes of ring blocks (in atoms)
+              ("C1CCCCC1",0,[6]),
+              ("c1ccccc1-c1ccccc1CC",3,[6,6]),
+              ("c1ccc2ccccc2c1",0,[10]),
+              ("C1CCC2(CC1)CCCC2",0,[5,6]),  # spiro atom separates the blocks
+              ("C1CC1CCC1CC1",3,[3,3]),
+              ]
+
+  def _testformula(self, num):
+    smile1, bridges_num, block_sizes = self.formulas[num]
+    mol = smiles.text_to_mol( smile1, calc_coords=0)
+    self.assertEqual( len( mol.get_bridges()), bridges_num)
+    self.assertEqual( sorted( map( len, mol.get_ring_blocks())), block_sizes)
+    for e in mol.edges:
+      self.assertEqual( bool( mol.is_edge_a_bridge( e)), e in mol.get_bridges())
+    mol.temporarily_strip_bridge_edges()
+    self.assertEqual( len( mol.edges), sum( map( len, mol.get_ring_blocks_e())))
+    mol.reconnect_temporarily_disconnected_edges()
+
+# this creates individual test for bridges
+for i in range( len( TestBridges.formulas)):
+  setattr( TestBridges, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Bridges and ring blocks testing
+
+
+## Ring info testing
+
+class TestRingInfo(unittest.TestCase):
+  """tests the cached ring perception"""
+
+  formulas = [("CCCC",[],[],0),  # smiles, SSSR sizes, relevant cycle sizes, number of ring systems
+              ("c1ccccc1-c1ccccc1",[6,6],[6,6],2),
+              ("C1CCC2(CC1)CCCC2",[5,6],[5,6],1),
+              ("C1C2CC3CC1CC(C2)C3",[6,6,6],[6,6,6,6],1),  # adamantane
+              ("C12C3C4C1C5C2C3C45",[4,4,4,4,4],[4,4,4,4,4,4],1),  # cubane
+              ("C1CC2CCC1CC2",[6,6],[6,6,6],1),
+              ("c1ccc2ccccc2c1CC1CC1",[3,6,6],[3,6,6],2),
+              ("c1cc2cc3ccc(cc4ccc(cc5ccc(cc1n2)[nH]5)n4)[nH]3",[5,5,5,5,16],[5,5,5,5,16],1),  # porphin
+              ("c12c3c4c5c1c1c6c7c2c2c8c3c3c9c4c4c%10c5c5c1c1c6c6c%11c7c2c2c7c8c3c3c8c9c4c4c9c%10c5c5c1c1c6c6c%11c2c2c7c3c3c8c4c4c9c5c1c1c6c2c3c41",
+               12*[5]+19*[6],12*[5]+20*[6],1),  # C60
+              ]
+
+  def _testformula(self, num):
+    smile1, sssr, relevant, systems = self.formulas[num]
+    mol = smiles.text_to_mol( smile1, calc_coords=0)
+    ri = mol.get_ring_info()
+    self.assertEqual( sorted( map( len, ri.get_sssr())), sssr)
+    self.assertEqual( sorted( map( len, ri.get_relevant_cycles())), relevant)
+    self.assertEqual( len( ri.get_ring_systems()), systems)
+    for a in mol.vertices:
+      self.assertEqual( ri.is_atom_in_ring( a), bool( [r for r in ri.sssr if a in r]))
+    for b in mol.edges:
+      self.assertEqual( ri.is_bond_in_ring( b), not mol.is_edge_a_bridge( b))
+
+  def test_cache_flush(self):
+    mol = smiles.text_to_mol( "C1CCCCC1", calc_coords=0)
+    ri = mol.get_ring_info()
+    self.assertTrue( mol.get_ring_info() is ri)
+    ri.get_sssr()[0].clear()
+    self.assertEqual( len( mol.get_ring_info().get_sssr()[0]), 6)
+    mol.disconnect( mol.vertices[0], mol.vertices[1])
+    self.assertFalse( mol.get_ring_info() is ri)
+    self.assertEqual( mol.get_ring_info().get_sssr(), [])
+
+  def test_all_cycles(self):
+    mol = smiles.text_to_mol( "C1CC2CCC1CC2", calc_coords=0)
+    self.assertEqual( sorted( map( len, mol.get_ring_info().get_all_cycles())), [6,6,6])
+    mol = smiles.text_to_mol( "c1cc2ccc3ccc4ccc5ccc6ccc1c7c2c3c4c5c67", calc_coords=0)  # coronene
+    self.assertEqual( len( mol.get_all_cycles()), 94)
+    self.assertEqual( len( mol.get_all_cycles( max_size=6)), 7)
+    self.assertEqual( len( mol.get_all_cycles_e( max_size=10)), 19)
+    self.assertRaises( graph.too_many_cycles_error, mol.get_all_cycles, max_count=50)
+    for b in mol.edges:
+      b.aromatic = 0
+    mol.mark_aromatic_bonds( max_cycles=50)
+    self.assertEqual( len( [b for b in mol.edges if b.aromatic]), 30)
+
+# this creates individual test for ring info
+for i in range( len( TestRingInfo.formulas)):
+  setattr( TestRingInfo, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Ring info testing
+
+
+
+## Coordinates generation testing
+
+class TestCoordsGenerator(unittest.TestCase):
+
+  formulas = ["CC(C)CC(C)(C)C", "C1" + 100*"C" + "C1", 30*"C1CCC(CC1)C", "c1ccc2cc3cc4ccccc4cc3cc2c1",
+              "c1cc2ccc3ccc4ccc5ccc6ccc1c7c2c3c4c5c67", "C1CC2(CC1)CCC1(CC2)CCCC1"]
+
+  def _bond_lengths( self, mol):
+    return [((a1.x-a2.x)**2 + (a1.y-a2.y)**2) ** 0.5 for a1, a2 in (b.vertices for b in mol.edges)]
+
+  def _testformula(self, num):
+    mol = smiles.text_to_mol( self.formulas[num], calc_coords=0)
+    coords_generator.calculate_coords( mol, bond_length=1.5, force=1)
+    for v in mol.vertices:
+      self.assertFalse( v.x is None or v.y is None)
+    for length in self._bond_lengths( mol):
+      self.assertAlmostEqual( length, 1.5, 5)
+
+  def test_partial(self):
+    mol = smiles.text_to_mol( "c1ccccc1CCCc1ccc2ccccc2c1", calc_coords=0)
+    coords_generator.calculate_coords( mol, bond_length=1.5, force=1)
+    kept = mol.vertices[:9]
+    coords = [(v.x, v.y) for v in kept]
+    for v in mol.vertices[9:]:
+      v.x = v.y = None
+    coords_generator.calculate_coords( mol, bond_length=-1)
+    self.assertEqual( [(v.x, v.y) for v in kept], coords)
+    for length in self._bond_lengths( mol):
+      self.assertAlmostEqual( length, 1.5, 5)
+
+  def test_large(self):
+    # a strip of 1000 fused hexagons
+    length = 2*1000 + 1
+    bonds = [(i, i+1) for i in range( length-1)] + [(length+i, length+i+1) for i in range( length-1)]
+    bonds += [(i, length+i) for i in range( 0, length, 2)]
+    mol = molecule.from_arrays( 2*length*["C"], bonds)
+    coords_generator.calculate_coords( mol, bond_length=1, force=1)
+    for l in self._bond_lengths( mol):
+      self.assertAlmostEqual( l, 1, 5)
+
+# this creates individual test for coords generation
+for i in range( len( TestCoordsGenerator.formulas)):
+  setattr( TestCoordsGenerator, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Coordinates generation testing
+
+
+
+## Ring templates testing
+
+class TestRingTemplates(unittest.TestCase):
+
+  formulas = ["NC12CC3CC(CC(C3)C1)C2", "CC1(C)C2CCC1(C)C(=O)C2", "OC(=O)C12C3C4C1C5C2C3C45", "C1CN2CCC1CC2",
+              "CN1C2CCC1CC(O)C2", "CC12CCC3C(C1CCC2O)CCC4=CC(=O)CCC34C",
+              "CCc1c(CC)c2cc3c(CC)c(CC)c(cc4c(CC)c(CC)c(cc5c(CC)c(CC)c(cc1n2)[nH]5)n4)[nH]3",
+              "C1C2CC3CC1CC(C2)C3C1C2CC3CC1CC(C2)C3", "c1ccccc1CC12CC3CC(CC(C3)C1)C2"]
+
+  def _testformula(self, num):
+    mol = smiles.text_to_mol( self.formulas[num], calc_coords=0)
+    coords_generator.calculate_coords( mol, bond_length=1, force=1)
+    for a1, a2 in (b.vertices for b in mol.edges):
+      self.assertTrue( 0.6 < ((a1.x-a2.x)**2 + (a1.y-a2.y)**2) ** 0.5 < 1.2)
+    vs = mol.vertices
+    for i, a1 in enumerate( vs):
+      for a2 in vs[:i]:
+        self.assertTrue( ((a1.x-a2.x)**2 + (a1.y-a2.y)**2) ** 0.5 > 0.5)
+
+  def test_lookup(self):
+    mol = smiles.text_to_mol( "CC1(C)C2CCC1(C)C(=O)C2", calc_coords=0)  # camphor
+    system = mol.get_ring_info().get_ring_systems()[0]
+    mappings = ring_templates.find_template_coords( system)
+    self.assertEqual( len( mappings), 4)
+    self.assertEqual( set( mappings[0].keys()), system)
+    mol = smiles.text_to_mol( "c1ccc2ccccc2c1", calc_coords=0)
+    self.assertEqual( ring_templates.find_template_coords( mol.vertices), [])
+
+  def test_add_template(self):
+    mol = smiles.text_to_mol( "C1CC2CC3C1CC2C3", calc_coords=0)  # twistane
+    system = mol.get_ring_info().get_ring_systems()[0]
+    self.assertEqual( ring_templates.find_template_coords( system), [])
+    template = smiles.text_to_mol( "C1CC2CC3C1CC2C3", calc_coords=0)
+    coords = [(0.5, 1.6), (-0.5, 1.6), (-1.2, 0.8), (-1.2, -0.3), (-0.3, -0.8), (0.2, 0.7),
+              (0.5, -1.7), (1.2, -0.3), (-0.6, -1.6)]
+    for a, (x, y) in zip( template.vertices, coords):
+      a.x, a.y = 2*x, 2*y
+    ring_templates.add_template( template, name="twistane")
+    self.assertTrue( ring_templates.find_template_coords( system))
+    coords_generator.calculate_coords( mol, bond_length=1, force=1)
+    # the bond lengths of the template are kept
+    def get_lengths( m):
+      lengths = sorted( ((a1.x-a2.x)**2 + (a1.y-a2.y)**2) ** 0.5 for a1, a2 in (b.vertices for b in m.edges))
+      return [l / lengths[0] for l in lengths]
+    for l1, l2 in zip( get_lengths( mol), get_lengths( template)):
+      self.assertAlmostEqual( l1, l2, 5)
+
+# this creates individual test for ring templates
+for i in range( len( TestRingTemplates.formulas)):
+  setattr( TestRingTemplates, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Ring templates testing
+
+
+
+## Coordinates optimization testing
+
+class TestCoordsOptimizer(unittest.TestCase):
+
+  def _optimize( self, mol, numpy_min_atoms=None, repulsion=0):
+    opt = coords_optimizer.coords_optimizer()
+    opt.numpy_min_atoms = numpy_min_atoms
+    opt.repulsion = repulsion
+    self.assertTrue( opt.optimize_coords( mol, bond_length=0.9))
+    return [(v.x, v.y) for v in mol.vertices]
+
+  def _distance( self, a1, a2):
+    return ((a1.x-a2.x)**2 + (a1.y-a2.y)**2) ** 0.5
+
+  def _hepta_chain( self):
+    """heptane coiled to a hexagon, the first and the last atom overlap"""
+    mol = smiles.text_to_mol( "CCCCCCC", calc_coords=0)
+    for i, v in enumerate( mol.vertices):
+      v.x = 0.9 * math.cos( 2*math.pi*i/6.05)
+      v.y = 0.9 * math.sin( 2*math.pi*i/6.05)
+    return mol
+
+  def test_bond_lengths(self):
+    mol = smiles.text_to_mol( "CC(C)C(C)CCCC")
+    for v in mol.vertices:
+      v.x *= 1.3
+    self._optimize( mol)
+    for b in mol.edges:
+      self.assertAlmostEqual( self._distance( *b.vertices), 0.9, 3)
+    for v in mol.vertices:
+      for n1 in v.neighbors:
+        for n2 in v.neighbors:
+          if n1 is not n2:
+            self.assertAlmostEqual( self._distance( n1, n2), 0.9*math.sqrt( 3), 2)
+
+  def test_repulsion(self):
+    mol = self._hepta_chain()
+    self._optimize( mol)
+    self.assertTrue( self._distance( mol.vertices[0], mol.vertices[-1]) < 0.1)
+    mol = self._hepta_chain()
+    self._optimize( mol, repulsion=1)
+    self.assertTrue( self._distance( mol.vertices[0], mol.vertices[-1]) > 0.85)
+
+  def test_repulsion_pairs(self):
+    mol = smiles.text_to_mol( 200*"C", calc_coords=1)
+    length = self._distance( *list( mol.edges)[0].vertices)
+    bonds, pairs = coords_optimizer._get_index_pairs( mol)
+    others = coords_optimizer._repulsion_pairs( bonds, pairs, length)
+    self.assertTrue( others.is_outdated())
+    others.update( [(v.x, v.y) for v in mol.vertices])
+    self.assertFalse( others.is_outdated())
+    vs = mol.vertices
+    close = set( bonds) | set( pairs) | set( (j, i) for i, j in bonds + pairs)
+    expected = [(i, j) for i in range( len( vs)) for j in range( i+1, len( vs))
+                if (i, j) not in close and self._distance( vs[i], vs[j]) < 2*length]
+    self.assertEqual( others.pairs, expected)
+    self.assertTrue( len( others.pairs) < 5*len( vs))
+
+  def test_same_point(self):
+    engines = [None] + (coords_optimizer.numpy is not None and [0] or [])
+    for numpy_min_atoms in engines:
+      for repulsion in (0, 1):
+        mol = smiles.text_to_mol( "CCCC", calc_coords=0)
+        for i, v in enumerate( mol.vertices):
+          v.x, v.y = 0.8*i, 0.4*(i % 2)
+        # a bonded atom at the same point as its neighbor
+        mol.vertices[1].x, mol.vertices[1].y = 0.0, 0.0
+        self._optimize( mol, numpy_min_atoms=numpy_min_atoms, repulsion=repulsion)
+        for b in mol.edges:
+          self.assertAlmostEqual( self._distance( *b.vertices), 0.9, 3)
+
+  @unittest.skipIf( coords_optimizer.numpy is None, "numpy is not installed")
+  def test_numpy(self):
+    for repulsion in (0, 1):
+      mol1 = self._hepta_chain()
+      mol2 = self._hepta_chain()
+      coords1 = self._optimize( mol1, numpy_min_atoms=None, repulsion=repulsion)
+      coords2 = self._optimize( mol2, numpy_min_atoms=0, repulsion=repulsion)
+      for (x1, y1), (x2, y2) in zip( coords1, coords2):
+        self.assertAlmostEqual( x1, x2, 6)
+        self.assertAlmostEqual( y1, y2, 6)
+
+## // Coordinates optimization testing
+
+
+
+## Spatial index testing
+
+class TestSpatialIndex(unittest.TestCase):
+
+  def _points( self):
+    # atoms on a spiral, some of them closer than the cell size
+    mol = smiles.text_to_mol( 60*"C", calc_coords=0)
+    for i, v in enumerate( mol.vertices):
+      v.x = 0.1*i * math.cos( 0.7*i)
+      v.y = 0.1*i * math.sin( 0.7*i) - 2
+    return mol.vertices
+
+  def _close( self, a1, a2, radius):
+    return (a1.x-a2.x)**2 + (a1.y-a2.y)**2 < radius**2
+
+  def test_items_within(self):
+    vs = self._points()
+    index = spatial_index( vs, cell_size=0.7)
+    self.assertEqual( len( index), len( vs))
+    for radius in (0.3, 1.0, 2.5):
+      for v in vs:
+        self.assertEqual( set( index.get_items_within( v.x, v.y, radius)),
+                          set( a for a in vs if self._close( a, v, radius)))
+
+  def test_close_pairs(self):
+    vs = self._points()
+    for cell_size in (0.4, 1.0):
+      index = spatial_index( vs, cell_size=cell_size)
+      for radius in (0.5, 1.0):
+        pairs = index.get_close_pairs( radius)
+        self.assertEqual( len( pairs), len( set( frozenset( p) for p in pairs)))
+        self.assertEqual( set( frozenset( p) for p in pairs),
+                          set( frozenset( (a1, a2)) for i, a1 in enumerate( vs) for a2 in vs[:i] if self._close( a1, a2, radius)))
+
+  def test_move(self):
+    vs = self._points()
+    index = spatial_index( vs, cell_size=0.5)
+    v = vs[10]
+    v.x, v.y = 100, 100
+    index.move( v)
+    self.assertEqual( index.get_items_within( 100.1, 100, 0.5), [v])
+    self.assertFalse( v in index.get_items_within( vs[9].x, vs[9].y, 5))
+
+  def test_move_while_iterating(self):
+    vs = self._points()
+    index = spatial_index( vs, cell_size=0.4)
+    moved = set()
+    found = set()
+    for a1, a2 in index.iter_close_pairs( 1.0):
+      found.add( frozenset( (a1, a2)))
+      if len( moved) < 10 and a1 not in moved:
+        a1.x += 100
+        index.move( a1)
+        moved.add( a1)
+    rest = [v for v in vs if v not in moved]
+    self.assertEqual( len( moved), 10)
+    self.assertTrue( set( frozenset( (a1, a2)) for i, a1 in enumerate( rest) for a2 in rest[:i] if self._close( a1, a2, 1.0)) <= found)
+
+  def test_molecule(self):
+    mol = smiles.text_to_mol( "CC(C)CC1CCCCC1")
+    index = mol.get_spatial_index()
+    self.assertEqual( len( index), len( mol.vertices))
+    self.assertEqual( index.get_close_pairs( 0.5), [])
+    self.assertEqual( len( index.get_close_pairs( 1.1)), len( mol.edges))
+
+## // Spatial index testing
+
+
+
+## Overlap resolution testing
+
+class TestOverlaps(unittest.TestCase):
+
+  formulas = ["CC(C)CC(C(=O)NC(CC(C)C)C(=O)NC(CC(C)C)C(=O)NC(CC(C)C)C(=O)O)NC(=O)C(CC(C)C)NC(=O)C(CC(C)C)N",
+              "OCC1OC(OC2C(CO)OC(OC3C(CO)OC(O)C(O)C3O)C(O)C2O)C(O)C(O)C1O",
+              "CC(C)(C)OC(=O)NC(Cc1ccccc1)C(=O)NC(CC(C)C)C(=O)NC(Cc1ccc(O)cc1)C(=O)OC(C)(C)C"]
+
+  def _testformula(self, num):
+    mol = smiles.text_to_mol( self.formulas[num], calc_coords=0)
+    coords_generator.calculate_coords( mol, bond_length=1.5, force=1)
+    self.assertEqual( mol.get_spatial_index().get_close_pairs( 0.75), [])
+    for a1, a2 in (b.vertices for b in mol.edges):
+      self.assertAlmostEqual( ((a1.x-a2.x)**2 + (a1.y-a2.y)**2) ** 0.5, 1.5, 5)
+
+  def test_work_limit(self):
+    # all atoms in a few crowded cells, the atoms looked at must stay within the work limit
+    mol = smiles.text_to_mol( 300*"C", calc_coords=0)
+    for i, v in enumerate( mol.vertices):
+      v.x = 0.01 * (i % 37)
+      v.y = 0.01 * (i % 41)
+    scanned = []
+    class counting_index( spatial_index):
+      def get_items_near( self, x, y, radius):
+        ret = spatial_index.get_items_near( self, x, y, radius)
+        scanned.append( len( ret))
+        return ret
+    mol.get_spatial_index = lambda cell_size=None: counting_index( mol.vertices, cell_size=cell_size)
+    gen = coords_generator.coords_generator()
+    gen.stereo = {}
+    gen._resolve_overlaps( mol)
+    self.assertTrue( scanned)
+    self.assertTrue( sum( scanned) <= (gen.max_overlap_work + 1) * len( mol.vertices))
+
+# this creates individual test for overlap resolution
+for i in range( len( TestOverlaps.formulas)):
+  setattr( TestOverlaps, "testformula"+str(i+1), create_test(i,"_testformula"))
+
+## // Overlap resolution testing
+
+
+
+## Cairo output testing
+
+try:
+  from src.oasa import cairo_out
+except ImportError:
+  cairo_out = None
+
+@unittest.skipIf( cairo_out is None, "pycairo is not installed")
+class TestCairoOut(unittest.TestCase):
+
+  def setUp(self):
+    import tempfile
+    self.dir = tempfile.mkdtemp()
+    self.mols = [smiles.text_to_mol( text, calc_coords=1) for text in ("OCC(=O)N", "c1ccccc1Cl")]
+
+  def tearDown(self):
+    import shutil
+    shutil.rmtree( self.dir)
+
+  def _coords( self):
+    return [(v.x, v.y, v.z) for mol in self.mols for v in mol.vertices]
+
+  def _read_png( self, name):
+    """returns the size of the image and the bbox of the pixels different from the corner"""
+    surface = cairo_out.cairo.ImageSurface.create_from_png( name)
+    w, h, stride = surface.get_width(), surface.get_height(), surface.get_stride()
+    data = bytes( surface.get_data())
+    ink = [(x, y) for y in range( h) for x in range( w) if data[ y*stride+4*x:y*stride+4*x+4] != data[0:4]]
+    return w, h, (min( x for x, y in ink), min( y for x, y in ink), max( x for x, y in ink), max( y for x, y in ink))
+
+  def test_coords_restored(self):
+    coords = self._coords()
+    name = os.path.join( self.dir, "mols.png")
+    cairo_out.mols_to_cairo( self.mols, name, "png", align_coords=True)
+    self.assertTrue( os.path.exists( name))
+    self.assertEqual( self._coords(), coords)
+    mols = self.mols
+    class failing_cairo_out( cairo_out.cairo_out):
+      def draw_mol( self, mol):
+        if mol is mols[1]:
+          raise ValueError( "drawing failed")
+        cairo_out.cairo_out.draw_mol( self, mol)
+    self.assertRaises( ValueError, failing_cairo_out().mols_to_cairo, self.mols, name)
+    self.assertEqual( self._coords(), coords)
+
+  def test_render_many(self):
+    coords = self._coords()
+    mols = [self.mols[0], molecule(), self.mols[1]]
+    for workers in (1, 2):
+      out_dir = os.path.join( self.dir, str( workers))
+      records = cairo_out.render_many( mols, out_dir, workers=workers, names=["a", "b", "c"], chunk_size=1)
+      self.assertEqual( [name for name, error in records], [os.path.join( out_dir, n+".png") for n in "abc"])
+      self.assertEqual( [error is None for name, error in records], [True, False, True])
+      self.assertTrue( os.path.exists( records[0][0]) and os.path.exists( records[2][0]))
+      self.assertEqual( self._coords(), coords)
+
+  def test_recording(self):
+    if not hasattr( cairo_out.cairo, "RecordingSurface"):
+      self.skipTest( "cairo does not support recording surfaces")
+    recorded = os.path.join( self.dir, "recorded.png")
+    drawn = os.path.join( self.dir, "drawn.png")
+    cairo_out.mol_to_png( self.mols[0], recorded, scaling=2)
+    # without the recording surface the molecule is drawn twice
+    recording_surface = cairo_out.cairo.RecordingSurface
+    del cairo_out.cairo.RecordingSurface
+    try:
+      cairo_out.mol_to_png( self.mols[0], drawn, scaling=2)
+    finally:
+      cairo_out.cairo.RecordingSurface = recording_surface
+    w1, h1, bbox1 = self._read_png( recorded)
+    w2, h2, bbox2 = self._read_png( drawn)
+    self.assertEqual( (w1, h1), (w2, h2))
+    for c1, c2 in zip( bbox1, bbox2):
+      self.assertTrue( abs( c1-c2) <= 1, (bbox1, bbox2))
+
+## // Cairo output testing
+
+
+
 
 if __name__ == '__main__':
   import sys